@@ -19,7 +19,7 @@
 # <pep8 compliant>
 
 import re
-import xml.dom.minidom
+import xml.etree.ElementTree as ET
 from math import cos, sin, tan, atan2, pi, ceil
 
 import bpy
@@ -30,7 +30,8 @@ from .svg_util import (units,
                        srgb_to_linearrgb,
                        check_points_equal,
                        parse_array_of_floats,
-                       read_float)
+                       read_float,
+                       tokenize_path_data)
 
 #### Common utilities ####
 
@@ -47,6 +48,7 @@ def SVGCreateCurve(context):
     obj = bpy.data.objects.new("Curve", cu)
 
     context['collection'].objects.link(obj)
+    context['objects'].append(obj)
 
     return obj
 
@@ -403,29 +405,7 @@ class SVGPathData:
         d - the definition of the outline of a shape
         """
 
-        spaces = ' ,\t'
-        commands = {'m', 'l', 'h', 'v', 'c', 's', 'q', '', 't', 'a', 'z'}
-        tokens = []
-
-        i = 0
-        n = len(d)
-        while i < n:
-            c = d[i]
-
-            if c in spaces:
-                pass
-            elif c.lower() in commands:
-                tokens.append(c)
-            elif c in ['-', '.'] or c.isdigit():
-                token, last_char = read_float(d, i)
-                tokens.append(token)
-
-                # in most cases len(token) and (last_char - i) are the same
-                # but with whitespace or ',' prefix they are not.
-
-                i += (last_char - i) - 1
-
-            i += 1
+        tokens = tokenize_path_data(d)
 
         self._data = tokens
         self._index = 0
@@ -1073,15 +1053,12 @@ class SVGGeometryContainer(SVGGeometry):
         Parse XML node to memory
         """
 
-        if type(self._node) is xml.dom.minidom.Element:
+        if self._node.tagName is not None:
             self._styles = SVGParseStyles(self._node, self._context)
 
         self._pushStyle(self._styles)
 
         for node in self._node.childNodes:
-            if type(node) is not xml.dom.minidom.Element:
-                continue
-
             ob = parseAbstractNode(node, self._context)
             if ob is not None:
                 self._geometries.append(ob)
@@ -1131,10 +1108,19 @@ class SVGGeometryPATH(SVGGeometry):
 
         self._styles = SVGParseStyles(self._node, self._context)
 
-        pathParser = SVGPathParser(d, self._styles['useFill'])
-        pathParser.parse()
+        # Map exports and icon sheets repeat the same outlines a lot,
+        # splines are only read when creating geometries so they can be shared
+        key = (d, self._styles['useFill'])
+        splines = self._context['paths'].get(key)
+
+        if splines is None:
+            pathParser = SVGPathParser(d, self._styles['useFill'])
+            pathParser.parse()
+
+            splines = pathParser.getSplines()
+            self._context['paths'][key] = splines
 
-        self._splines = pathParser.getSplines()
+        self._splines = splines
 
     def _doCreateGeom(self, instancing):
         """
@@ -1253,7 +1239,7 @@ class SVGGeometryUSE(SVGGeometry):
         Create real geometries
         """
 
-        ref = self._node.getAttribute('xlink:href')
+        ref = self._node.getAttribute('xlink:href') or self._node.getAttribute('href')
         geom = self._context['defines'].get(ref)
 
         if geom is not None:
@@ -1262,7 +1248,32 @@ class SVGGeometryUSE(SVGGeometry):
 
             self._pushMatrix(self.getNodeMatrix())
 
-            geom.createGeom(True)
+            # Referenced geometries only differ by their matrix for the same
+            # display rectangle, so objects of the first use are instanced
+            # with their data linked instead of creating geometries again
+            key = (ref, rect)
+            instance = self._context['instances'].get(key)
+            matrix = self._context['matrix']
+
+            if instance is not None:
+                objects, instance_matrix = instance
+                matrix = matrix @ instance_matrix
+
+                for ob in objects:
+                    copy = bpy.data.objects.new(ob.name, ob.data)
+                    copy.matrix_world = matrix @ ob.matrix_world
+                    self._context['collection'].objects.link(copy)
+                    self._context['objects'].append(copy)
+            else:
+                start = len(self._context['objects'])
+                cycle = geom._creating
+
+                geom.createGeom(True)
+
+                # Flattened geometries can't be instanced
+                if matrix.determinant() != 0.0 and not cycle:
+                    objects = self._context['objects'][start:]
+                    self._context['instances'][key] = (objects, matrix.inverted())
 
             self._popMatrix()
 
@@ -1806,7 +1817,7 @@ class SVGLoader(SVGGeometryContainer):
         collection = bpy.data.collections.new(name=svg_name)
         scene.collection.children.link(collection)
 
-        node = xml.dom.minidom.parse(filepath)
+        node = SVGParseFile(filepath)
 
         m = Matrix()
         m = m @ Matrix.Scale(1.0 / 90.0 * 0.3048 / 12.0, 4, Vector((1.0, 0.0, 0.0)))
@@ -1823,7 +1834,10 @@ class SVGLoader(SVGGeometryContainer):
                          'styles': [None],
                          'style': None,
                          'do_colormanage': do_colormanage,
-                         'collection': collection}
+                         'collection': collection,
+                         'objects': [],  # All created objects, in creation order
+                         'instances': {},  # Objects and inverted matrix of the first use of references
+                         'paths': {}}  # Parsed splines of path data
 
         super().__init__(node, self._context)
 
@@ -1843,6 +1857,71 @@ svgGeometryClasses = {
     'g': SVGGeometryG}
 
 
+class SVGNode:
+    """
+    Element of the SVG document, with the attributes used by geometries
+    """
+
+    __slots__ = ('tagName',  # Name of the element, None for the document
+                 'attributes',  # Attribute values by name
+                 'childNodes')  # List of child elements
+
+    def __init__(self, tagName, attributes):
+        self.tagName = tagName
+        self.attributes = attributes
+        self.childNodes = []
+
+    def getAttribute(self, name):
+        return self.attributes.get(name, '')
+
+
+SVGNamespace = 'http://www.w3.org/2000/svg'
+SVGAttributeNamespaces = {'http://www.w3.org/1999/xlink': 'xlink:'}
+
+
+def SVGParseFile(filepath):
+    """
+    Parse SVG file into a tree of SVGNode
+
+    Only SVG elements which are known geometries are kept, other elements
+    (metadata, editor data, text...) and their children are not imported
+    and skipped while streaming the file.
+    """
+
+    document = SVGNode(None, {})
+    nodes = [document]  # Stack of parent nodes, None under skipped elements
+
+    for event, elem in ET.iterparse(filepath, events=('start', 'end')):
+        if event == 'end':
+            nodes.pop()
+            elem.clear()
+            continue
+
+        parent = nodes[-1]
+        node = None
+
+        if parent is not None:
+            namespace, _, name = elem.tag.rpartition('}')
+
+            if namespace in {'', '{' + SVGNamespace} and name.lower() in svgGeometryClasses:
+                attributes = {}
+                for attr, value in elem.attrib.items():
+                    if attr[0] == '{':
+                        namespace, _, attr = attr[1:].partition('}')
+                        prefix = SVGAttributeNamespaces.get(namespace)
+                        if prefix is None:
+                            continue
+                        attr = prefix + attr
+                    attributes[attr] = value
+
+                node = SVGNode(name, attributes)
+                parent.childNodes.append(node)
+
+        nodes.append(node)
+
+    return document
+
+
 def parseAbstractNode(node, context):
     name = node.tagName.lower()
 
@@ -1880,7 +1959,7 @@ def load(operator, context, filepath=""):
     do_colormanage = context.scene.display_settings.display_device != 'NONE'
     try:
         load_svg(context, filepath, do_colormanage)
-    except (xml.parsers.expat.ExpatError, UnicodeEncodeError) as e:
+    except (ET.ParseError, UnicodeEncodeError) as e:
         import traceback
         traceback.print_exc()
 
@@ -56,6 +56,10 @@ re_match_number_optional_parts = re.compile(match_number_optional_parts)
 array_of_floats_pattern = f"({match_number_optional_parts})|{match_first_comma}|{match_comma_pair}|{match_last_comma}"
 re_array_of_floats_pattern = re.compile(array_of_floats_pattern)
 
+match_path_token = f"[MmLlHhVvCcSsQqTtAaZz]|{match_number_optional_parts}"
+re_path_token = re.compile(match_path_token)
+
+
 def parse_array_of_floats(text):
     """
     Accepts comma or space separated list of floats (without units) and returns an array
@@ -65,6 +69,15 @@ def parse_array_of_floats(text):
     return [value_to_float(v[0]) for v in elements]
 
 
+def tokenize_path_data(d: str):
+    """
+    Splits path data (the "d" attribute of a path) into commands and numbers (as strings).
+
+    Separators and characters which are neither commands nor numbers are skipped.
+    """
+    return [match.group(0) for match in re_path_token.finditer(d)]
+
+
 def read_float(text: str, start_index: int = 0):
     """
     Reads floating point value from a string. Parsing starts at the given index.
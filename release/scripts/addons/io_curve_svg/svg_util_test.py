@@ -24,9 +24,9 @@
 # XXX Not really nice, but that hack is needed to allow execution of that test
 #     from both automated CTest and by directly running the file manually.
 if __name__ == '__main__':
-    from svg_util import (parse_array_of_floats, read_float, parse_coord,)
+    from svg_util import (parse_array_of_floats, read_float, parse_coord, tokenize_path_data,)
 else:
-    from .svg_util import (parse_array_of_floats, read_float, parse_coord,)
+    from .svg_util import (parse_array_of_floats, read_float, parse_coord, tokenize_path_data,)
 import unittest
 
 class ParseArrayOfFloatsTest(unittest.TestCase):
@@ -179,5 +179,35 @@ class ParseCoordTest(unittest.TestCase):
         self.assertEqual(parse_coord("1.2%", 200), 2.4)
 
 
+class TokenizePathDataTest(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(tokenize_path_data(""), [])
+        self.assertEqual(tokenize_path_data("  \n "), [])
+
+    def test_commands(self):
+        self.assertEqual(tokenize_path_data("M 1 2 L 3 4 z"),
+                         ["M", "1", "2", "L", "3", "4", "z"])
+        self.assertEqual(tokenize_path_data("m1,2l3,4Z"),
+                         ["m", "1", "2", "l", "3", "4", "Z"])
+
+    def test_separators(self):
+        self.assertEqual(tokenize_path_data("M1,2\n\tL 3 ,4"),
+                         ["M", "1", "2", "L", "3", "4"])
+
+    def test_sign_as_separator(self):
+        self.assertEqual(tokenize_path_data("l1-2-3"), ["l", "1", "-2", "-3"])
+
+    def test_decimal_as_separator(self):
+        self.assertEqual(tokenize_path_data("l1.5.5-.5"), ["l", "1.5", ".5", "-.5"])
+
+    def test_scientific_value(self):
+        self.assertEqual(tokenize_path_data("M1.2e+3,4E-2"), ["M", "1.2e+3", "4E-2"])
+        # "e" without exponent isn't part of the number
+        self.assertEqual(tokenize_path_data("M1.2eV3"), ["M", "1.2", "V", "3"])
+
+    def test_missing_fractional(self):
+        self.assertEqual(tokenize_path_data("M1. 2."), ["M", "1.", "2."])
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
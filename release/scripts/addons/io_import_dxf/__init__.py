@@ -34,7 +34,7 @@ except:
 bl_info = {
     "name": "Import AutoCAD DXF Format (.dxf)",
     "author": "Lukas Treyer, Manfred Moitzi (support + dxfgrabber library), Vladimir Elistratov, Bastien Montagne, Remigiusz Fiedler (AKA migius)",
-    "version": (0, 9, 6),
+    "version": (0, 9, 8),
     "blender": (2, 80, 0),
     "location": "File > Import > AutoCAD DXF",
     "description": "Import files in the Autocad DXF format (.dxf)",
@@ -95,6 +95,7 @@ T_ExportAcis = False
 T_MergeLines = True
 T_OutlinerGroups = True
 T_Bbox = True
+T_InstanceBlocks = False
 T_CreateNewScene = False
 T_Recenter = False
 T_ThicknessBevel = True
@@ -110,11 +111,11 @@ def is_ref_scene(scene):
 
 def read(report, filename, obj_merge=BY_LAYER, import_text=True, import_light=True, export_acis=True, merge_lines=True,
          do_bbox=True, block_rep=LINKED_OBJECTS, new_scene=None, recenter=False, projDXF=None, projSCN=None,
-         thicknessWidth=True, but_group_by_att=True, dxf_unit_scale=1.0):
+         thicknessWidth=True, but_group_by_att=True, dxf_unit_scale=1.0, instance_blocks=False):
     # import dxf and export nurbs types to sat/sab files
     # because that's how autocad stores nurbs types in a dxf...
     do = Do(filename, obj_merge, import_text, import_light, export_acis, merge_lines, do_bbox, block_rep, recenter,
-            projDXF, projSCN, thicknessWidth, but_group_by_att, dxf_unit_scale)
+            projDXF, projSCN, thicknessWidth, but_group_by_att, dxf_unit_scale, instance_blocks)
 
     errors = do.entities(os.path.basename(filename).replace(".dxf", ""), new_scene)
 
@@ -283,6 +284,13 @@ class IMPORT_OT_dxf(bpy.types.Operator):
 
             )
 
+    instance_blocks: BoolProperty(
+            name="Instance Repeated Blocks",
+            description="Blocks inserted more than once are imported once and instanced as collection instances "
+                        "(faster and lighter than copies of the block objects)",
+            default=T_InstanceBlocks
+            )
+
     def _update_create_new_scene(self, context):
         _update_use_georeferencing_do(self, context)
         _set_recenter(self, self.recenter)
@@ -390,6 +398,9 @@ class IMPORT_OT_dxf(bpy.types.Operator):
         sub = box.row()
         #sub.enabled = merge_map[self.merge_options] != BY_BLOCKS
         sub.prop(self, "block_options")
+        sub = box.row()
+        sub.enabled = self.block_options == 'LINKED_OBJECTS'
+        sub.prop(self, "instance_blocks")
         box.prop(self, "do_bbox")
         box.prop(self, "merge")
         sub = box.row()
@@ -538,7 +549,8 @@ class IMPORT_OT_dxf(bpy.types.Operator):
         else:
             read(self.report, self.filepath, merge_options, self.import_text, self.import_light, self.export_acis,
                  self.merge_lines, self.do_bbox, block_map[self.block_options], scene, self.recenter,
-                 proj_dxf, proj_scn, self.represent_thickness_and_width, self.import_atts, dxf_unit_scale)
+                 proj_dxf, proj_scn, self.represent_thickness_and_width, self.import_atts, dxf_unit_scale,
+                 self.instance_blocks)
 
         if self.outliner_groups:
             display_groups_in_outliner()
@@ -31,11 +31,11 @@ from .color import aci_to_true_color
 
 
 def read(stream, options=None):
-    if hasattr(stream, 'readline'):
+    if hasattr(stream, 'read'):
         from .drawing import Drawing
         return Drawing(stream, options)
     else:
-        raise AttributeError('stream object requires a readline() method.')
+        raise AttributeError('stream object requires a read() method.')
 
 
 def readfile(filename, options=None):
@@ -51,7 +51,8 @@ def readfile_as_utf8(filename, options=None, errors='strict'):
 
 def readfile_as_asc(filename, options=None):
     def get_encoding():
-        with io.open(filename) as fp:
+        # the header is ascii, but tags are read in chunks which may reach text in the file encoding
+        with io.open(filename, encoding='latin-1') as fp:
             info = dxfinfo(fp)
         return info.encoding
 
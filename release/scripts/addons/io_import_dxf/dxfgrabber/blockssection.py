@@ -7,7 +7,7 @@ __author__ = "mozman <mozman@gmx.at>"
 
 from itertools import islice
 
-from .tags import TagGroups
+from .tags import Tags, TagGroups
 from .entitysection import build_entities
 
 
@@ -55,3 +55,80 @@ class BlocksSection(object):
 
     def get(self, name, default=None):
         return self._blocks.get(name, default)
+
+
+class LazyBlocksSection(BlocksSection):
+    """ Blocks section which keeps the section tags and the position of each block in it, blocks are built when they
+    are requested for the first time.
+    """
+    def __init__(self):
+        super(LazyBlocksSection, self).__init__()
+        self._tags = Tags()
+        self._index = dict()  # block name: (start, end) in self._tags
+        self._setup_entity = None
+
+    @staticmethod
+    def from_tags(tags, drawing):
+        blocks_section = LazyBlocksSection()
+        if drawing.grab_blocks:
+            blocks_section._tags = tags
+            blocks_section._index = index_blocks(tags, 2, len(tags) - 1)
+            blocks_section._setup_entity = drawing.setup_entity
+        return blocks_section
+
+    def _build_block(self, name):
+        start, end = self._index[name]
+        entities = build_entities(TagGroups(self._tags[start:end]))
+        block = entities[0]
+        block.set_entities(entities[1:-1])
+        for entity in block:
+            self._setup_entity(entity)
+        self._blocks[name] = block
+        return block
+
+    # start of public interface
+    def __len__(self):
+        return len(self._index)
+
+    def __iter__(self):
+        return (self[name] for name in self._index)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __getitem__(self, name):
+        try:
+            return self._blocks[name]
+        except KeyError:
+            return self._build_block(name)
+
+    def get(self, name, default=None):
+        if name in self._index:
+            return self[name]
+        return default
+
+
+def index_blocks(tags, start, end):
+    """ Returns a dict of block name: (start, end) of the BLOCK ... ENDBLK tags in tags[start:end]. """
+    index = dict()
+    block_start = None
+    name = None
+    in_block_tags = False  # tags of the BLOCK entity, not of the block entities
+    in_endblk = False
+    for position in range(start, end):
+        code, value = tags[position]
+        if code == 0:
+            if in_endblk:
+                index[name] = (block_start, position)
+                in_endblk = False
+            in_block_tags = value == 'BLOCK'
+            if in_block_tags:
+                block_start = position
+                name = ''
+            elif value == 'ENDBLK' and block_start is not None:
+                in_endblk = True
+        elif code == 2 and in_block_tags:
+            name = value
+    if in_endblk:
+        index[name] = (block_start, end)
+    return index
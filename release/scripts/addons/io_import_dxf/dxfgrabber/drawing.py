@@ -12,6 +12,7 @@ DEFAULT_OPTIONS = {
     "grab_blocks": True,  # import block definitions True=yes, False=No
     "assure_3d_coords": False,  # guarantees (x, y, z) tuples for ALL coordinates
     "resolve_text_styles": True,  # Text, Attrib, Attdef and MText attributes will be set by the associated text style if necessary
+    "lazy": False,  # build entities and blocks when they are requested for the first time
 }
 
 
@@ -22,6 +23,7 @@ class Drawing(object):
         self.grab_blocks = options.get('grab_blocks', True)
         self.assure_3d_coords = options.get('assure_3d_coords', False)
         self.resolve_text_styles = options.get('resolve_text_styles', True)
+        self.lazy = options.get('lazy', False)
 
         tagreader = stream_tagger(stream, self.assure_3d_coords)
         self.dxfversion = 'AC1009'
@@ -38,25 +40,46 @@ class Drawing(object):
         if 'acdsdata' in sections:
             self.acdsdata = sections.acdsdata
             # sab data introduced with DXF version AC1027 (R2013)
-            if self.dxfversion >= 'AC1027':
+            if self.dxfversion >= 'AC1027' and not self.lazy:
                 self.collect_sab_data()
 
-        if self.resolve_text_styles:
+        if self.resolve_text_styles and not self.lazy:
             resolve_text_styles(self.entities, self.styles)
             for block in self.blocks:
                 resolve_text_styles(block, self.styles)
 
-    def modelspace(self):
-        return (entity for entity in self.entities if not entity.paperspace)
+    def modelspace(self, layers=None, types=None):
+        """ Entities of the model space, layers and types limit the entities to the given layers and DXF types. In
+        lazy mode, only these entities are built.
+        """
+        return self.query(layers, types, paperspace=False)
 
-    def paperspace(self):
-        return (entity for entity in self.entities if entity.paperspace)
+    def paperspace(self, layers=None, types=None):
+        return self.query(layers, types, paperspace=True)
+
+    def query(self, layers=None, types=None, paperspace=None):
+        if self.lazy:
+            return self.entities.query(layers, types, paperspace)
+        return (entity for entity in self.entities
+                if (layers is None or entity.layer in layers) and
+                (types is None or entity.dxftype in types) and
+                (paperspace is None or bool(entity.paperspace) == paperspace))
 
     def collect_sab_data(self):
         for entity in self.entities:
-            if hasattr(entity, 'set_sab_data'):
-                sab_data = self.acdsdata.sab_data[entity.handle]
-                entity.set_sab_data(sab_data)
+            self.set_sab_data(entity)
+
+    def set_sab_data(self, entity):
+        if hasattr(entity, 'set_sab_data'):
+            sab_data = self.acdsdata.sab_data[entity.handle]
+            entity.set_sab_data(sab_data)
+
+    def setup_entity(self, entity):
+        """ Lazy mode: resolve text style and sab data of an entity when it is built. """
+        if self.resolve_text_styles and hasattr(entity, 'resolve_text_style'):
+            entity.resolve_text_style(self.styles)
+        if self.dxfversion >= 'AC1027' and hasattr(self, 'acdsdata'):
+            self.set_sab_data(entity)
 
 
 def resolve_text_styles(entities, text_styles):
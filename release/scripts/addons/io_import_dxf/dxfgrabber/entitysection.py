@@ -51,6 +51,70 @@ class ObjectsSection(EntitySection):
     name = 'objects'
 
 
+class LazyEntitySection(EntitySection):
+    """ Entity section which keeps the section tags and an index of the entities in it, entities are built when they
+    are requested for the first time.
+    """
+    def __init__(self):
+        super(LazyEntitySection, self).__init__()
+        self._tags = Tags()
+        self._index = list()
+        self._built = dict()  # index entry position: entity or None for unsupported entities
+        self._setup_entity = None
+
+    @classmethod
+    def from_tags(cls, tags, drawing):
+        entity_section = cls()
+        entity_section._tags = tags
+        entity_section._index = index_entities(tags, 2, len(tags) - 1)
+        entity_section._setup_entity = drawing.setup_entity
+        return entity_section
+
+    def get_entities(self):
+        return list(self.query())
+
+    # start of public interface
+
+    def __len__(self):
+        return len(self.get_entities())
+
+    def __iter__(self):
+        return self.query()
+
+    def __getitem__(self, index):
+        return self.get_entities()[index]
+
+    def query(self, layers=None, types=None, paperspace=None):
+        """ Yields the entities of the given layers and DXF types, all layers or types if None. Types are the types of
+        the DXF file, POLYLINE includes POLYFACE and POLYMESH. If paperspace is not None, only yields paperspace
+        (True) or modelspace (False) entities.
+        """
+        for position, entry in enumerate(self._index):
+            if layers is not None and entry.layer not in layers:
+                continue
+            if types is not None and entry.dxftype not in types:
+                continue
+            if paperspace is not None and entry.paperspace != paperspace:
+                continue
+            entity = self._build_entry(position, entry)
+            if entity is not None:
+                yield entity
+
+    # end of public interface
+
+    def _build_entry(self, position, entry):
+        try:
+            return self._built[position]
+        except KeyError:
+            pass
+        entities = build_entities(TagGroups(self._tags[entry.start:entry.end]))
+        entity = entities[0] if entities else None
+        if entity is not None:
+            self._setup_entity(entity)
+        self._built[position] = entity
+        return entity
+
+
 def build_entities(tag_groups):
     def build_entity(group):
         try:
@@ -80,6 +144,59 @@ def build_entities(tag_groups):
     return entities
 
 
+class IndexEntry(object):
+    """ Position of an entity in the tags of its section, POLYLINE and INSERT entities include their VERTEX and
+    ATTRIB entities up to SEQEND.
+    """
+    __slots__ = ('start', 'end', 'dxftype', 'layer', 'paperspace')
+
+    def __init__(self, start, dxftype):
+        self.start = start
+        self.end = start
+        self.dxftype = dxftype
+        self.layer = '0'
+        self.paperspace = False
+
+
+def index_entities(tags, start, end):
+    """ Returns IndexEntry() of the entities in tags[start:end], without building them. """
+    index = list()
+    entry = None
+    in_entity = False  # tags of the entry, not of its VERTEX or ATTRIB entities
+    in_app_data = False
+    follows = False  # VERTEX or ATTRIB entities follow up to SEQEND
+    for position in range(start, end):
+        code, value = tags[position]
+        if code == 0:
+            if follows:
+                if value == 'SEQEND':
+                    follows = False
+                in_entity = False
+                continue
+            if entry is not None:
+                entry.end = position
+            entry = IndexEntry(position, value)
+            index.append(entry)
+            in_entity = True
+            in_app_data = False
+            follows = value == 'POLYLINE'
+        elif not in_entity:
+            continue
+        elif code == 102:
+            in_app_data = not in_app_data
+        elif in_app_data:
+            continue
+        elif code == 8:
+            entry.layer = value
+        elif code == 67:
+            entry.paperspace = bool(value)
+        elif code == 66 and entry.dxftype == 'INSERT':
+            follows = bool(value)
+    if entry is not None:
+        entry.end = end
+    return index
+
+
 class _Collector:
     def __init__(self, entity):
         self.entity = entity
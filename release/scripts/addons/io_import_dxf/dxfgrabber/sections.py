@@ -9,8 +9,8 @@ from .codepage import toencoding
 from .defaultchunk import DefaultChunk, iterchunks
 from .headersection import HeaderSection
 from .tablessection import TablesSection
-from .entitysection import EntitySection, ObjectsSection
-from .blockssection import BlocksSection
+from .entitysection import EntitySection, LazyEntitySection, ObjectsSection
+from .blockssection import BlocksSection, LazyBlocksSection
 from .acdsdata import AcDsDataSection
 
 
@@ -42,7 +42,7 @@ class Sections(object):
             else:
                 section_name = name(section)
                 if section_name in SECTIONMAP:
-                    section_class = get_section_class(section_name)
+                    section_class = get_section_class(section_name, drawing.lazy)
                     new_section = section_class.from_tags(section, drawing)
                 else:
                     new_section = None
@@ -63,6 +63,10 @@ SECTIONMAP = {
     'ACDSDATA': AcDsDataSection,
 }
 
+LAZY_SECTIONMAP = dict(SECTIONMAP, ENTITIES=LazyEntitySection, BLOCKS=LazyBlocksSection)
 
-def get_section_class(name):
+
+def get_section_class(name, lazy=False):
+    if lazy:
+        return LAZY_SECTIONMAP.get(name, DefaultChunk)
     return SECTIONMAP.get(name, DefaultChunk)
@@ -123,63 +123,92 @@ cast_tag = _TagCaster.cast
 cast_tag_value = _TagCaster.cast_value
 
 
+# characters read from the stream at once by stream_tagger()
+CHUNK_SIZE = 1 << 20
+
+
 def stream_tagger(stream, assure_3d_coords=False):
-    """ Generates DXFTag() from a stream (untrusted external source). Does not skip comment tags 999.
+    """ Generates DXFTag() from a stream (untrusted external source). Skips comment tags 999.
+
+    The stream is read in chunks of CHUNK_SIZE characters and each chunk is split into code and value lines at once,
+    which is much faster than reading the stream line by line.
     """
-    class Counter:
-        def __init__(self):
-            self.counter = 0
-
-    undo_tag = None
-    line = Counter()  # writeable line counter for next_tag(), Python 2.7 does not support the nonlocal statement
-
-    def next_tag():
-        code = stream.readline()
-        value = stream.readline()
-        line.counter += 2
-        if code and value:  # StringIO(): empty strings indicates EOF
-            return DXFTag(int(code.rstrip('\r\n')), value.rstrip('\r\n'))  # without line ending
-        else:  # StringIO(): empty lines indicates EOF
-            raise EOFError()
-
-    while True:
+    tuple_new = tuple.__new__  # faster than DXFTag(code, value)
+    get_caster = _TagCaster._cast.get
+    point_codes = POINT_CODES
+
+    lines = []  # lines not tagged yet
+    tail = ''  # unterminated last line of the previous chunk
+    line_counter = 0  # lines before lines[0]
+    eof = False
+    while not eof:
+        data = stream.read(CHUNK_SIZE)
+        if data:
+            data = tail + data
+            chunk_lines = data.split('\n')
+            tail = chunk_lines.pop()
+        else:
+            eof = True
+            data = tail
+            chunk_lines = [tail] if tail else []
+        if '\r' in data:
+            chunk_lines = [line.rstrip('\r') for line in chunk_lines]
+        lines.extend(chunk_lines)
+
+        count = len(lines)
+        # a point needs up to 6 lines, they may be in the next chunk
+        stop = count - 1 if eof else count - 5
+        index = 0
         try:
-            if undo_tag is not None:
-                x = undo_tag
-                undo_tag = None
-            else:
-                x = next_tag()
-            code = x.code
-            if code == 999:  # skip comments
-                continue
-            if code in POINT_CODES:
-                y = next_tag()  # y coordinate is mandatory
-                if y.code != code + 10:
-                    raise DXFStructureError("Missing required y coordinate near line: {}.".format(line.counter))
-                z = next_tag()  # z coordinate just for 3d points
-                try:
-                    if z.code == code + 20:
-                        point = (float(x.value), float(y.value), float(z.value))
-                    else:
-                        if assure_3d_coords:
-                            point = (float(x.value), float(y.value), 0.)
+            while index < stop:
+                code = int(lines[index])
+                value = lines[index + 1]
+                index += 2
+                if code == 999:  # skip comments
+                    continue
+                if code in point_codes:
+                    if index + 1 >= count:  # at EOF without y coordinate
+                        return
+                    if int(lines[index]) != code + 10:  # y coordinate is mandatory
+                        raise DXFStructureError("Missing required y coordinate near line: {}.".format(
+                            line_counter + index + 2))
+                    try:
+                        if index + 3 < count and int(lines[index + 2]) == code + 20:  # z coordinate just for 3d points
+                            point = (float(value), float(lines[index + 1]), float(lines[index + 3]))
+                            index += 4
                         else:
-                            point = (float(x.value), float(y.value))
-                        undo_tag = z
-                except ValueError:
-                    raise DXFStructureError('Invalid floating point values near line: {}.'.format(line.counter))
-                yield DXFTag(code, point)
-            else:  # just a single tag
-                try:
-                    yield cast_tag(x)
-                except ValueError:
-                    raise DXFStructureError('Invalid tag (code={code}, value="{value}") near line: {line}.'.format(
-                        line=line.counter,
-                        code=x.code,
-                        value=x.value,
-                    ))
-        except EOFError:
-            return
+                            if assure_3d_coords:
+                                point = (float(value), float(lines[index + 1]), 0.)
+                            else:
+                                point = (float(value), float(lines[index + 1]))
+                            index += 2
+                    except ValueError:
+                        raise DXFStructureError('Invalid floating point values near line: {}.'.format(
+                            line_counter + index + 2))
+                    yield tuple_new(DXFTag, (code, point))
+                else:  # just a single tag
+                    typecaster = get_caster(code, tostr)
+                    try:
+                        yield tuple_new(DXFTag, (code, typecaster(value)))
+                    except ValueError:
+                        try:
+                            if typecaster is not int:
+                                raise
+                            yield tuple_new(DXFTag, (code, int(float(value))))  # convert float to int
+                        except ValueError:
+                            raise DXFStructureError(
+                                'Invalid tag (code={code}, value="{value}") near line: {line}.'.format(
+                                    line=line_counter + index,
+                                    code=code,
+                                    value=value,
+                                ))
+        except ValueError:  # invalid group code
+            raise DXFStructureError('Invalid group code "{code}" near line: {line}.'.format(
+                code=lines[index].strip(),
+                line=line_counter + index + 1,
+            ))
+        del lines[:index]
+        line_counter += index
 
 
 def string_tagger(s):
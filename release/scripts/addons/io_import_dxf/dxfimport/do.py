@@ -21,6 +21,7 @@
 import bpy
 import os
 import re
+from collections import Counter
 from mathutils import Vector, Matrix, Euler, Color, geometry
 from math import pi, radians, sqrt
 
@@ -95,13 +96,13 @@ class Do:
         "dwg", "combination", "known_blocks", "import_text", "import_light", "export_acis", "merge_lines",
         "do_bounding_boxes", "acis_files", "errors", "block_representation", "recenter", "did_group_instance",
         "objects_before", "pDXF", "pScene", "thickness_and_width", "but_group_by_att", "current_scene",
-        "dxf_unit_scale"
+        "dxf_unit_scale", "instance_blocks", "known_block_instances", "insert_counts"
     )
 
     def __init__(self, dxf_filename, c=BY_LAYER, import_text=True, import_light=True, export_acis=True,
                  merge_lines=True, do_bbox=True, block_rep=LINKED_OBJECTS, recenter=False, pDXF=None, pScene=None,
-                 thicknessWidth=True, but_group_by_att=True, dxf_unit_scale=1.0):
-        self.dwg = dxfgrabber.readfile(dxf_filename, {"assure_3d_coords": True})
+                 thicknessWidth=True, but_group_by_att=True, dxf_unit_scale=1.0, instance_blocks=False):
+        self.dwg = dxfgrabber.readfile(dxf_filename, {"assure_3d_coords": True, "lazy": True})
         self.combination = c
         self.known_blocks = {}
         self.import_text = import_text
@@ -121,6 +122,9 @@ class Do:
         self.but_group_by_att = but_group_by_att
         self.current_scene = None
         self.dxf_unit_scale = dxf_unit_scale
+        self.instance_blocks = instance_blocks
+        self.known_block_instances = {}
+        self.insert_counts = None
 
     def proj(self, co, elevation=0):
         """
@@ -966,8 +970,8 @@ class Do:
             block_scene = bpy.data.scenes["Blocks"]
 
         # create the block
-        if len(block_group.objects) == 0 or name not in self.known_blocks.keys():
-            bpy.context.screen.scene = block_scene
+        if len(block_group.objects) == 0 or name not in self.known_block_instances.keys():
+            self._set_scene(block_scene)
             block_inserts = [en for en in entity if is_.insert(en.dxftype)]
             bc = (en for en in entity if is_.combined_entity(en))
             bs = (en for en in entity if is_.separated_entity(en) and not is_.insert(en.dxftype))
@@ -999,11 +1003,11 @@ class Do:
                 block_group.objects.link(i_empty)
                 block_scene.collection.objects.link(i_empty)
 
-            self.known_blocks[name] = [objects, inserts, bbox]
+            self.known_block_instances[name] = [objects, inserts, bbox]
         else:
-            bbox = self.known_blocks[name][2]
+            bbox = self.known_block_instances[name][2]
 
-        bpy.context.screen.scene = scene
+        self._set_scene(scene)
         o = bbox.copy()
         # o.empty_display_size = 0.3
         o.instance_type = "COLLECTION"
@@ -1035,6 +1039,9 @@ class Do:
         if need_group_inst is None:
             need_group_inst = (entity.row_count or entity.col_count) > 1 and \
                               (kids > 0 or objtypes > 1 or sep > 1 or (objtypes > 0 and sep > 0))
+            # repeated blocks share one collection instead of copying the block objects for each insert
+            if self.instance_blocks and self._insert_count(entity.name) > 1:
+                need_group_inst = True
 
         if group is None:
             group = self._get_group(entity.layer)
@@ -1107,6 +1114,15 @@ class Do:
            any((p.co.z != 0 for spline in curve.splines for p in spline.bezier_points)):
             curve.dimensions = '3D'
 
+    def _insert_count(self, name):
+        """
+        name: block name
+        Returns how often the block is inserted in the model space.
+        """
+        if self.insert_counts is None:
+            self.insert_counts = Counter(en.name for en in self.dwg.modelspace(types={"INSERT"}))
+        return self.insert_counts[name]
+
     def _merge_lines(self, lines, curve):
         """
         lines: list of LINE entities
@@ -1396,8 +1412,16 @@ class Do:
                 group.objects.link(o)
         return o
 
+    def _set_scene(self, scene):
+        """
+        Makes scene the scene of the window, so that view layer updates evaluate its objects.
+        """
+        window = bpy.context.window
+        if window is not None:
+            window.scene = scene
+
     def _recenter(self, scene, name):
-        bpy.context.screen.scene = scene
+        self._set_scene(scene)
         bpy.context.view_layer.update()
         bpy.ops.object.select_all(action='DESELECT')
 
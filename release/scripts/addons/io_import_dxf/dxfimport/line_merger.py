@@ -19,95 +19,140 @@
 # <pep8 compliant>
 
 
-def line_merger(lines, precision=6):
-    merger = _LineMerger(lines, precision)
-    return merger.polylines
+from itertools import product
+from math import floor
 
+# grid cells are this many times the tolerance, so that most points are far from the cell borders and only
+# their own cell has to be searched for points within the tolerance
+_CELL_TOLERANCES = 16
+# cells are centered on multiples of their size, round coordinates would all be on cell borders otherwise
+_CELL_OFFSET = 0.5
 
-def _round_point(point, precision):
-    return tuple(round(c, precision) for c in point)
+
+def line_merger(lines, precision=6):
+    """
+    lines: LINE entities
+    precision: start and end points closer than 10 ** -precision are considered the same point
+    Returns polylines as lists of points, closed polylines end with their first point.
+    """
+    merger = _LineMerger(lines, 10 ** -precision)
+    return merger.polylines
 
 
 class _LineMerger:
-    def __init__(self, lines, precision):
-        self.segments = set()  # single lines as tuples: ((sx, sy[, sz]), (ex, ey[, ez]))
-        self.used_segments = set()
-        self.points = dict()  # key: point -> value: list of segments with this point as start or end point
-        self.precision = precision
+    def __init__(self, lines, tolerance):
+        self.tolerance = tolerance
+        self.cell_size = tolerance * _CELL_TOLERANCES
+        self.points = []  # point of each vertex, the first point found within the tolerance
+        self.exact = dict()  # key: point -> value: vertex, for points found before
+        self.cells = dict()  # key: grid cell -> value: list of vertices with their point in this cell
+        self.segments = []  # (start vertex, end vertex)
         self.setup(lines)
         self.polylines = self.merge_lines()  # result of merging process
 
     def setup(self, lines):
+        known_segments = set()
         for line in lines:
-            s = _round_point(line.start, self.precision)
-            e = _round_point(line.end, self.precision)
-            self.add_segment(s, e)
-
-    def add_segment(self, start, end):
-        if start == end:
-            return  # this is not a segment
-        if end < start:  # order start and end points to detect all doubles
-            segment = (end, start)
+            s = self.vertex(tuple(line.start))
+            e = self.vertex(tuple(line.end))
+            if s == e:
+                continue  # this is not a segment
+            segment = (s, e) if s < e else (e, s)  # ordered to detect all doubles
+            if segment in known_segments:
+                continue  # this segment already exist
+            known_segments.add(segment)
+            self.segments.append(segment)
+
+    def vertex(self, point):
+        vertex = self.exact.get(point)
+        if vertex is None:
+            cell = tuple(int(floor(c / self.cell_size + _CELL_OFFSET)) for c in point)
+            vertex = self.find_vertex(point, cell)
+            if vertex is None:
+                vertex = len(self.points)
+                self.points.append(point)
+                vertices = self.cells.get(cell)
+                if vertices is None:
+                    self.cells[cell] = [vertex]
+                else:
+                    vertices.append(vertex)
+            self.exact[point] = vertex
+        return vertex
+
+    def find_vertex(self, point, cell):
+        """Returns the vertex closest to point within the tolerance, None if there is none"""
+        tolerance = self.tolerance
+        cell_size = self.cell_size
+
+        # search neighbour cells only along the axes where the point is closer than the tolerance to the cell border
+        near_border = False
+        offsets = []
+        for c, i in zip(point, cell):
+            border_distance = c - (i - _CELL_OFFSET) * cell_size
+            if border_distance < tolerance:
+                offsets.append((0, -1))
+                near_border = True
+            elif border_distance > cell_size - tolerance:
+                offsets.append((0, 1))
+                near_border = True
+            else:
+                offsets.append((0, ))
+        if near_border:
+            cells = [tuple(i + o for i, o in zip(cell, offset)) for offset in product(*offsets)]
         else:
-            segment = (start, end)
-        if segment in self.segments:
-            return  # this segment already exist
-        self.segments.add(segment)
-        self.add_point(start, segment)
-        self.add_point(end, segment)
-
-    def add_point(self, point, segment):
-        segments = self.points.get(point)
-        if segments is None:
-            segments = list()
-            self.points[point] = segments
-        segments.append(segment)
-
-    def get_segment_with_point(self, point):
-        segments = self.points.get(point)
-        if segments is None:
-            return None
-
-        # Very important: do not return already used segments
-        for segment in segments:
-            if segment not in self.used_segments:
-                return segment
-        return None
-
-    def mark_as_used_segment(self, segment):
-        self.used_segments.add(segment)
-        self.segments.discard(segment)
+            cells = (cell, )
+
+        closest = None
+        closest_distance = tolerance * tolerance
+        for neighbour in cells:
+            vertices = self.cells.get(neighbour)
+            if vertices is None:
+                continue
+            for vertex in vertices:
+                distance = sum((a - b) ** 2 for a, b in zip(point, self.points[vertex]))
+                if distance < closest_distance:
+                    closest = vertex
+                    closest_distance = distance
+        return closest
 
     def merge_lines(self):
-        def get_extension_point(point):
-            extension = self.get_segment_with_point(point)
-            if extension is not None:
-                self.mark_as_used_segment(extension)
-                if extension[0] == point:
-                    return extension[1]
-                else:
-                    return extension[0]
-            return None
+        segments = self.segments
+        used = bytearray(len(segments))
+        vertex_segments = [[] for point in self.points]  # segments with this vertex as start or end
+        for index, (start, end) in enumerate(segments):
+            vertex_segments[start].append(index)
+            vertex_segments[end].append(index)
+        first_unused = [0] * len(self.points)  # segments before this index in vertex_segments are used
+
+        def get_extension_vertex(vertex):
+            candidates = vertex_segments[vertex]
+            i = first_unused[vertex]
+            while i < len(candidates) and used[candidates[i]]:
+                i += 1
+            first_unused[vertex] = i
+            if i == len(candidates):
+                return None
+
+            # Very important: do not return already used segments
+            used[candidates[i]] = 1
+            start, end = segments[candidates[i]]
+            return end if start == vertex else start
 
         polylines = []
-        while len(self.segments):
-            segment = self.segments.pop()  # take an arbitrary segment
-            self.mark_as_used_segment(segment)
+        for index, segment in enumerate(segments):
+            if used[index]:
+                continue
+            used[index] = 1
             polyline = list(segment)  # start a new polyline
-            extend_start = True
-            extend_end = True
-            while extend_start or extend_end:
-                if extend_start:
-                    extension_point = get_extension_point(polyline[0])  # extend start of polyline
-                    if extension_point is not None:
-                        polyline.insert(0, extension_point)
-                    else:
-                        extend_start = False
-                if extend_end:
-                    extension_point = get_extension_point(polyline[-1])  # extend end of polyline
-                    if extension_point is not None:
-                        polyline.append(extension_point)
-                    else:
-                        extend_end = False
-            polylines.append(polyline)
+            vertex = get_extension_vertex(polyline[-1])  # extend end of polyline
+            while vertex is not None:
+                polyline.append(vertex)
+                vertex = get_extension_vertex(vertex)
+            start = []
+            vertex = get_extension_vertex(polyline[0])  # extend start of polyline
+            while vertex is not None:
+                start.append(vertex)
+                vertex = get_extension_vertex(vertex)
+            start.reverse()
+            polylines.append([self.points[vertex] for vertex in start + polyline])
         return polylines
@@ -19,6 +19,10 @@
 # <pep8 compliant>
 
 
+# Number of ASCII lines parsed at once.
+ASCII_CHUNK_LEN = 1 << 16
+
+
 class ElementSpec:
     __slots__ = (
         "name",
@@ -42,6 +46,195 @@ class ElementSpec:
                 return i
         return -1
 
+    def columns_from_rows(self, rows):
+        """
+        Convert rows of values (as returned by :meth:`load`) to columns,
+        see :meth:`load_binary` for the returned data.
+        """
+        import numpy as np
+
+        columns = {}
+        for i, p in enumerate(self.properties):
+            if p.numeric_type == 's':
+                columns[p.name] = [row[i] for row in rows]
+            elif p.list_type is None:
+                columns[p.name] = np.array([row[i] for row in rows], dtype=p.numeric_type)
+            else:
+                counts = np.array([len(row[i]) for row in rows], dtype=np.int64)
+                values = np.fromiter(
+                    (v for row in rows for v in row[i]), dtype=p.numeric_type, count=int(counts.sum()),
+                )
+                columns[p.name] = (counts, values)
+        return columns
+
+    def _fixed_dtype(self, format, list_counts):
+        import numpy as np
+
+        fields = []
+        for p in self.properties:
+            if p.list_type is None:
+                fields.append((p.name.decode(), format + p.numeric_type))
+            else:
+                fields.append((p.name.decode() + "_count", format + p.list_type))
+                fields.append((p.name.decode(), format + p.numeric_type, (list_counts[p.name],)))
+        return np.dtype(fields)
+
+    def _fixed_columns(self, data, list_counts):
+        import numpy as np
+
+        columns = {}
+        for p in self.properties:
+            if p.list_type is None:
+                columns[p.name] = np.array(data[p.name.decode()])
+            else:
+                values = np.array(data[p.name.decode()]).reshape(-1)
+                columns[p.name] = (np.full(len(data), list_counts[p.name], dtype=np.int64), values)
+        return columns
+
+    def load_binary(self, format, buffer, offset):
+        """
+        Read all rows of this element from *buffer* (usually a memory-mapped file), starting at *offset*.
+
+        Returns the columns and the offset right after the element data.
+        Columns are a dict mapping property names to numpy arrays,
+        list properties being a tuple of (counts, flat values) numpy arrays.
+        """
+        import struct
+        import numpy as np
+
+        if self.count == 0:
+            return self.columns_from_rows([]), offset
+
+        if all(p.numeric_type != 's' and p.list_type != 's' for p in self.properties):
+            # Assume all lists have the same length as in the first row (e.g. triangles only),
+            # this gives a fixed-size layout which can be read in bulk.
+            list_counts = {}
+            row_offset = offset
+            for p in self.properties:
+                if p.list_type is None:
+                    row_offset += struct.calcsize(format + p.numeric_type)
+                else:
+                    fmt = format + p.list_type
+                    list_counts[p.name] = count = int(struct.unpack_from(fmt, buffer, row_offset)[0])
+                    row_offset += struct.calcsize(fmt) + struct.calcsize('%s%i%s' % (format, count, p.numeric_type))
+
+            dtype = self._fixed_dtype(format, list_counts)
+            if offset + dtype.itemsize * self.count <= len(buffer):
+                data = np.frombuffer(buffer, dtype=dtype, count=self.count, offset=offset)
+                if all(np.all(data[name.decode() + "_count"] == count) for name, count in list_counts.items()):
+                    columns = self._fixed_columns(data, list_counts)
+                    del data  # Release the buffer.
+                    return columns, offset + dtype.itemsize * self.count
+                del data
+
+        # Generic (slow) path, one row at a time.
+        buffer.seek(offset)
+        rows = [self.load(format, buffer) for j in range(self.count)]
+        return self.columns_from_rows(rows), buffer.tell()
+
+    def load_ascii(self, stream):
+        """
+        Read all rows of this element from *stream*, in chunks of lines,
+        see :meth:`load_binary` for the returned columns.
+        """
+        import itertools
+        import numpy as np
+
+        if self.count == 0:
+            return self.columns_from_rows([])
+
+        use_fixed = all(p.numeric_type != 's' for p in self.properties)
+        list_counts = None
+        chunks = []
+
+        lines_left = self.count
+        while lines_left > 0:
+            lines = list(itertools.islice(stream, min(lines_left, ASCII_CHUNK_LEN)))
+            if not lines:
+                break
+            lines_left -= len(lines)
+
+            if use_fixed:
+                if list_counts is None:
+                    # Assume all lists have the same length as in the first row.
+                    tokens = lines[0].split()
+                    list_counts = {}
+                    token_index = 0
+                    for p in self.properties:
+                        if p.list_type is None:
+                            token_index += 1
+                        else:
+                            list_counts[p.name] = count = int(tokens[token_index])
+                            token_index += 1 + count
+                    row_len = token_index
+
+                values = np.fromstring(b''.join(lines), dtype=np.float64, sep=' ')
+                if len(values) == len(lines) * row_len:
+                    values = values.reshape(len(lines), row_len)
+                    token_index = 0
+                    for p in self.properties:
+                        if p.list_type is not None:
+                            if not np.all(values[:, token_index] == list_counts[p.name]):
+                                break
+                            token_index += list_counts[p.name]
+                        token_index += 1
+                    else:
+                        chunks.append(values)
+                        continue
+
+                # Varying amount of values per row, fall back to the generic path.
+                use_fixed = False
+                chunks = [row for chunk in chunks for row in self._rows_from_fixed(chunk, list_counts)]
+
+            chunks.extend(self.load(b'ascii', _LineStream(line)) for line in lines)
+
+        if not use_fixed:
+            return self.columns_from_rows(chunks)
+
+        values = np.concatenate(chunks) if len(chunks) > 1 else chunks[0]
+        columns = {}
+        token_index = 0
+        for p in self.properties:
+            if p.list_type is None:
+                columns[p.name] = values[:, token_index].astype(p.numeric_type)
+                token_index += 1
+            else:
+                count = list_counts[p.name]
+                columns[p.name] = (
+                    np.full(len(values), count, dtype=np.int64),
+                    values[:, token_index + 1:token_index + 1 + count].astype(p.numeric_type).reshape(-1),
+                )
+                token_index += 1 + count
+        return columns
+
+    def _rows_from_fixed(self, values, list_counts):
+        for row_values in values.tolist():
+            row = []
+            token_index = 0
+            for p in self.properties:
+                mapper = float if p.numeric_type in {'f', 'd'} else int
+                if p.list_type is None:
+                    row.append(mapper(row_values[token_index]))
+                    token_index += 1
+                else:
+                    count = list_counts[p.name]
+                    row.append([mapper(v) for v in row_values[token_index + 1:token_index + 1 + count]])
+                    token_index += 1 + count
+            yield row
+
+
+class _LineStream:
+    """
+    Expose a single already read line through the ``readline`` interface expected by :meth:`ElementSpec.load`.
+    """
+    __slots__ = ("line",)
+
+    def __init__(self, line):
+        self.line = line
+
+    def readline(self):
+        return self.line
+
 
 class PropertySpec:
     __slots__ = (
@@ -110,12 +303,24 @@ class ObjectSpec:
         self.specs = []
 
     def load(self, format, stream):
-        return {
-            i.name: [
-                i.load(format, stream) for j in range(i.count)
-            ]
-            for i in self.specs
-        }
+        """
+        Return a dict mapping element names to their columns (see :meth:`ElementSpec.load_binary`).
+        """
+        if format == b'ascii':
+            return {i.name: i.load_ascii(stream) for i in self.specs}
+
+        # Memory-map binary files, elements with a fixed-size layout are then read in bulk.
+        import mmap
+
+        offset = stream.tell()
+        buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            obj = {}
+            for i in self.specs:
+                obj[i.name], offset = i.load_binary(format, buffer, offset)
+        finally:
+            buffer.close()
+        return obj
 
 
 def read(filepath):
@@ -250,6 +455,7 @@ def read(filepath):
 
 
 def load_ply_mesh(filepath, ply_name):
+    import numpy as np
     import bpy
 
     obj_spec, obj, texture = read(filepath)
@@ -258,122 +464,95 @@ def load_ply_mesh(filepath, ply_name):
         print("Invalid file")
         return
 
-    uvindices = colindices = None
+    uvindices = colindices = noindices = None
     colmultiply = None
 
-    # TODO import normals
-    # noindices = None
-
     for el in obj_spec.specs:
         if el.name == b'vertex':
-            vindices_x, vindices_y, vindices_z = el.index(b'x'), el.index(b'y'), el.index(b'z')
-            # noindices = (el.index('nx'), el.index('ny'), el.index('nz'))
-            # if -1 in noindices: noindices = None
-            uvindices = (el.index(b's'), el.index(b't'))
-            if -1 in uvindices:
+            vindices = (b'x', b'y', b'z')
+            noindices = (b'nx', b'ny', b'nz')
+            if any(el.index(name) == -1 for name in noindices):
+                noindices = None
+            uvindices = (b's', b't')
+            if any(el.index(name) == -1 for name in uvindices):
                 uvindices = None
             # ignore alpha if not present
             if el.index(b'alpha') == -1:
-                colindices = el.index(b'red'), el.index(b'green'), el.index(b'blue')
+                colindices = b'red', b'green', b'blue'
             else:
-                colindices = el.index(b'red'), el.index(b'green'), el.index(b'blue'), el.index(b'alpha')
-            if -1 in colindices:
-                if any(idx > -1 for idx in colindices):
+                colindices = b'red', b'green', b'blue', b'alpha'
+            if any(el.index(name) == -1 for name in colindices):
+                if any(el.index(name) > -1 for name in colindices):
                     print("Warning: At least one obligatory color channel is missing, ignoring vertex colors.")
                 colindices = None
             else:  # if not a float assume uchar
-                colmultiply = [1.0 if el.properties[i].numeric_type in {'f', 'd'} else (1.0 / 255.0) for i in colindices]
+                colmultiply = [
+                    1.0 if el.properties[el.index(name)].numeric_type in {'f', 'd'} else (1.0 / 255.0)
+                    for name in colindices
+                ]
 
         elif el.name == b'face':
-            findex = el.index(b'vertex_indices')
+            findex = b'vertex_indices'
         elif el.name == b'tristrips':
-            trindex = el.index(b'vertex_indices')
+            trindex = b'vertex_indices'
         elif el.name == b'edge':
-            eindex1, eindex2 = el.index(b'vertex1'), el.index(b'vertex2')
-
-    mesh_faces = []
-    mesh_uvs = []
-    mesh_colors = []
-
-    def add_face(vertices, indices, uvindices, colindices):
-        mesh_faces.append(indices)
-        if uvindices:
-            mesh_uvs.extend([(vertices[index][uvindices[0]], vertices[index][uvindices[1]]) for index in indices])
-        if colindices:
-            if len(colindices) == 3:
-                mesh_colors.extend([
-                    (
-                        vertices[index][colindices[0]] * colmultiply[0],
-                        vertices[index][colindices[1]] * colmultiply[1],
-                        vertices[index][colindices[2]] * colmultiply[2],
-                        1.0,
-                    )
-                    for index in indices
-                ])
-            elif len(colindices) == 4:
-                mesh_colors.extend([
-                    (
-                        vertices[index][colindices[0]] * colmultiply[0],
-                        vertices[index][colindices[1]] * colmultiply[1],
-                        vertices[index][colindices[2]] * colmultiply[2],
-                        vertices[index][colindices[3]] * colmultiply[3],
-                    )
-                    for index in indices
-                ])
-
-    if uvindices or colindices:
-        # If we have Cols or UVs then we need to check the face order.
-        add_face_simple = add_face
-
-        # EVIL EEKADOODLE - face order annoyance.
-        def add_face(vertices, indices, uvindices, colindices):
-            if len(indices) == 4:
-                if indices[2] == 0 or indices[3] == 0:
-                    indices = indices[2], indices[3], indices[0], indices[1]
-            elif len(indices) == 3:
-                if indices[2] == 0:
-                    indices = indices[1], indices[2], indices[0]
-
-            add_face_simple(vertices, indices, uvindices, colindices)
+            eindex1, eindex2 = b'vertex1', b'vertex2'
 
     verts = obj[b'vertex']
+    verts_len = len(verts[vindices[0]])
+
+    # Faces as flat loops vertex indices, and polygons loop totals.
+    loops_vert_idx = []
+    faces_loop_total = []
 
     if b'face' in obj:
-        for f in obj[b'face']:
-            ind = f[findex]
-            add_face(verts, ind, uvindices, colindices)
+        counts, indices = obj[b'face'][findex]
+        loops_vert_idx.append(indices)
+        faces_loop_total.append(counts)
 
     if b'tristrips' in obj:
-        for t in obj[b'tristrips']:
-            ind = t[trindex]
-            len_ind = len(ind)
-            for j in range(len_ind - 2):
-                add_face(verts, (ind[j], ind[j + 1], ind[j + 2]), uvindices, colindices)
+        counts, indices = obj[b'tristrips'][trindex]
+        strip_start = 0
+        for len_ind in counts.tolist():
+            ind = indices[strip_start:strip_start + len_ind]
+            strip_start += len_ind
+            if len_ind < 3:
+                continue
+            loops_vert_idx.append(np.column_stack((ind[:-2], ind[1:-1], ind[2:])).reshape(-1))
+            faces_loop_total.append(np.full(len_ind - 2, 3, dtype=np.int64))
+
+    loops_vert_idx = np.concatenate(loops_vert_idx).astype(np.int32) if loops_vert_idx else np.empty(0, np.int32)
+    faces_loop_total = np.concatenate(faces_loop_total).astype(np.int32) if faces_loop_total else np.empty(0, np.int32)
+    faces_loop_start = np.zeros(len(faces_loop_total), dtype=np.int32)
+    np.cumsum(faces_loop_total[:-1], out=faces_loop_start[1:])
+
+    if uvindices or colindices:
+        # If we have Cols or UVs then we need to check the face order.
+        # EVIL EEKADOODLE - face order annoyance.
+        for total, roll, test_offsets in ((4, 2, (2, 3)), (3, 1, (2,))):
+            starts = faces_loop_start[faces_loop_total == total]
+            swap = np.zeros(len(starts), dtype=bool)
+            for test_offset in test_offsets:
+                swap |= loops_vert_idx[starts + test_offset] == 0
+            starts = starts[swap]
+            if len(starts):
+                loops = starts[:, None] + np.arange(total)
+                loops_vert_idx[loops] = loops_vert_idx[starts[:, None] + (np.arange(total) + roll) % total]
 
     mesh = bpy.data.meshes.new(name=ply_name)
 
-    mesh.vertices.add(len(obj[b'vertex']))
+    mesh.vertices.add(verts_len)
 
-    mesh.vertices.foreach_set("co", [a for v in obj[b'vertex'] for a in (v[vindices_x], v[vindices_y], v[vindices_z])])
+    mesh.vertices.foreach_set("co", np.column_stack([verts[name] for name in vindices]).astype(np.float32).ravel())
 
     if b'edge' in obj:
-        mesh.edges.add(len(obj[b'edge']))
-        mesh.edges.foreach_set("vertices", [a for e in obj[b'edge'] for a in (e[eindex1], e[eindex2])])
-
-    if mesh_faces:
-        loops_vert_idx = []
-        faces_loop_start = []
-        faces_loop_total = []
-        lidx = 0
-        for f in mesh_faces:
-            nbr_vidx = len(f)
-            loops_vert_idx.extend(f)
-            faces_loop_start.append(lidx)
-            faces_loop_total.append(nbr_vidx)
-            lidx += nbr_vidx
+        edges = obj[b'edge']
+        mesh.edges.add(len(edges[eindex1]))
+        mesh.edges.foreach_set("vertices", np.column_stack((edges[eindex1], edges[eindex2])).astype(np.int32).ravel())
 
+    if len(faces_loop_total):
         mesh.loops.add(len(loops_vert_idx))
-        mesh.polygons.add(len(mesh_faces))
+        mesh.polygons.add(len(faces_loop_total))
 
         mesh.loops.foreach_set("vertex_index", loops_vert_idx)
         mesh.polygons.foreach_set("loop_start", faces_loop_start)
@@ -381,21 +560,25 @@ def load_ply_mesh(filepath, ply_name):
 
         if uvindices:
             uv_layer = mesh.uv_layers.new()
-            for i, uv in enumerate(uv_layer.data):
-                uv.uv = mesh_uvs[i]
+            uvs = np.column_stack([verts[name] for name in uvindices]).astype(np.float32)
+            uv_layer.data.foreach_set("uv", uvs[loops_vert_idx].ravel())
 
         if colindices:
             vcol_lay = mesh.vertex_colors.new()
-
-            for i, col in enumerate(vcol_lay.data):
-                col.color[0] = mesh_colors[i][0]
-                col.color[1] = mesh_colors[i][1]
-                col.color[2] = mesh_colors[i][2]
-                col.color[3] = mesh_colors[i][3]
+            cols = np.ones((verts_len, 4), dtype=np.float32)
+            for i, name in enumerate(colindices):
+                cols[:, i] = verts[name] * colmultiply[i]
+            vcol_lay.data.foreach_set("color", cols[loops_vert_idx].ravel())
 
     mesh.update()
     mesh.validate()
 
+    if noindices and len(mesh.polygons):
+        nors = np.column_stack([verts[name] for name in noindices]).astype(np.float32)
+        mesh.polygons.foreach_set("use_smooth", np.ones(len(mesh.polygons), dtype=bool))
+        mesh.normals_split_custom_set_from_vertices(nors)
+        mesh.use_auto_smooth = True
+
     if texture and uvindices:
         pass
         # TODO add support for using texture.
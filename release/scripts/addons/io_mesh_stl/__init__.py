@@ -21,7 +21,7 @@
 bl_info = {
     "name": "STL format",
     "author": "Guillaume Bouchard (Guillaum)",
-    "version": (1, 1, 3),
+    "version": (1, 1, 4),
     "blender": (2, 81, 6),
     "location": "File > Import-Export",
     "description": "Import-Export STL files",
@@ -250,7 +250,7 @@ class ExportSTL(Operator, ExportHelper):
 
     def execute(self, context):
         import os
-        import itertools
+        import numpy as np
         from mathutils import Matrix
         from . import stl_utils
         from . import blender_utils
@@ -286,9 +286,9 @@ class ExportSTL(Operator, ExportHelper):
         ).to_4x4() @ Matrix.Scale(global_scale, 4)
 
         if self.batch_mode == 'OFF':
-            faces = itertools.chain.from_iterable(
+            faces = np.concatenate([
                     blender_utils.faces_from_mesh(ob, global_matrix, self.use_mesh_modifiers)
-                    for ob in data_seq)
+                    for ob in data_seq] or [np.empty((0, 3, 3), dtype=np.float32)])
 
             stl_utils.write_stl(faces=faces, **keywords)
         elif self.batch_mode == 'OBJECT':
@@ -26,38 +26,6 @@ Used as a blender script, it load all the stl files in the scene:
 blender --python stl_utils.py -- file1.stl file2.stl file3.stl ...
 """
 
-# TODO: endien
-
-
-class ListDict(dict):
-    """
-    Set struct with order.
-
-    You can:
-       - insert data into without doubles
-       - get the list of data in insertion order with self.list
-
-    Like collections.OrderedDict, but quicker, can be replaced if
-    ODict is optimised.
-    """
-
-    def __init__(self):
-        dict.__init__(self)
-        self.list = []
-        self._len = 0
-
-    def add(self, item):
-        """
-        Add a value to the Set, return its position in it.
-        """
-        value = self.setdefault(item, self._len)
-        if value == self._len:
-            self.list.append(item)
-            self._len += 1
-
-        return value
-
-
 # an stl binary file is
 # - 80 bytes of description
 # - 4 bytes of size (unsigned int)
@@ -68,6 +36,11 @@ class ListDict(dict):
 #   - 2 bytes of garbage (usually 0)
 BINARY_HEADER = 80
 BINARY_STRIDE = 12 * 4 + 2
+BINARY_DTYPE = [
+    ('normal', '<f4', 3),
+    ('vertices', '<f4', (3, 3)),
+    ('attributes', '<u2'),
+]
 
 
 def _header_version():
@@ -108,6 +81,7 @@ def _binary_read(data):
 
     import os
     import struct
+    import numpy as np
 
     data.seek(BINARY_HEADER)
     size = struct.unpack('<I', data.read(4))[0]
@@ -123,20 +97,10 @@ def _binary_read(data):
         size = file_size // BINARY_STRIDE
         print("WARNING! Reported size (facet number) is 0, inferring %d facets from file size." % size)
 
-    # We read 4096 elements at once, avoids too much calls to read()!
-    CHUNK_LEN = 4096
-    chunks = [CHUNK_LEN] * (size // CHUNK_LEN)
-    chunks.append(size % CHUNK_LEN)
+    # Read all facet records at once, no need for a Python loop over them.
+    facets = np.frombuffer(data.read(BINARY_STRIDE * size), dtype=BINARY_DTYPE, count=size)
 
-    unpack = struct.Struct('<12f').unpack_from
-    for chunk_len in chunks:
-        if chunk_len == 0:
-            continue
-        buf = data.read(BINARY_STRIDE * chunk_len)
-        for i in range(chunk_len):
-            # read the normal and points coordinates of each triangle
-            pt = unpack(buf, BINARY_STRIDE * i)
-            yield pt[:3], (pt[3:6], pt[6:9], pt[9:])
+    return facets['normal'], facets['vertices']
 
 
 def _ascii_read(data):
@@ -152,64 +116,87 @@ def _ascii_read(data):
     #     endloop
     #     endfacet
 
+    import numpy as np
+
     # strip header
     data.readline()
 
     curr_nor = None
+    nors = []
+    coords = []
 
     for l in data:
         l = l.lstrip()
         if l.startswith(b'facet'):
-            curr_nor = tuple(map(float, l.split()[2:]))
+            curr_nor = l.split()[2:]
         # if we encounter a vertex, read next 2
         if l.startswith(b'vertex'):
-            yield curr_nor, [tuple(map(float, l_item.split()[1:])) for l_item in (l, data.readline(), data.readline())]
+            nors.append(curr_nor)
+            coords.extend(l_item.split()[1:] for l_item in (l, data.readline(), data.readline()))
 
+    nors = np.array(nors, dtype=np.float32).reshape(-1, 3)
+    coords = np.array(coords, dtype=np.float32).reshape(-1, 3, 3)
 
-def _binary_write(filepath, faces):
-    import struct
-    import itertools
-    from mathutils.geometry import normal
+    return nors, coords
 
-    with open(filepath, 'wb') as data:
-        fw = data.write
-        # header
-        # we write padding at header beginning to avoid to
-        # call len(list(faces)) which may be expensive
-        fw(struct.calcsize('<80sI') * b'\0')
 
-        # 3 vertex == 9f
-        pack = struct.Struct('<9f').pack
+def _weld_vertices(coords):
+    """
+    Merge identical vertices of the (N, 3, 3) triangles coordinates,
+    returns the (N, 3) triangles' indices and the (M, 3) unique points,
+    points being ordered by first occurrence in the file.
+    """
+    import numpy as np
 
-        # number of vertices written
-        nb = 0
+    # Adding zero turns -0.0 into 0.0, so that both get welded.
+    verts = coords.reshape(-1, 3) + np.float32(0.0)
+    if not len(verts):
+        return np.empty((0, 3), dtype=np.int32), verts
 
-        for face in faces:
-            # calculate face normal
-            # write normal + vertexes + pad as attributes
-            fw(struct.pack('<3f', *normal(*face)) + pack(*itertools.chain.from_iterable(face)))
-            # attribute byte count (unused)
-            fw(b'\0\0')
-            nb += 1
+    # Sort-based deduplication, then restore the order of first occurrence.
+    _unique, first_index, inverse = np.unique(verts, axis=0, return_index=True, return_inverse=True)
+    order = np.argsort(first_index)
+    remap = np.empty_like(order)
+    remap[order] = np.arange(len(order))
 
-        # header, with correct value now
-        data.seek(0)
-        fw(struct.pack('<80sI', _header_version().encode('ascii'), nb))
+    tris = remap[inverse.reshape(-1)].reshape(-1, 3).astype(np.int32)
+    pts = verts[first_index[order]]
+    return tris, pts
 
 
-def _ascii_write(filepath, faces):
-    from mathutils.geometry import normal
+def _face_normals(coords):
+    import numpy as np
+
+    nors = np.cross(coords[:, 0] - coords[:, 1], coords[:, 1] - coords[:, 2])
+    lengths = np.linalg.norm(nors, axis=1, keepdims=True)
+    # Degenerate triangles get a null normal.
+    np.divide(nors, lengths, out=nors, where=(lengths != 0.0))
+    return nors
+
+
+def _binary_write(filepath, faces):
+    import struct
+    import numpy as np
 
+    facets = np.zeros(len(faces), dtype=BINARY_DTYPE)
+    facets['normal'] = _face_normals(faces)
+    facets['vertices'] = faces
+
+    with open(filepath, 'wb') as data:
+        data.write(struct.pack('<80sI', _header_version().encode('ascii'), len(facets)))
+        facets.tofile(data)
+
+
+def _ascii_write(filepath, faces):
     with open(filepath, 'w') as data:
         fw = data.write
         header = _header_version()
         fw('solid %s\n' % header)
 
-        for face in faces:
-            # calculate face normal
-            fw('facet normal %f %f %f\nouter loop\n' % normal(*face)[:])
+        for nor, face in zip(_face_normals(faces).tolist(), faces.tolist()):
+            fw('facet normal %f %f %f\nouter loop\n' % tuple(nor))
             for vert in face:
-                fw('vertex %f %f %f\n' % vert[:])
+                fw('vertex %f %f %f\n' % tuple(vert))
             fw('endloop\nendfacet\n')
 
         fw('endsolid %s\n' % header)
@@ -223,11 +210,15 @@ def write_stl(filepath="", faces=(), ascii=False):
        output filepath
 
     faces
-       iterable of tuple of 3 vertex, vertex is tuple of 3 coordinates as float
+       array of triangles of shape (N, 3, 3), each triangle made of 3 vertex,
+       each vertex made of 3 coordinates as float (or anything numpy can convert to it)
 
     ascii
        save the file in ascii format (very huge)
     """
+    import numpy as np
+
+    faces = np.asarray(faces, dtype=np.float32).reshape(-1, 3, 3)
     (_ascii_write if ascii else _binary_write)(filepath, faces)
 
 
@@ -235,50 +226,42 @@ def read_stl(filepath):
     """
     Return the triangles and points of an stl binary file.
 
-    Please note that this process can take lot of time if the file is
-    huge (~1m30 for a 1 Go stl file on an quad core i7).
+    Binary files are read in bulk, and identical points are merged
+    (welded) with a sort-based deduplication.
 
-    - returns a tuple(triangles, triangles' normals, points).
+    - returns a tuple(triangles, triangles' normals, points) of numpy arrays.
 
       triangles
-          A list of triangles, each triangle as a tuple of 3 index of
+          A (N, 3) int32 array of triangles, each triangle as 3 indices of
           point in *points*.
 
       triangles' normals
-          A list of vectors3 (tuples, xyz).
+          A (N, 3) float32 array of vectors3 (xyz).
 
       points
-          An indexed list of points, each point is a tuple of 3 float
-          (xyz).
+          A (M, 3) float32 array of points (xyz), in order of first
+          occurrence in the file.
 
     Example of use:
 
        >>> tris, tri_nors, pts = read_stl(filepath)
-       >>> pts = list(pts)
        >>>
        >>> # print the coordinate of the triangle n
-       >>> print(pts[i] for i in tris[n])
+       >>> print(pts[tris[n]])
     """
     import time
     start_time = time.process_time()
 
-    tris, tri_nors, pts = [], [], ListDict()
-
     with open(filepath, 'rb') as data:
         # check for ascii or binary
-        gen = _ascii_read if _is_ascii_file(data) else _binary_read
+        read = _ascii_read if _is_ascii_file(data) else _binary_read
+        tri_nors, coords = read(data)
 
-        for nor, pt in gen(data):
-            # Add the triangle and the point.
-            # If the point is already in the list of points, the
-            # index returned by pts.add() will be the one from the
-            # first equal point inserted.
-            tris.append([pts.add(p) for p in pt])
-            tri_nors.append(nor)
+    tris, pts = _weld_vertices(coords)
 
     print('Import finished in %.4f sec.' % (time.process_time() - start_time))
 
-    return tris, tri_nors, pts.list
+    return tris, tri_nors, pts
 
 
 if __name__ == '__main__':
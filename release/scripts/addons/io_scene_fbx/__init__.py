@@ -21,7 +21,7 @@
 bl_info = {
     "name": "FBX format",
     "author": "Campbell Barton, Bastien Montagne, Jens Restemeier",
-    "version": (4, 22, 0),
+    "version": (4, 23, 0),
     "blender": (2, 90, 0),
     "location": "File > Import-Export",
     "description": "FBX IO meshes, UV's, vertex colors, materials, textures, cameras, lamps and actions",
@@ -47,6 +47,7 @@ from bpy.props import (
         StringProperty,
         BoolProperty,
         FloatProperty,
+        IntProperty,
         EnumProperty,
         CollectionProperty,
         )
@@ -610,6 +611,13 @@ class ExportFBX(bpy.types.Operator, ExportHelper):
             description="Create a dir for each exported file",
             default=True,
             )
+    compression_level: IntProperty(
+            name="Compression",
+            description="Compression level of the exported arrays (0 to store them uncompressed, "
+                        "9 for the smallest but slowest to write files)",
+            min=0, max=9,
+            default=1,
+            )
     use_metadata: BoolProperty(
             name="Use Metadata",
             default=True,
@@ -675,6 +683,7 @@ class FBX_PT_export_main(bpy.types.Panel):
         row.prop(operator, "batch_mode")
         sub = row.row(align=True)
         sub.prop(operator, "use_batch_own_dir", text="", icon='NEWFOLDER')
+        layout.prop(operator, "compression_level")
 
 
 class FBX_PT_export_include(bpy.types.Panel):
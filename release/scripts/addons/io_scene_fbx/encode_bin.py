@@ -26,7 +26,9 @@ except:
     import data_types
 
 from struct import pack
+from concurrent.futures import Future, ThreadPoolExecutor
 import array
+import os
 import zlib
 
 _BLOCK_SENTINEL_LENGTH = 13
@@ -42,6 +44,13 @@ _TIME_ID = b'1970-01-01 10:00:00:000'
 _FILE_ID = b'\x28\xb3\x2a\xeb\xb6\x24\xcc\xc2\xbf\xc8\xb0\x2a\xa9\x2b\xfc\xf1'
 _FOOT_ID = b'\xfa\xbc\xab\x09\xd0\xc8\xd4\x66\xb1\x76\xfb\x83\x1c\xf7\x26\x7e'
 
+# Arrays bigger than this (in bytes) are compressed in worker threads (zlib releases the GIL),
+# smaller ones are not worth the overhead and get compressed immediately.
+_ARRAY_THREADED_COMPRESS_SIZE = 1 << 16
+# zlib compression level of arrays, zero disables compression (see init_write()).
+_ARRAY_COMPRESSION_LEVEL = 1
+_compress_pool = None
+
 # Awful exceptions: those "classes" of elements seem to need block sentinel even when having no children and some props.
 _ELEMS_ID_ALWAYS_BLOCK_SENTINEL = {b"AnimationStack", b"AnimationLayer"}
 
@@ -52,9 +61,6 @@ class FBXElem:
         "props",
         "props_type",
         "elems",
-
-        "_props_length",  # combine length of props
-        "_end_offset",  # byte offset from the start of the file.
         )
 
     def __init__(self, id):
@@ -63,8 +69,6 @@ class FBXElem:
         self.props = []
         self.props_type = bytearray()
         self.elems = []
-        self._end_offset = -1
-        self._props_length = -1
 
     def add_bool(self, data):
         assert(isinstance(data, bool))
@@ -142,16 +146,12 @@ class FBXElem:
         data = data.tobytes()
 
         # mimic behavior of fbxconverter (also common sense)
-        # we could make this configurable.
-        encoding = 0 if len(data) <= 128 else 1
-        if encoding == 0:
-            pass
-        elif encoding == 1:
-            data = zlib.compress(data, 1)
-
-        comp_len = len(data)
-
-        data = pack('<3I', length, encoding, comp_len) + data
+        encoding = 0 if (len(data) <= 128 or _ARRAY_COMPRESSION_LEVEL == 0) else 1
+        if encoding == 1 and len(data) > _ARRAY_THREADED_COMPRESS_SIZE:
+            # Resolved to actual bytes when written.
+            data = _compress_pool_get().submit(_pack_array, data, length, encoding)
+        else:
+            data = _pack_array(data, length, encoding)
 
         self.props_type.append(prop_type)
         self.props.append(data)
@@ -189,71 +189,74 @@ class FBXElem:
     # -------------------------
     # internal helper functions
 
-    def _calc_offsets(self, offset, is_last):
-        """
-        Call before writing, calculates fixed offsets.
-        """
-        assert(self._end_offset == -1)
-        assert(self._props_length == -1)
-
-        offset += 12  # 3 uints
-        offset += 1 + len(self.id)  # len + idname
-
-        props_length = 0
-        for data in self.props:
-            # 1 byte for the prop type
-            props_length += 1 + len(data)
-        self._props_length = props_length
-        offset += props_length
-
-        offset = self._calc_offsets_children(offset, is_last)
-
-        self._end_offset = offset
-        return offset
-
-    def _calc_offsets_children(self, offset, is_last):
-        if self.elems:
-            elem_last = self.elems[-1]
-            for elem in self.elems:
-                offset = elem._calc_offsets(offset, (elem is elem_last))
-            offset += _BLOCK_SENTINEL_LENGTH
-        elif not self.props or self.id in _ELEMS_ID_ALWAYS_BLOCK_SENTINEL:
-            if not is_last:
-                offset += _BLOCK_SENTINEL_LENGTH
-
-        return offset
+    def _write(self, write, tell, is_last, end_offsets):
+        # The end offset is only known once children are written,
+        # write a placeholder and record its position to patch it afterwards.
+        end_offset_pos = tell()
 
-    def _write(self, write, tell, is_last):
-        assert(self._end_offset != -1)
-        assert(self._props_length != -1)
+        props = self.props
+        for i, data in enumerate(props):
+            if data.__class__ is Future:
+                props[i] = data.result()
+        props_length = sum(1 + len(data) for data in props)
 
-        write(pack('<3I', self._end_offset, len(self.props), self._props_length))
+        write(pack('<3I', 0, len(props), props_length))
 
         write(bytes((len(self.id),)))
         write(self.id)
 
-        for i, data in enumerate(self.props):
+        for i, data in enumerate(props):
             write(bytes((self.props_type[i],)))
             write(data)
 
-        self._write_children(write, tell, is_last)
+        self._write_children(write, tell, is_last, end_offsets)
 
-        if tell() != self._end_offset:
-            raise IOError("scope length not reached, "
-                          "something is wrong (%d)" % (end_offset - tell()))
+        end_offsets.append((end_offset_pos, tell()))
 
-    def _write_children(self, write, tell, is_last):
+    def _write_children(self, write, tell, is_last, end_offsets):
         if self.elems:
             elem_last = self.elems[-1]
             for elem in self.elems:
                 assert(elem.id != b'')
-                elem._write(write, tell, (elem is elem_last))
+                elem._write(write, tell, (elem is elem_last), end_offsets)
             write(_BLOCK_SENTINEL_DATA)
         elif not self.props or self.id in _ELEMS_ID_ALWAYS_BLOCK_SENTINEL:
             if not is_last:
                 write(_BLOCK_SENTINEL_DATA)
 
 
+def _pack_array(data, length, encoding):
+    if encoding == 1:
+        data = zlib.compress(data, _ARRAY_COMPRESSION_LEVEL)
+    return pack('<3I', length, encoding, len(data)) + data
+
+
+def _compress_pool_get():
+    global _compress_pool
+    if _compress_pool is None:
+        _compress_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+    return _compress_pool
+
+
+def _compress_pool_free():
+    global _compress_pool
+    if _compress_pool is not None:
+        _compress_pool.shutdown()
+        _compress_pool = None
+
+
+def init_write(compression_level=1):
+    """
+    Set the zlib compression level (0-9) of the arrays of the elements created from now on,
+    zero stores them uncompressed.
+    """
+    global _ARRAY_COMPRESSION_LEVEL
+    assert(0 <= compression_level <= 9)
+    _ARRAY_COMPRESSION_LEVEL = compression_level
+    # In case a previous export did not reach write().
+    _compress_pool_free()
+
+
 def _write_timedate_hack(elem_root):
     # perform 2 changes
     # - set the FileID
@@ -299,8 +302,9 @@ def write(fn, elem_root, version):
         # ideally we would _not_ modify this data.
         _write_timedate_hack(elem_root)
 
-        elem_root._calc_offsets_children(tell(), False)
-        elem_root._write_children(write, tell, False)
+        end_offsets = []
+        elem_root._write_children(write, tell, False, end_offsets)
+        _compress_pool_free()
 
         write(_FOOT_ID)
         write(b'\x00' * 4)
@@ -319,3 +323,9 @@ def write(fn, elem_root, version):
         # unknown magic (always the same)
         write(b'\0' * 120)
         write(b'\xf8\x5a\x8c\x6a\xde\xf5\xd9\x7e\xec\xe9\x0c\xe3\x75\x8f\x29\x0b')
+
+        # Back-patch elements' end offsets, in file order.
+        end_offsets.sort()
+        for end_offset_pos, end_offset in end_offsets:
+            f.seek(end_offset_pos)
+            write(pack('<I', end_offset))
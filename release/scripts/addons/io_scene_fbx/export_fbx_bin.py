@@ -3000,6 +3000,7 @@ def save_single(operator, scene, depsgraph, filepath="",
                 use_custom_props=False,
                 bake_space_transform=False,
                 armature_nodetype='NULL',
+                compression_level=1,
                 **kwargs
                 ):
 
@@ -3075,6 +3076,9 @@ def save_single(operator, scene, depsgraph, filepath="",
     print('\nFBX export starting... %r' % filepath)
     start_time = time.process_time()
 
+    # Big arrays get compressed in worker threads while the rest of the data is generated.
+    encode_bin.init_write(compression_level)
+
     # Generate some data about exported scene...
     scene_data = fbx_data_from_scene(scene, depsgraph, settings)
 
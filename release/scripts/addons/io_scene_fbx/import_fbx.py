@@ -2403,7 +2403,8 @@ def load(operator, context, filepath="",
     # End ascii detection.
 
     try:
-        elem_root, version = parse_fbx.parse(filepath)
+        # Memory-map the file, arrays are only decoded once the importer actually needs them.
+        elem_root, version = parse_fbx.parse(filepath, use_mmap=True, array_cache_size=16)
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -2413,6 +2414,7 @@ def load(operator, context, filepath="",
 
     if version < 7100:
         operator.report({'ERROR'}, "Version %r unsupported, must be %r or later" % (version, 7100))
+        parse_fbx.close(elem_root)
         return {'CANCELLED'}
 
     print("FBX version: %r" % version)
@@ -2448,6 +2450,7 @@ def load(operator, context, filepath="",
     fbx_settings_props = elem_find_first(fbx_settings, b'Properties70')
     if fbx_settings is None or fbx_settings_props is None:
         operator.report({'ERROR'}, "No 'GlobalSettings' found in file %r" % filepath)
+        parse_fbx.close(elem_root)
         return {'CANCELLED'}
 
     # FBX default base unit seems to be the centimeter, while raw Blender Unit is equivalent to the meter...
@@ -2515,9 +2518,11 @@ def load(operator, context, filepath="",
 
     if fbx_nodes is None:
         operator.report({'ERROR'}, "No 'Objects' found in file %r" % filepath)
+        parse_fbx.close(elem_root)
         return {'CANCELLED'}
     if fbx_connections is None:
         operator.report({'ERROR'}, "No 'Connections' found in file %r" % filepath)
+        parse_fbx.close(elem_root)
         return {'CANCELLED'}
 
     # ----
@@ -3214,6 +3219,9 @@ def load(operator, context, filepath="",
                         obj.cycles_visibility.shadow = False
     _(); del _
 
+    # all the arrays needed are decoded now
+    parse_fbx.close(elem_root)
+
     perfmon.level_down()
 
     perfmon.level_down("Import finished.")
@@ -26,10 +26,13 @@ __all__ = (
     "data_types",
     "parse_version",
     "FBXElem",
+    "FBXLazyProps",
     )
 
 from struct import unpack
+from collections import OrderedDict
 import array
+import mmap
 import zlib
 
 from . import data_types
@@ -64,13 +67,7 @@ def read_string_ubyte(read):
     return data
 
 
-def unpack_array(read, array_type, array_stride, array_byteswap):
-    length = read_uint(read)
-    encoding = read_uint(read)
-    comp_len = read_uint(read)
-
-    data = read(comp_len)
-
+def decode_array(data, length, encoding, array_type, array_stride, array_byteswap):
     if encoding == 0:
         pass
     elif encoding == 1:
@@ -84,6 +81,16 @@ def unpack_array(read, array_type, array_stride, array_byteswap):
     return data_array
 
 
+def unpack_array(read, array_type, array_stride, array_byteswap):
+    length = read_uint(read)
+    encoding = read_uint(read)
+    comp_len = read_uint(read)
+
+    data = read(comp_len)
+
+    return decode_array(data, length, encoding, array_type, array_stride, array_byteswap)
+
+
 read_data_dict = {
     b'Y'[0]: lambda read: unpack(b'<h', read(2))[0],  # 16 bit int
     b'C'[0]: lambda read: unpack(b'?', read(1))[0],   # 1 bit bool (yes/no)
@@ -102,6 +109,118 @@ read_data_dict = {
     }
 
 
+# Lazy (memory-mapped) parsing: array properties are not read on the first pass,
+# only their location in the file is stored, they get decoded on first access.
+class _LazyArray:
+    __slots__ = (
+        "offset",
+        "comp_len",
+        "length",
+        "encoding",
+        "array_type",
+        "array_stride",
+        "array_byteswap",
+        )
+
+    def __init__(self, offset, comp_len, length, encoding, array_type, array_stride, array_byteswap):
+        self.offset = offset
+        self.comp_len = comp_len
+        self.length = length
+        self.encoding = encoding
+        self.array_type = array_type
+        self.array_stride = array_stride
+        self.array_byteswap = array_byteswap
+
+
+class _LazyArraySource:
+    """
+    Decodes arrays out of a memory-mapped file,
+    optionally keeping the most recently used ones in a bounded LRU cache.
+    """
+    __slots__ = (
+        "_mm",
+        "_cache",
+        "_cache_size",
+        )
+
+    def __init__(self, mm, cache_size):
+        self._mm = mm
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+
+    def decode(self, lazy):
+        cache = self._cache
+        data_array = cache.get(lazy.offset)
+        if data_array is not None:
+            cache.move_to_end(lazy.offset)
+            return data_array
+
+        data = self._mm[lazy.offset:lazy.offset + lazy.comp_len]
+        data_array = decode_array(data, lazy.length, lazy.encoding,
+                                  lazy.array_type, lazy.array_stride, lazy.array_byteswap)
+
+        if self._cache_size > 0:
+            cache[lazy.offset] = data_array
+            if len(cache) > self._cache_size:
+                cache.popitem(last=False)
+        return data_array
+
+    def close(self):
+        self._cache.clear()
+        self._mm.close()
+
+
+class FBXLazyProps(list):
+    """
+    List of element properties, where array properties are decoded from the file on access.
+    """
+    __slots__ = (
+        "_source",
+        )
+
+    def __init__(self, props, source):
+        super().__init__(props)
+        self._source = source
+
+    def _resolve(self, value):
+        return self._source.decode(value) if value.__class__ is _LazyArray else value
+
+    def __getitem__(self, index):
+        if index.__class__ is slice:
+            return [self._resolve(value) for value in super().__getitem__(index)]
+        return self._resolve(super().__getitem__(index))
+
+    def __iter__(self):
+        resolve = self._resolve
+        for value in super().__iter__():
+            yield resolve(value)
+
+
+def _lazy_read_data_dict(mm, source):
+    seek = mm.seek
+    tell = mm.tell
+
+    def skip_array(read, array_type, array_stride, array_byteswap):
+        length = read_uint(read)
+        encoding = read_uint(read)
+        comp_len = read_uint(read)
+
+        offset = tell()
+        seek(comp_len, 1)
+        return _LazyArray(offset, comp_len, length, encoding, array_type, array_stride, array_byteswap)
+
+    read_data = read_data_dict.copy()
+    read_data.update({
+        b'f'[0]: lambda read: skip_array(read, data_types.ARRAY_FLOAT32, 4, False),  # array (float)
+        b'i'[0]: lambda read: skip_array(read, data_types.ARRAY_INT32, 4, True),   # array (int)
+        b'd'[0]: lambda read: skip_array(read, data_types.ARRAY_FLOAT64, 8, False),  # array (double)
+        b'l'[0]: lambda read: skip_array(read, data_types.ARRAY_INT64, 8, True),   # array (long)
+        b'b'[0]: lambda read: skip_array(read, data_types.ARRAY_BOOL, 1, False),  # array (bool)
+        b'c'[0]: lambda read: skip_array(read, data_types.ARRAY_BYTE, 1, False),  # array (ubyte)
+        })
+    return read_data
+
+
 # FBX 7500 (aka FBX2016) introduces incompatible changes at binary level:
 #   * The NULL block marking end of nested stuff switches from 13 bytes long to 25 bytes long.
 #   * The FBX element metadata (end_offset, prop_count and prop_length) switch from uint32 to uint64.
@@ -121,7 +240,7 @@ def init_version(fbx_version):
     _BLOCK_SENTINEL_DATA = (b'\0' * _BLOCK_SENTINEL_LENGTH)
 
 
-def read_elem(read, tell, use_namedtuple):
+def read_elem(read, tell, use_namedtuple, read_data=read_data_dict, lazy_source=None):
     # [0] the offset at which this block ends
     # [1] the number of properties in the scope
     # [2] the length of the property list
@@ -139,12 +258,15 @@ def read_elem(read, tell, use_namedtuple):
 
     for i in range(prop_count):
         data_type = read(1)[0]
-        elem_props_data[i] = read_data_dict[data_type](read)
+        elem_props_data[i] = read_data[data_type](read)
         elem_props_type[i] = data_type
 
+    if lazy_source is not None and _LazyArray in {p.__class__ for p in elem_props_data}:
+        elem_props_data = FBXLazyProps(elem_props_data, lazy_source)
+
     if tell() < end_offset:
         while tell() < (end_offset - _BLOCK_SENTINEL_LENGTH):
-            elem_subtree.append(read_elem(read, tell, use_namedtuple))
+            elem_subtree.append(read_elem(read, tell, use_namedtuple, read_data, lazy_source))
 
         if read(_BLOCK_SENTINEL_LENGTH) != _BLOCK_SENTINEL_DATA:
             raise IOError("failed to read nested block sentinel, "
@@ -171,10 +293,26 @@ def parse_version(fn):
         return read_uint(read)
 
 
-def parse(fn, use_namedtuple=True):
+def parse(fn, use_namedtuple=True, use_mmap=False, array_cache_size=0):
+    """
+    Parse a binary FBX file, returning the root element and the file version.
+
+    When ``use_mmap`` is enabled, the file is memory-mapped and array properties are only decoded
+    when accessed (see :class:`FBXLazyProps`), ``array_cache_size`` being the number of decoded arrays
+    to keep around (zero disables caching).
+    The mapping remains open until :func:`close` is called with the returned root element
+    (or the tree is freed), array properties can't be accessed once it's closed.
+    """
     root_elems = []
+    read_data = read_data_dict
+    lazy_source = None
 
     with open(fn, 'rb') as f:
+        if use_mmap:
+            f = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            lazy_source = _LazyArraySource(f, array_cache_size)
+            read_data = _lazy_read_data_dict(f, lazy_source)
+
         read = f.read
         tell = f.tell
 
@@ -185,10 +323,23 @@ def parse(fn, use_namedtuple=True):
         init_version(fbx_version)
 
         while True:
-            elem = read_elem(read, tell, use_namedtuple)
+            elem = read_elem(read, tell, use_namedtuple, read_data, lazy_source)
             if elem is None:
                 break
             root_elems.append(elem)
 
-    args = (b'', [], bytearray(0), root_elems)
+    # the root has no properties, it keeps the lazy source for close()
+    root_props = [] if lazy_source is None else FBXLazyProps((), lazy_source)
+
+    args = (b'', root_props, bytearray(0), root_elems)
     return FBXElem(*args) if use_namedtuple else args, fbx_version
+
+
+def close(elem_root):
+    """
+    Close the file memory-mapped by :func:`parse` for this root element,
+    does nothing when it wasn't parsed with ``use_mmap``.
+    """
+    props = elem_root[1]
+    if props.__class__ is FBXLazyProps:
+        props._source.close()
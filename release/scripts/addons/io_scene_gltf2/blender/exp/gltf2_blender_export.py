@@ -20,8 +20,10 @@ import traceback
 from io_scene_gltf2.blender.com import gltf2_blender_json
 from io_scene_gltf2.blender.exp import gltf2_blender_export_keys
 from io_scene_gltf2.blender.exp import gltf2_blender_gather
+from io_scene_gltf2.blender.exp import gltf2_blender_gather_cache
 from io_scene_gltf2.blender.exp.gltf2_blender_gltf2_exporter import GlTF2Exporter
 from io_scene_gltf2.io.com.gltf2_io_debug import print_console, print_newline
+from io_scene_gltf2.io.exp import gltf2_io_buffer
 from io_scene_gltf2.io.exp import gltf2_io_export
 from io_scene_gltf2.io.exp import gltf2_io_draco_compression_extension
 from io_scene_gltf2.io.exp.gltf2_io_user_extensions import export_user_extensions
@@ -43,12 +45,20 @@ def save(context, export_settings):
     for callback in pre_export_callbacks:
         callback(export_settings)
 
-    json, buffer = __export(export_settings)
+    cache = gltf2_blender_gather_cache.begin_export(export_settings)
+    try:
+        json, buffer = __export(export_settings)
+    finally:
+        gltf2_blender_gather_cache.end_export()
+    if bpy.app.debug_value != 0:
+        cache.report()
 
     post_export_callbacks = export_settings["post_export_callbacks"]
     for callback in post_export_callbacks:
         callback(export_settings)
     __write_file(json, buffer, export_settings)
+    if isinstance(buffer, gltf2_io_buffer.Buffer):
+        buffer.clear()
 
     end_time = time.time()
     __notify_end(context, end_time - start_time)
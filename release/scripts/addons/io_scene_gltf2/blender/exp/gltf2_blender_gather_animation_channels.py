@@ -18,6 +18,7 @@ import typing
 from ..com.gltf2_blender_data_path import get_target_object_path, get_target_property_name, get_rotation_modes
 from io_scene_gltf2.io.com import gltf2_io
 from io_scene_gltf2.io.com import gltf2_io_debug
+from io_scene_gltf2.blender.exp import gltf2_blender_gather_cache
 from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import cached
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_animation_samplers
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_animation_channel_target
@@ -35,6 +36,9 @@ def gather_animation_channels(blender_action: bpy.types.Action,
                               ) -> typing.List[gltf2_io.AnimationChannel]:
     channels = []
 
+    # Driver values sampled while baking bones are only valid for this action
+    gltf2_blender_gather_cache.get_cache(export_settings).action_scope = (
+        gltf2_blender_gather_cache.datablock_key(blender_object), blender_action.name)
 
     # First calculate range of animation for baking
     # This is need if user set 'Force sampling' and in case we need to bake
@@ -122,13 +126,6 @@ def gather_animation_channels(blender_action: bpy.types.Action,
             if channel is not None:
                 channels.append(channel)
 
-
-    # resetting driver caches
-    gltf2_blender_gather_drivers.get_sk_driver_values.reset_cache()
-    gltf2_blender_gather_drivers.get_sk_drivers.reset_cache()
-    # resetting bone caches
-    gltf2_blender_gather_animation_sampler_keyframes.get_bone_matrix.reset_cache()
-
     return channels
 
 def __get_channel_group_sorted(channels: typing.Tuple[bpy.types.FCurve], blender_object: bpy.types.Object):
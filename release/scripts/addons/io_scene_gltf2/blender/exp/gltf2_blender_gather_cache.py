@@ -13,18 +13,137 @@
 # limitations under the License.
 
 import functools
+import time
+from collections import OrderedDict
+
 import bpy
 from io_scene_gltf2.blender.exp import gltf2_blender_get
+from io_scene_gltf2.io.com.gltf2_io_debug import print_console
+
+# Maximum number of baked (armature, action) bone matrix sets kept alive at the same time.
+BONE_CACHE_SIZE = 8
+
+
+class ExportCache:
+    """
+    Results of the gather functions for one export.
+
+    Every cached function gets its own store, with hit/miss counters and the time spent
+    computing missed entries (inclusive of nested gather calls).
+    Stores created with a maximum size evict their least recently used entries.
+    """
+
+    def __init__(self, export_settings=None):
+        self.export_settings = export_settings
+        self.__stores = {}
+        self.__stats = {}
+        # Set while gathering the channels of an action, driver values are only valid for it
+        self.action_scope = None
+
+    def store(self, name, max_size=None):
+        store = self.__stores.get(name)
+        if store is None:
+            store = self.__stores[name] = (OrderedDict(), max_size)
+            self.__stats[name] = [0, 0, 0, 0.0]
+        return store[0]
+
+    def get(self, name, key, compute):
+        """Return the cached result for key, calling compute() on a miss."""
+        entries, max_size = self.__stores.get(name) or (self.store(name), None)
+        stats = self.__stats[name]
+        if key in entries:
+            stats[0] += 1
+            if max_size is not None:
+                entries.move_to_end(key)
+            return entries[key]
+
+        stats[1] += 1
+        start = time.perf_counter()
+        result = compute()
+        stats[3] += time.perf_counter() - start
+
+        entries[key] = result
+        if max_size is not None and len(entries) > max_size:
+            entries.popitem(last=False)
+            stats[2] += 1
+        return result
+
+    def clear(self, name=None):
+        if name is None:
+            self.__stores.clear()
+            self.__stats.clear()
+        elif name in self.__stores:
+            self.__stores[name][0].clear()
+
+    def report(self):
+        """Print hit/miss counters and time spent per gather function, most expensive first."""
+        print_console('PROFILE', 'Export cache: {} functions'.format(len(self.__stats)))
+        for name, (hits, misses, evictions, seconds) in sorted(self.__stats.items(), key=lambda item: -item[1][3]):
+            print_console('PROFILE', '  {:<60} {:>8} hits {:>8} misses {:>6} evicted {:>9.3f} s'.format(
+                name, hits, misses, evictions, seconds))
+
+
+__current_cache = None
+
+
+def begin_export(export_settings):
+    """Start a new cache session for the given export settings and return its cache."""
+    global __current_cache
+    __current_cache = ExportCache(export_settings)
+    return __current_cache
+
+
+def end_export():
+    """Drop the cache of the current export."""
+    global __current_cache
+    cache = __current_cache
+    __current_cache = None
+    return cache
+
+
+def get_cache(export_settings=None):
+    """
+    Return the cache of the current export.
+
+    A new cache is started if none is active or if it was created for other export settings,
+    e.g. when gather functions are called outside of an export.
+    """
+    global __current_cache
+    if __current_cache is None or (export_settings is not None and __current_cache.export_settings is not export_settings):
+        __current_cache = ExportCache(export_settings)
+    return __current_cache
+
+
+# Datablocks keyed by name, so that evaluated and original datablocks share cache entries
+__BY_NAME = (bpy.types.Object, bpy.types.Scene, bpy.types.Material, bpy.types.Action, bpy.types.Mesh)
+
+
+def datablock_key(value):
+    """Return a hashable key identifying a Blender datablock, or the value itself for other types."""
+    if type(value) in __BY_NAME:
+        # name_full includes the library name for linked datablocks
+        return (type(value).__name__, value.name_full)
+    if type(value) is bpy.types.PoseBone:
+        return ('PoseBone', value.id_data.name_full, value.name)
+    return value
 
 
 def cached(func):
     """
     Decorate the cache gather functions results.
 
-    The gather function is only executed if its result isn't in the cache yet
-    :param func: the function to be decorated. It will have a static __cache member afterwards
+    The gather function is only executed if its result isn't in the cache of the current export yet.
+    Datablocks are keyed by their (library qualified) name, export settings select the cache.
+    :param func: the function to be decorated. It will have a reset_cache member afterwards
     :return:
     """
+    name = func.__module__.rsplit('.', 1)[-1] + '.' + func.__qualname__
+
+    def reset_cache_cached():
+        get_cache().clear(name)
+
+    func.reset_cache = reset_cache_cached
+
     @functools.wraps(func)
     def wrapper_cached(*args, **kwargs):
         assert len(args) >= 2 and 0 <= len(kwargs) <= 1, "Wrong signature for cached function"
@@ -39,40 +158,25 @@ def cached(func):
             export_settings = args[-1]
             cache_key_args = args[:-1]
 
-        __by_name = [bpy.types.Object, bpy.types.Scene, bpy.types.Material, bpy.types.Action, bpy.types.Mesh, bpy.types.PoseBone]
-
         # we make a tuple from the function arguments so that they can be used as a key to the cache
-        cache_key = ()
-        for i in cache_key_args:
-            if type(i) in __by_name:
-                cache_key += (i.name,)
-            else:
-                cache_key += (i,)
-        for i in cache_key_kwargs.values():
-            if type(i) in __by_name:
-                cache_key += (i.name,)
-            else:
-                cache_key += (i,)
-
-        # invalidate cache if export settings have changed
-        if not hasattr(func, "__export_settings") or export_settings != func.__export_settings:
-            func.__cache = {}
-            func.__export_settings = export_settings
-        # use or fill cache
-        if cache_key in func.__cache:
-            return func.__cache[cache_key]
-        else:
-            result = func(*args)
-            func.__cache[cache_key] = result
-            return result
+        cache_key = tuple(datablock_key(i) for i in cache_key_args)
+        cache_key += tuple(datablock_key(i) for i in cache_key_kwargs.values())
+
+        return get_cache(export_settings).get(name, cache_key, lambda: func(*args, **kwargs))
+
     return wrapper_cached
 
 def bonecache(func):
+    """
+    Cache baked bone matrices per armature, action and bake range.
+
+    The most recently used BONE_CACHE_SIZE bakes are kept, so alternating between actions
+    doesn't bake them again.
+    """
+    name = func.__module__.rsplit('.', 1)[-1] + '.' + func.__qualname__
 
     def reset_cache_bonecache():
-        func.__current_action_name = None
-        func.__current_armature_name = None
-        func.__bonecache = {}
+        get_cache().clear(name)
 
     func.reset_cache = reset_cache_bonecache
 
@@ -84,16 +188,12 @@ def bonecache(func):
         else:
             pose_bone_if_armature = args[0].pose.bones[args[2]]
 
-        if not hasattr(func, "__current_action_name"):
-            func.reset_cache()
-        if args[6] != func.__current_action_name or args[0] != func.__current_armature_name:
-            result = func(*args)
-            func.__bonecache = result
-            func.__current_action_name = args[6]
-            func.__current_armature_name = args[0]
-            return result[args[7]][pose_bone_if_armature.name]
-        else:
-            return func.__bonecache[args[7]][pose_bone_if_armature.name]
+        cache = get_cache()
+        cache.store(name, BONE_CACHE_SIZE)
+        # armature, action name, bake range and step
+        cache_key = (datablock_key(args[0]), args[6], args[4], args[5], args[8])
+        result = cache.get(name, cache_key, lambda: func(*args, **kwargs))
+        return result[args[7]][pose_bone_if_armature.name]
     return wrapper_bonecache
 
 # TODO: replace "cached" with "unique" in all cases where the caching is functional and not only for performance reasons
@@ -101,45 +201,30 @@ call_or_fetch = cached
 unique = cached
 
 def skdriverdiscovercache(func):
+    """Cache the shape key drivers found for each armature."""
+    name = func.__module__.rsplit('.', 1)[-1] + '.' + func.__qualname__
 
     def reset_cache_skdriverdiscovercache():
-        func.__current_armature_name = None
-        func.__skdriverdiscover = {}
+        get_cache().clear(name)
 
     func.reset_cache = reset_cache_skdriverdiscovercache
 
     @functools.wraps(func)
     def wrapper_skdriverdiscover(*args, **kwargs):
-        if not hasattr(func, "__current_armature_name") or func.__current_armature_name is None:
-            func.reset_cache()
-
-        if args[0] != func.__current_armature_name:
-            result = func(*args)
-            func.__skdriverdiscover[args[0]] = result
-            func.__current_armature_name = args[0]
-            return result
-        else:
-            return func.__skdriverdiscover[args[0]]
+        return get_cache().get(name, datablock_key(args[0]), lambda: func(*args, **kwargs))
     return wrapper_skdriverdiscover
 
 def skdrivervalues(func):
+    """Cache the shape key driver values per object and frame, for the action being gathered."""
+    name = func.__module__.rsplit('.', 1)[-1] + '.' + func.__qualname__
 
     def reset_cache_skdrivervalues():
-        func.__skdrivervalues = {}
+        get_cache().clear(name)
 
     func.reset_cache = reset_cache_skdrivervalues
 
     @functools.wraps(func)
     def wrapper_skdrivervalues(*args, **kwargs):
-        if not hasattr(func, "__skdrivervalues") or func.__skdrivervalues is None:
-            func.reset_cache()
-
-        if args[0].name not in func.__skdrivervalues.keys():
-            func.__skdrivervalues[args[0].name] = {}
-        if args[1] not in func.__skdrivervalues[args[0].name]:
-            vals = func(*args)
-            func.__skdrivervalues[args[0].name][args[1]] = vals
-            return vals
-        else:
-            return func.__skdrivervalues[args[0].name][args[1]]
+        cache = get_cache()
+        return cache.get(name, (cache.action_scope, datablock_key(args[0]), args[1]), lambda: func(*args, **kwargs))
     return wrapper_skdrivervalues
@@ -18,6 +18,7 @@ from mathutils import Matrix, Quaternion, Vector
 
 from . import gltf2_blender_export_keys
 from io_scene_gltf2.blender.com import gltf2_blender_math
+from io_scene_gltf2.blender.exp import gltf2_blender_gather_cache
 from io_scene_gltf2.blender.exp.gltf2_blender_gather_cache import cached
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_skins
 from io_scene_gltf2.blender.exp import gltf2_blender_gather_cameras
@@ -35,16 +36,13 @@ def gather_node(blender_object, library, blender_scene, dupli_object_parent, exp
     # custom cache to avoid cache miss when called from animation
     # with blender_scene=None
 
-    # invalidate cache if export settings have changed
-    if not hasattr(gather_node, "__export_settings") or export_settings != gather_node.__export_settings:
-        gather_node.__cache = {}
-        gather_node.__export_settings = export_settings
+    nodes = gltf2_blender_gather_cache.get_cache(export_settings).store('gather_nodes.gather_node')
 
-    if blender_scene is None and (blender_object.name, library) in gather_node.__cache:
-        return gather_node.__cache[(blender_object.name, library)]
+    if blender_scene is None and (blender_object.name, library) in nodes:
+        return nodes[(blender_object.name, library)]
 
     node = __gather_node(blender_object, library, blender_scene, dupli_object_parent, export_settings)
-    gather_node.__cache[(blender_object.name, library)] = node
+    nodes[(blender_object.name, library)] = node
     return node
 
 @cached
@@ -19,6 +19,7 @@ from typing import List
 from ... import get_version_string
 from io_scene_gltf2.io.com import gltf2_io
 from io_scene_gltf2.io.com import gltf2_io_extensions
+from io_scene_gltf2.io.com.gltf2_io_debug import print_console
 from io_scene_gltf2.io.exp import gltf2_io_binary_data
 from io_scene_gltf2.io.exp import gltf2_io_buffer
 from io_scene_gltf2.io.exp import gltf2_io_image_data
@@ -125,7 +126,7 @@ class GlTF2Exporter:
                 uri = None
             elif output_path and buffer_name:
                 with open(output_path + buffer_name, 'wb') as f:
-                    f.write(self.__buffer.to_bytes())
+                    self.__buffer.write_to(f)
                 uri = buffer_name
             else:
                 uri = self.__buffer.to_embed_string()
@@ -139,10 +140,17 @@ class GlTF2Exporter:
             )
             self.__gltf.buffers.append(buffer)
 
+        if self.__buffer.deduplicated_count > 0:
+            print_console('INFO', 'Reused {} buffer views, saved {} bytes'.format(
+                self.__buffer.deduplicated_count, self.__buffer.deduplicated_byte_length))
+
         self.__finalized = True
 
         if is_glb:
-            return self.__buffer.to_bytes()
+            # The buffer is streamed into the GLB file by the caller, which is responsible for clearing it.
+            return self.__buffer
+
+        self.__buffer.clear()
 
     def add_draco_extension(self):
         """
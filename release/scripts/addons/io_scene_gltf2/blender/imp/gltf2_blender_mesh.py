@@ -435,14 +435,12 @@ def points_edges_tris(mode, indices):
         # 0---2---4
         #  \ / \ /
         #   1---3
-        # TODO: numpyify
-        def alternate(i, xs):
-            even = i % 2 == 0
-            return xs if even else (xs[0], xs[2], xs[1])
-        tris = np.array([
-            alternate(i, (indices[i], indices[i + 1], indices[i + 2]))
-            for i in range(0, len(indices) - 2)
-        ])
+        tris = np.empty((max(len(indices) - 2, 0), 3), dtype=indices.dtype)
+        tris[:, 0] = indices[:-2]
+        tris[:, 1] = indices[1:-1]
+        tris[:, 2] = indices[2:]
+        # Every other triangle has its winding flipped.
+        tris[1::2, 1:] = tris[1::2, 2:0:-1]
         tris = squish(tris)
 
     elif mode == 6:
@@ -450,11 +448,10 @@ def points_edges_tris(mode, indices):
         #   3---2
         #  / \ / \
         # 4---0---1
-        # TODO: numpyify
-        tris = np.array([
-            (indices[0], indices[i], indices[i + 1])
-            for i in range(1, len(indices) - 1)
-        ])
+        tris = np.empty((max(len(indices) - 2, 0), 3), dtype=indices.dtype)
+        tris[:, 0] = indices[0]
+        tris[:, 1] = indices[1:-1]
+        tris[:, 2] = indices[2:]
         tris = squish(tris)
 
     else:
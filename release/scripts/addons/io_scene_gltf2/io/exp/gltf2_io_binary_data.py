@@ -14,6 +14,7 @@
 
 import typing
 import array
+import hashlib
 from io_scene_gltf2.io.com import gltf2_io_constants
 
 
@@ -24,6 +25,7 @@ class BinaryData:
         if not isinstance(data, bytes):
             raise TypeError("Data is not a bytes array")
         self.data = data
+        self.__digest = None
 
     def __eq__(self, other):
         return self.data == other.data
@@ -31,6 +33,13 @@ class BinaryData:
     def __hash__(self):
         return hash(self.data)
 
+    @property
+    def digest(self):
+        """Content digest used to detect identical data, computed once on first access."""
+        if self.__digest is None:
+            self.__digest = hashlib.blake2b(self.data, digest_size=16).digest()
+        return self.__digest
+
     @classmethod
     def from_list(cls, lst: typing.List[typing.Any], gltf_component_type: gltf2_io_constants.ComponentType):
         format_char = gltf2_io_constants.ComponentType.to_type_code(gltf_component_type)
@@ -13,28 +13,53 @@
 # limitations under the License.
 
 import base64
+import shutil
+import tempfile
 
 from io_scene_gltf2.io.com import gltf2_io
 from io_scene_gltf2.io.exp import gltf2_io_binary_data
 
+# Buffers up to this size are kept in memory, larger ones are spilled to a temporary file.
+SPOOL_MAX_SIZE = 64 * 1024 * 1024
+# Size of the chunks used when streaming the buffer to its destination (multiple of 3 for base64).
+COPY_CHUNK_SIZE = 3 * 1024 * 1024
+
 
 class Buffer:
-    """Class representing binary data for use in a glTF file as 'buffer' property."""
+    """
+    Class representing binary data for use in a glTF file as 'buffer' property.
+
+    Binary data is content addressed: adding data that is already stored in the buffer
+    returns the existing buffer view instead of appending a copy.
+    The data is written to a spooled temporary file as it is added, so that large
+    buffers don't have to be held in memory until the file is written.
+    """
 
     def __init__(self, buffer_index=0):
-        self.__data = bytearray(b"")
+        self.__file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        self.__length = 0
         self.__buffer_index = buffer_index
+        self.__views = {}
+        self.__deduplicated_count = 0
+        self.__deduplicated_byte_length = 0
 
     def add_and_get_view(self, binary_data: gltf2_io_binary_data.BinaryData) -> gltf2_io.BufferView:
         """Add binary data to the buffer. Return a glTF BufferView."""
-        offset = len(self.__data)
-        self.__data.extend(binary_data.data)
-
         length = binary_data.byte_length
+        key = (length, binary_data.digest)
+        buffer_view = self.__views.get(key)
+        if buffer_view is not None:
+            self.__deduplicated_count += 1
+            self.__deduplicated_byte_length += length
+            return buffer_view
+
+        offset = self.__length
+        self.__file.write(binary_data.data)
 
         # offsets should be a multiple of 4 --> therefore add padding if necessary
         padding = (4 - (length % 4)) % 4
-        self.__data.extend(b"\x00" * padding)
+        self.__file.write(b"\x00" * padding)
+        self.__length += length + padding
 
         buffer_view = gltf2_io.BufferView(
             buffer=self.__buffer_index,
@@ -46,17 +71,44 @@ class Buffer:
             name=None,
             target=None
         )
+        self.__views[key] = buffer_view
         return buffer_view
 
     @property
     def byte_length(self):
-        return len(self.__data)
+        return self.__length
+
+    @property
+    def deduplicated_count(self):
+        """Number of binary data blocks that reused an existing buffer view."""
+        return self.__deduplicated_count
+
+    @property
+    def deduplicated_byte_length(self):
+        """Number of bytes not written to the buffer thanks to deduplication."""
+        return self.__deduplicated_byte_length
 
     def to_bytes(self):
-        return self.__data
+        self.__file.seek(0)
+        return self.__file.read(self.__length)
+
+    def write_to(self, file):
+        """Stream the buffer content to an open binary file."""
+        self.__file.seek(0)
+        shutil.copyfileobj(self.__file, file, COPY_CHUNK_SIZE)
 
     def to_embed_string(self):
-        return 'data:application/octet-stream;base64,' + base64.b64encode(self.__data).decode('ascii')
+        self.__file.seek(0)
+        chunks = ['data:application/octet-stream;base64,']
+        while True:
+            chunk = self.__file.read(COPY_CHUNK_SIZE)
+            if not chunk:
+                break
+            chunks.append(base64.b64encode(chunk).decode('ascii'))
+        return ''.join(chunks)
 
     def clear(self):
-        self.__data = b""
+        self.__file.close()
+        self.__file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        self.__length = 0
+        self.__views = {}
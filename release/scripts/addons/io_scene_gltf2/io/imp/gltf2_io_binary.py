@@ -74,15 +74,19 @@ class BinaryData():
 
     @staticmethod
     def decode_accessor(gltf, accessor_idx, cache=False):
-        """Decodes accessor to 2D numpy array (count x num_components)."""
+        """
+        Decodes accessor to 2D numpy array (count x num_components).
+
+        When possible the array is a read-only view over the (memory-mapped) buffer data, without any copy.
+        """
         if accessor_idx in gltf.decode_accessor_cache:
-            return gltf.accessor_cache[accessor_idx]
+            return gltf.decode_accessor_cache[accessor_idx]
 
         accessor = gltf.data.accessors[accessor_idx]
         array = BinaryData.decode_accessor_obj(gltf, accessor)
 
         if cache:
-            gltf.accessor_cache[accessor_idx] = array
+            gltf.decode_accessor_cache[accessor_idx] = array
             # Prevent accidentally modifying cached arrays
             array.flags.writeable = False
 
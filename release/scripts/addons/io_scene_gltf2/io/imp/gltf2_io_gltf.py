@@ -16,6 +16,7 @@ from ..com.gltf2_io import gltf_from_dict
 from ..com.gltf2_io_debug import Log
 import logging
 import json
+import mmap
 import struct
 import base64
 from os.path import dirname, join, isfile
@@ -139,8 +140,9 @@ class glTFImporter():
         if not isfile(self.filename):
             raise ImportError("Please select a file")
 
-        with open(self.filename, 'rb') as f:
-            content = memoryview(f.read())
+        content = glTFImporter.map_file(self.filename)
+        if not content:
+            raise ImportError("Bad glTF: empty file")
 
         if content[:4] == b'glTF':
             gltf, self.glb_buffer = self.load_glb(content)
@@ -173,6 +175,19 @@ class glTFImporter():
             if buffer_idx == 0 and self.glb_buffer is not None:
                 self.buffers[buffer_idx] = self.glb_buffer
 
+    @staticmethod
+    def map_file(path):
+        """
+        Memory-map a file, returns a read-only memoryview of its content.
+
+        Numpy arrays decoded from accessors are views on it, so the file is only paged in when data is used.
+        The mapping is released once nothing references it anymore.
+        """
+        with open(path, 'rb') as f:
+            if f.seek(0, 2) == 0:
+                return memoryview(b'')
+            return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
     def load_uri(self, uri):
         """Loads a URI."""
         sep = ';base64,'
@@ -184,8 +199,7 @@ class glTFImporter():
 
         path = join(dirname(self.filename), unquote(uri))
         try:
-            with open(path, 'rb') as f_:
-                return memoryview(f_.read())
+            return glTFImporter.map_file(path)
         except Exception:
             self.log.error("Couldn't read file: " + path)
             return None
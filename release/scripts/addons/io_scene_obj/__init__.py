@@ -21,7 +21,7 @@
 bl_info = {
     "name": "Wavefront OBJ format",
     "author": "Campbell Barton, Bastien Montagne",
-    "version": (3, 8, 1),
+    "version": (3, 9, 0),
     "blender": (2, 81, 6),
     "location": "File > Import-Export",
     "description": "Import-Export OBJ, Import OBJ mesh, UV's, materials and textures",
@@ -33,6 +33,8 @@ bl_info = {
 
 if "bpy" in locals():
     import importlib
+    if "obj_parse" in locals():
+        importlib.reload(obj_parse)
     if "import_obj" in locals():
         importlib.reload(import_obj)
     if "export_obj" in locals():
@@ -118,6 +120,13 @@ class ImportOBJ(bpy.types.Operator, ImportHelper):
             default=0.0,
             )
 
+    use_parallel_parse: BoolProperty(
+            name="Parallel Parsing",
+            description="Parse big files using several processes "
+                        "(files with multi-line statements or curves are still parsed in a single one)",
+            default=False,
+            )
+
     def execute(self, context):
         # print("Selected: " + context.active_object.name)
         from . import import_obj
@@ -233,6 +242,8 @@ class OBJ_PT_import_geometry(bpy.types.Panel):
         else:
             col.prop(operator, "use_groups_as_vgroups")
 
+        layout.prop(operator, "use_parallel_parse")
+
 
 @orientation_helper(axis_forward='-Z', axis_up='Y')
 class ExportOBJ(bpy.types.Operator, ExportHelper):
@@ -40,51 +40,13 @@ import mathutils
 from bpy_extras.io_utils import unpack_list
 from bpy_extras.image_utils import load_image
 from bpy_extras.wm_utils.progress_report import ProgressReport
-
-
-def line_value(line_split):
-    """
-    Returns 1 string representing the value for this line
-    None will be returned if there's only 1 word
-    """
-    length = len(line_split)
-    if length == 1:
-        return None
-
-    elif length == 2:
-        return line_split[1]
-
-    elif length > 2:
-        return b' '.join(line_split[1:])
-
-
-def filenames_group_by_ext(line, ext):
-    """
-    Splits material libraries supporting spaces, so:
-    b'foo bar.mtl baz spam.MTL' -> (b'foo bar.mtl', b'baz spam.MTL')
-    Also handle " chars (some software use those to protect filenames with spaces, see T67266... sic).
-    """
-    # Note that we assume that if there are some " in that line,
-    # then all filenames are properly enclosed within those...
-    start = line.find(b'"') + 1
-    if start != 0:
-        while start != 0:
-            end = line.find(b'"', start)
-            if end != -1:
-                yield line[start:end]
-                start = line.find(b'"', end + 1) + 1
-            else:
-                break
-        return
-
-    line_lower = line.lower()
-    i_prev = 0
-    while i_prev != -1 and i_prev < len(line):
-        i = line_lower.find(ext, i_prev)
-        if i != -1:
-            i += len(ext)
-        yield line[i_prev:i].strip()
-        i_prev = i
+from .obj_parse import (
+    filenames_group_by_ext,
+    line_value,
+    parse_chunk,
+    parse_chunk_ranges,
+    worker_init_args,
+)
 
 
 def obj_image_load(img_data, context_imagepath_map, line, DIR, recursive, relpath):
@@ -902,6 +864,172 @@ def any_number_as_int(svalue):
     return int(float(svalue))
 
 
+# Files smaller than this are always parsed in a single process, the pool overhead is not worth it.
+PARALLEL_PARSE_MIN_SIZE = 1 << 24
+
+
+def parse_chunks_parallel(filepath, use_comma, use_edges):
+    """
+    Parse the file in a pool of worker processes, returns the list of parsed chunks (see :func:`parse_chunk`),
+    or None when the regular parser has to be used.
+    """
+    import concurrent.futures
+    import pickle
+    import runpy
+
+    if os.path.getsize(filepath) < PARALLEL_PARSE_MIN_SIZE:
+        return None
+
+    ranges = parse_chunk_ranges(filepath, (os.cpu_count() or 1) * 4)
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+                initializer=runpy.run_path,
+                initargs=worker_init_args(),
+        ) as exctr:
+            futures = [exctr.submit(parse_chunk, filepath, start, end, use_comma, use_edges) for start, end in ranges]
+            parsed_chunks = [future.result() for future in futures]
+    except (concurrent.futures.process.BrokenProcessPool, OSError, pickle.PicklingError) as ex:
+        print("WARNING, parallel parsing failed, using the regular parser: %s" % ex)
+        return None
+
+    if None in parsed_chunks:
+        return None
+    return parsed_chunks
+
+
+def merge_parsed_chunks(parsed_chunks, verts_loc, verts_nor, verts_tex, faces, material_libs, vertex_groups,
+                        unique_materials, unique_smooth_groups, objects_names,
+                        use_smooth_groups, use_split_objects, use_split_groups, use_groups_as_vgroups):
+    """
+    Merge chunks parsed by :func:`parse_chunk` into the same data the regular parser generates,
+    returns whether the default material is used.
+    """
+    def unique_name(existing_names, name_orig):
+        i = 0
+        if name_orig is None:
+            name_orig = b"ObjObject"
+        name = name_orig
+        while name in existing_names:
+            name = b"%s.%03d" % (name_orig, i)
+            i += 1
+        existing_names.add(name)
+        return name
+
+    context = {
+        "material": None,
+        "smooth_group": None,
+        "object_key": None,
+        "object_obpart": None,
+        "vgroup": None,
+    }
+
+    def apply_event(line_start, value):
+        if line_start == b's':
+            if use_smooth_groups:
+                if value == b'off':
+                    value = None
+                elif value:  # is not None
+                    unique_smooth_groups[value] = None
+                context["smooth_group"] = value
+        elif line_start == b'o':
+            if use_split_objects:
+                context["object_key"] = context["object_obpart"] = unique_name(objects_names, value)
+        elif line_start == b'g':
+            if use_split_groups:
+                obpart = context["object_obpart"]
+                context["object_key"] = (obpart, value) if obpart else value
+            elif use_groups_as_vgroups:
+                if value and value != b'(null)':
+                    vertex_groups.setdefault(value, [])
+                else:
+                    value = None  # dont assign a vgroup
+                context["vgroup"] = value
+        elif line_start == b'usemtl':
+            context["material"] = value
+            unique_materials[value] = None
+
+    use_default_material = False
+
+    for (chunk_verts_loc, chunk_verts_nor, chunk_verts_tex,
+         loops_loc, loops_tex, loops_nor, loops_loc_rel, loops_tex_rel, loops_nor_rel,
+         faces_total, events, chunk_material_libs) in parsed_chunks:
+        # Make chunk-relative indices absolute.
+        for loops, loops_rel, offset in ((loops_loc, loops_loc_rel, len(verts_loc)),
+                                         (loops_tex, loops_tex_rel, len(verts_tex)),
+                                         (loops_nor, loops_nor_rel, len(verts_nor))):
+            for i in loops_rel:
+                loops[i] += offset
+
+        verts_loc.extend(zip(*(iter(chunk_verts_loc),) * 3))
+        verts_nor.extend(zip(*(iter(chunk_verts_nor),) * 3))
+        verts_tex.extend(zip(*(iter(chunk_verts_tex),) * 2))
+        material_libs |= chunk_material_libs
+
+        loops_loc = loops_loc.tolist()
+        loops_tex = loops_tex.tolist()
+        loops_nor = loops_nor.tolist()
+
+        # Sentinel event, applies nothing but flushes remaining events after the last face.
+        events.append((len(faces_total), None, None))
+        events_iter = iter(events)
+        event_face_idx, line_start, value = next(events_iter)
+
+        loop_start = 0
+        for face_idx, face_total in enumerate(faces_total):
+            while event_face_idx == face_idx:
+                apply_event(line_start, value)
+                event_face_idx, line_start, value = next(events_iter)
+
+            context_material = context["material"]
+            is_polyline = face_total < 0
+            if is_polyline:
+                face_total = -face_total
+            loop_end = loop_start + face_total
+            face_vert_loc_indices = loops_loc[loop_start:loop_end]
+            face_invalid_blenpoly = []
+
+            if is_polyline:
+                # Polylines are tagged by a single True item as face_vert_nor_indices, see regular parser.
+                face_vert_nor_indices = [True]
+                face_vert_tex_indices = []
+            else:
+                face_vert_nor_indices = loops_nor[loop_start:loop_end]
+                face_vert_tex_indices = loops_tex[loop_start:loop_end]
+                if use_groups_as_vgroups and context["vgroup"]:
+                    vertex_groups[context["vgroup"]].extend(face_vert_loc_indices)
+                # Same check as the regular parser does, if a same vertex is used more than once,
+                # the ngon may use a same edge more than once (blender-invalid).
+                if len(set(face_vert_loc_indices)) != face_total:
+                    face_items_usage = set()
+                    prev_vidx = face_vert_loc_indices[-1]
+                    for vidx in face_vert_loc_indices:
+                        edge_key = (prev_vidx, vidx) if (prev_vidx < vidx) else (vidx, prev_vidx)
+                        if edge_key in face_items_usage:
+                            face_invalid_blenpoly.append(True)
+                            break
+                        face_items_usage.add(edge_key)
+                        prev_vidx = vidx
+
+            faces.append((
+                face_vert_loc_indices,
+                face_vert_nor_indices,
+                face_vert_tex_indices,
+                context_material,
+                context["smooth_group"],
+                context["object_key"],
+                face_invalid_blenpoly,
+            ))
+            if context_material is None:
+                use_default_material = True
+            loop_start = loop_end
+
+        for event_face_idx, line_start, value in [(event_face_idx, line_start, value)] + list(events_iter):
+            if line_start is not None:
+                apply_event(line_start, value)
+
+    return use_default_material
+
+
 def load(context,
          filepath,
          *,
@@ -913,13 +1041,17 @@ def load(context,
          use_image_search=True,
          use_groups_as_vgroups=False,
          relpath=None,
-         global_matrix=None
+         global_matrix=None,
+         use_parallel_parse=False
          ):
     """
     Called by the user interface or another script.
     load_obj(path) - should give acceptable results.
     This function passes the file and sends the data off
         to be split into objects and then converted into mesh objects
+
+    use_parallel_parse parses big files in several worker processes,
+    falling back to the regular parser for files using features it does not handle.
     """
     def unique_name(existing_names, name_orig):
         i = 0
@@ -1016,231 +1148,242 @@ def load(context,
         skip_quick_vert = False
 
         progress.enter_substeps(3, "Parsing OBJ file...")
-        with open(filepath, 'rb') as f:
-            for line in f:
-                line_split = line.split()
-
-                if not line_split:
-                    continue
-
-                line_start = line_split[0]  # we compare with this a _lot_
-
-                if len(line_split) == 1 and not context_multi_line and line_start != b'end':
-                    print("WARNING, skipping malformatted line: %s" % line.decode('UTF-8', 'replace').rstrip())
-                    continue
-
-                # Handling vertex data are pretty similar, factorize that.
-                # Also, most OBJ files store all those on a single line, so try fast parsing for that first,
-                # and only fallback to full multi-line parsing when needed, this gives significant speed-up
-                # (~40% on affected code).
-                if line_start == b'v':
-                    vdata, vdata_len, do_quick_vert = verts_loc, 3, not skip_quick_vert
-                elif line_start == b'vn':
-                    vdata, vdata_len, do_quick_vert = verts_nor, 3, not skip_quick_vert
-                elif line_start == b'vt':
-                    vdata, vdata_len, do_quick_vert = verts_tex, 2, not skip_quick_vert
-                elif context_multi_line == b'v':
-                    vdata, vdata_len, do_quick_vert = verts_loc, 3, False
-                elif context_multi_line == b'vn':
-                    vdata, vdata_len, do_quick_vert = verts_nor, 3, False
-                elif context_multi_line == b'vt':
-                    vdata, vdata_len, do_quick_vert = verts_tex, 2, False
-                else:
-                    vdata_len = 0
-
-                if vdata_len:
-                    if do_quick_vert:
-                        try:
-                            vdata.append(list(map(float_func, line_split[1:vdata_len + 1])))
-                        except:
-                            do_quick_vert = False
-                            # In case we get too many failures on quick parsing, force fallback to full multi-line one.
-                            # Exception handling can become costly...
-                            quick_vert_failures += 1
-                            if quick_vert_failures > 10000:
-                                skip_quick_vert = True
-                    if not do_quick_vert:
-                        context_multi_line = handle_vec(line_start, context_multi_line, line_split,
-                                                        context_multi_line or line_start,
-                                                        vdata, vec, vdata_len)
-
-                elif line_start == b'f' or context_multi_line == b'f':
-                    if not context_multi_line:
-                        line_split = line_split[1:]
-                        # Instantiate a face
-                        face = create_face(context_material, context_smooth_group, context_object_key)
-                        (face_vert_loc_indices, face_vert_nor_indices, face_vert_tex_indices,
-                         _1, _2, _3, face_invalid_blenpoly) = face
-                        faces.append(face)
-                        face_items_usage.clear()
-                        verts_loc_len = len(verts_loc)
-                        verts_nor_len = len(verts_nor)
-                        verts_tex_len = len(verts_tex)
-                        if context_material is None:
-                            use_default_material = True
-                    # Else, use face_vert_loc_indices and face_vert_tex_indices previously defined and used the obj_face
-
-                    context_multi_line = b'f' if strip_slash(line_split) else b''
-
-                    for v in line_split:
-                        obj_vert = v.split(b'/')
-                        idx = int(obj_vert[0])  # Note that we assume here we cannot get OBJ invalid 0 index...
-                        vert_loc_index = (idx + verts_loc_len) if (idx < 1) else idx - 1
-                        # Add the vertex to the current group
-                        # *warning*, this wont work for files that have groups defined around verts
-                        if use_groups_as_vgroups and context_vgroup:
-                            vertex_groups[context_vgroup].append(vert_loc_index)
-                        # This a first round to quick-detect ngons that *may* use a same edge more than once.
-                        # Potential candidate will be re-checked once we have done parsing the whole face.
-                        if not face_invalid_blenpoly:
-                            # If we use more than once a same vertex, invalid ngon is suspected.
-                            if vert_loc_index in face_items_usage:
-                                face_invalid_blenpoly.append(True)
-                            else:
-                                face_items_usage.add(vert_loc_index)
-                        face_vert_loc_indices.append(vert_loc_index)
-
-                        # formatting for faces with normals and textures is
-                        # loc_index/tex_index/nor_index
-                        if len(obj_vert) > 1 and obj_vert[1] and obj_vert[1] != b'0':
-                            idx = int(obj_vert[1])
-                            face_vert_tex_indices.append((idx + verts_tex_len) if (idx < 1) else idx - 1)
-                        else:
-                            face_vert_tex_indices.append(0)
-
-                        if len(obj_vert) > 2 and obj_vert[2] and obj_vert[2] != b'0':
-                            idx = int(obj_vert[2])
-                            face_vert_nor_indices.append((idx + verts_nor_len) if (idx < 1) else idx - 1)
-                        else:
-                            face_vert_nor_indices.append(0)
-
-                    if not context_multi_line:
-                        # Means we have finished a face, we have to do final check if ngon is suspected to be blender-invalid...
-                        if face_invalid_blenpoly:
-                            face_invalid_blenpoly.clear()
+        parsed_chunks = None
+        if use_parallel_parse:
+            parsed_chunks = parse_chunks_parallel(filepath, float_func is not float, use_edges)
+
+        if parsed_chunks is not None:
+            use_default_material = merge_parsed_chunks(
+                parsed_chunks, verts_loc, verts_nor, verts_tex, faces, material_libs, vertex_groups,
+                unique_materials, unique_smooth_groups, objects_names,
+                use_smooth_groups, use_split_objects, use_split_groups, use_groups_as_vgroups)
+            del parsed_chunks
+        else:
+            with open(filepath, 'rb') as f:
+                for line in f:
+                    line_split = line.split()
+
+                    if not line_split:
+                        continue
+
+                    line_start = line_split[0]  # we compare with this a _lot_
+
+                    if len(line_split) == 1 and not context_multi_line and line_start != b'end':
+                        print("WARNING, skipping malformatted line: %s" % line.decode('UTF-8', 'replace').rstrip())
+                        continue
+
+                    # Handling vertex data are pretty similar, factorize that.
+                    # Also, most OBJ files store all those on a single line, so try fast parsing for that first,
+                    # and only fallback to full multi-line parsing when needed, this gives significant speed-up
+                    # (~40% on affected code).
+                    if line_start == b'v':
+                        vdata, vdata_len, do_quick_vert = verts_loc, 3, not skip_quick_vert
+                    elif line_start == b'vn':
+                        vdata, vdata_len, do_quick_vert = verts_nor, 3, not skip_quick_vert
+                    elif line_start == b'vt':
+                        vdata, vdata_len, do_quick_vert = verts_tex, 2, not skip_quick_vert
+                    elif context_multi_line == b'v':
+                        vdata, vdata_len, do_quick_vert = verts_loc, 3, False
+                    elif context_multi_line == b'vn':
+                        vdata, vdata_len, do_quick_vert = verts_nor, 3, False
+                    elif context_multi_line == b'vt':
+                        vdata, vdata_len, do_quick_vert = verts_tex, 2, False
+                    else:
+                        vdata_len = 0
+
+                    if vdata_len:
+                        if do_quick_vert:
+                            try:
+                                vdata.append(list(map(float_func, line_split[1:vdata_len + 1])))
+                            except:
+                                do_quick_vert = False
+                                # In case we get too many failures on quick parsing, force fallback to full multi-line one.
+                                # Exception handling can become costly...
+                                quick_vert_failures += 1
+                                if quick_vert_failures > 10000:
+                                    skip_quick_vert = True
+                        if not do_quick_vert:
+                            context_multi_line = handle_vec(line_start, context_multi_line, line_split,
+                                                            context_multi_line or line_start,
+                                                            vdata, vec, vdata_len)
+
+                    elif line_start == b'f' or context_multi_line == b'f':
+                        if not context_multi_line:
+                            line_split = line_split[1:]
+                            # Instantiate a face
+                            face = create_face(context_material, context_smooth_group, context_object_key)
+                            (face_vert_loc_indices, face_vert_nor_indices, face_vert_tex_indices,
+                             _1, _2, _3, face_invalid_blenpoly) = face
+                            faces.append(face)
                             face_items_usage.clear()
-                            prev_vidx = face_vert_loc_indices[-1]
-                            for vidx in face_vert_loc_indices:
-                                edge_key = (prev_vidx, vidx) if (prev_vidx < vidx) else (vidx, prev_vidx)
-                                if edge_key in face_items_usage:
+                            verts_loc_len = len(verts_loc)
+                            verts_nor_len = len(verts_nor)
+                            verts_tex_len = len(verts_tex)
+                            if context_material is None:
+                                use_default_material = True
+                        # Else, use face_vert_loc_indices and face_vert_tex_indices previously defined and used the obj_face
+
+                        context_multi_line = b'f' if strip_slash(line_split) else b''
+
+                        for v in line_split:
+                            obj_vert = v.split(b'/')
+                            idx = int(obj_vert[0])  # Note that we assume here we cannot get OBJ invalid 0 index...
+                            vert_loc_index = (idx + verts_loc_len) if (idx < 1) else idx - 1
+                            # Add the vertex to the current group
+                            # *warning*, this wont work for files that have groups defined around verts
+                            if use_groups_as_vgroups and context_vgroup:
+                                vertex_groups[context_vgroup].append(vert_loc_index)
+                            # This a first round to quick-detect ngons that *may* use a same edge more than once.
+                            # Potential candidate will be re-checked once we have done parsing the whole face.
+                            if not face_invalid_blenpoly:
+                                # If we use more than once a same vertex, invalid ngon is suspected.
+                                if vert_loc_index in face_items_usage:
                                     face_invalid_blenpoly.append(True)
-                                    break
-                                face_items_usage.add(edge_key)
-                                prev_vidx = vidx
+                                else:
+                                    face_items_usage.add(vert_loc_index)
+                            face_vert_loc_indices.append(vert_loc_index)
+
+                            # formatting for faces with normals and textures is
+                            # loc_index/tex_index/nor_index
+                            if len(obj_vert) > 1 and obj_vert[1] and obj_vert[1] != b'0':
+                                idx = int(obj_vert[1])
+                                face_vert_tex_indices.append((idx + verts_tex_len) if (idx < 1) else idx - 1)
+                            else:
+                                face_vert_tex_indices.append(0)
 
-                elif use_edges and (line_start == b'l' or context_multi_line == b'l'):
-                    # very similar to the face load function above with some parts removed
-                    if not context_multi_line:
-                        line_split = line_split[1:]
-                        # Instantiate a face
-                        face = create_face(context_material, context_smooth_group, context_object_key)
-                        face_vert_loc_indices = face[0]
-                        # XXX A bit hackish, we use special 'value' of face_vert_nor_indices (a single True item) to tag this
-                        #     as a polyline, and not a regular face...
-                        face[1][:] = [True]
-                        faces.append(face)
-                        if context_material is None:
-                            use_default_material = True
-                    # Else, use face_vert_loc_indices previously defined and used the obj_face
-
-                    context_multi_line = b'l' if strip_slash(line_split) else b''
-
-                    for v in line_split:
-                        obj_vert = v.split(b'/')
-                        idx = int(obj_vert[0]) - 1
-                        face_vert_loc_indices.append((idx + len(verts_loc) + 1) if (idx < 0) else idx)
-
-                elif line_start == b's':
-                    if use_smooth_groups:
-                        context_smooth_group = line_value(line_split)
-                        if context_smooth_group == b'off':
-                            context_smooth_group = None
-                        elif context_smooth_group:  # is not None
-                            unique_smooth_groups[context_smooth_group] = None
-
-                elif line_start == b'o':
-                    if use_split_objects:
-                        context_object_key = unique_name(objects_names, line_value(line_split))
-                        context_object_obpart = context_object_key
-                        # unique_objects[context_object_key]= None
-
-                elif line_start == b'g':
-                    if use_split_groups:
-                        grppart = line_value(line_split)
-                        context_object_key = (context_object_obpart, grppart) if context_object_obpart else grppart
-                        # print 'context_object_key', context_object_key
-                        # unique_objects[context_object_key]= None
-                    elif use_groups_as_vgroups:
-                        context_vgroup = line_value(line.split())
-                        if context_vgroup and context_vgroup != b'(null)':
-                            vertex_groups.setdefault(context_vgroup, [])
+                            if len(obj_vert) > 2 and obj_vert[2] and obj_vert[2] != b'0':
+                                idx = int(obj_vert[2])
+                                face_vert_nor_indices.append((idx + verts_nor_len) if (idx < 1) else idx - 1)
+                            else:
+                                face_vert_nor_indices.append(0)
+
+                        if not context_multi_line:
+                            # Means we have finished a face, we have to do final check if ngon is suspected to be blender-invalid...
+                            if face_invalid_blenpoly:
+                                face_invalid_blenpoly.clear()
+                                face_items_usage.clear()
+                                prev_vidx = face_vert_loc_indices[-1]
+                                for vidx in face_vert_loc_indices:
+                                    edge_key = (prev_vidx, vidx) if (prev_vidx < vidx) else (vidx, prev_vidx)
+                                    if edge_key in face_items_usage:
+                                        face_invalid_blenpoly.append(True)
+                                        break
+                                    face_items_usage.add(edge_key)
+                                    prev_vidx = vidx
+
+                    elif use_edges and (line_start == b'l' or context_multi_line == b'l'):
+                        # very similar to the face load function above with some parts removed
+                        if not context_multi_line:
+                            line_split = line_split[1:]
+                            # Instantiate a face
+                            face = create_face(context_material, context_smooth_group, context_object_key)
+                            face_vert_loc_indices = face[0]
+                            # XXX A bit hackish, we use special 'value' of face_vert_nor_indices (a single True item) to tag this
+                            #     as a polyline, and not a regular face...
+                            face[1][:] = [True]
+                            faces.append(face)
+                            if context_material is None:
+                                use_default_material = True
+                        # Else, use face_vert_loc_indices previously defined and used the obj_face
+
+                        context_multi_line = b'l' if strip_slash(line_split) else b''
+
+                        for v in line_split:
+                            obj_vert = v.split(b'/')
+                            idx = int(obj_vert[0]) - 1
+                            face_vert_loc_indices.append((idx + len(verts_loc) + 1) if (idx < 0) else idx)
+
+                    elif line_start == b's':
+                        if use_smooth_groups:
+                            context_smooth_group = line_value(line_split)
+                            if context_smooth_group == b'off':
+                                context_smooth_group = None
+                            elif context_smooth_group:  # is not None
+                                unique_smooth_groups[context_smooth_group] = None
+
+                    elif line_start == b'o':
+                        if use_split_objects:
+                            context_object_key = unique_name(objects_names, line_value(line_split))
+                            context_object_obpart = context_object_key
+                            # unique_objects[context_object_key]= None
+
+                    elif line_start == b'g':
+                        if use_split_groups:
+                            grppart = line_value(line_split)
+                            context_object_key = (context_object_obpart, grppart) if context_object_obpart else grppart
+                            # print 'context_object_key', context_object_key
+                            # unique_objects[context_object_key]= None
+                        elif use_groups_as_vgroups:
+                            context_vgroup = line_value(line.split())
+                            if context_vgroup and context_vgroup != b'(null)':
+                                vertex_groups.setdefault(context_vgroup, [])
+                            else:
+                                context_vgroup = None  # dont assign a vgroup
+
+                    elif line_start == b'usemtl':
+                        context_material = line_value(line.split())
+                        unique_materials[context_material] = None
+                    elif line_start == b'mtllib':  # usemap or usemat
+                        # can have multiple mtllib filenames per line, mtllib can appear more than once,
+                        # so make sure only occurrence of material exists
+                        material_libs |= {os.fsdecode(f) for f in filenames_group_by_ext(line.lstrip()[7:].strip(), b'.mtl')
+                        }
+
+                        # Nurbs support
+                    elif line_start == b'cstype':
+                        context_nurbs[b'cstype'] = line_value(line.split())  # 'rat bspline' / 'bspline'
+                    elif line_start == b'curv' or context_multi_line == b'curv':
+                        curv_idx = context_nurbs[b'curv_idx'] = context_nurbs.get(b'curv_idx', [])  # in case were multiline
+
+                        if not context_multi_line:
+                            context_nurbs[b'curv_range'] = float_func(line_split[1]), float_func(line_split[2])
+                            line_split[0:3] = []  # remove first 3 items
+
+                        if strip_slash(line_split):
+                            context_multi_line = b'curv'
                         else:
-                            context_vgroup = None  # dont assign a vgroup
-
-                elif line_start == b'usemtl':
-                    context_material = line_value(line.split())
-                    unique_materials[context_material] = None
-                elif line_start == b'mtllib':  # usemap or usemat
-                    # can have multiple mtllib filenames per line, mtllib can appear more than once,
-                    # so make sure only occurrence of material exists
-                    material_libs |= {os.fsdecode(f) for f in filenames_group_by_ext(line.lstrip()[7:].strip(), b'.mtl')
-                    }
-
-                    # Nurbs support
-                elif line_start == b'cstype':
-                    context_nurbs[b'cstype'] = line_value(line.split())  # 'rat bspline' / 'bspline'
-                elif line_start == b'curv' or context_multi_line == b'curv':
-                    curv_idx = context_nurbs[b'curv_idx'] = context_nurbs.get(b'curv_idx', [])  # in case were multiline
-
-                    if not context_multi_line:
-                        context_nurbs[b'curv_range'] = float_func(line_split[1]), float_func(line_split[2])
-                        line_split[0:3] = []  # remove first 3 items
-
-                    if strip_slash(line_split):
-                        context_multi_line = b'curv'
-                    else:
-                        context_multi_line = b''
+                            context_multi_line = b''
 
-                    for i in line_split:
-                        vert_loc_index = int(i) - 1
+                        for i in line_split:
+                            vert_loc_index = int(i) - 1
 
-                        if vert_loc_index < 0:
-                            vert_loc_index = len(verts_loc) + vert_loc_index + 1
+                            if vert_loc_index < 0:
+                                vert_loc_index = len(verts_loc) + vert_loc_index + 1
 
-                        curv_idx.append(vert_loc_index)
+                            curv_idx.append(vert_loc_index)
 
-                elif line_start == b'parm' or context_multi_line == b'parm':
-                    if context_multi_line:
-                        context_multi_line = b''
-                    else:
-                        context_parm = line_split[1]
-                        line_split[0:2] = []  # remove first 2
+                    elif line_start == b'parm' or context_multi_line == b'parm':
+                        if context_multi_line:
+                            context_multi_line = b''
+                        else:
+                            context_parm = line_split[1]
+                            line_split[0:2] = []  # remove first 2
 
-                    if strip_slash(line_split):
-                        context_multi_line = b'parm'
-                    else:
-                        context_multi_line = b''
-
-                    if context_parm.lower() == b'u':
-                        context_nurbs.setdefault(b'parm_u', []).extend([float_func(f) for f in line_split])
-                    elif context_parm.lower() == b'v':  # surfaces not supported yet
-                        context_nurbs.setdefault(b'parm_v', []).extend([float_func(f) for f in line_split])
-                    # else: # may want to support other parm's ?
-
-                elif line_start == b'deg':
-                    context_nurbs[b'deg'] = [int(i) for i in line.split()[1:]]
-                elif line_start == b'end':
-                    # Add the nurbs curve
-                    if context_object_key:
-                        context_nurbs[b'name'] = context_object_key
-                    nurbs.append(context_nurbs)
-                    context_nurbs = {}
-                    context_parm = b''
-
-                ''' # How to use usemap? deprecated?
-                elif line_start == b'usema': # usemap or usemat
-                    context_image= line_value(line_split)
-                '''
+                        if strip_slash(line_split):
+                            context_multi_line = b'parm'
+                        else:
+                            context_multi_line = b''
+
+                        if context_parm.lower() == b'u':
+                            context_nurbs.setdefault(b'parm_u', []).extend([float_func(f) for f in line_split])
+                        elif context_parm.lower() == b'v':  # surfaces not supported yet
+                            context_nurbs.setdefault(b'parm_v', []).extend([float_func(f) for f in line_split])
+                        # else: # may want to support other parm's ?
+
+                    elif line_start == b'deg':
+                        context_nurbs[b'deg'] = [int(i) for i in line.split()[1:]]
+                    elif line_start == b'end':
+                        # Add the nurbs curve
+                        if context_object_key:
+                            context_nurbs[b'name'] = context_object_key
+                        nurbs.append(context_nurbs)
+                        context_nurbs = {}
+                        context_parm = b''
+
+                    ''' # How to use usemap? deprecated?
+                    elif line_start == b'usema': # usemap or usemat
+                        context_image= line_value(line_split)
+                    '''
 
         progress.step("Done, loading materials and images...")
 
@@ -0,0 +1,223 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+"""
+Wavefront OBJ parsing functions used by the OBJ importer.
+
+This module doesn't import bpy, so the file can be parsed by worker processes
+which only have the Python standard library.
+"""
+
+import array
+import os
+
+WORKER_INIT_NAME = "__obj_parse_worker_init__"
+
+
+def worker_init_args():
+    """
+    Returns the arguments for :func:`runpy.run_path`, used as initializer of the worker processes:
+    it runs this file so the package gets registered before its functions are unpickled (see below).
+    """
+    return __file__, {"PACKAGE": __package__}, WORKER_INIT_NAME
+
+
+if __name__ == WORKER_INIT_NAME:
+    # Worker processes import the parsing functions from this package, register the package
+    # without running its '__init__', which needs bpy. Processes forked from Blender already have it.
+    import sys
+    import types
+
+    package = types.ModuleType(PACKAGE)
+    package.__path__ = [os.path.dirname(__file__)]
+    sys.modules.setdefault(PACKAGE, package)
+
+
+def line_value(line_split):
+    """
+    Returns 1 string representing the value for this line
+    None will be returned if there's only 1 word
+    """
+    length = len(line_split)
+    if length == 1:
+        return None
+
+    elif length == 2:
+        return line_split[1]
+
+    elif length > 2:
+        return b' '.join(line_split[1:])
+
+
+def filenames_group_by_ext(line, ext):
+    """
+    Splits material libraries supporting spaces, so:
+    b'foo bar.mtl baz spam.MTL' -> (b'foo bar.mtl', b'baz spam.MTL')
+    Also handle " chars (some software use those to protect filenames with spaces, see T67266... sic).
+    """
+    # Note that we assume that if there are some " in that line,
+    # then all filenames are properly enclosed within those...
+    start = line.find(b'"') + 1
+    if start != 0:
+        while start != 0:
+            end = line.find(b'"', start)
+            if end != -1:
+                yield line[start:end]
+                start = line.find(b'"', end + 1) + 1
+            else:
+                break
+        return
+
+    line_lower = line.lower()
+    i_prev = 0
+    while i_prev != -1 and i_prev < len(line):
+        i = line_lower.find(ext, i_prev)
+        if i != -1:
+            i += len(ext)
+        yield line[i_prev:i].strip()
+        i_prev = i
+
+
+def parse_chunk_ranges(filepath, chunks_num):
+    """
+    Split the file in (start, end) byte ranges, each one starting at the beginning of a line.
+    """
+    size = os.path.getsize(filepath)
+    starts = [0]
+    with open(filepath, 'rb') as f:
+        for i in range(1, chunks_num):
+            f.seek(max(size * i // chunks_num, starts[-1]))
+            f.readline()  # Skip to the start of next line.
+            if f.tell() >= size:
+                break
+            if f.tell() > starts[-1]:
+                starts.append(f.tell())
+    return list(zip(starts, starts[1:] + [size]))
+
+
+def parse_chunk(filepath, start, end, use_comma, use_edges):
+    """
+    Parse a chunk of an OBJ file into compact arrays (run in worker processes).
+
+    Returns None if the chunk uses things only handled by the regular parser
+    (multi-line statements, nurbs, malformed values...).
+
+    Vertex indices are absolute, except the relative (negative) ones, which may refer to vertices
+    defined in previous chunks: those are stored relative to the chunk's first vertex
+    and listed in the '*_rel' arrays, to be offset once all chunks are parsed.
+    State changes (materials, smooth groups, objects, groups) are stored as events,
+    tagged with the number of faces defined before them.
+    """
+    if use_comma:
+        def float_func(f):
+            return float(f.replace(b',', b'.'))
+    else:
+        float_func = float
+
+    verts_loc = array.array('d')
+    verts_nor = array.array('d')
+    verts_tex = array.array('d')
+    # Per face loop data.
+    loops_loc = array.array('q')
+    loops_tex = array.array('q')
+    loops_nor = array.array('q')
+    loops_loc_rel = array.array('q')
+    loops_tex_rel = array.array('q')
+    loops_nor_rel = array.array('q')
+    # Per face amount of loops, negative for polylines.
+    faces_total = array.array('q')
+    events = []
+    material_libs = set()
+
+    def add_loop_index(loops, loops_rel, idx, verts_len):
+        if idx < 1:
+            loops_rel.append(len(loops))
+            loops.append(idx + verts_len)
+        else:
+            loops.append(idx - 1)
+
+    with open(filepath, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    for line in data.splitlines():
+        line_split = line.split()
+
+        if not line_split:
+            continue
+
+        line_start = line_split[0]
+
+        if line_split[-1][-1] == 92:  # '\' char, multi-line statement.
+            return None
+
+        if len(line_split) == 1 and line_start != b'end':
+            print("WARNING, skipping malformatted line: %s" % line.decode('UTF-8', 'replace').rstrip())
+            continue
+
+        try:
+            if line_start == b'v':
+                verts_loc.extend(map(float_func, (line_split[1:4] + [b'0', b'0'])[:3]))
+            elif line_start == b'vn':
+                verts_nor.extend(map(float_func, (line_split[1:4] + [b'0', b'0'])[:3]))
+            elif line_start == b'vt':
+                verts_tex.extend(map(float_func, (line_split[1:3] + [b'0'])[:2]))
+
+            elif line_start == b'f':
+                verts_loc_len = len(verts_loc) // 3
+                verts_nor_len = len(verts_nor) // 3
+                verts_tex_len = len(verts_tex) // 2
+                faces_total.append(len(line_split) - 1)
+                for v in line_split[1:]:
+                    obj_vert = v.split(b'/')
+                    add_loop_index(loops_loc, loops_loc_rel, int(obj_vert[0]), verts_loc_len)
+
+                    if len(obj_vert) > 1 and obj_vert[1] and obj_vert[1] != b'0':
+                        add_loop_index(loops_tex, loops_tex_rel, int(obj_vert[1]), verts_tex_len)
+                    else:
+                        loops_tex.append(0)
+
+                    if len(obj_vert) > 2 and obj_vert[2] and obj_vert[2] != b'0':
+                        add_loop_index(loops_nor, loops_nor_rel, int(obj_vert[2]), verts_nor_len)
+                    else:
+                        loops_nor.append(0)
+
+            elif line_start == b'l':
+                if use_edges:
+                    verts_loc_len = len(verts_loc) // 3
+                    faces_total.append(1 - len(line_split))
+                    for v in line_split[1:]:
+                        add_loop_index(loops_loc, loops_loc_rel, int(v.split(b'/')[0]), verts_loc_len)
+                        loops_tex.append(0)
+                        loops_nor.append(0)
+
+            elif line_start in {b's', b'o', b'g', b'usemtl'}:
+                events.append((len(faces_total), line_start, line_value(line_split)))
+            elif line_start == b'mtllib':
+                material_libs |= {os.fsdecode(f) for f in filenames_group_by_ext(line.lstrip()[7:].strip(), b'.mtl')}
+            elif line_start in {b'cstype', b'curv', b'parm', b'deg', b'end'}:
+                # Nurbs, leave them to the regular parser.
+                return None
+        except ValueError:
+            return None
+
+    return (verts_loc, verts_nor, verts_tex,
+            loops_loc, loops_tex, loops_nor, loops_loc_rel, loops_tex_rel, loops_nor_rel,
+            faces_total, events, material_libs)
@@ -21,7 +21,7 @@
 bl_info = {
     "name": "Web3D X3D/VRML2 format",
     "author": "Campbell Barton, Bart, Bastien Montagne, Seva Alekseyev",
-    "version": (2, 2, 5),
+    "version": (2, 2, 6),
     "blender": (2, 81, 6),
     "location": "File > Import-Export",
     "description": "Import-Export X3D, Import VRML2",
@@ -22,8 +22,10 @@ DEBUG = False
 
 # This should work without a blender at all
 import os
+import re
 import shlex
 import math
+import xml.etree.ElementTree as ET
 from math import sin, cos, pi
 from itertools import chain
 
@@ -102,6 +104,21 @@ def vrml_split_fields(value):
     return field_list
 
 
+# Matches the start of a word that can be a key for vrml_split_fields
+re_field_key = re.compile(r'(?:^|\s)[^\W\d_]')
+
+
+def vrml_split_line_fields(line):
+    """
+    vrml_split_fields for a line, lines of numbers (arrays) are a single field.
+    """
+    if re_field_key.search(line) is None:
+        words = line.split()
+        return [words] if words else []
+
+    return vrml_split_fields(line.split())
+
+
 def vrmlFormat(data):
     """
     Keep this as a valid vrml file, but format in a way we can predict.
@@ -146,28 +163,12 @@ def vrmlFormat(data):
         # We need this so we can detect URL's
         data = '\n'.join([' '.join(l.split()) for l in data.split('\n')])  # remove all whitespace
 
-        string_ls = []
-
-        #search = 'url "'
-        search = '"'
-
-        ok = True
-        last_i = 0
-        while ok:
-            ok = False
-            i = data.find(search, last_i)
-            if i != -1:
-
-                start = i + len(search)  # first char after end of search
-                end = data.find('"', start)
-                if end != -1:
-                    item = data[start:end]
-                    string_ls.append(item)
-                    data = data[:start] + data[end:]
-                    ok = True  # keep looking
-
-                    last_i = (end - len(item)) + 1
-                    # print(last_i, item, '|' + data[last_i] + '|')
+        # Every other quote opens a string, an unclosed last quote is kept as is.
+        parts = data.split('"')
+        string_ls = parts[1:len(parts) - 1:2]
+        parts[1:len(parts) - 1:2] = [''] * len(string_ls)
+        data = '"'.join(parts)
+        del parts
 
     # done with messy extracting strings part
 
@@ -184,28 +185,15 @@ def vrmlFormat(data):
 
     # We need to write one property (field) per line only, otherwise we fail later to detect correctly new nodes.
     # See T45195 for details.
-    data = '\n'.join([' '.join(value) for l in data.split('\n') for value in vrml_split_fields(l.split())])
+    data = '\n'.join([' '.join(value) for l in data.split('\n') for value in vrml_split_line_fields(l)])
 
     if EXTRACT_STRINGS:
         # add strings back in
 
-        search = '"'  # fill in these empty strings
-
-        ok = True
-        last_i = 0
-        while ok:
-            ok = False
-            i = data.find(search + '"', last_i)
-            # print(i)
-            if i != -1:
-                start = i + len(search)  # first char after end of search
-                item = string_ls.pop(0)
-                # print(item)
-                data = data[:start] + item + data[start:]
-
-                last_i = start + len(item) + 1
-
-                ok = True
+        # fill in the empty strings, in order
+        string_iter = iter(string_ls)
+        data = re.sub('""', lambda m: '"' + next(string_iter, '') + '"', data)
+        del string_iter
 
     # More annoying obscure cases where USE or DEF are placed on a newline
     # data = data.replace('\nDEF ', ' DEF ')
@@ -321,6 +309,24 @@ def is_nodeline(i, words):
     return node_type, new_i
 
 
+def int_base0(value):
+    return int(value, 0)
+
+
+def array_as_number(array_string, int_type):
+    """
+    Convert a list of strings to all ints, or else all floats.
+    Return None if they are not numbers.
+    """
+    for num_type in (int_type, float):
+        try:
+            return list(map(num_type, array_string))
+        except ValueError:
+            pass
+
+    return None
+
+
 def is_numline(i):
     """
     Does this line start with a number?
@@ -793,18 +799,6 @@ class vrmlNode(object):
         For this parser arrays are children
         """
 
-        def array_as_number(array_string):
-            array_data = []
-            try:
-                array_data = [int(val, 0) for val in array_string]
-            except:
-                try:
-                    array_data = [float(val) for val in array_string]
-                except:
-                    print('\tWarning, could not parse array data from field')
-
-            return array_data
-
         self_real = self.getRealNode()  # in case we're an instance
 
         child_array = self_real.getFieldName(field, ancestry, True, SPLIT_COMMAS=True)
@@ -819,11 +813,17 @@ class vrmlNode(object):
             if not data_split:
                 return []
 
-            array_data = array_as_number(data_split)
+            array_data = array_as_number(data_split, int_base0)
+            if array_data is None:
+                print('\tWarning, could not parse array data from field')
+                array_data = []
 
         elif type(child_array) == list:
             # x3d creates these
-            array_data = array_as_number(child_array)
+            array_data = array_as_number(child_array, int_base0)
+            if array_data is None:
+                print('\tWarning, could not parse array data from field')
+                array_data = []
         else:
             # print(child_array)
             # Normal vrml
@@ -859,14 +859,9 @@ class vrmlNode(object):
         if group == 0:
             return flat_array
 
-        new_array = []
-        sub_array = []
-
-        for item in flat_array:
-            sub_array.append(item)
-            if len(sub_array) == group:
-                new_array.append(sub_array)
-                sub_array = []
+        aligned_len = len(flat_array) - len(flat_array) % group
+        new_array = [flat_array[i:i + group] for i in range(0, aligned_len, group)]
+        sub_array = flat_array[aligned_len:]
 
         if sub_array:
             print('\twarning, array was not aligned to requested grouping', group, 'remaining value', sub_array)
@@ -1180,6 +1175,17 @@ class vrmlNode(object):
                 i = child.parse(i)
 
             elif is_numline(i):
+                # Arrays spread over many lines, convert all the number lines at once
+                i_end = i + 1
+                while i_end < len(lines) and not lines[i_end][:1].isalpha() and is_numline(i_end):
+                    i_end += 1
+
+                values = array_as_number(' '.join(lines[i:i_end]).replace(',', ' ').split(), int)
+                if values is not None:
+                    self.array_data.extend(values)
+                    i = i_end
+                    continue
+
                 l_split = l.split(',')
 
                 values = None
@@ -1267,7 +1273,7 @@ def gzipOpen(path):
 
     if data is None:
         try:
-            filehandle = open(path, 'rU', encoding='utf-8', errors='surrogateescape')
+            filehandle = open(path, 'r', encoding='utf-8', errors='surrogateescape')
             data = filehandle.read()
             filehandle.close()
         except:
@@ -1337,31 +1343,27 @@ class x3dNode(vrmlNode):
         self.x3dNode = x3dNode
 
     def parse(self, IS_PROTO_DATA=False):
-        # print(self.x3dNode.tagName)
-        self.lineno = self.x3dNode.parse_position[0]
-
-        define = self.x3dNode.getAttributeNode('DEF')
-        if define:
-            self.getDefDict()[define.value] = self
+        # print(self.x3dNode.tag)
+        define = self.x3dNode.get('DEF')
+        if define is not None:
+            self.getDefDict()[define] = self
         else:
-            use = self.x3dNode.getAttributeNode('USE')
-            if use:
+            use = self.x3dNode.get('USE')
+            if use is not None:
                 try:
-                    self.reference = self.getDefDict()[use.value]
+                    self.reference = self.getDefDict()[use]
                     self.node_type = NODE_REFERENCE
                 except:
-                    print('\tWarning: reference', use.value, 'not found')
+                    print('\tWarning: reference', use, 'not found')
                     self.parent.children.remove(self)
 
                 return
 
-        for x3dChildNode in self.x3dNode.childNodes:
-            if x3dChildNode.nodeType in {x3dChildNode.TEXT_NODE, x3dChildNode.COMMENT_NODE, x3dChildNode.CDATA_SECTION_NODE}:
-                continue
-
+        # Only elements, comments are left out by the parser
+        for x3dChildNode in self.x3dNode:
             node_type = NODE_NORMAL
             # print(x3dChildNode, dir(x3dChildNode))
-            if x3dChildNode.getAttributeNode('USE'):
+            if x3dChildNode.get('USE') is not None:
                 node_type = NODE_REFERENCE
 
             child = x3dNode(self, node_type, x3dChildNode)
@@ -1370,16 +1372,16 @@ class x3dNode(vrmlNode):
         # TODO - x3d Inline
 
     def getSpec(self):
-        return self.x3dNode.tagName  # should match vrml spec
+        return self.x3dNode.tag  # should match vrml spec
 
     # Used to retain object identifiers from X3D to Blender
     def getDefName(self):
-        node_id = self.x3dNode.getAttributeNode('DEF')
-        if node_id:
-            return node_id.value
-        node_id = self.x3dNode.getAttributeNode('USE')
-        if node_id:
-            return "USE_" + node_id.value
+        node_id = self.x3dNode.get('DEF')
+        if node_id is not None:
+            return node_id
+        node_id = self.x3dNode.get('USE')
+        if node_id is not None:
+            return "USE_" + node_id
         return None
 
     # Other funcs operate from vrml, but this means we can wrap XML fields, still use nice utility funcs
@@ -1388,10 +1390,8 @@ class x3dNode(vrmlNode):
         # ancestry and AS_CHILD are ignored, only used for VRML now
 
         self_real = self.getRealNode()  # in case we're an instance
-        field_xml = self.x3dNode.getAttributeNode(field)
-        if field_xml:
-            value = field_xml.value
-
+        value = self.x3dNode.get(field)
+        if value is not None:
             # We may want to edit. for x3d specific stuff
             # Sucks a bit to return the field name in the list but vrml excepts this :/
             if SPLIT_COMMAS:
@@ -1401,10 +1401,11 @@ class x3dNode(vrmlNode):
             return None
 
     def canHaveReferences(self):
-        return self.x3dNode.getAttributeNode('DEF')
+        return self.x3dNode.get('DEF') is not None
 
     def desc(self):
-        return self.getRealNode().x3dNode.toxml()
+        # Tails were cleared when parsing, so this is the element and its children only
+        return ET.tostring(self.getRealNode().x3dNode, encoding='unicode')
 
 
 def x3d_parse(path):
@@ -1412,43 +1413,24 @@ def x3d_parse(path):
     Sets up the root node and returns it so load_web3d() can deal with the blender side of things.
     Return root (x3dNode, '') or (None, 'Error String')
     """
-    import xml.dom.minidom
-    import xml.sax
-    from xml.sax import handler
-
-    '''
-    try:    doc = xml.dom.minidom.parse(path)
-    except: return None, 'Could not parse this X3D file, XML error'
-    '''
-
     # Could add a try/except here, but a console error is more useful.
     data = gzipOpen(path)
 
     if data is None:
         return None, 'Failed to open file: ' + path
 
-    # Enable line number reporting in the parser - kinda brittle
-    def set_content_handler(dom_handler):
-        def startElementNS(name, tagName, attrs):
-            orig_start_cb(name, tagName, attrs)
-            cur_elem = dom_handler.elementStack[-1]
-            cur_elem.parse_position = (parser._parser.CurrentLineNumber, parser._parser.CurrentColumnNumber)
-
-        orig_start_cb = dom_handler.startElementNS
-        dom_handler.startElementNS = startElementNS
-        orig_set_content_handler(dom_handler)
+    # ElementTree doesn't load external entities
+    doc = ET.fromstring(data)
 
-    parser = xml.sax.make_parser()
-    orig_set_content_handler = parser.setContentHandler
-    parser.setFeature(handler.feature_external_ges, False)
-    parser.setFeature(handler.feature_external_pes, False)
-    parser.setContentHandler = set_content_handler
+    for elem in doc.iter():
+        # Tags should match the vrml spec, without namespaces
+        if elem.tag[0] == '{':
+            elem.tag = elem.tag.rpartition('}')[2]
+        # Text between elements isn't used, and would be in desc()
+        elem.tail = None
 
-    doc = xml.dom.minidom.parseString(data, parser)
-
-    try:
-        x3dnode = doc.getElementsByTagName('X3D')[0]
-    except:
+    x3dnode = next(doc.iter('X3D'), None)
+    if x3dnode is None:
         return None, 'Not a valid x3d document, cannot import'
 
     bpy.ops.object.select_all(action='DESELECT')
@@ -1907,37 +1889,31 @@ def importMesh_IndexedFaceSet(geom, ancestry):
         del index[-1]
 
     if len(points) >= 2 * len(index):  # Need to cull
-        culled_points = []
-        cull = {}  # Maps old vertex indices to new ones
-        uncull = []  # Maps new indices to the old ones
-        new_index = 0
+        # Maps new indices to the old ones, in order of first use
+        uncull = [i for i in dict.fromkeys(index) if i != -1]
+        # Maps old vertex indices to new ones
+        cull = {i: new_index for new_index, i in enumerate(uncull)}
+        cull[-1] = -1
+        index = [cull[i] for i in index]
+        del cull[-1]
     else:
         uncull = cull = None
 
+    # Generate faces, split at the -1 indices
     faces = []
-    face = []
-    # Generate faces. Cull the vertices if necessary,
-    for i in index:
-        if i == -1:
-            if face:
-                faces.append(flip(face, ccw))
-            face = []
-        else:
-            if cull is not None:
-                if not(i in cull):
-                    culled_points.append(points[i])
-                    cull[i] = new_index
-                    uncull.append(i)
-                    i = new_index
-                    new_index += 1
-                else:
-                    i = cull[i]
-            face.append(i)
-    if face:
-        faces.append(flip(face, ccw))  # The last face
+    index_len = len(index)
+    start = 0
+    while start < index_len:
+        try:
+            end = index.index(-1, start)
+        except ValueError:
+            end = index_len
+        if end > start:
+            faces.append(flip(index[start:end], ccw))
+        start = end + 1
 
     if cull:
-        points = culled_points
+        points = [points[i] for i in uncull]
 
     bpymesh = bpy.data.meshes.new(name="IndexedFaceSet")
     bpymesh.from_pydata(points, [], faces)
@@ -2014,26 +1990,15 @@ def importMesh_IndexedFaceSet(geom, ancestry):
                     for v in f
                     for co in tex_coord_points[v]]
     else:
-        x_min = x_max = y_min = y_max = z_min = z_max = None
-        for f in faces:
-            # Unused vertices don't participate in size; X3DOM does so
-            for v in f:
-                (x, y, z) = points[v]
-                if x_min is None or x < x_min:
-                    x_min = x
-                if x_max is None or x > x_max:
-                    x_max = x
-                if y_min is None or y < y_min:
-                    y_min = y
-                if y_max is None or y > y_max:
-                    y_max = y
-                if z_min is None or z < z_min:
-                    z_min = z
-                if z_max is None or z > z_max:
-                    z_max = z
-
-        mins = (x_min, y_min, z_min)
-        deltas = (x_max - x_min, y_max - y_min, z_max - z_min)
+        # Unused vertices don't participate in size; X3DOM does so
+        if cull:
+            used_points = points
+        else:
+            used_points = [points[v] for v in set(chain.from_iterable(faces))]
+        x_co, y_co, z_co = zip(*used_points)
+        mins = (min(x_co), min(y_co), min(z_co))
+        deltas = (max(x_co) - mins[0], max(y_co) - mins[1], max(z_co) - mins[2])
+        del used_points, x_co, y_co, z_co
         axes = [0, 1, 2]
         axes.sort(key=lambda a: (-deltas[a], a))
         # Tuple comparison breaks ties
@@ -2051,9 +2016,10 @@ def importMesh_IndexedFaceSet(geom, ancestry):
 
         def generatePointCoords(pt):
             return (pt[s_axis] - s_min) / ds, (pt[t_axis] - t_min) / dt
+        point_coords = [generatePointCoords(pt) for pt in points]
         loops = [co for f in faces
                     for v in f
-                    for co in generatePointCoords(points[v])]
+                    for co in point_coords[v]]
 
     importMesh_ApplyTextureToLoops(bpymesh, loops)
 
@@ -3053,6 +3019,10 @@ def importShape_ProcessObject(
         if bpymat:
             bpydata.materials.append(bpymat)
 
+    importShape_CreateObject(bpycollection, vrmlname, bpydata, geom, node, ancestry, global_matrix)
+
+
+def importShape_CreateObject(bpycollection, vrmlname, bpydata, geom, node, ancestry, global_matrix):
     # Can transform data or object, better the object so we can instance
     # the data
     # bpymesh.transform(getFinalMatrix(node))
@@ -3064,6 +3034,32 @@ def importShape_ProcessObject(
     if DEBUG:
         bpyob["source_line_no"] = geom.lineno
 
+    return bpyob
+
+
+def importShape_ProcessSharedObject(
+        bpycollection, vrmlname, bpydata, geom, geom_spec, node,
+        bpymat, has_alpha, ancestry,
+        global_matrix):
+    # Data of a geometry node used by many shapes, made by
+    # importShape_ProcessObject for the first shape.
+    # It keeps the material of that shape, others have theirs on the object.
+    data_mat = bpydata.materials[0] if bpydata.materials else None
+    if bpymat != data_mat and not bpydata.materials:
+        bpydata.materials.append(None)
+
+    bpyob = importShape_CreateObject(
+            bpycollection, vrmlname + "_" + geom_spec, bpydata, geom,
+            node, ancestry, global_matrix)
+
+    if bpymat != data_mat:
+        slot = bpyob.material_slots[0]
+        slot.link = 'OBJECT'
+        slot.material = bpymat
+
+    if has_alpha and bpymat and type(bpydata) == bpy.types.Mesh and bpydata.uv_layers:
+        bpymat.blend_method = 'BLEND'
+
 
 def importText(geom, ancestry):
     fmt = geom.getChildBySpec('FontStyle')
@@ -3151,6 +3147,21 @@ def importShape(bpycollection, node, ancestry, global_matrix):
     # geometries are easier to flip than others
     geom_fn = geometry_importers.get(geom_spec)
     if geom_fn is not None:
+        # Geometry nodes with a DEF are imported once, and the data is
+        # shared by all the shapes using them. Unless the texture
+        # coordinates are transformed, or fields may come from a PROTO
+        # instance, so the same node gives different data.
+        geom_real = geom.getRealNode()
+        share_data = (geom_real.canHaveReferences() and not texmtx and
+                      not any(n.getRealNode().proto_node for n in ancestry))
+
+        if share_data and geom_real.blendData is not None:
+            importShape_ProcessSharedObject(
+                    bpycollection, vrmlname, geom_real.blendData, geom,
+                    geom_spec, node, bpymat, tex_has_alpha,
+                    ancestry, global_matrix)
+            return
+
         bpydata = geom_fn(geom, ancestry)
 
         # There are no geometry importers that can legally return
@@ -3159,6 +3170,9 @@ def importShape(bpycollection, node, ancestry, global_matrix):
                 bpycollection, vrmlname, bpydata, geom, geom_spec,
                 node, bpymat, tex_has_alpha, texmtx,
                 ancestry, global_matrix)
+
+        if share_data:
+            geom_real.blendData = bpydata
     else:
         print('\tImportX3D warning: unsupported type "%s"' % geom_spec)
 
@@ -22,6 +22,7 @@
 
 
 import bmesh
+import numpy as np
 
 
 def bmesh_copy_from_object(obj, transform=True, triangulate=True, apply_modifiers=False):
@@ -87,110 +88,317 @@ def bmesh_calc_area(bm):
     return sum(f.calc_area() for f in bm.faces)
 
 
-def bmesh_check_self_intersect_object(obj):
-    """Check if any faces self intersect returns an array of edge index values."""
-    import array
-    import mathutils
-
-    if not obj.data.polygons:
-        return array.array('i', ())
+class MeshArrays:
+    """
+    Mesh data of an object as arrays, shared by all checks on this object.
 
-    bm = bmesh_copy_from_object(obj, transform=False, triangulate=False)
-    tree = mathutils.bvhtree.BVHTree.FromBMesh(bm, epsilon=0.00001)
-    overlap = tree.overlap(tree)
-    faces_error = {i for i_pair in overlap for i in i_pair}
+    Blender data is only read on creation, derived data (world space
+    coordinates, normals, the BVH tree) is calculated on first use,
+    so checks can run outside of the main thread.
+    """
 
-    return array.array('i', faces_error)
+    __slots__ = (
+        "co",
+        "matrix_world",
+        "edge_verts",
+        "loop_verts",
+        "loop_edges",
+        "poly_loop_start",
+        "poly_loop_total",
+        "tri_verts",
+        "tri_polys",
+        "_cache",
+    )
 
+    def __init__(self, obj):
+        assert obj.type == 'MESH'
 
-def bmesh_face_points_random(f, num_points=1, margin=0.05):
-    import random
-    from random import uniform
+        if obj.mode == 'EDIT':
+            obj.update_from_editmode()
 
-    # for pradictable results
-    random.seed(f.index)
+        me = obj.data
+        me.calc_loop_triangles()
+
+        def foreach_get(seq, attr, dtype, size=1):
+            data = np.empty(len(seq) * size, dtype=dtype)
+            seq.foreach_get(attr, data)
+            return data.reshape(-1, size) if size > 1 else data
+
+        self.co = foreach_get(me.vertices, "co", np.float32, 3).astype(np.float64)
+        self.matrix_world = np.array(obj.matrix_world, dtype=np.float64)
+        self.edge_verts = foreach_get(me.edges, "vertices", np.int32, 2)
+        self.loop_verts = foreach_get(me.loops, "vertex_index", np.int32)
+        self.loop_edges = foreach_get(me.loops, "edge_index", np.int32)
+        self.poly_loop_start = foreach_get(me.polygons, "loop_start", np.int32)
+        self.poly_loop_total = foreach_get(me.polygons, "loop_total", np.int32)
+        self.tri_verts = foreach_get(me.loop_triangles, "vertices", np.int32, 3)
+        self.tri_polys = foreach_get(me.loop_triangles, "polygon_index", np.int32)
+        self._cache = {}
+
+    def _cached(self, key, fn):
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._cache[key] = fn()
+            return value
+
+    def co_world(self):
+        def calc():
+            mat = self.matrix_world
+            return self.co @ mat[:3, :3].T + mat[:3, 3]
+        return self._cached("co_world", calc)
+
+    def loop_polys(self):
+        """Polygon index of every loop."""
+        return self._cached("loop_polys", lambda: np.repeat(
+            np.arange(len(self.poly_loop_start), dtype=np.int32),
+            self.poly_loop_total,
+        ))
+
+    def loop_next(self):
+        """Index of the next loop in the polygon, for every loop."""
+        def calc():
+            loop_next = np.arange(1, len(self.loop_verts) + 1, dtype=np.int32)
+            loop_next[self.poly_loop_start + self.poly_loop_total - 1] = self.poly_loop_start
+            return loop_next
+        return self._cached("loop_next", calc)
+
+    def loop_prev(self):
+        """Index of the previous loop in the polygon, for every loop."""
+        def calc():
+            loop_prev = np.arange(-1, len(self.loop_verts) - 1, dtype=np.int32)
+            loop_prev[self.poly_loop_start] = self.poly_loop_start + self.poly_loop_total - 1
+            return loop_prev
+        return self._cached("loop_prev", calc)
+
+    def _poly_normals_unnormalized(self, co):
+        # Newell's method, relative to the first vertex for precision.
+        loop_polys = self.loop_polys()
+        co_first = co[self.loop_verts[self.poly_loop_start]][loop_polys]
+        co_curr = co[self.loop_verts] - co_first
+        co_next = co[self.loop_verts[self.loop_next()]] - co_first
+        cross = np.cross(co_curr, co_next)
+        num = len(self.poly_loop_start)
+        # 'bincount' of no loops gives integers.
+        return np.column_stack([
+            np.bincount(loop_polys, weights=cross[:, i], minlength=num)
+            for i in range(3)
+        ]).astype(np.float64, copy=False)
+
+    def poly_areas(self):
+        """Polygon areas in local space."""
+        return self._cached("poly_areas", lambda: np.linalg.norm(
+            self._poly_normals_unnormalized(self.co), axis=1,
+        ) * 0.5)
+
+    def poly_normals_world(self):
+        """Normalized polygon normals in world space, zero for degenerate polygons."""
+        def calc():
+            no = self._poly_normals_unnormalized(self.co_world())
+            return normalized(no)
+        return self._cached("poly_normals_world", calc)
+
+    def edge_loops(self):
+        """
+        Returns (loops_count, loops_first, loops_second) for every edge,
+        the loop indices are only valid for manifold edges.
+        """
+        def calc():
+            num = len(self.edge_verts)
+            loops_count = np.bincount(self.loop_edges, minlength=num)
+            if len(self.loop_edges) < 2:
+                loops_none = np.zeros(num, dtype=np.int32)
+                return loops_count, loops_none, loops_none
+            order = np.argsort(self.loop_edges, kind='stable')
+            offset = np.cumsum(loops_count) - loops_count
+            offset = np.minimum(offset, len(order) - 2)
+            return loops_count, order[offset], order[offset + 1]
+        return self._cached("edge_loops", calc)
+
+    def bvhtree_world(self):
+        """BVH tree of the triangles in world space, tree indices are triangle indices."""
+        def calc():
+            from mathutils.bvhtree import BVHTree
+            return BVHTree.FromPolygons(
+                self.co_world().tolist(),
+                self.tri_verts.tolist(),
+                all_triangles=True,
+                epsilon=0.00001,
+            )
+        return self._cached("bvhtree_world", calc)
+
+
+def normalized(vecs):
+    """Normalize an array of vectors, zero length vectors stay zero."""
+    length = np.linalg.norm(vecs, axis=1)[:, None]
+    return np.divide(vecs, length, out=np.zeros(vecs.shape), where=(length != 0.0))
+
+
+def mesh_check_solid(data):
+    """Returns arrays of the non manifold and non contiguous edge indices."""
+    loops_count, loops_first, _loops_second = data.edge_loops()
+    is_manifold = loops_count == 2
+
+    # The two loops of a contiguous edge run in opposite directions,
+    # so exactly one of them uses the first vertex of the edge.
+    loop_edges = data.loop_edges
+    starts_v0 = np.bincount(
+        loop_edges,
+        weights=(data.loop_verts == data.edge_verts[loop_edges, 0]),
+        minlength=len(loops_count),
+    )
+    edges_non_manifold = np.flatnonzero(~is_manifold)
+    edges_non_contig = np.flatnonzero(is_manifold & (starts_v0 != 1))
+    return edges_non_manifold, edges_non_contig
+
+
+def mesh_check_self_intersect(data):
+    """Returns an array of the self intersecting polygon indices."""
+    if not len(data.tri_verts):
+        return np.empty(0, dtype=np.int32)
+
+    tree = data.bvhtree_world()
+    overlap = np.array(tree.overlap(tree), dtype=np.int32)
+    return np.unique(data.tri_polys[overlap.ravel()])
+
+
+def mesh_check_degenerate(data, threshold):
+    """Returns arrays of the zero area polygon and zero length edge indices (in local space)."""
+    co = data.co
+    edge_verts = data.edge_verts
+    edge_lengths = np.linalg.norm(co[edge_verts[:, 0]] - co[edge_verts[:, 1]], axis=1)
+    faces_zero = np.flatnonzero(data.poly_areas() <= threshold)
+    edges_zero = np.flatnonzero(edge_lengths <= threshold)
+    return faces_zero, edges_zero
+
+
+def mesh_check_distorted(data, angle_distort):
+    """Returns an array of the non-flat polygon indices, see face_is_distorted()."""
+    co = data.co_world()
+    loop_verts = data.loop_verts
+    co_curr = co[loop_verts]
+    loop_no = np.cross(
+        co[loop_verts[data.loop_prev()]] - co_curr,
+        co[loop_verts[data.loop_next()]] - co_curr,
+    )
+    loop_no = normalized(loop_no)
+    loop_polys = data.loop_polys()
+    poly_no = data.poly_normals_world()
+    loop_poly_no = poly_no[loop_polys]
+
+    # Corners with a degenerate normal use the polygon normal,
+    # polygons with a degenerate normal are always distorted.
+    is_zero = ~loop_no.any(axis=1)
+    loop_no[is_zero] = loop_poly_no[is_zero]
+    dot = np.abs(np.einsum("ij,ij->i", loop_no, loop_poly_no))
+    is_distort = np.arccos(np.minimum(dot, 1.0)) > angle_distort
+    is_distort |= ~loop_poly_no.any(axis=1)
+
+    poly_distort = np.bincount(loop_polys, weights=is_distort, minlength=len(poly_no))
+    return np.flatnonzero(poly_distort)
+
+
+def mesh_check_thick(data, thickness, num_points=6, margin=0.05):
+    """
+    Returns an array of the polygon indices thinner than ``thickness``.
+
+    Rays are cast backwards from random points on every triangle,
+    faces hit within the thickness are reported along with the triangle.
+    """
+    EPS_BIAS = 0.0001
 
-    uniform_args = 0.0 + margin, 1.0 - margin
-    vecs = [v.co for v in f.verts]
+    distance = thickness - EPS_BIAS
+    if distance <= 0.0 or not len(data.tri_verts):
+        return np.empty(0, dtype=np.int32)
+
+    co = data.co_world()
+    tri_co = co[data.tri_verts]
+    side1 = tri_co[:, 1] - tri_co[:, 0]
+    side2 = tri_co[:, 2] - tri_co[:, 0]
+    tri_no = normalized(np.cross(side1, side2))
+    tri_index = np.flatnonzero(tri_no.any(axis=1))
+
+    # for predictable results
+    rng = np.random.default_rng(len(tri_co))
+    u1, u2 = rng.uniform(0.0 + margin, 1.0 - margin, (2, len(tri_index), num_points, 1))
+    is_flip = (u1 + u2) > 1.0
+    u1 = np.where(is_flip, 1.0 - u1, u1)
+    u2 = np.where(is_flip, 1.0 - u2, u2)
+
+    tri_no = tri_no[tri_index][:, None]
+    points = (
+        tri_co[tri_index, 0][:, None] +
+        u1 * side1[tri_index][:, None] +
+        u2 * side2[tri_index][:, None]
+    )
+    # Cast the rays backwards.
+    ray_origins = (points - tri_no * EPS_BIAS).reshape(-1, 3)
+    ray_dirs = np.broadcast_to(-tri_no, points.shape).reshape(-1, 3)
+    ray_tris = np.repeat(tri_index, num_points)
+
+    ray_cast = data.bvhtree_world().ray_cast
+    tris_error = set()
+    for i, origin, direction in zip(ray_tris.tolist(), ray_origins.tolist(), ray_dirs.tolist()):
+        index = ray_cast(origin, direction, distance)[2]
+        if index is not None:
+            # Add the face we hit
+            tris_error.add(i)
+            tris_error.add(index)
+
+    tris_error = np.fromiter(tris_error, dtype=np.int32, count=len(tris_error))
+    return np.unique(data.tri_polys[tris_error])
+
+
+def mesh_check_sharp(data, angle_sharp):
+    """Returns an array of the manifold edge indices, sharper than ``angle_sharp``."""
+    loops_count, loops_first, loops_second = data.edge_loops()
+    edges = np.flatnonzero(loops_count == 2)
+    # Same loop order as BMesh, where the edge uses the loop added last,
+    # the direction matters for non contiguous edges.
+    loops_a = loops_second[edges]
+    loops_b = loops_first[edges]
+
+    loop_polys = data.loop_polys()
+    poly_no = data.poly_normals_world()
+    no_a = poly_no[loop_polys[loops_a]]
+    no_b = poly_no[loop_polys[loops_b]]
+    angle = np.arccos(np.clip(np.einsum("ij,ij->i", no_a, no_b), -1.0, 1.0))
+
+    # Concave edges have a negative angle, see BMEdge.calc_face_angle_signed().
+    co = data.co_world()
+    loop_verts = data.loop_verts
+    edge_dir = co[loop_verts[data.loop_next()[loops_a]]] - co[loop_verts[loops_a]]
+    is_convex = (
+        (no_a == no_b).all(axis=1) |
+        (np.einsum("ij,ij->i", np.cross(no_a, no_b), edge_dir) > 0.0)
+    )
+    return edges[is_convex & (angle > angle_sharp)]
+
+
+def mesh_check_overhang(data, angle_overhang):
+    """Returns an array of the polygon indices facing down within ``angle_overhang``."""
+    poly_no = data.poly_normals_world()
+    angle = np.arccos(np.clip(-poly_no[:, 2], -1.0, 1.0))
+    # ignores zero area faces
+    return np.flatnonzero(poly_no.any(axis=1) & (angle < angle_overhang))
 
-    for _ in range(num_points):
-        u1 = uniform(*uniform_args)
-        u2 = uniform(*uniform_args)
-        u_tot = u1 + u2
 
-        if u_tot > 1.0:
-            u1 = 1.0 - u1
-            u2 = 1.0 - u2
+def bmesh_check_self_intersect_object(obj):
+    """Check if any faces self intersect returns an array of edge index values."""
+    import array
 
-        side1 = vecs[1] - vecs[0]
-        side2 = vecs[2] - vecs[0]
+    if not obj.data.polygons:
+        return array.array('i', ())
 
-        yield vecs[0] + u1 * side1 + u2 * side2
+    faces_error = mesh_check_self_intersect(MeshArrays(obj))
+    return array.array('i', faces_error.tolist())
 
 
 def bmesh_check_thick_object(obj, thickness):
     import array
-    import bpy
-
-    # Triangulate
-    bm = bmesh_copy_from_object(obj, transform=True, triangulate=False)
-
-    # map original faces to their index.
-    face_index_map_org = {f: i for i, f in enumerate(bm.faces)}
-    ret = bmesh.ops.triangulate(bm, faces=bm.faces)
-    face_map = ret["face_map"]
-    del ret
-    # old edge -> new mapping
-
-    # Convert new/old map to index dict.
-
-    # Create a real mesh (lame!)
-    context = bpy.context
-    layer = context.view_layer
-    scene_collection = context.layer_collection.collection
-
-    me_tmp = bpy.data.meshes.new(name="~temp~")
-    bm.to_mesh(me_tmp)
-    obj_tmp = bpy.data.objects.new(name=me_tmp.name, object_data=me_tmp)
-    scene_collection.objects.link(obj_tmp)
-
-    layer.update()
-    ray_cast = obj_tmp.ray_cast
-
-    EPS_BIAS = 0.0001
-
-    faces_error = set()
-    bm_faces_new = bm.faces[:]
-
-    for f in bm_faces_new:
-        no = f.normal
-        no_sta = no * EPS_BIAS
-        no_end = no * thickness
-        for p in bmesh_face_points_random(f, num_points=6):
-            # Cast the ray backwards
-            p_a = p - no_sta
-            p_b = p - no_end
-            p_dir = p_b - p_a
-
-            ok, _co, no, index = ray_cast(p_a, p_dir, distance=p_dir.length)
-
-            if ok:
-                # Add the face we hit
-                for f_iter in (f, bm_faces_new[index]):
-                    # if the face wasn't triangulated, just use existing
-                    f_org = face_map.get(f_iter, f_iter)
-                    f_org_index = face_index_map_org[f_org]
-                    faces_error.add(f_org_index)
-
-    bm.free()
-
-    scene_collection.objects.unlink(obj_tmp)
-    bpy.data.objects.remove(obj_tmp)
-    bpy.data.meshes.remove(me_tmp)
-
-    layer.update()
 
-    return array.array('i', faces_error)
+    faces_error = mesh_check_thick(MeshArrays(obj), thickness)
+    return array.array('i', faces_error.tolist())
 
 
 def face_is_distorted(ele, angle_distort):
@@ -21,7 +21,9 @@
 # All Operator
 
 
+import array
 import math
+import os
 
 import bpy
 from bpy.types import Operator
@@ -112,21 +114,84 @@ class MESH_OT_print3d_info_area(Operator):
 # ---------------
 # Geometry Checks
 
-def execute_check(self, context):
-    obj = context.active_object
+def check_settings(scene):
+    """Copy the check settings, for use outside of the main thread."""
+    print_3d = scene.print_3d
+    return {
+        attr: getattr(print_3d, attr)
+        for attr in (
+            "thickness_min",
+            "threshold_zero",
+            "angle_distort",
+            "angle_sharp",
+            "angle_overhang",
+        )
+    }
 
-    info = []
-    self.main_check(obj, info)
-    report.update(*info)
 
-    multiple_obj_warning(self, context)
+def check_objects(context):
+    """The active object followed by the other selected mesh objects."""
+    obj_act = context.active_object
+    objects = [obj_act] if obj_act and obj_act.type == 'MESH' else []
+    objects.extend(
+        obj for obj in context.selected_objects
+        if obj.type == 'MESH' and obj != obj_act
+    )
+    return objects
+
+
+def execute_check(self, context, check_cls=None):
+    from concurrent.futures import ThreadPoolExecutor
+
+    if check_cls is None:
+        check_cls = (self.__class__,)
+
+    objects = check_objects(context)
+    settings = check_settings(context.scene)
+
+    # Read all Blender data in the main thread,
+    # the checks themselves only use the mesh arrays.
+    objects_data = [mesh_helpers.MeshArrays(obj) for obj in objects]
+
+    def object_check(obj, data):
+        info = []
+        for cls in check_cls:
+            cls.main_check(obj, info, data=data, settings=settings)
+        return info
+
+    if len(objects) > 1:
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            objects_info = list(executor.map(object_check, objects, objects_data))
+    else:
+        objects_info = list(map(object_check, objects, objects_data))
+
+    if len(objects) == 1:
+        info = objects_info[0]
+    else:
+        # Only the active object can have its report selected.
+        info = []
+        for obj, obj_info in zip(objects, objects_info):
+            is_active = obj == context.active_object
+            info.extend(
+                (f"{obj.name}: {text}", data if is_active else None)
+                for text, data in obj_info
+            )
+
+    report.update(*info)
 
     return {'FINISHED'}
 
 
-def multiple_obj_warning(self, context):
-    if len(context.selected_objects) > 1:
-        self.report({"INFO"}, "Multiple selected objects. Only the active one will be evaluated")
+def check_data(obj, data, settings):
+    if data is None:
+        data = mesh_helpers.MeshArrays(obj)
+    if settings is None:
+        settings = check_settings(bpy.context.scene)
+    return data, settings
+
+
+def index_array(indices):
+    return array.array('i', indices.tolist())
 
 
 class MESH_OT_print3d_check_solid(Operator):
@@ -135,22 +200,16 @@ class MESH_OT_print3d_check_solid(Operator):
     bl_description = "Check for geometry is solid (has valid inside/outside) and correct normals"
 
     @staticmethod
-    def main_check(obj, info):
-        import array
-
-        bm = mesh_helpers.bmesh_copy_from_object(obj, transform=False, triangulate=False)
+    def main_check(obj, info, data=None, settings=None):
+        data, settings = check_data(obj, data, settings)
 
-        edges_non_manifold = array.array('i', (i for i, ele in enumerate(bm.edges) if not ele.is_manifold))
-        edges_non_contig = array.array(
-            'i',
-            (i for i, ele in enumerate(bm.edges) if ele.is_manifold and (not ele.is_contiguous)),
-        )
+        edges_non_manifold, edges_non_contig = mesh_helpers.mesh_check_solid(data)
+        edges_non_manifold = index_array(edges_non_manifold)
+        edges_non_contig = index_array(edges_non_contig)
 
         info.append((f"Non Manifold Edge: {len(edges_non_manifold)}", (bmesh.types.BMEdge, edges_non_manifold)))
         info.append((f"Bad Contig. Edges: {len(edges_non_contig)}", (bmesh.types.BMEdge, edges_non_contig)))
 
-        bm.free()
-
     def execute(self, context):
         return execute_check(self, context)
 
@@ -161,8 +220,10 @@ class MESH_OT_print3d_check_intersections(Operator):
     bl_description = "Check geometry for self intersections"
 
     @staticmethod
-    def main_check(obj, info):
-        faces_intersect = mesh_helpers.bmesh_check_self_intersect_object(obj)
+    def main_check(obj, info, data=None, settings=None):
+        data, settings = check_data(obj, data, settings)
+
+        faces_intersect = index_array(mesh_helpers.mesh_check_self_intersect(data))
         info.append((f"Intersect Face: {len(faces_intersect)}", (bmesh.types.BMFace, faces_intersect)))
 
     def execute(self, context):
@@ -178,23 +239,17 @@ class MESH_OT_print3d_check_degenerate(Operator):
     )
 
     @staticmethod
-    def main_check(obj, info):
-        import array
-
-        scene = bpy.context.scene
-        print_3d = scene.print_3d
-        threshold = print_3d.threshold_zero
-
-        bm = mesh_helpers.bmesh_copy_from_object(obj, transform=False, triangulate=False)
+    def main_check(obj, info, data=None, settings=None):
+        data, settings = check_data(obj, data, settings)
+        threshold = settings["threshold_zero"]
 
-        faces_zero = array.array('i', (i for i, ele in enumerate(bm.faces) if ele.calc_area() <= threshold))
-        edges_zero = array.array('i', (i for i, ele in enumerate(bm.edges) if ele.calc_length() <= threshold))
+        faces_zero, edges_zero = mesh_helpers.mesh_check_degenerate(data, threshold)
+        faces_zero = index_array(faces_zero)
+        edges_zero = index_array(edges_zero)
 
         info.append((f"Zero Faces: {len(faces_zero)}", (bmesh.types.BMFace, faces_zero)))
         info.append((f"Zero Edges: {len(edges_zero)}", (bmesh.types.BMEdge, edges_zero)))
 
-        bm.free()
-
     def execute(self, context):
         return execute_check(self, context)
 
@@ -205,25 +260,14 @@ class MESH_OT_print3d_check_distorted(Operator):
     bl_description = "Check for non-flat faces"
 
     @staticmethod
-    def main_check(obj, info):
-        import array
-
-        scene = bpy.context.scene
-        print_3d = scene.print_3d
-        angle_distort = print_3d.angle_distort
+    def main_check(obj, info, data=None, settings=None):
+        data, settings = check_data(obj, data, settings)
+        angle_distort = settings["angle_distort"]
 
-        bm = mesh_helpers.bmesh_copy_from_object(obj, transform=True, triangulate=False)
-        bm.normal_update()
-
-        faces_distort = array.array(
-            'i',
-            (i for i, ele in enumerate(bm.faces) if mesh_helpers.face_is_distorted(ele, angle_distort))
-        )
+        faces_distort = index_array(mesh_helpers.mesh_check_distorted(data, angle_distort))
 
         info.append((f"Non-Flat Faces: {len(faces_distort)}", (bmesh.types.BMFace, faces_distort)))
 
-        bm.free()
-
     def execute(self, context):
         return execute_check(self, context)
 
@@ -237,11 +281,10 @@ class MESH_OT_print3d_check_thick(Operator):
     )
 
     @staticmethod
-    def main_check(obj, info):
-        scene = bpy.context.scene
-        print_3d = scene.print_3d
+    def main_check(obj, info, data=None, settings=None):
+        data, settings = check_data(obj, data, settings)
 
-        faces_error = mesh_helpers.bmesh_check_thick_object(obj, print_3d.thickness_min)
+        faces_error = index_array(mesh_helpers.mesh_check_thick(data, settings["thickness_min"]))
         info.append((f"Thin Faces: {len(faces_error)}", (bmesh.types.BMFace, faces_error)))
 
     def execute(self, context):
@@ -254,21 +297,13 @@ class MESH_OT_print3d_check_sharp(Operator):
     bl_description = "Check edges are below the sharpness preference"
 
     @staticmethod
-    def main_check(obj, info):
-        scene = bpy.context.scene
-        print_3d = scene.print_3d
-        angle_sharp = print_3d.angle_sharp
-
-        bm = mesh_helpers.bmesh_copy_from_object(obj, transform=True, triangulate=False)
-        bm.normal_update()
+    def main_check(obj, info, data=None, settings=None):
+        data, settings = check_data(obj, data, settings)
+        angle_sharp = settings["angle_sharp"]
 
-        edges_sharp = [
-            ele.index for ele in bm.edges
-            if ele.is_manifold and ele.calc_face_angle_signed() > angle_sharp
-        ]
+        edges_sharp = index_array(mesh_helpers.mesh_check_sharp(data, angle_sharp))
 
         info.append((f"Sharp Edge: {len(edges_sharp)}", (bmesh.types.BMEdge, edges_sharp)))
-        bm.free()
 
     def execute(self, context):
         return execute_check(self, context)
@@ -280,31 +315,17 @@ class MESH_OT_print3d_check_overhang(Operator):
     bl_description = "Check faces don't overhang past a certain angle"
 
     @staticmethod
-    def main_check(obj, info):
-        from mathutils import Vector
-
-        scene = bpy.context.scene
-        print_3d = scene.print_3d
-        angle_overhang = (math.pi / 2.0) - print_3d.angle_overhang
+    def main_check(obj, info, data=None, settings=None):
+        data, settings = check_data(obj, data, settings)
+        angle_overhang = (math.pi / 2.0) - settings["angle_overhang"]
 
         if angle_overhang == math.pi:
             info.append(("Skipping Overhang", ()))
             return
 
-        bm = mesh_helpers.bmesh_copy_from_object(obj, transform=True, triangulate=False)
-        bm.normal_update()
-
-        z_down = Vector((0, 0, -1.0))
-        z_down_angle = z_down.angle
-
-        # 4.0 ignores zero area faces
-        faces_overhang = [
-            ele.index for ele in bm.faces
-            if z_down_angle(ele.normal, 4.0) < angle_overhang
-        ]
+        faces_overhang = index_array(mesh_helpers.mesh_check_overhang(data, angle_overhang))
 
         info.append((f"Overhang Face: {len(faces_overhang)}", (bmesh.types.BMFace, faces_overhang)))
-        bm.free()
 
     def execute(self, context):
         return execute_check(self, context)
@@ -326,17 +347,7 @@ class MESH_OT_print3d_check_all(Operator):
     )
 
     def execute(self, context):
-        obj = context.active_object
-
-        info = []
-        for cls in self.check_cls:
-            cls.main_check(obj, info)
-
-        report.update(*info)
-
-        multiple_obj_warning(self, context)
-
-        return {'FINISHED'}
+        return execute_check(self, context, self.check_cls)
 
 
 class MESH_OT_print3d_clean_distorted(Operator):
@@ -21,7 +21,7 @@
 bl_info = {
     "name": "Network Renderer",
     "author": "Martin Poirier",
-    "version": (1, 8, 1),
+    "version": (1, 8, 7),
     "blender": (2, 60, 0),
     "location": "Render > Engine > Network Render",
     "description": "Distributed rendering for Blender",
@@ -47,6 +47,9 @@ if "init_data" in locals():
     importlib.reload(repath)
     importlib.reload(versioning)
     importlib.reload(baking)
+    importlib.reload(filecache)
+    importlib.reload(journal)
+    importlib.reload(regions)
 else:
     from netrender import model
     from netrender import operators
@@ -60,6 +63,9 @@ else:
     from netrender import repath
     from netrender import versioning
     from netrender import baking
+    from netrender import filecache
+    from netrender import journal
+    from netrender import regions
 
 jobs = []
 slaves = []
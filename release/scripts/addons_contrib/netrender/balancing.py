@@ -17,6 +17,7 @@
 # ##### END GPL LICENSE BLOCK #####
 
 import time
+import heapq
 
 from netrender.utils import *
 import netrender.model
@@ -29,6 +30,10 @@ class RatingRule:
     def id(self):
         return str(id(self))
 
+    def prepare(self, jobs):
+        """Called once per balancing pass, before rating the jobs"""
+        pass
+
     def rate(self, job):
         return 0
 
@@ -39,6 +44,10 @@ class ExclusionRule:
     def id(self):
         return str(id(self))
 
+    def prepare(self, jobs):
+        """Called once per balancing pass, before testing the jobs"""
+        pass
+
     def test(self, job):
         return False
 
@@ -49,15 +58,43 @@ class PriorityRule:
     def id(self):
         return str(id(self))
 
+    def prepare(self, jobs):
+        """Called once per balancing pass, before testing the jobs"""
+        pass
+
     def test(self, job):
         return False
 
+# Jobs are only sorted again when something changed since the last pass, but at most
+# every BALANCE_MIN_INTERVAL seconds. Time based rules are refreshed every BALANCE_MAX_INTERVAL.
+BALANCE_MIN_INTERVAL = 0.1
+BALANCE_MAX_INTERVAL = 1.0
+
 class Balancer:
     def __init__(self):
         self.rules = []
         self.priorities = []
         self.exceptions = []
 
+        self.initQueues()
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.initQueues()
+
+    def initQueues(self):
+        self.dirty = True
+        self.last_balance = 0
+        self.jobs_count = 0
+        # job tags -> [(rank, job), ...] of dispatchable jobs, in balancing order
+        self.queues = {}
+        # slave tags -> queues of the jobs slaves with these tags can render
+        self.slave_queues = {}
+
+    def invalidate(self):
+        """Sort the jobs again on the next balancing pass"""
+        self.dirty = True
+
     def ruleByID(self, rule_id):
         for rule in self.rules:
             if rule.id() == rule_id:
@@ -73,12 +110,15 @@ class Balancer:
 
     def addRule(self, rule):
         self.rules.append(rule)
+        self.invalidate()
 
     def addPriority(self, priority):
         self.priorities.append(priority)
+        self.invalidate()
 
     def addException(self, exception):
         self.exceptions.append(exception)
+        self.invalidate()
 
     def applyRules(self, job):
         return sum((rule.rate(job) for rule in self.rules if rule.enabled))
@@ -102,15 +142,61 @@ class Balancer:
                         0 if self.applyPriorities(job) else 1, # priorities first
                         self.applyRules(job))
 
+    def needsBalance(self, jobs):
+        elapsed = time.time() - self.last_balance
+        if len(jobs) != self.jobs_count:
+            return True
+        elif self.dirty:
+            return elapsed >= BALANCE_MIN_INTERVAL
+        else:
+            return elapsed >= BALANCE_MAX_INTERVAL
+
     def balance(self, jobs):
-        if jobs:
+        if not jobs:
+            self.queues = {}
+            self.slave_queues = {}
+            self.jobs_count = 0
+            return None
+
+        if self.needsBalance(jobs):
+            for rule in self.rules + self.priorities + self.exceptions:
+                rule.prepare(jobs)
+
+            keys = {job.id: self.sortKey(job) for job in jobs}
+
             # use inline copy to make sure the list is still accessible while sorting
-            jobs[:] = sorted(jobs, key=self.sortKey)
-            return jobs[0]
+            # jobs are still in the previous order, which makes this close to linear
+            jobs[:] = sorted(jobs, key=lambda job: keys[job.id])
+
+            self.queues = {}
+            for rank, job in enumerate(jobs):
+                if keys[job.id][0]:
+                    break # only excluded jobs left
+                self.queues.setdefault(frozenset(job.tags), []).append((rank, job))
+
+            self.slave_queues = {}
+            self.dirty = False
+            self.last_balance = time.time()
+            self.jobs_count = len(jobs)
+
+        return jobs[0]
+
+    def candidates(self, slave_tags):
+        """Iterate on the jobs slaves with these tags can render, in balancing order"""
+        slave_tags = frozenset(slave_tags)
+        queues = self.slave_queues.get(slave_tags)
+        if queues is None:
+            # slaves without tags render anything, otherwise slaves need all job tags
+            queues = [queue for tags, queue in self.queues.items() if not slave_tags or tags <= slave_tags]
+            self.slave_queues[slave_tags] = queues
+
+        if len(queues) == 1:
+            for rank, job in queues[0]:
+                yield job
         else:
-            return None
+            for rank, job in heapq.merge(*queues, key=lambda item: item[0]):
+                yield job
 
-# ==========================
 
 class RatingUsage(RatingRule):
     def __str__(self):
@@ -136,9 +222,19 @@ class RatingUsageByCategory(RatingRule):
     def __str__(self):
         return "Usage per category"
 
+    def prepare(self, jobs):
+        self.categories = {}
+        for j in jobs:
+            total_category_usage, maximum_priority = self.categories.get(j.category, (0, j.priority))
+            self.categories[j.category] = (total_category_usage + j.usage, max(maximum_priority, j.priority))
+
     def rate(self, job):
-        total_category_usage = sum([j.usage for j in self.getJobs() if j.category == job.category])
-        maximum_priority = max([j.priority for j in self.getJobs() if j.category == job.category])
+        categories = getattr(self, "categories", None)
+        if categories and job.category in categories:
+            total_category_usage, maximum_priority = categories[job.category]
+        else:
+            total_category_usage = sum([j.usage for j in self.getJobs() if j.category == job.category])
+            maximum_priority = max([j.priority for j in self.getJobs() if j.category == job.category])
 
         # less usage is better
         return total_category_usage / maximum_priority
@@ -243,8 +339,14 @@ class ExcludeSlavesLimit(ExclusionRule):
     def __str__(self):
         return "Exclude jobs that would use too many slaves"
 
+    def prepare(self, jobs):
+        self.jobs_count = self.count_jobs()
+
     def test(self, job):
-        return not ( self.count_jobs() == 1 or self.count_slaves() <= 1 or float(job.countSlaves() + 1) / self.count_slaves() <= self.limit )
+        jobs_count = getattr(self, "jobs_count", None)
+        if jobs_count is None:
+            jobs_count = self.count_jobs()
+        return not ( jobs_count == 1 or self.count_slaves() <= 1 or float(job.countSlaves() + 1) / self.count_slaves() <= self.limit )
 
     def serialize(self):
         return { "type": "exception",
@@ -314,6 +314,9 @@ def sendJobBlender(conn, scene, anim = False, can_save = True):
 
     fillCommonJobSettings(job, job_name, netsettings)
 
+    if netsettings.job_regions > 1:
+        job.regions = netsettings.job_regions
+
     job.tags.add(netrender.model.TAG_RENDER)
 
     # try to send path first
@@ -368,7 +371,9 @@ class NetworkRenderEngine(bpy.types.RenderEngine):
                          test_break = self.test_break,
                          use_ssl=netsettings.use_ssl,
                          cert_path=netsettings.cert_path,
-                         key_path=netsettings.key_path)
+                         key_path=netsettings.key_path,
+                         chunk_time=netsettings.master_chunk_time,
+                         use_speculative=netsettings.use_master_speculative)
 
 
     def render_slave(self, scene):
@@ -0,0 +1,243 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Slave side store of job files, addressed by their signature.
+#
+# Files are downloaded once into the store and hard linked (copied when linking
+# isn't possible) into the job directories, so jobs sharing dependencies don't
+# download them again. Interrupted downloads are resumed, and the least recently
+# used files are evicted when the store grows over its size limit.
+#
+# Slaves can share a store: a lock file per signature is held while a file is
+# downloaded, added and linked, and eviction skips files locked by others.
+
+import os, shutil, hashlib, time
+import http, http.client
+
+from netrender.utils import *
+
+PARTIAL_DIR = "partial"
+LOCKS_DIR = "locks"
+
+class FileLock:
+    """Exclusive lock on a file, between processes"""
+    def __init__(self, path):
+        self.path = path
+        self.fd = None
+
+    def acquire(self, blocking = True):
+        """Returns False when not blocking and the lock is held by someone else"""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT)
+        try:
+            if os.name == 'nt':
+                import msvcrt
+                while True:
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                        break
+                    except OSError:
+                        if not blocking:
+                            raise
+                        time.sleep(0.1)
+            else:
+                import fcntl
+                fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            if blocking:
+                raise
+            return False
+
+        self.fd = fd
+        return True
+
+    def release(self):
+        # lock files are kept, removing them would let another process lock a new file
+        # while one still holds the lock of the removed one
+        if os.name == 'nt':
+            import msvcrt
+            msvcrt.locking(self.fd, msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        os.close(self.fd)
+        self.fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+class FileCache:
+    def __init__(self, path, max_size):
+        self.path = path
+        self.max_size = max_size
+        verifyCreateDir(os.path.join(self.path, PARTIAL_DIR))
+        verifyCreateDir(os.path.join(self.path, LOCKS_DIR))
+
+    def lock(self, signature):
+        """Lock of a signature, to hold while using its partial and stored files"""
+        return FileLock(os.path.join(self.path, LOCKS_DIR, signature + ".lock"))
+
+    def objectPath(self, signature):
+        return os.path.join(self.path, signature[:2], signature)
+
+    def partialPath(self, signature):
+        return os.path.join(self.path, PARTIAL_DIR, signature + ".part")
+
+    def get(self, signature):
+        """Path of the file with this signature in the store, None if it isn't stored"""
+        path = self.objectPath(signature)
+        if os.path.exists(path):
+            # modification time is used as last use time for eviction
+            os.utime(path)
+            return path
+        return None
+
+    def add(self, signature, path):
+        """Move a verified file into the store"""
+        object_path = self.objectPath(signature)
+        verifyCreateDir(os.path.dirname(object_path))
+        os.replace(path, object_path)
+        # the partial file keeps the time of its first download, mark it as just used
+        os.utime(object_path)
+        return object_path
+
+    def download(self, conn, job_id, slave_id, rfile):
+        """
+        Download a job file in the store, resuming a previous partial download if any.
+        Returns the path in the store, None if the file couldn't be downloaded or has the wrong signature.
+        Callers must hold the lock of the signature.
+        """
+        signature = rfile.signature
+        partial_path = self.partialPath(signature)
+
+        md5 = hashlib.md5()
+        offset = 0
+        if os.path.exists(partial_path):
+            offset = hashFileInto(partial_path, md5)
+
+        headers = {"slave-id":slave_id}
+        if offset:
+            headers["range"] = "bytes=%i-" % offset
+
+        with ConnectionContext():
+            conn.request("GET", fileURL(job_id, rfile.index), headers=headers)
+        response = conn.getresponse()
+
+        if response.status == http.client.OK:
+            # full content, master doesn't support ranges or file changed
+            md5 = hashlib.md5()
+            mode = "wb"
+        elif response.status == http.client.PARTIAL_CONTENT:
+            print("Resuming download at %i bytes" % offset)
+            mode = "ab"
+        else:
+            response.read()
+            return None
+
+        with open(partial_path, mode) as f:
+            buf = response.read(FILE_BUFFER_SIZE)
+            while buf:
+                md5.update(buf)
+                f.write(buf)
+                buf = response.read(FILE_BUFFER_SIZE)
+
+        if md5.hexdigest() != signature:
+            print("Signature mismatch for downloaded file", rfile.filepath)
+            os.remove(partial_path)
+            return None
+
+        return self.add(signature, partial_path)
+
+    def fetch(self, conn, job_id, slave_id, rfile, job_full_path):
+        """
+        Make a job file available at job_full_path, from the store or downloaded into it first.
+        Returns False if the file couldn't be downloaded.
+        """
+        signature = rfile.signature
+        with self.lock(signature):
+            object_path = self.get(signature)
+            if object_path:
+                print("Using cached", job_full_path)
+            else:
+                print("Downloading to cache", job_full_path)
+                object_path = self.download(conn, job_id, slave_id, rfile)
+                if not object_path:
+                    return False
+
+            self.link(object_path, job_full_path)
+
+        # after linking, the job keeps its file even if it's evicted
+        self.evict(keep = signature)
+        return True
+
+    def link(self, object_path, job_full_path):
+        """Make the stored file available at job_full_path"""
+        verifyCreateDir(os.path.dirname(job_full_path))
+        if os.path.exists(job_full_path):
+            os.remove(job_full_path)
+        try:
+            os.link(object_path, job_full_path)
+        except OSError:
+            # different file system or no hard link support
+            shutil.copyfile(object_path, job_full_path, follow_symlinks=True)
+
+    def size(self):
+        return sum(size for path, size, mtime in self.entries())
+
+    def entries(self):
+        for directory in os.scandir(self.path):
+            if not directory.is_dir() or directory.name in {PARTIAL_DIR, LOCKS_DIR}:
+                continue
+            for entry in os.scandir(directory.path):
+                st = entry.stat()
+                yield entry.path, st.st_size, st.st_mtime
+
+    def evict(self, keep = None):
+        """
+        Remove least recently used files until the store fits in its size limit.
+        The file with the keep signature and files locked by other slaves are never removed.
+        """
+        if self.max_size <= 0:
+            return
+
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        total = sum(size for path, size, mtime in entries)
+
+        for path, size, mtime in entries:
+            if total <= self.max_size:
+                break
+            signature = os.path.basename(path)
+            if signature == keep:
+                continue
+
+            lock = self.lock(signature)
+            if not lock.acquire(blocking = False):
+                continue
+            try:
+                # files still used by job directories keep their other links
+                os.remove(path)
+            except FileNotFoundError:
+                # evicted by another slave
+                pass
+            finally:
+                lock.release()
+            total -= size
@@ -0,0 +1,239 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Master state journal.
+#
+# The state of the master is a snapshot, plus a journal of the changes made since
+# the snapshot, one JSON record per line. Records are written by a thread, so
+# requests don't wait for the disk. When the journal has enough records, a new
+# snapshot is written and the journal starts over.
+#
+# Records and snapshots carry a sequence number, records older than the snapshot
+# (left by a crash during compaction) are skipped when loading.
+
+import os, json, queue, threading
+
+SNAPSHOT_NAME = "master_snapshot.json"
+JOURNAL_NAME = "master_journal.jsonl"
+
+# Records written before the journal is compacted into a new snapshot
+COMPACT_RECORDS = 10000
+
+STATE_VERSION = 1
+
+def frameState(frame):
+    return {
+                "number": frame.number,
+                "region": frame.region,
+                "status": frame.status,
+                "time": frame.time,
+                "command": frame.command,
+                "results": list(frame.results),
+                "log_path": frame.log_path
+            }
+
+def jobState(job):
+    data = job.serialize(withFrames=False)
+    data["transitions"] = list(job.transitions)
+    data["blacklist"] = list(job.blacklist)
+    data["frames"] = [frameState(frame) for frame in job.frames]
+    data["save_path"] = job.save_path
+    data["start_time"] = job.start_time
+    data["finish_time"] = job.finish_time
+    data["frames_time"] = job.frames_time
+    data["frames_timed"] = job.frames_timed
+    return data
+
+def jobStatusState(job):
+    return {
+                "id": job.id,
+                "status": job.status,
+                "transitions": list(job.transitions),
+                "priority": job.priority,
+                "chunks": job.chunks,
+                "finish_time": job.finish_time
+            }
+
+class Journal:
+    def __init__(self, path):
+        self.snapshot_path = os.path.join(path, SNAPSHOT_NAME)
+        self.journal_path = os.path.join(path, JOURNAL_NAME)
+
+        self.sequence = 0 # sequence number of the last record
+        self.records = 0 # records since the last snapshot
+
+        self.queue = queue.Queue()
+        self.thread = None
+
+    def exists(self):
+        return os.path.exists(self.snapshot_path)
+
+    def clear(self):
+        for filepath in (self.snapshot_path, self.journal_path):
+            if os.path.exists(filepath):
+                os.remove(filepath)
+
+    # =-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-
+
+    def load(self):
+        """
+        Snapshot state with the journal records applied, None if there is no snapshot.
+        Jobs and slaves are dictionaries by id, in their original order.
+        """
+        if not self.exists():
+            return None
+
+        with open(self.snapshot_path, 'r', encoding='utf8') as f:
+            snapshot = json.load(f)
+
+        state = {
+                    "path": snapshot["path"],
+                    "jobs": {job["id"]: job for job in snapshot["jobs"]},
+                    "slaves": {slave["id"]: slave for slave in snapshot["slaves"]},
+                }
+
+        self.sequence = snapshot["sequence"]
+
+        if os.path.exists(self.journal_path):
+            frame_index = {}
+            with open(self.journal_path, 'r', encoding='utf8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # last line cut by a crash
+                        break
+
+                    if record["seq"] <= self.sequence:
+                        continue
+
+                    self.sequence = record["seq"]
+                    self.records += 1
+                    self.apply(state, record, frame_index)
+
+        return state
+
+    def apply(self, state, record, frame_index):
+        op = record["op"]
+        jobs = state["jobs"]
+
+        if op == "job":
+            data = record["job"]
+            jobs[data["id"]] = data
+            frame_index.pop(data["id"], None)
+        elif op == "job_status":
+            data = record["job"]
+            job = jobs.get(data["id"])
+            if job:
+                job.update(data)
+        elif op == "remove_job":
+            jobs.pop(record["id"], None)
+            frame_index.pop(record["id"], None)
+        elif op == "frame":
+            job = jobs.get(record["job"])
+            if job:
+                index = frame_index.get(record["job"])
+                if index is None:
+                    index = frame_index[record["job"]] = {(frame["number"], frame.get("region", -1)): i for i, frame in enumerate(job["frames"])}
+
+                data = record["frame"]
+                i = index.get((data["number"], data.get("region", -1)))
+                if i is not None:
+                    job["frames"][i] = data
+
+                job["frames_time"] = record["frames_time"]
+                job["frames_timed"] = record["frames_timed"]
+                job["last_dispatched"] = record["last_dispatched"]
+        elif op == "slave":
+            data = record["slave"]
+            state["slaves"][data["id"]] = data
+        elif op == "remove_slave":
+            state["slaves"].pop(record["id"], None)
+
+    def writeSnapshot(self, state):
+        """
+        Write the state as the new snapshot and start a new journal.
+        State is a dictionary of the master path, and the serialized jobs and slaves.
+        """
+        snapshot = dict(state, version=STATE_VERSION)
+        snapshot.setdefault("sequence", self.sequence)
+
+        snapshot_tmp = self.snapshot_path + ".tmp"
+        with open(snapshot_tmp, 'w', encoding='utf8') as f:
+            json.dump(snapshot, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(snapshot_tmp, self.snapshot_path)
+
+        # records of this journal are all in the snapshot now
+        with open(self.journal_path, 'w', encoding='utf8'):
+            pass
+
+    # =-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def close(self):
+        """Write the pending records and stop the writer thread"""
+        if self.thread:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def append(self, record):
+        """Add a record, callers must hold the master lock so records keep their order"""
+        self.sequence += 1
+        self.records += 1
+        record["seq"] = self.sequence
+        self.queue.put(record)
+
+    def needsCompaction(self):
+        return self.records >= COMPACT_RECORDS
+
+    def compact(self, state):
+        """Replace the journal with a snapshot of state, taken with the master lock held"""
+        self.records = 0
+        self.queue.put(dict(state, sequence=self.sequence))
+
+    def run(self):
+        f = open(self.journal_path, 'a', encoding='utf8')
+        try:
+            running = True
+            while running:
+                items = [self.queue.get()]
+                # write everything queued at once
+                while not self.queue.empty():
+                    items.append(self.queue.get())
+
+                for item in items:
+                    if item is None:
+                        running = False
+                    elif "op" in item:
+                        f.write(json.dumps(item) + "\n")
+                    else:
+                        # snapshot, see compact
+                        f.close()
+                        self.writeSnapshot(item)
+                        f = open(self.journal_path, 'a', encoding='utf8')
+
+                f.flush()
+                os.fsync(f.fileno())
+        finally:
+            f.close()
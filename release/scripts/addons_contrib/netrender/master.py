@@ -18,10 +18,11 @@
 
 import sys, os
 import http, http.client, http.server, socket, socketserver
-import shutil, time, hashlib
+import shutil, time, hashlib, math
+import threading
+import contextlib
 import pickle
 import zipfile
-import select # for select.error
 import json
 
 
@@ -29,8 +30,16 @@ from netrender.utils import *
 import netrender.model
 import netrender.balancing
 import netrender.master_html
+import netrender.journal
+import netrender.regions
 import netrender.thumbnail as thumbnail
 
+# Adaptive chunks: maximum frames per dispatch, smoothing of the slave speeds
+MAX_CHUNKS = 100
+SPEED_SMOOTHING = 0.3
+# Speculative dispatch of frames taking more than this times their expected render time
+SPECULATIVE_FACTOR = 2.0
+
 class MRenderFile(netrender.model.RenderFile):
     def __init__(self, filepath, index, start, end, signature):
         super().__init__(filepath, index, start, end, signature)
@@ -65,16 +74,27 @@ class MRenderSlave(netrender.model.RenderSlave):
         self.job = None
         self.job_frames = []
 
+        # frame render time relative to the average of the job, smoothed
+        self.speed = 1.0
+
         netrender.model.RenderSlave._slave_map[self.id] = self
 
+    def __setstate__(self, state):
+        state.setdefault("speed", 1.0)
+        self.__dict__.update(state)
+
     def seen(self):
         self.last_seen = time.time()
 
-    def finishedFrame(self, frame_number):
+    def addFrameTime(self, frame_time, average_time):
+        if average_time > 0:
+            self.speed += SPEED_SMOOTHING * (frame_time / average_time - self.speed)
+
+    def finishedFrame(self, frame_key):
         try:
-            self.job_frames.remove(frame_number)
+            self.job_frames.remove(frame_key)
         except ValueError as e:
-            print("Internal error: Frame %i not in job frames list" % frame_number)
+            print("Internal error: Frame %s not in job frames list" % (frame_key,))
             print(self.job_frames)
         if not self.job_frames:
             self.job = None
@@ -86,8 +106,8 @@ class MRenderJob(netrender.model.RenderJob):
         self.last_dispatched = time.time()
         self.start_time = time.time()
         self.finish_time = self.start_time
-        # force one chunk for process jobs
-        if self.type == netrender.model.JOB_PROCESS:
+        # force one chunk for process jobs, and jobs split in regions (a render process renders one region)
+        if self.type == netrender.model.JOB_PROCESS or self.regions:
             self.chunks = 1
 
         # Force WAITING status on creation
@@ -98,6 +118,41 @@ class MRenderJob(netrender.model.RenderJob):
         self.save_path = ""
         self.files = [MRenderFile(rfile.filepath, rfile.index, rfile.start, rfile.end, rfile.signature) for rfile in job_info.files]
 
+        # render time of the finished frames
+        self.frames_time = 0.0
+        self.frames_timed = 0
+
+        self.initIndex()
+
+    def __setstate__(self, state):
+        state.setdefault("frames_time", 0.0)
+        state.setdefault("frames_timed", 0)
+        state.setdefault("regions", 0)
+        self.__dict__.update(state)
+        self.initIndex()
+
+    def initIndex(self):
+        # frame lookup and frame counters, kept up to date by the frames themselves
+        self.frames_map = {}
+        self.frames_count = {
+                                netrender.model.FRAME_QUEUED: 0,
+                                netrender.model.FRAME_DISPATCHED: 0,
+                                netrender.model.FRAME_DONE: 0,
+                                netrender.model.FRAME_ERROR: 0
+                            }
+        self.numbers_map = {} # frame number -> frame, or its regions
+        self.slaves_count = {} # slave -> number of frames dispatched to it
+        self.queued_cursor = 0 # no queued frame before this index
+        self.dispatched = set() # frames with the dispatched status, anywhere before the queued cursor
+        self.merging = set() # numbers of the frames whose regions are being merged
+
+        for index, frame in enumerate(self.frames):
+            frame.job = self
+            frame.index = index
+            self.frames_map[frame.key] = frame
+            self.numbers_map.setdefault(frame.number, []).append(frame)
+            self.frameStatusChanged(frame, None, frame.status)
+
     def setForceUpload(self, force):
         for rfile in self.files:
             rfile.force = force
@@ -134,10 +189,7 @@ class MRenderJob(netrender.model.RenderJob):
         return True
 
     def testFinished(self):
-        for f in self.frames:
-            if f.status in {netrender.model.FRAME_QUEUED, netrender.model.FRAME_DISPATCHED, netrender.model.FRAME_ERROR}:
-                break
-        else:
+        if self.frames_count[netrender.model.FRAME_DONE] == len(self.frames):
             self.status = netrender.model.JOB_FINISHED
             self.finish_time=time.time()
 
@@ -161,16 +213,77 @@ class MRenderJob(netrender.model.RenderJob):
         log_name = "%06d_%06d.log" % (frames[0], frames[-1])
         log_path = os.path.join(self.save_path, log_name)
 
+        # regions of a frame share its log
         for number in frames:
-            frame = self[number]
-            if frame:
+            for frame in self.framesOf(number):
                 frame.log_path = log_path
 
-    def addFrame(self, frame_number, command):
-        frame = MRenderFrame(frame_number, command)
+    def addFrame(self, frame_number, command, region = -1):
+        frame = MRenderFrame(frame_number, command, region)
+        frame.job = self
+        frame.index = len(self.frames)
         self.frames.append(frame)
+        self.frames_map[frame.key] = frame
+        self.numbers_map.setdefault(frame_number, []).append(frame)
+        self.frameStatusChanged(frame, None, frame.status)
         return frame
 
+    def framesOf(self, frame_number):
+        """The frame with this number, or all its regions"""
+        return self.numbers_map.get(frame_number, [])
+
+    def resultStatus(self, frame_number):
+        """Status of the render of a frame, with all its regions"""
+        statuses = set(frame.status for frame in self.framesOf(frame_number))
+        for status in (netrender.model.FRAME_ERROR, netrender.model.FRAME_DISPATCHED, netrender.model.FRAME_QUEUED):
+            if status in statuses:
+                return status
+        return netrender.model.FRAME_DONE
+
+    def frameStatusChanged(self, frame, old_status, new_status):
+        if old_status is not None:
+            self.frames_count[old_status] -= 1
+            if old_status == netrender.model.FRAME_DISPATCHED:
+                self.removeSlaveFrame(frame.slave)
+                self.dispatched.discard(frame)
+
+        self.frames_count[new_status] += 1
+        if new_status == netrender.model.FRAME_DISPATCHED:
+            self.addSlaveFrame(frame.slave)
+            self.dispatched.add(frame)
+        elif new_status == netrender.model.FRAME_QUEUED:
+            self.queued_cursor = min(self.queued_cursor, frame.index)
+
+    def frameSlaveChanged(self, frame, old_slave, new_slave):
+        if frame.status == netrender.model.FRAME_DISPATCHED:
+            self.removeSlaveFrame(old_slave)
+            self.addSlaveFrame(new_slave)
+
+    def addSlaveFrame(self, slave):
+        self.slaves_count[slave] = self.slaves_count.get(slave, 0) + 1
+
+    def removeSlaveFrame(self, slave):
+        count = self.slaves_count.get(slave, 0) - 1
+        if count > 0:
+            self.slaves_count[slave] = count
+        else:
+            self.slaves_count.pop(slave, None)
+
+    def countFrames(self, status=netrender.model.FRAME_QUEUED):
+        return self.frames_count[status]
+
+    def countSlaves(self):
+        return len(self.slaves_count)
+
+    def framesStatus(self):
+        return dict(self.frames_count)
+
+    def __contains__(self, frame_key):
+        return frame_key in self.frames_map
+
+    def __getitem__(self, frame_key):
+        return self.frames_map.get(frame_key)
+
     def reset(self, all):
         for f in self.frames:
             f.reset(all)
@@ -178,14 +291,117 @@ class MRenderJob(netrender.model.RenderJob):
         if all:
             self.status = netrender.model.JOB_QUEUED
 
-    def getFrames(self):
+    def frameTime(self):
+        """Average render time of the finished frames, 0 if none is finished yet"""
+        if self.frames_timed:
+            return self.frames_time / self.frames_timed
+        return 0
+
+    def usesAdaptiveChunks(self):
+        return self.type == netrender.model.JOB_BLENDER and self.subtype == netrender.model.JOB_SUB_RENDER and not self.regions
+
+    def chunkSize(self, slave, chunk_time, slaves_count):
+        """
+        Number of frames to dispatch at once to slave, so it renders them in about chunk_time seconds.
+        The job chunk size is used until a frame is finished, or if chunk_time is 0.
+        """
+        chunks = self.chunks
+        if chunk_time > 0 and self.usesAdaptiveChunks():
+            frame_time = self.frameTime()
+            if frame_time:
+                chunks = int(chunk_time / (frame_time * slave.speed))
+                chunks = min(max(chunks, 1), MAX_CHUNKS)
+
+            # near the end of the job, split the remaining frames between slaves
+            # so one big chunk doesn't finish long after the others
+            queued = self.frames_count[netrender.model.FRAME_QUEUED]
+            chunks = min(chunks, max(math.ceil(queued / max(slaves_count, 1)), 1))
+        return chunks
+
+    def dispatchFrames(self, frames, slave):
+        for f in frames:
+            print("dispatch", f.number)
+            if f.status == netrender.model.FRAME_DISPATCHED:
+                # speculative copy, the first result wins
+                f.speculative_slave = slave
+            else:
+                f.status = netrender.model.FRAME_DISPATCHED
+                f.slave = slave
+            f.dispatch_time = time.time()
+
+        slave.job = self
+        slave.job_frames = [f.key for f in frames]
+
+    def getStraggler(self, slave, speculative_factor):
+        """
+        Slowest dispatched frame taking more than speculative_factor times the expected render time,
+        once no frame is queued anymore. None if there is no such frame.
+        """
+        frame_time = self.frameTime()
+        if not frame_time or self.frames_count[netrender.model.FRAME_QUEUED] or not self.usesAdaptiveChunks():
+            return None
+
+        now = time.time()
+        straggler = None
+        straggler_late = 0
+        for f in self.dispatched:
+            if not f.speculative_slave and f.slave is not slave:
+                expected = frame_time * (f.slave.speed if f.slave else 1.0)
+                late = (now - f.dispatch_time) / expected
+                if late > speculative_factor and late > straggler_late:
+                    straggler = f
+                    straggler_late = late
+
+        return straggler
+
+    def finishFrame(self, frame, slave, result, frame_time):
+        """
+        Record the result of a frame rendered by slave.
+        Returns False when the result is ignored, because the frame was already done by another slave,
+        or failed while another slave still renders it.
+        """
+        if frame.status == netrender.model.FRAME_DONE:
+            return False
+
+        if frame.speculative_slave:
+            if result != netrender.model.FRAME_DONE:
+                # the other slave is still rendering this frame
+                if frame.speculative_slave is not slave:
+                    frame.slave = frame.speculative_slave
+                frame.speculative_slave = None
+                return False
+
+            frame.speculative_slave = None
+
+        if result == netrender.model.FRAME_DONE:
+            slave.addFrameTime(frame_time, self.frameTime() or frame_time)
+            self.frames_time += frame_time
+            self.frames_timed += 1
+
+        frame.status = result
+        frame.time = frame_time
+        return True
+
+    def getFrames(self, chunks = None):
+        if chunks is None:
+            chunks = self.chunks
+
         frames = []
-        for f in self.frames:
+        if not self.frames_count[netrender.model.FRAME_QUEUED]:
+            return frames
+
+        index = self.queued_cursor
+        while index < len(self.frames):
+            f = self.frames[index]
             if f.status == netrender.model.FRAME_QUEUED:
                 self.last_dispatched = time.time()
                 frames.append(f)
-                if len(frames) >= self.chunks:
+                if len(frames) >= chunks:
                     break
+            elif not frames:
+                # frames before the first queued one won't be queued again until reset
+                self.queued_cursor = index + 1
+            index += 1
 
         return frames
 
@@ -193,9 +409,18 @@ class MRenderJob(netrender.model.RenderJob):
         return os.path.join(self.save_path, filename)
 
 class MRenderFrame(netrender.model.RenderFrame):
-    def __init__(self, frame, command):
+    def __init__(self, frame, command, region = -1):
+        # set by the job when the frame is added, used to keep its counters up to date
+        self.job = None
+        self.index = 0
+        self._status = None
+        self._slave = None
+        # second slave rendering the frame, see RenderMasterServer.use_speculative
+        self.speculative_slave = None
+        self.dispatch_time = 0
         super().__init__()
         self.number = frame
+        self.region = region
         self.slave = None
         self.time = 0
         self.status = netrender.model.FRAME_QUEUED
@@ -203,15 +428,60 @@ class MRenderFrame(netrender.model.RenderFrame):
 
         self.log_path = None
 
+    def __setstate__(self, state):
+        # older saves stored status and slave as plain attributes
+        if "status" in state:
+            state["_status"] = state.pop("status")
+        if "slave" in state:
+            state["_slave"] = state.pop("slave")
+        state.setdefault("job", None)
+        state.setdefault("index", 0)
+        state.setdefault("speculative_slave", None)
+        state.setdefault("dispatch_time", 0)
+        state.setdefault("region", -1)
+        self.__dict__.update(state)
+
+    @property
+    def status(self):
+        return self._status
+
+    @status.setter
+    def status(self, value):
+        old_status = self._status
+        self._status = value
+        if self.job and old_status != value:
+            self.job.frameStatusChanged(self, old_status, value)
+
+    @property
+    def slave(self):
+        return self._slave
+
+    @slave.setter
+    def slave(self, value):
+        old_slave = self._slave
+        self._slave = value
+        if self.job and old_slave is not value:
+            self.job.frameSlaveChanged(self, old_slave, value)
+
     def addDefaultRenderResult(self):
-        self.results.append(self.getRenderFilename())
+        # frames rendered or merged again keep the same result file
+        filename = self.getFrameFilename()
+        if filename not in self.results:
+            self.results.append(filename)
 
     def getRenderFilename(self):
+        if self.region != -1:
+            return "%06d_region%03d.exr" % (self.number, self.region)
+        return self.getFrameFilename()
+
+    def getFrameFilename(self):
+        """Render of the whole frame, merged from the regions renders when split"""
         return "%06d.exr" % self.number
 
     def reset(self, all):
         if all or self.status == netrender.model.FRAME_ERROR:
             self.log_path = None
+            self.speculative_slave = None
             self.slave = None
             self.time = 0
             self.status = netrender.model.FRAME_QUEUED
@@ -221,6 +491,45 @@ class MRenderFrame(netrender.model.RenderFrame):
 # =-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-
 # -=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
 # =-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-
+def restoreJob(data):
+    """Job from its journal state, frames being rendered when the master stopped are queued again"""
+    job_info = netrender.model.RenderJob.materialize(dict(data, frames=[]))
+    job = MRenderJob(data["id"], job_info)
+    for rfile, file_data in zip(job.files, data["files"]):
+        rfile.original_path = file_data["original_path"]
+        rfile.force = file_data["force"]
+        rfile.updateStatus()
+
+    for frame_data in data["frames"]:
+        frame = job.addFrame(frame_data["number"], frame_data["command"], frame_data.get("region", -1))
+        if frame_data["status"] != netrender.model.FRAME_DISPATCHED:
+            frame.status = frame_data["status"]
+        frame.time = frame_data["time"]
+        frame.results = frame_data["results"]
+        frame.log_path = frame_data["log_path"]
+
+    # set directly, these aren't transitions
+    job._status = data["status"]
+    job.transitions = [tuple(transition) for transition in data["transitions"]]
+    job.usage = data["usage"]
+    job.last_dispatched = data["last_dispatched"]
+    job.resolution = data["resolution"]
+    job.save_path = data["save_path"]
+    job.start_time = data["start_time"]
+    job.finish_time = data["finish_time"]
+    job.frames_time = data["frames_time"]
+    job.frames_timed = data["frames_timed"]
+
+    return job
+
+def restoreSlave(data):
+    slave_info = netrender.model.RenderSlave.materialize(data, cache = False)
+    slave_info.address = tuple(slave_info.address)
+    slave = MRenderSlave(slave_info)
+    slave.total_done = slave_info.total_done
+    slave.total_error = slave_info.total_error
+    return slave
+
 file_pattern = re.compile("/file_([a-zA-Z0-9]+)_([0-9]+)")
 render_pattern = re.compile("/render_([a-zA-Z0-9]+)_([0-9]+).exr")
 result_pattern = re.compile("/result_([a-zA-Z0-9]+).zip")
@@ -231,14 +540,100 @@ cancel_pattern = re.compile("/cancel_([a-zA-Z0-9]+)")
 pause_pattern = re.compile("/pause_([a-zA-Z0-9]+)")
 edit_pattern = re.compile("/edit_([a-zA-Z0-9]+)")
 
+# Time between slave timeouts and usage updates
+UPDATE_INTERVAL = 2
+
 class RenderHandler(http.server.BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive, so slaves don't reconnect for every request
+    protocol_version = "HTTP/1.1"
+    timeout = KEEP_ALIVE_TIMEOUT
+
+    @contextlib.contextmanager
+    def unlocked(self):
+        """Let other requests use the server while transferring data"""
+        self.server.lock.release()
+        try:
+            yield
+        finally:
+            self.server.lock.acquire()
+
+    def frameKey(self):
+        """Key of the frame a slave request is about"""
+        return netrender.model.frameKey(int(self.headers.get('job-frame', -1)), int(self.headers.get('job-region', -1)))
+
+    def frameResult(self, job, frame_number):
+        """
+        Status and render path of a frame.
+        Regions are merged when they are all rendered, failing merges set them in error.
+        """
+        frames = job.framesOf(frame_number)
+        status = job.resultStatus(frame_number)
+        filename = job.getResultPath(frames[0].getFrameFilename())
+
+        if status == netrender.model.FRAME_DONE and frames[0].region != -1 and not os.path.exists(filename):
+            if frame_number in job.merging:
+                # merged by another request
+                return netrender.model.FRAME_DISPATCHED, filename
+
+            job.merging.add(frame_number)
+            try:
+                with self.unlocked():
+                    netrender.regions.merge([job.getResultPath(frame.getRenderFilename()) for frame in frames], filename)
+            except (OSError, ValueError) as e:
+                print("Error merging regions of frame %i:" % frame_number, e)
+                for frame in frames:
+                    frame.status = netrender.model.FRAME_ERROR
+                    self.server.journalFrame(job, frame)
+                status = netrender.model.FRAME_ERROR
+            else:
+                frames[0].addDefaultRenderResult()
+                self.server.journalFrame(job, frames[0])
+            finally:
+                job.merging.discard(frame_number)
+
+        return status, filename
+
     def write_file(self, file_path, mode = 'wb'):
         length = int(self.headers['content-length'])
-        f = open(file_path, mode)
-        buf = self.rfile.read(length)
-        f.write(buf)
-        f.close()
-        del buf
+        with self.unlocked(), open(file_path, mode) as f:
+            while length > 0:
+                buf = self.rfile.read(min(length, FILE_BUFFER_SIZE))
+                if not buf:
+                    break
+                f.write(buf)
+                length -= len(buf)
+
+    def send_file(self, file_path, content = "application/octet-stream"):
+        # Supports a single "bytes=start-" range, used by slaves to resume downloads
+        file_size = os.path.getsize(file_path)
+        start = 0
+        range_header = self.headers.get('range', "")
+        if range_header.startswith("bytes=") and range_header.endswith("-"):
+            try:
+                start = int(range_header[6:-1])
+            except ValueError:
+                start = 0
+            if not 0 < start < file_size:
+                start = 0
+
+        with self.unlocked(), open(file_path, 'rb') as f:
+            if start:
+                f.seek(start)
+                self.send_head(http.client.PARTIAL_CONTENT, headers={
+                    "content-length": file_size - start,
+                    "content-range": "bytes %i-%i/%i" % (start, file_size - 1, file_size),
+                    }, content = content)
+            else:
+                self.send_head(headers={"content-length": file_size}, content = content)
+            shutil.copyfileobj(f, self.wfile, FILE_BUFFER_SIZE)
+
+    def send_content(self, data, code = http.client.OK, headers = {}, content = "application/octet-stream"):
+        if isinstance(data, str):
+            data = bytes(data, encoding='utf8')
+        headers = dict(headers)
+        headers["content-length"] = len(data)
+        self.send_head(code, headers, content)
+        self.wfile.write(data)
 
     def log_message(self, format, *args):
         # override because the original calls self.address_string(), which
@@ -257,23 +652,53 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
     def send_head(self, code = http.client.OK, headers = {}, content = "application/octet-stream"):
         self.send_response(code)
 
-        if code == http.client.OK and content:
+        has_body = code == http.client.OK and content and self.command != "HEAD"
+
+        if has_body:
             self.send_header("Content-type", content)
 
         for key, value in headers.items():
             self.send_header(key, value)
 
+        if not any(key.lower() == "content-length" for key in headers):
+            if has_body:
+                # body of unknown length, delimited by closing the connection
+                self.send_header("Connection", "close")
+                self.close_connection = True
+            else:
+                self.send_header("Content-Length", "0")
+
+        if code != http.client.OK and int(self.headers.get('content-length', 0)) > 0:
+            # the request body might not have been read
+            self.send_header("Connection", "close")
+            self.close_connection = True
+
         self.end_headers()
 
     def do_HEAD(self):
+        with self.server.lock:
+            self.handle_HEAD()
+
+    def do_GET(self):
+        with self.server.lock:
+            self.handle_GET()
+
+    def do_POST(self):
+        with self.server.lock:
+            self.handle_POST()
+
+    def do_PUT(self):
+        with self.server.lock:
+            self.handle_PUT()
+
+    def handle_HEAD(self):
 
         if self.path == "/status":
             job_id = self.headers.get('job-id', "")
-            job_frame = int(self.headers.get('job-frame', -1))
 
             job = self.server.getJobID(job_id)
             if job:
-                frame = job[job_frame]
+                frame = job[self.frameKey()]
 
 
                 if frame:
@@ -291,12 +716,11 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
     # -=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
     # =-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-
 
-    def do_GET(self):
+    def handle_GET(self):
 
         if self.path == "/version":
-            self.send_head()
             self.server.stats("", "Version check")
-            self.wfile.write(VERSION)
+            self.send_content(VERSION)
         # =-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-
         elif self.path.startswith("/render"):
             match = render_pattern.match(self.path)
@@ -308,21 +732,16 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
                 job = self.server.getJobID(job_id)
 
                 if job:
-                    frame = job[frame_number]
+                    if job.framesOf(frame_number):
+                        status, filename = self.frameResult(job, frame_number)
 
-                    if frame:
-                        if frame.status in {netrender.model.FRAME_QUEUED, netrender.model.FRAME_DISPATCHED}:
+                        if status in {netrender.model.FRAME_QUEUED, netrender.model.FRAME_DISPATCHED}:
                             self.send_head(http.client.ACCEPTED)
-                        elif frame.status == netrender.model.FRAME_DONE:
+                        elif status == netrender.model.FRAME_DONE:
                             self.server.stats("", "Sending result to client")
 
-                            filename = job.getResultPath(frame.getRenderFilename())
-
-                            f = open(filename, 'rb')
-                            self.send_head(content = "image/x-exr")
-                            shutil.copyfileobj(f, self.wfile)
-                            f.close()
-                        elif frame.status == netrender.model.FRAME_ERROR:
+                            self.send_file(filename, content = "image/x-exr")
+                        elif status == netrender.model.FRAME_ERROR:
                             self.send_head(http.client.PARTIAL_CONTENT)
                     else:
                         # no such frame
@@ -346,19 +765,15 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
                     self.server.stats("", "Sending result to client")
 
                     zip_filepath = job.getResultPath("results.zip")
-                    with zipfile.ZipFile(zip_filepath, "w") as zfile:
-                        for frame in job.frames:
-                            if frame.status == netrender.model.FRAME_DONE:
-                                for filename in frame.results:
-                                    filepath = job.getResultPath(filename)
+                    filenames = [filename for frame in job.frames if frame.status == netrender.model.FRAME_DONE for filename in frame.results]
 
-                                    zfile.write(filepath, filename)
+                    with self.unlocked(), zipfile.ZipFile(zip_filepath, "w") as zfile:
+                        for filename in filenames:
+                            filepath = job.getResultPath(filename)
 
+                            zfile.write(filepath, filename)
 
-                    f = open(zip_filepath, 'rb')
-                    self.send_head(content = "application/x-zip-compressed")
-                    shutil.copyfileobj(f, self.wfile)
-                    f.close()
+                    self.send_file(zip_filepath, content = "application/x-zip-compressed")
                 else:
                     # no such job id
                     self.send_head(http.client.NO_CONTENT)
@@ -376,25 +791,21 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
                 job = self.server.getJobID(job_id)
 
                 if job:
-                    frame = job[frame_number]
+                    if job.framesOf(frame_number):
+                        status, filename = self.frameResult(job, frame_number)
 
-                    if frame:
-                        if frame.status in {netrender.model.FRAME_QUEUED, netrender.model.FRAME_DISPATCHED}:
+                        if status in {netrender.model.FRAME_QUEUED, netrender.model.FRAME_DISPATCHED}:
                             self.send_head(http.client.ACCEPTED)
-                        elif frame.status == netrender.model.FRAME_DONE:
-                            filename = job.getResultPath(frame.getRenderFilename())
-
-                            thumbname = thumbnail.generate(filename)
+                        elif status == netrender.model.FRAME_DONE:
+                            with self.unlocked():
+                                thumbname = thumbnail.generate(filename)
 
                             if thumbname:
-                                f = open(thumbname, 'rb')
-                                self.send_head(content = "image/jpeg")
-                                shutil.copyfileobj(f, self.wfile)
-                                f.close()
+                                self.send_file(thumbname, content = "image/jpeg")
                             else: # thumbnail couldn't be generated
                                 self.send_head(http.client.PARTIAL_CONTENT)
                                 return
-                        elif frame.status == netrender.model.FRAME_ERROR:
+                        elif status == netrender.model.FRAME_ERROR:
                             self.send_head(http.client.PARTIAL_CONTENT)
                     else:
                         # no such frame
@@ -416,20 +827,15 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
                 job = self.server.getJobID(job_id)
 
                 if job:
-                    frame = job[frame_number]
+                    frames = job.framesOf(frame_number)
 
-                    if frame:
-                        if not frame.log_path or frame.status in {netrender.model.FRAME_QUEUED, netrender.model.FRAME_DISPATCHED}:
+                    if frames:
+                        frame = frames[0]
+                        if not frame.log_path or job.resultStatus(frame_number) in {netrender.model.FRAME_QUEUED, netrender.model.FRAME_DISPATCHED}:
                             self.send_head(http.client.PROCESSING)
                         else:
                             self.server.stats("", "Sending log to client")
-                            f = open(frame.log_path, 'rb')
-
-                            self.send_head(content = "text/plain")
-
-                            shutil.copyfileobj(f, self.wfile)
-
-                            f.close()
+                            self.send_file(frame.log_path, content = "text/plain")
                     else:
                         # no such frame
                         self.send_head(http.client.NO_CONTENT)
@@ -449,7 +855,7 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
                 job = self.server.getJobID(job_id)
                 if job:
                     if job_frame != -1:
-                        frame = job[frame]
+                        frame = job[self.frameKey()]
 
                         if frame:
                             message = frame.serialize()
@@ -471,8 +877,7 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
 
 
             self.server.stats("", "Sending status")
-            self.send_head()
-            self.wfile.write(bytes(json.dumps(message), encoding='utf8'))
+            self.send_content(json.dumps(message))
 
         # =-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-
         elif self.path == "/job":
@@ -486,18 +891,10 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
                 job, frames = self.server.newDispatch(slave)
 
                 if job and frames:
-                    for f in frames:
-                        print("dispatch", f.number)
-                        f.status = netrender.model.FRAME_DISPATCHED
-                        f.slave = slave
-
-                    slave.job = job
-                    slave.job_frames = [f.number for f in frames]
-
-                    self.send_head(headers={"job-id": job.id})
+                    job.dispatchFrames(frames, slave)
 
                     message = job.serialize(frames)
-                    self.wfile.write(bytes(json.dumps(message), encoding='utf8'))
+                    self.send_content(json.dumps(message), headers={"job-id": job.id})
 
                     self.server.stats("", "Sending job to slave")
                 else:
@@ -530,12 +927,7 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
 
                     if render_file:
                         self.server.stats("", "Sending file to slave")
-                        f = open(render_file.filepath, 'rb')
-
-                        self.send_head()
-                        shutil.copyfileobj(f, self.wfile)
-
-                        f.close()
+                        self.send_file(render_file.filepath)
                     else:
                         # no such file
                         self.send_head(http.client.NO_CONTENT)
@@ -553,9 +945,7 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
             for slave in self.server.slaves:
                 message.append(slave.serialize())
 
-            self.send_head()
-
-            self.wfile.write(bytes(json.dumps(message), encoding='utf8'))
+            self.send_content(json.dumps(message))
         # =-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-
         else:
             # hand over the rest to the html section
@@ -566,7 +956,9 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
     # =-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-
     # -=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
     # =-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-
-    def do_POST(self):
+    def handle_POST(self):
+        # requests changing jobs, frames or rules can change the balancing order
+        self.server.balancer.invalidate()
 
         # =-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-
         if self.path == "/job":
@@ -581,7 +973,11 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
             job.setForceUpload(self.server.force)
 
             for frame in job_info.frames:
-                frame = job.addFrame(frame.number, frame.command)
+                if job.regions:
+                    for region in range(job.regions):
+                        job.addFrame(frame.number, frame.command, region)
+                else:
+                    job.addFrame(frame.number, frame.command)
 
             self.server.addJob(job)
 
@@ -589,6 +985,7 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
 
             if job.testStart():
                 self.server.stats("", "New job, started")
+                self.server.journalJobStatus(job)
                 self.send_head(headers=headers, content = None)
             else:
                 self.server.stats("", "New job, missing files (%i total)" % len(job.files))
@@ -606,6 +1003,7 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
                     info_map = self.getInfoMap()
 
                     job.edit(info_map)
+                    self.server.journalJobStatus(job)
                     self.send_head(content = None)
                 else:
                     # no such job id
@@ -671,6 +1069,7 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
                 if job:
                     self.server.stats("", "Pausing job")
                     job.pause(status)
+                    self.server.journalJobStatus(job)
                     self.send_head(content = None)
                 else:
                     # no such job id
@@ -702,10 +1101,12 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
                 if job:
                     if job_frame != 0:
 
-                        frame = job[job_frame]
-                        if frame:
+                        frames = job.framesOf(job_frame)
+                        if frames:
                             self.server.stats("", "Reset job frame")
-                            frame.reset(all)
+                            for frame in frames:
+                                frame.reset(all)
+                                self.server.journalFrame(job, frame)
                             self.send_head(content = None)
                         else:
                             # no such frame
@@ -714,6 +1115,7 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
                     else:
                         self.server.stats("", "Reset job")
                         job.reset(all)
+                        self.server.journalJob(job)
                         self.send_head(content = None)
 
                 else: # job not found
@@ -750,6 +1152,9 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
                 if job:
                     self.server.stats("", "Log announcement")
                     job.addLog(log_info.frames)
+                    for number in log_info.frames:
+                        for frame in job.framesOf(number):
+                            self.server.journalFrame(job, frame)
                     self.send_head(content = None)
                 else:
                     # no such job id
@@ -761,7 +1166,9 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
     # =-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-
     # -=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=
     # =-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-
-    def do_PUT(self):
+    def handle_PUT(self):
+        # requests changing jobs, frames or rules can change the balancing order
+        self.server.balancer.invalidate()
 
         # =-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-
         if self.path.startswith("/file"):
@@ -796,6 +1203,8 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
                         rfile.filepath = file_path # set the new path
                         found = rfile.updateStatus() # make sure we have the right file
 
+                        self.server.journalJob(job)
+
                         if not found: # checksum mismatch
                             self.server.stats("", "File upload but checksum mismatch, this shouldn't happen")
                             self.send_head(http.client.CONFLICT)
@@ -828,7 +1237,7 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
                 job = self.server.getJobID(job_id)
 
                 if job:
-                    job_frame = int(self.headers['job-frame'])
+                    job_frame = self.frameKey()
                     job_result = int(self.headers['job-result'])
                     job_time = float(self.headers['job-time'])
 
@@ -837,23 +1246,42 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
                     if frame:
                         self.send_head(content = None)
 
-                        if job.hasRenderResult():
-                            if job_result == netrender.model.FRAME_DONE:
-                                frame.addDefaultRenderResult()
-                                self.write_file(job.getResultPath(frame.getRenderFilename()))
+                        if frame.status == netrender.model.FRAME_DONE:
+                            # already rendered by another slave (speculative dispatch), drop this result
+                            if job.hasRenderResult() and job_result == netrender.model.FRAME_DONE:
+                                self.write_file(os.devnull)
+
+                            slave.finishedFrame(job_frame)
+                        else:
+                            if job.hasRenderResult():
+                                if job_result == netrender.model.FRAME_DONE:
+                                    if frame.region == -1:
+                                        frame.addDefaultRenderResult()
+                                    else:
+                                        # merged again with this region
+                                        merged_path = job.getResultPath(frame.getFrameFilename())
+                                        if os.path.exists(merged_path):
+                                            os.remove(merged_path)
+                                    self.write_file(job.getResultPath(frame.getRenderFilename()))
+
+                                elif job_result == netrender.model.FRAME_ERROR:
+                                    # blacklist slave on this job on error
+                                    # slaves might already be in blacklist if errors on the whole chunk
+                                    if not slave.id in job.blacklist:
+                                        job.blacklist.append(slave.id)
+
+                            slave.finishedFrame(job_frame)
 
-                            elif job_result == netrender.model.FRAME_ERROR:
-                                # blacklist slave on this job on error
-                                # slaves might already be in blacklist if errors on the whole chunk
-                                if not slave.id in job.blacklist:
-                                    job.blacklist.append(slave.id)
+                            job.finishFrame(frame, slave, job_result, job_time)
 
-                        slave.finishedFrame(job_frame)
+                            job.testFinished()
 
-                        frame.status = job_result
-                        frame.time = job_time
+                            self.server.journalFrame(job, frame)
+                            self.server.journalJobStatus(job)
 
-                        job.testFinished()
+                            # merge regions as soon as the last one is rendered
+                            if frame.region != -1 and job.hasRenderResult():
+                                self.frameResult(job, frame.number)
 
                     else: # frame not found
                         self.send_head(http.client.NO_CONTENT)
@@ -875,7 +1303,7 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
                 job = self.server.getJobID(job_id)
 
                 if job:
-                    job_frame = int(self.headers['job-frame'])
+                    job_frame = self.frameKey()
 
                     frame = job[job_frame]
 
@@ -899,6 +1327,9 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
                             frame.time = job_time
 
                             job.testFinished()
+
+                            self.server.journalFrame(job, frame)
+                            self.server.journalJobStatus(job)
                     else: # frame not found
                         self.send_head(http.client.NO_CONTENT)
                 else: # job not found
@@ -919,15 +1350,13 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
                 job = self.server.getJobID(job_id)
 
                 if job:
-                    job_frame = int(self.headers['job-frame'])
-
-                    frame = job[job_frame]
+                    frame = job[self.frameKey()]
 
                     if frame:
                         self.send_head(content = None)
 
                         if job.hasRenderResult():
-                            self.write_file(os.path.join(os.path.join(job.save_path, "%06d.jpg" % job_frame)))
+                            self.write_file(os.path.join(os.path.join(job.save_path, "%06d.jpg" % frame.number)))
 
                     else: # frame not found
                         self.send_head(http.client.NO_CONTENT)
@@ -949,7 +1378,8 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
                 if job:
                     job_frame = int(match.groups()[1])
 
-                    frame = job[job_frame]
+                    frames = job.framesOf(job_frame)
+                    frame = frames[0] if frames else None
 
                     if frame and frame.log_path:
                         self.send_head(content = None)
@@ -966,7 +1396,22 @@ class RenderHandler(http.server.BaseHTTPRequestHandler):
                 self.send_head(http.client.NO_CONTENT)
 
 class RenderMasterServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
-    def __init__(self, address, handler_class, path, force=False, subdir=True):
+    # one thread per connection, kept alive connections don't hold the server when closing
+    daemon_threads = True
+    # slaves connecting at the same time when the master starts
+    request_queue_size = 128
+
+    def __init__(self, address, handler_class, path, force=False, subdir=True, chunk_time=0, use_speculative=False):
+        # held by requests while they use jobs and slaves
+        self.lock = threading.Lock()
+
+        # state changes are recorded here when set, see createMaster
+        self.journal = None
+
+        # target render time of a dispatch, 0 to use the job chunk size
+        self.chunk_time = chunk_time
+        # render frames late at the end of jobs again on idle slaves
+        self.use_speculative = use_speculative
         self.jobs = []
         self.jobs_map = {}
         self.slaves = []
@@ -1013,17 +1458,50 @@ class RenderMasterServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
         self.job_id += 1
         return str(self.job_id)
 
+    def state(self):
+        """Serialized jobs and slaves, for the journal snapshots"""
+        return {
+                    "path": self.path,
+                    "jobs": [netrender.journal.jobState(job) for job in self.jobs],
+                    "slaves": [slave.serialize() for slave in self.slaves]
+                }
+
+    def journalJob(self, job):
+        if self.journal:
+            self.journal.append({"op": "job", "job": netrender.journal.jobState(job)})
+
+    def journalJobStatus(self, job):
+        if self.journal:
+            self.journal.append({"op": "job_status", "job": netrender.journal.jobStatusState(job)})
+
+    def journalFrame(self, job, frame):
+        if self.journal:
+            self.journal.append({
+                                    "op": "frame",
+                                    "job": job.id,
+                                    "frame": netrender.journal.frameState(frame),
+                                    "frames_time": job.frames_time,
+                                    "frames_timed": job.frames_timed,
+                                    "last_dispatched": job.last_dispatched
+                                })
+
     def addSlave(self, slave_info):
         slave = MRenderSlave(slave_info)
         self.slaves.append(slave)
         self.slaves_map[slave.id] = slave
 
+        if self.journal:
+            self.journal.append({"op": "slave", "slave": slave.serialize()})
+
         return slave.id
 
     def removeSlave(self, slave):
         self.slaves.remove(slave)
         self.slaves_map.pop(slave.id)
 
+        if self.journal:
+            self.journal.append({"op": "remove_slave", "id": slave.id})
+
     def getSlave(self, slave_id):
         return self.slaves_map.get(slave_id)
 
@@ -1045,11 +1523,21 @@ class RenderMasterServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
 
                 if slave.job:
                     for f in slave.job_frames:
-                        slave.job[f].status = netrender.model.FRAME_ERROR
+                        frame = slave.job[f]
+                        slave.job.finishFrame(frame, slave, netrender.model.FRAME_ERROR, 0)
+                        self.journalFrame(slave.job, frame)
 
         for slave in removed:
             self.removeSlave(slave)
 
+    def update(self):
+        with self.lock:
+            self.timeoutSlaves()
+            self.updateUsage()
+
+            if self.journal and self.journal.needsCompaction():
+                self.journal.compact(self.state())
+
     def updateUsage(self):
         blend = 0.5
         for job in self.jobs:
@@ -1062,6 +1550,7 @@ class RenderMasterServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
                 if slave.job:
                     slave.job.usage += slave_usage
 
+        self.balancer.invalidate()
 
     def clear(self, clear_files = False):
         removed = self.jobs[:]
@@ -1090,6 +1579,9 @@ class RenderMasterServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
         self.jobs.remove(job)
         self.jobs_map.pop(job.id)
 
+        if self.journal:
+            self.journal.append({"op": "remove_job", "id": job.id})
+
         if clear_files:
             shutil.rmtree(job.save_path)
 
@@ -1108,6 +1600,8 @@ class RenderMasterServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
 
         job.save()
 
+        self.journalJob(job)
+
     def getJobID(self, id):
         return self.jobs_map.get(id)
 
@@ -1117,45 +1611,91 @@ class RenderMasterServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
 
     def newDispatch(self, slave):
         if self.jobs:
-            for job in self.jobs:
+            # only jobs whose tags the slave has, and that weren't excluded when balancing
+            for job in self.balancer.candidates(slave.tags):
                 if (
                     not self.balancer.applyExceptions(job)      # No exceptions
                     and slave.id not in job.blacklist           # slave is not blacklisted
-                    and (not slave.tags or job.tags.issubset(slave.tags))  # slave doesn't use tags or slave has all job tags
                          ):
 
-                    return job, job.getFrames()
+                    return job, job.getFrames(job.chunkSize(slave, self.chunk_time, self.countSlaves()))
+
+            if self.use_speculative:
+                return self.speculativeDispatch(slave)
+
+        return None, None
+
+    def speculativeDispatch(self, slave):
+        """Give an idle slave the slowest frame still rendering at the end of a job"""
+        for job in self.jobs:
+            if (
+                job.status == netrender.model.JOB_QUEUED
+                and slave.id not in job.blacklist
+                and (not slave.tags or job.tags.issubset(slave.tags))
+                     ):
+                frame = job.getStraggler(slave, SPECULATIVE_FACTOR)
+                if frame:
+                    print("speculative dispatch", frame.number)
+                    return job, [frame]
 
         return None, None
 
+class RepeatTimer(threading.Timer):
+    """Call function every interval seconds, until cancelled"""
+    def run(self):
+        self.function(*self.args, **self.kwargs)
+        while not self.finished.wait(self.interval):
+            self.function(*self.args, **self.kwargs)
+
 def clearMaster(path):
     shutil.rmtree(path)
 
 def createMaster(address, clear, force, path):
+    journal = netrender.journal.Journal(path)
     filepath = os.path.join(path, "blender_master.data")
 
-    if not clear and os.path.exists(filepath):
+    if clear:
+        journal.clear()
+        httpd = RenderMasterServer(address, RenderHandler, path, force=force)
+    elif journal.exists():
+        print("loading saved master:", journal.snapshot_path)
+        state = journal.load()
+
+        httpd = RenderMasterServer(address, RenderHandler, state["path"], force=force, subdir=False)
+        httpd.restore(
+                        [restoreJob(data) for data in state["jobs"].values()],
+                        [restoreSlave(data) for data in state["slaves"].values()]
+                     )
+    elif os.path.exists(filepath):
+        # master saved by an older version
         print("loading saved master:", filepath)
         with open(filepath, 'rb') as f:
-            path, jobs, slaves = pickle.load(f)
+            master_path, jobs, slaves = pickle.load(f)
+
+        httpd = RenderMasterServer(address, RenderHandler, master_path, force=force, subdir=False)
+        httpd.restore(jobs, slaves)
+    else:
+        httpd = RenderMasterServer(address, RenderHandler, path, force=force)
 
-            httpd = RenderMasterServer(address, RenderHandler, path, force=force, subdir=False)
-            httpd.restore(jobs, slaves)
+    # start from a snapshot of the restored state, replaying the journal is only needed after a crash
+    journal.writeSnapshot(httpd.state())
+    if os.path.exists(filepath):
+        os.remove(filepath)
 
-            return httpd
+    httpd.journal = journal
+    journal.start()
 
-    return RenderMasterServer(address, RenderHandler, path, force=force)
+    return httpd
 
 def saveMaster(path, httpd):
-    filepath = os.path.join(path, "blender_master.data")
-
-    with open(filepath, 'wb') as f:
-        pickle.dump((httpd.path, httpd.jobs, httpd.slaves), f, pickle.HIGHEST_PROTOCOL)
+    httpd.journal.close()
+    httpd.journal.writeSnapshot(httpd.state())
 
-def runMaster(address, broadcast, clear, force, path, update_stats, test_break,use_ssl=False,cert_path="",key_path=""):
+def runMaster(address, broadcast, clear, force, path, update_stats, test_break,use_ssl=False,cert_path="",key_path="",chunk_time=0,use_speculative=False):
     httpd = createMaster(address, clear, force, path)
-    httpd.timeout = 1
     httpd.stats = update_stats
+    httpd.chunk_time = chunk_time
+    httpd.use_speculative = use_speculative
     if use_ssl:
         import ssl
         httpd.socket = ssl.wrap_socket(
@@ -1170,26 +1710,31 @@ def runMaster(address, broadcast, clear, force, path, update_stats, test_break,u
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         s.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
 
-    start_time = time.time() - 2
+    def update():
+        httpd.update()
 
-    while not test_break():
-        try:
-            httpd.handle_request()
-        except select.error:
-            pass
+        if broadcast:
+            print("broadcasting address")
+            s.sendto(bytes("%i" % address[1], encoding='utf8'), 0, ('<broadcast>', 8000))
 
-        if time.time() - start_time >= 2: # need constant here
-            httpd.timeoutSlaves()
+    # requests are served by their own threads, slave timeouts and usage on a timer
+    server_thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.5}, daemon=True)
+    server_thread.start()
 
-            httpd.updateUsage()
+    update_timer = RepeatTimer(UPDATE_INTERVAL, update)
+    update_timer.start()
 
-            if broadcast:
-                print("broadcasting address")
-                s.sendto(bytes("%i" % address[1], encoding='utf8'), 0, ('<broadcast>', 8000))
-                start_time = time.time()
+    while not test_break():
+        time.sleep(0.1)
 
+    update_timer.cancel()
+    update_timer.join()
+    httpd.shutdown()
     httpd.server_close()
     if clear:
+        httpd.journal.close()
+        httpd.journal.clear()
         clearMaster(httpd.path)
     else:
-        saveMaster(path, httpd)
+        with httpd.lock:
+            saveMaster(path, httpd)
@@ -114,16 +114,10 @@ def get(handler):
         return """<input type="checkbox" title="%s" %s %s>""" % (title, "checked" if value else "", ("onclick=\"%s\"" % script) if script else "")
 
     def sendjson(message):
-        handler.send_head(content = "application/json")
-        output(json.dumps(message,sort_keys=False))
+        handler.send_content(json.dumps(message,sort_keys=False), content = "application/json")
 
     def sendFile(filename,content_type):
-        f = open(os.path.join(src_folder,filename), 'rb')
-
-        handler.send_head(content = content_type)
-        shutil.copyfileobj(f, handler.wfile)
-
-        f.close()
+        handler.send_file(os.path.join(src_folder,filename), content = content_type)
     # return serialized version of job for html interface
     # job: the base job
     # includeFiles: boolean to indicate if we want file to be serialized too into job
@@ -530,7 +524,7 @@ def get(handler):
 
                 for frame in job.frames:
                     rowTable(
-                             frame.number,
+                             frame.number if frame.region == -1 else "%i (region %i)" % (frame.number, frame.region),
                              frame.statusText(),
                              "%.1fs" % frame.time,
                              frame.slave.name if frame.slave else "&nbsp;",
@@ -544,7 +538,7 @@ def get(handler):
 
                 for frame in job.frames:
                     rowTable(
-                             frame.number,
+                             frame.number if frame.region == -1 else "%i (region %i)" % (frame.number, frame.region),
                              frame.statusText(),
                              "%.1fs" % frame.time,
                              frame.slave.name if frame.slave else "&nbsp;",
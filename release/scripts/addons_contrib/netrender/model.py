@@ -88,6 +88,10 @@ TAG_RENDER = "render"
 
 TAG_ALL = set((TAG_BAKING, TAG_RENDER))
 
+def frameKey(number, region = -1):
+    """Frames are identified by their number, or number and region when split in regions"""
+    return number if region == -1 else (number, region)
+
 class LogFile:
     def __init__(self, job_id = 0, slave_id = 0, frames = []):
         self.job_id = job_id
@@ -269,7 +273,8 @@ class RenderJob:
 
         self._status = None
 
-        if info:
+        if info is not None:
+            self.regions = info.regions
             self.type = info.type
             self.subtype = info.subtype
             self.name = info.name
@@ -283,6 +288,7 @@ class RenderJob:
             self.version_info = info.version_info
             self.render = info.render
         else:
+            self.regions = 0 # number of regions frames are split in, 0 to render whole frames
             self.type = JOB_BLENDER
             self.subtype = JOB_SUB_RENDER
             self.name = ""
@@ -422,7 +428,8 @@ class RenderJob:
                             "last_dispatched": self.last_dispatched,
                             "version_info": self.version_info.serialize() if self.version_info else None,
                             "resolution": self.resolution,
-                            "render": self.render
+                            "render": self.render,
+                            "regions": self.regions
                         }
         if (withFiles):
            data["files"]=[f.serialize() for f in self.files if f.start == -1 or not frames or (f.start <= max_frame and f.end >= min_frame)]
@@ -454,6 +461,7 @@ class RenderJob:
         job.last_dispatched = data["last_dispatched"]
         job.resolution = data["resolution"]
         job.render=data["render"]
+        job.regions = data.get("regions", 0)
 
         version_info = data.get("version_info", None)
         if version_info:
@@ -462,20 +470,26 @@ class RenderJob:
         return job
 
 class RenderFrame:
-    def __init__(self, number = 0, command = ""):
+    def __init__(self, number = 0, command = "", region = -1):
         self.number = number
+        self.region = region # -1 for the whole frame
         self.time = 0
         self.status = FRAME_QUEUED
         self.slave = None
         self.command = command
         self.results = []   # List of filename of result files associated with this frame
 
+    @property
+    def key(self):
+        return frameKey(self.number, self.region)
+
     def statusText(self):
         return FRAME_STATUS_TEXT[self.status]
 
     def serialize(self):
         return 	{
                             "number": self.number,
+                            "region": self.region,
                             "time": self.time,
                             "status": self.status,
                             "slave": None if not self.slave else self.slave.serialize(),
@@ -490,6 +504,7 @@ class RenderFrame:
 
         frame = RenderFrame()
         frame.number = data["number"]
+        frame.region = data.get("region", -1)
         frame.time = data["time"]
         frame.status = data["status"]
         frame.slave = RenderSlave.materialize(data["slave"])
@@ -0,0 +1,178 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# Frames split in regions.
+#
+# Each region is a horizontal band of the frame, rendered by a slave as a border
+# render that isn't cropped, so all region renders have the size of the frame.
+# Regions are merged by the master, copying the compressed scanline blocks of
+# each region from its render into the frame EXR, without decoding pixels.
+#
+# Run as a script in the render process (see slave.py), it sets the border of
+# the region given after "--".
+
+import sys, os, struct
+
+# Lines of a block for each EXR compression
+EXR_BLOCK_LINES = {
+                    0: 1,   # NONE
+                    1: 1,   # RLE
+                    2: 1,   # ZIPS
+                    3: 16,  # ZIP
+                    4: 32,  # PIZ
+                    5: 16,  # PXR24
+                    6: 32,  # B44
+                    7: 32,  # B44A
+                    8: 32,  # DWAA
+                    9: 256, # DWAB
+                  }
+
+EXR_MAGIC = 20000630
+
+# version flags
+EXR_TILED = 0x200
+EXR_NON_IMAGE = 0x800
+EXR_MULTIPART = 0x1000
+
+def regionRows(region, regions, height):
+    """First and last + 1 rows of a region, counted from the bottom like Blender borders"""
+    return region * height // regions, (region + 1) * height // regions
+
+def regionOfRow(row, regions, height):
+    # inverse of regionRows
+    return ((row + 1) * regions - 1) // height
+
+def setBorder(scene, region, regions):
+    """Render only the rows of region, keeping the frame size"""
+    render = scene.render
+    height = render.resolution_y * render.resolution_percentage // 100
+    ymin, ymax = regionRows(region, regions, height)
+
+    render.use_border = True
+    render.use_crop_to_border = False
+    render.border_min_x = 0.0
+    render.border_max_x = 1.0
+    # borders are converted to pixels by truncation, half a pixel keeps the rows exact
+    render.border_min_y = (ymin + 0.5) / height
+    render.border_max_y = min((ymax + 0.5) / height, 1.0)
+
+    # one line blocks, so blocks never cross region boundaries
+    render.image_settings.exr_codec = 'ZIPS'
+
+# =-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-=-
+
+class EXRFile:
+    """Header and scanline blocks of a single part scanline EXR file"""
+    def __init__(self, filepath):
+        with open(filepath, 'rb') as f:
+            self.data = f.read()
+
+        data = self.data
+        magic, version = struct.unpack_from("<ii", data, 0)
+        if magic != EXR_MAGIC:
+            raise ValueError("%s is not an EXR file" % filepath)
+        if version & (EXR_TILED | EXR_NON_IMAGE | EXR_MULTIPART):
+            raise ValueError("%s isn't a single part scanline EXR file" % filepath)
+
+        # attributes, name and type are null terminated, followed by the value size
+        offset = 8
+        self.attributes = {}
+        while data[offset] != 0:
+            end = data.index(b'\0', offset)
+            name = data[offset:end]
+            offset = data.index(b'\0', end + 1) + 1
+            size, = struct.unpack_from("<i", data, offset)
+            offset += 4
+            self.attributes[name] = data[offset:offset + size]
+            offset += size
+
+        self.header_end = offset + 1
+
+        self.compression = self.attributes[b'compression'][0]
+        self.data_window = struct.unpack("<iiii", self.attributes[b'dataWindow'])
+        self.display_window = struct.unpack("<iiii", self.attributes[b'displayWindow'])
+        self.block_lines = EXR_BLOCK_LINES[self.compression]
+
+        xmin, ymin, xmax, ymax = self.data_window
+        self.blocks_count = (ymax - ymin + self.block_lines) // self.block_lines
+        self.offsets = struct.unpack_from("<%iQ" % self.blocks_count, data, self.header_end)
+
+    def block(self, index):
+        """y of the first line and bytes of a block, as stored in the file"""
+        offset = self.offsets[index]
+        y, size = struct.unpack_from("<ii", self.data, offset)
+        return y, self.data[offset:offset + 8 + size]
+
+def merge(filenames, output):
+    """
+    Merge the renders of the regions of a frame, in region order, into output.
+    Raises ValueError if the renders can't be merged.
+    """
+    try:
+        files = [EXRFile(filename) for filename in filenames]
+    except (struct.error, KeyError, IndexError) as e:
+        raise ValueError("Invalid EXR file: %s" % e)
+    first = files[0]
+    regions = len(files)
+
+    for exr in files:
+        if exr.data_window != first.data_window or exr.compression != first.compression:
+            raise ValueError("Region renders have different sizes or compressions")
+        if exr.data_window != exr.display_window:
+            raise ValueError("Region renders are cropped")
+
+    xmin, ymin, xmax, ymax = first.data_window
+    height = ymax - ymin + 1
+
+    blocks = []
+    for index in range(first.blocks_count):
+        # EXR lines go down from the top, region rows go up from the bottom
+        top = index * first.block_lines
+        bottom = min(top + first.block_lines, height) - 1
+        region = regionOfRow(height - 1 - top, regions, height)
+        if regionOfRow(height - 1 - bottom, regions, height) != region:
+            raise ValueError("Region boundary inside a block of %i lines" % first.block_lines)
+
+        y, block = files[region].block(index)
+        if y != ymin + top:
+            raise ValueError("Unexpected block order in %s" % filenames[region])
+        blocks.append(block)
+
+    output_tmp = output + ".tmp"
+    with open(output_tmp, 'wb') as f:
+        f.write(first.data[:first.header_end])
+
+        offset = first.header_end + 8 * len(blocks)
+        offsets = []
+        for block in blocks:
+            offsets.append(offset)
+            offset += len(block)
+
+        f.write(struct.pack("<%iQ" % len(offsets), *offsets))
+        for block in blocks:
+            f.write(block)
+
+    os.replace(output_tmp, output)
+
+if __name__ == "__main__":
+    import bpy
+
+    start = sys.argv.index("--") + 1
+    region, regions = int(sys.argv[start]), int(sys.argv[start + 1])
+    for scene in bpy.data.scenes:
+        setBorder(scene, region, regions)
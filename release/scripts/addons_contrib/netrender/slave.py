@@ -27,6 +27,8 @@ from netrender.utils import *
 import netrender.model
 import netrender.repath
 import netrender.baking
+import netrender.filecache
+import netrender.regions
 import netrender.thumbnail as thumbnail
 
 
@@ -54,9 +56,9 @@ def slave_Info(netsettings):
 
     return slave
 
-def testCancel(conn, job_id, frame_number):
+def testCancel(conn, job_id, frame_number, region = -1):
         with ConnectionContext():
-            conn.request("HEAD", "/status", headers={"job-id":job_id, "job-frame": str(frame_number)})
+            conn.request("HEAD", "/status", headers={"job-id":job_id, "job-frame": str(frame_number), "job-region": str(region)})
 
         # canceled if job isn't found anymore
         if responseStatus(conn) == http.client.NO_CONTENT:
@@ -64,7 +66,36 @@ def testCancel(conn, job_id, frame_number):
         else:
             return False
 
-def testFile(conn, job_id, slave_id, rfile, job_prefix, main_path=None):
+def renderCommand(job, job_full_path, job_prefix, threads):
+    """Blender command rendering the frames of a job, or the region of a frame when split in regions"""
+    command = [bpy.app.binary_path,
+               "-b",
+               "-y",
+               "-noaudio",
+               job_full_path,
+               "-t", str(threads),
+               "-o", os.path.join(job_prefix, "######"),
+               "-E", job.render,
+               "-F", "MULTILAYER",
+               ]
+
+    # regions are dispatched one at a time
+    region = job.frames[0].region
+
+    # the border script runs before rendering, and reads its arguments after "--"
+    if region != -1:
+        command += ["-P", netrender.regions.__file__]
+
+    for frame in job.frames:
+        print("frame", frame.number)
+        command += ["-f", str(frame.number)]
+
+    if region != -1:
+        command += ["--", str(region), str(job.regions)]
+
+    return command
+
+def testFile(conn, job_id, slave_id, rfile, job_prefix, main_path=None, cache=None):
     job_full_path = createLocalPath(rfile, job_prefix, main_path, rfile.force)
 
     found = os.path.exists(job_full_path)
@@ -77,6 +108,12 @@ def testFile(conn, job_id, slave_id, rfile, job_prefix, main_path=None):
             print("Found file %s at %s but signature mismatch!" % (rfile.filepath, job_full_path))
             os.remove(job_full_path)
 
+    if not found and cache and rfile.signature is not None:
+        job_full_path = createLocalPath(rfile, job_prefix, main_path, True)
+        if not cache.fetch(conn, job_id, slave_id, rfile, job_full_path):
+            return None # file for job not returned by server, need to return an error code to server
+        found = True
+
     if not found:
         # Force prefix path if not found
         job_full_path = createLocalPath(rfile, job_prefix, main_path, True)
@@ -87,16 +124,11 @@ def testFile(conn, job_id, slave_id, rfile, job_prefix, main_path=None):
         response = conn.getresponse()
 
         if response.status != http.client.OK:
+            response.read()
             return None # file for job not returned by server, need to return an error code to server
 
-        f = open(temp_path, "wb")
-        buf = response.read(1024)
-
-        while buf:
-            f.write(buf)
-            buf = response.read(1024)
-
-        f.close()
+        with open(temp_path, "wb") as f:
+            shutil.copyfileobj(response, f, FILE_BUFFER_SIZE)
 
         os.renames(temp_path, job_full_path)
 
@@ -152,6 +184,12 @@ def render_slave(engine, netsettings, threads):
         NODE_PREFIX = os.path.join(slave_path, "slave_" + slave_id)
         verifyCreateDir(NODE_PREFIX)
 
+        # shared by all slaves using this path, kept when clearing on exit
+        if netsettings.slave_cache_size > 0:
+            cache = netrender.filecache.FileCache(os.path.join(slave_path, "cache"), netsettings.slave_cache_size * 1024 * 1024 * 1024)
+        else:
+            cache = None
+
         engine.update_stats("", "Network render connected to master, waiting for jobs")
 
         while not engine.test_break():
@@ -177,12 +215,12 @@ def render_slave(engine, netsettings, threads):
                     job_path = job.files[0].original_path # original path of the first file
                     main_path, main_file = os.path.split(job_path)
 
-                    job_full_path = testFile(conn, job.id, slave_id, job.files[0], job_prefix)
+                    job_full_path = testFile(conn, job.id, slave_id, job.files[0], job_prefix, cache=cache)
                     print("Fullpath", job_full_path)
                     print("File:", main_file, "and %i other files" % (len(job.files) - 1,))
 
                     for rfile in job.files[1:]:
-                        testFile(conn, job.id, slave_id, rfile, job_prefix, main_path)
+                        testFile(conn, job.id, slave_id, rfile, job_prefix, main_path, cache=cache)
                         print("\t", rfile.filepath)
 
                     netrender.repath.update(job)
@@ -212,29 +250,15 @@ def render_slave(engine, netsettings, threads):
 
 
                 first_frame = job.frames[0].number
+                first_region = job.frames[0].region
 
                 # start render
                 start_t = time.time()
 
                 if job.rendersWithBlender():
-                    frame_args = []
-
-                    for frame in job.frames:
-                        print("frame", frame.number)
-                        frame_args += ["-f", str(frame.number)]
-
                     with NoErrorDialogContext():
                         process = subprocess.Popen(
-                            [bpy.app.binary_path,
-                             "-b",
-                             "-y",
-                             "-noaudio",
-                             job_full_path,
-                             "-t", str(threads),
-                             "-o", os.path.join(job_prefix, "######"),
-                             "-E", job.render,
-                             "-F", "MULTILAYER",
-                             ] + frame_args,
+                            renderCommand(job, job_full_path, job_prefix, threads),
                             stdout=subprocess.PIPE,
                             stderr=subprocess.STDOUT,
                             )
@@ -312,7 +336,7 @@ def render_slave(engine, netsettings, threads):
                         data.lock.release()
 
                         data.last_time = current_time
-                        if testCancel(conn, job.id, first_frame):
+                        if testCancel(conn, job.id, first_frame, first_region):
                             engine.update_stats("", "Job canceled by Master")
                             data.cancelled = True
 
@@ -369,13 +393,14 @@ def render_slave(engine, netsettings, threads):
                     headers["job-result"] = str(netrender.model.FRAME_DONE)
                     for frame in job.frames:
                         headers["job-frame"] = str(frame.number)
+                        headers["job-region"] = str(frame.region)
                         if job.hasRenderResult():
                             # send image back to server
 
                             filename = os.path.join(job_prefix, "%06d.exr" % frame.number)
 
-                            # thumbnail first
-                            if netsettings.use_slave_thumb:
+                            # thumbnail first, the master makes those of frames split in regions
+                            if netsettings.use_slave_thumb and frame.region == -1:
                                 thumbname = thumbnail.generate(filename)
                                 if thumbname:
                                     sendFile(conn, "/thumb", thumbname, headers=headers)
@@ -407,6 +432,7 @@ def render_slave(engine, netsettings, threads):
                     headers["job-result"] = str(netrender.model.FRAME_ERROR)
                     for frame in job.frames:
                         headers["job-frame"] = str(frame.number)
+                        headers["job-region"] = str(frame.region)
                         # send error result back to server
                         with ConnectionContext():
                             conn.request("PUT", "/render", headers=headers)
@@ -415,6 +441,8 @@ def render_slave(engine, netsettings, threads):
 
                 engine.update_stats("", "Network render connected to master, waiting for jobs")
             else:
+                # connection is kept alive, the response needs to be read before the next request
+                response.read()
                 bisleep.sleep()
 
         conn.close()
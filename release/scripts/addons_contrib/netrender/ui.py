@@ -167,6 +167,7 @@ class RENDER_PT_network_slave_settings(NetRenderButtonsPanel, bpy.types.Panel):
         layout.prop(netsettings, "slave_render")
         layout.prop(netsettings, "slave_bake")
         layout.prop(netsettings, "use_slave_clear")
+        layout.prop(netsettings, "slave_cache_size")
         layout.prop(netsettings, "use_slave_thumb")
         layout.prop(netsettings, "use_slave_output_log")
         layout.label(text="Threads:")
@@ -193,6 +194,8 @@ class RENDER_PT_network_master_settings(NetRenderButtonsPanel, bpy.types.Panel):
         layout.prop(netsettings, "use_master_broadcast")
         layout.prop(netsettings, "use_master_force_upload")
         layout.prop(netsettings, "use_master_clear")
+        layout.prop(netsettings, "master_chunk_time")
+        layout.prop(netsettings, "use_master_speculative")
 
 class RENDER_PT_network_job(NetRenderButtonsPanel, bpy.types.Panel):
     bl_label = "Job Settings"
@@ -234,6 +237,7 @@ class RENDER_PT_network_job(NetRenderButtonsPanel, bpy.types.Panel):
         row.prop(netsettings, "chunks")
 
         if netsettings.job_type == "JOB_BLENDER":
+            layout.prop(netsettings, "job_regions")
             layout.prop(netsettings, "save_before_job")
 
 
@@ -438,6 +442,13 @@ class NetRenderSettings(bpy.types.PropertyGroup):
                         description="delete downloaded files on exit",
                         default = True)
 
+        NetRenderSettings.slave_cache_size = IntProperty(
+                        name="Cache size",
+                        description="Maximum size in GB of the job files kept between jobs (0 to disable the cache)",
+                        default = 20,
+                        min=0,
+                        max=65535)
+
         NetRenderSettings.use_slave_thumb = BoolProperty(
                         name="Generate thumbnails",
                         description="Generate thumbnails on slaves instead of master",
@@ -474,6 +485,18 @@ class NetRenderSettings(bpy.types.PropertyGroup):
                         description="Force client to upload dependency files to master",
                         default = False)
 
+        NetRenderSettings.master_chunk_time = IntProperty(
+                        name="Chunk time",
+                        description="Render time in seconds to aim for when dispatching frames, sizing chunks of render jobs from measured frame times (0 to use the job chunks)",
+                        default = 0,
+                        min=0,
+                        max=3600)
+
+        NetRenderSettings.use_master_speculative = BoolProperty(
+                        name="Speculative Dispatch",
+                        description="Render frames running late at the end of a job again on idle slaves, keeping the first result",
+                        default = False)
+
         default_path = os.environ.get("TEMP")
 
         if not default_path:
@@ -547,6 +570,13 @@ class NetRenderSettings(bpy.types.PropertyGroup):
                         min=1,
                         max=65535)
 
+        NetRenderSettings.job_regions = IntProperty(
+                        name="Regions",
+                        description="Number of regions frames are split in, each rendered by a slave and merged by the master (1 to render whole frames)",
+                        default = 1,
+                        min=1,
+                        max=256)
+
         NetRenderSettings.priority = IntProperty(
                         name="Priority",
                         description="Priority of the job",
@@ -28,6 +28,14 @@ try:
 except:
   bpy = None
 
+# Buffer size used to transfer and hash files
+FILE_BUFFER_SIZE = 1024 * 1024
+
+# Idle time after which the master closes kept alive connections
+KEEP_ALIVE_TIMEOUT = 30
+# Clients reopen their connection when idle longer than this, before the master closes it
+KEEP_ALIVE_IDLE = KEEP_ALIVE_TIMEOUT - 10
+
 VERSION = bytes(".".join((str(n) for n in netrender.bl_info["version"])), encoding='utf8')
 
 try:
@@ -159,6 +167,26 @@ def clientScan(report = None):
 
         return ("", 8000) # return default values
 
+class KeepAliveMixIn:
+    """Reopen connections left idle long enough to have been closed by the master"""
+    last_used = 0.0
+
+    def request(self, *args, **kwargs):
+        if time.time() - self.last_used > KEEP_ALIVE_IDLE:
+            self.close()
+        super().request(*args, **kwargs)
+
+    def getresponse(self):
+        response = super().getresponse()
+        self.last_used = time.time()
+        return response
+
+class KeepAliveHTTPConnection(KeepAliveMixIn, http.client.HTTPConnection):
+    pass
+
+class KeepAliveHTTPSConnection(KeepAliveMixIn, http.client.HTTPSConnection):
+    pass
+
 def clientConnection(netsettings, report = None, scan = True, timeout = 50):
     address = netsettings.server_address
     port = netsettings.server_port
@@ -177,12 +205,12 @@ def clientConnection(netsettings, report = None, scan = True, timeout = 50):
             return None
     conn = None
     try:
-        HTTPConnection = http.client.HTTPSConnection if use_ssl else http.client.HTTPConnection
+        HTTPConnection = KeepAliveHTTPSConnection if use_ssl else KeepAliveHTTPConnection
         if platform.system() == "Darwin":
             with ConnectionContext(timeout):
-                conn = HTTPConnection(address, port)
+                conn = HTTPConnection(address, port, blocksize = FILE_BUFFER_SIZE)
         else:
-            conn = HTTPConnection(address, port, timeout = timeout)
+            conn = HTTPConnection(address, port, timeout = timeout, blocksize = FILE_BUFFER_SIZE)
 
         if conn:
             if clientVerifyVersion(conn, timeout):
@@ -232,10 +260,20 @@ def cancelURL(job_id):
     return "/cancel_%s" % (job_id)
 
 def hashFile(path):
-    f = open(path, "rb")
-    value = hashData(f.read())
-    f.close()
-    return value
+    m = hashlib.md5()
+    hashFileInto(path, m)
+    return m.hexdigest()
+
+def hashFileInto(path, m):
+    # hash by chunks, dependencies can be bigger than the available memory
+    size = 0
+    with open(path, "rb") as f:
+        buf = f.read(FILE_BUFFER_SIZE)
+        while buf:
+            m.update(buf)
+            size += len(buf)
+            buf = f.read(FILE_BUFFER_SIZE)
+    return size
 
 def hashData(data):
     m = hashlib.md5()
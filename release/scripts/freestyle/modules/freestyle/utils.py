@@ -28,9 +28,12 @@ __all__ = (
     "BoundingBox",
     "ContextFunctions",
     "curvature_from_stroke_vertex",
+    "distance_from_camera_array",
+    "distance_from_object_array",
     "find_matching_vertex",
     "get_chain_length",
     "get_object_name",
+    "get_stroke_array",
     "get_strokes",
     "get_test_stroke",
     "getCurrentScene",
@@ -46,11 +49,14 @@ __all__ = (
     "pairwise",
     "phase_to_direction",
     "rgb_to_bw",
+    "set_stroke_array",
     "simplify",
     "stroke_curvature",
     "stroke_normal",
     "StrokeCollector",
+    "t2d_along_stroke_array",
     "tripplewise",
+    "vertex_orientation_2d_array",
 )
 
 # module members
@@ -73,6 +79,8 @@ from functools import lru_cache, namedtuple
 from math import cos, sin, pi, atan2
 from itertools import tee, compress
 
+import numpy as np
+
 
 # -- types -- #
 
@@ -487,6 +495,85 @@ def iter_distance_along_stroke(stroke):
         yield distance
 
 
+# -- stroke vertex attributes as arrays -- #
+
+# number of values per stroke vertex of the attributes supported by
+# Stroke.foreach_get() and Stroke.foreach_set()
+STROKE_ARRAY_SIZES = {
+    "point": 2,
+    "point_3d": 3,
+    "curvilinear_abscissa": 1,
+    "u": 1,
+    "color": 3,
+    "alpha": 1,
+    "thickness": 2,
+}
+
+
+def get_stroke_array(stroke, attribute):
+    """
+    Returns an attribute of all the stroke vertices as a NumPy array,
+    of shape (len(stroke),) for single values, (len(stroke), size) otherwise.
+    """
+    size = STROKE_ARRAY_SIZES[attribute]
+    values = np.empty(len(stroke) * size, dtype=np.float32)
+    stroke.foreach_get(attribute, values)
+    return values if size == 1 else values.reshape(-1, size)
+
+
+def set_stroke_array(stroke, attribute, values):
+    """Sets an attribute of all the stroke vertices from an array, see get_stroke_array()."""
+    stroke.foreach_set(attribute, np.ascontiguousarray(values, dtype=np.float32).reshape(-1))
+
+
+def t2d_along_stroke_array(stroke):
+    """Same values as iter_t2d_along_stroke(), as an array."""
+    total = stroke.length_2d
+    if total == 0.0:
+        return np.zeros(len(stroke))
+    points = get_stroke_array(stroke, "point").astype(np.float64)
+    distance = np.zeros(len(points))
+    np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1), out=distance[1:])
+    return np.minimum(distance / total, 1.0)
+
+
+def _distance_to_range_array(distance, range_min, range_max, normfac):
+    # same as iter_distance_from_camera(), including 1.0 for distance == range_min
+    t = np.ones(len(distance))
+    inside = (range_min < distance) & (distance < range_max)
+    t[inside] = (distance[inside] - range_min) / normfac
+    t[distance < range_min] = 0.0
+    return t
+
+
+def distance_from_camera_array(stroke, range_min, range_max, normfac):
+    """Same values as iter_distance_from_camera(), as an array."""
+    points = get_stroke_array(stroke, "point_3d").astype(np.float64)
+    return _distance_to_range_array(np.linalg.norm(points, axis=1), range_min, range_max, normfac)
+
+
+def distance_from_object_array(stroke, location, range_min, range_max, normfac):
+    """Same values as iter_distance_from_object(), as an array."""
+    points = get_stroke_array(stroke, "point_3d").astype(np.float64)
+    distance = np.linalg.norm(points - np.array(location[0:3]), axis=1)
+    return _distance_to_range_array(distance, range_min, range_max, normfac)
+
+
+def vertex_orientation_2d_array(stroke):
+    """Same values as VertexOrientation2DF0D for every stroke vertex, as an array."""
+    points = get_stroke_array(stroke, "point").astype(np.float64)
+
+    def normalized(v):
+        length = np.linalg.norm(v, axis=1)[:, None]
+        return np.divide(v, length, out=np.zeros_like(v), where=(length != 0.0))
+
+    # first and last vertices have no previous or next one, the
+    # segment from/to themselves is a null vector
+    segments = normalized(np.diff(points, axis=0))
+    zero = np.zeros((1, 2))
+    return normalized(np.concatenate((zero, segments)) + np.concatenate((segments, zero)))
+
+
 # -- mathematical operations -- #
 
 def stroke_curvature(it):
@@ -93,16 +93,19 @@ from freestyle.utils import (
     BoundedProperty,
     ContextFunctions,
     curvature_from_stroke_vertex,
+    distance_from_camera_array,
+    distance_from_object_array,
+    get_stroke_array,
     getCurrentScene,
     iter_distance_along_stroke,
-    iter_distance_from_camera,
-    iter_distance_from_object,
     iter_material_value,
-    iter_t2d_along_stroke,
     normal_at_I0D,
     pairwise,
+    set_stroke_array,
     simplify,
     stroke_normal,
+    t2d_along_stroke_array,
+    vertex_orientation_2d_array,
 )
 from _freestyle import (
     blendRamp,
@@ -114,6 +117,8 @@ import time
 import bpy
 import random
 
+import numpy as np
+
 from mathutils import Vector
 from math import pi, sin, cos, acos, radians, atan2
 from itertools import cycle, tee
@@ -134,6 +139,7 @@ class ColorRampModifier(StrokeShader):
         self.blend = blend
         self.influence = influence
         self.ramp = ramp
+        self.ramp_arrays = None
 
     def evaluate(self, t):
         col = evaluateColorRamp(self.ramp, t)
@@ -142,6 +148,66 @@ class ColorRampModifier(StrokeShader):
     def blend_ramp(self, a, b):
         return blendRamp(self.blend, a, self.influence, b)
 
+    def evaluate_array(self, t):
+        """Same as evaluate() for an array of positions, returns an array of RGB colors."""
+        ramp = self.ramp
+        interpolation = ramp.interpolation
+        if ramp.color_mode != 'RGB' or interpolation not in {'LINEAR', 'EASE', 'CONSTANT'}:
+            return np.array([self.evaluate(v) for v in t.tolist()], dtype=np.float64).reshape(-1, 3)
+
+        # same as BKE_colorband_evaluate()
+        if self.ramp_arrays is None:
+            elements = ramp.elements
+            self.ramp_arrays = (np.array([elem.position for elem in elements], dtype=np.float64),
+                                np.array([elem.color[0:3] for elem in elements], dtype=np.float64))
+        positions, colors = self.ramp_arrays
+        last = len(positions)
+        if last == 1:
+            return np.repeat(colors, len(t), axis=0)
+
+        # first element with a position > t
+        right = np.searchsorted(positions, t, side='right')
+        left = np.maximum(right - 1, 0)
+        if interpolation == 'CONSTANT':
+            result = colors[left]
+        else:
+            right_clamped = np.minimum(right, last - 1)
+            span = positions[left] - positions[right_clamped]
+            fac = np.divide(t - positions[right_clamped], span, out=np.zeros_like(t), where=(span != 0.0))
+            if interpolation == 'EASE':
+                fac = fac * fac * (3.0 - 2.0 * fac)
+            fac = fac[:, None]
+            result = (1.0 - fac) * colors[right_clamped] + fac * colors[left]
+        # before the first and after the last element
+        result[right == last] = colors[-1]
+        result[t <= positions[0]] = colors[0]
+        return result
+
+    def blend_ramp_array(self, a, b):
+        """Same as blend_ramp() for arrays of RGB colors."""
+        fac = self.influence
+        facm = 1.0 - fac
+        blend = self.blend
+        if blend == 'MIX':
+            return facm * a + fac * b
+        elif blend == 'ADD':
+            return a + fac * b
+        elif blend == 'MULTIPLY':
+            return a * (facm + fac * b)
+        elif blend == 'SUBTRACT':
+            return a - fac * b
+        elif blend == 'SCREEN':
+            return 1.0 - (facm + fac * (1.0 - b)) * (1.0 - a)
+        elif blend == 'DIVIDE':
+            return np.divide(facm * a * b + fac * a, b, out=a.copy(), where=(b != 0.0))
+        elif blend == 'DIFFERENCE':
+            return facm * a + fac * np.abs(a - b)
+        elif blend == 'DARKEN':
+            return np.minimum(a, b) * fac + a * facm
+        elif blend == 'LIGHTEN':
+            return np.maximum(a, fac * b)
+        return np.array([self.blend_ramp(x, y) for x, y in zip(a.tolist(), b.tolist())], dtype=np.float64)
+
 
 class ScalarBlendModifier(StrokeShader):
     """Primitive for alpha and thickness modifiers."""
@@ -174,14 +240,40 @@ class ScalarBlendModifier(StrokeShader):
             raise ValueError("unknown curve blend type: " + self.blend_type)
         return v1
 
+    def blend_array(self, v1, v2):
+        """Same as blend() for arrays of values."""
+        fac = self.influence
+        facm = 1.0 - fac
+        if self.blend_type == 'MIX':
+            v1 = facm * v1 + fac * v2
+        elif self.blend_type == 'ADD':
+            v1 = v1 + fac * v2
+        elif self.blend_type == 'MULTIPLY':
+            v1 = v1 * (facm + fac * v2)
+        elif self.blend_type == 'SUBTRACT':
+            v1 = v1 - fac * v2
+        elif self.blend_type == 'DIVIDE':
+            v1 = np.divide(facm * v1 * v2 + fac * v1, v2, out=np.array(v1, dtype=np.float64), where=(v2 != 0.0))
+        elif self.blend_type == 'DIFFERENCE':
+            v1 = facm * v1 + fac * np.abs(v1 - v2)
+        elif self.blend_type == 'MININUM':
+            v1 = np.minimum(fac * v2, v1)
+        elif self.blend_type == 'MAXIMUM':
+            v1 = np.maximum(fac * v2, v1)
+        else:
+            raise ValueError("unknown curve blend type: " + self.blend_type)
+        return v1
+
 
 class CurveMappingModifier(ScalarBlendModifier):
     def __init__(self, blend, influence, mapping, invert, curve):
         ScalarBlendModifier.__init__(self, blend, influence)
         assert mapping in {'LINEAR', 'CURVE'}
+        self.mapping = mapping
         self.evaluate = getattr(self, mapping)
         self.invert = invert
         self.curve = curve
+        self.curve_table = None
 
     def LINEAR(self, t):
         return (1.0 - t) if self.invert else t
@@ -195,6 +287,30 @@ class CurveMappingModifier(ScalarBlendModifier):
         # therefore, bound the result by the curve's min and max values
         return bound(curve.clip_min_y, result, curve.clip_max_y)
 
+    def evaluate_array(self, t):
+        """Same as evaluate() for an array of values."""
+        if self.mapping == 'LINEAR':
+            return (1.0 - t) if self.invert else t
+
+        # The curve is evaluated by linear interpolation in a table of CM_TABLE + 1 values,
+        # over the range of the clipping rectangle and curve points. Interpolate in the same
+        # table here, values outside of it are extrapolated by the curve.
+        curve = self.curve
+        if self.curve_table is None:
+            curve.initialize()
+            curve_map = curve.curves[0]
+            points_x = [point.location[0] for point in curve_map.points]
+            table_x = np.linspace(min(curve.clip_min_x, *points_x), max(curve.clip_max_x, *points_x), 256 + 1)
+            table_y = np.array([curve.evaluate(curve=curve_map, position=x) for x in table_x.tolist()])
+            self.curve_table = (table_x, table_y)
+        table_x, table_y = self.curve_table
+
+        result = np.interp(t, table_x, table_y)
+        outside = (t < table_x[0]) | (t > table_x[-1])
+        if outside.any():
+            result[outside] = [self.CURVE(v) for v in t[outside].tolist()]
+        return np.clip(result, curve.clip_min_y, curve.clip_max_y)
+
 
 class ThicknessModifierMixIn:
     def __init__(self):
@@ -219,6 +335,44 @@ class ThicknessModifierMixIn:
             outer = inner = (outer + inner) / 2
         sv.attribute.thickness = (outer, inner)
 
+    # what set_thickness() does with the outer and inner thickness of each vertex
+    SIDES_KEEP, SIDES_SWAP, SIDES_AVERAGE = range(3)
+
+    def thickness_sides(self, stroke):
+        """Returns an array of SIDES_KEEP, SIDES_SWAP or SIDES_AVERAGE for every stroke vertex."""
+        sides = np.full(len(stroke), self.SIDES_KEEP, dtype=np.int8)
+        persp_camera = self.persp_camera
+        for i, sv in enumerate(stroke):
+            fe = sv.fedge
+            nature = fe.nature
+            if (nature & Nature.BORDER):
+                if persp_camera:
+                    dir = (-sv.point_3d.normalized()).dot(fe.normal_left)
+                else:
+                    dir = fe.normal_left.z
+                if dir < 0.0:  # the back side is visible
+                    sides[i] = self.SIDES_SWAP
+            elif (nature & Nature.SILHOUETTE):
+                if fe.is_smooth:  # TODO more tests needed
+                    sides[i] = self.SIDES_SWAP
+            else:
+                sides[i] = self.SIDES_AVERAGE
+        return sides
+
+    def set_thickness_array(self, stroke, outer, inner, sides=None):
+        """Same as set_thickness() for all the stroke vertices, with arrays (or single values) of thickness."""
+        if sides is None:
+            sides = self.thickness_sides(stroke)
+        outer = np.broadcast_to(np.asarray(outer, dtype=np.float64), sides.shape)
+        inner = np.broadcast_to(np.asarray(inner, dtype=np.float64), sides.shape)
+        swap = (sides == self.SIDES_SWAP)
+        average = (sides == self.SIDES_AVERAGE)
+        thickness = np.empty((len(sides), 2))
+        thickness[:, 0] = np.where(swap, inner, outer)
+        thickness[:, 1] = np.where(swap, outer, inner)
+        thickness[average] = ((outer[average] + inner[average]) / 2)[:, None]
+        set_stroke_array(stroke, "thickness", thickness)
+
 
 class ThicknessBlenderMixIn(ThicknessModifierMixIn):
     def __init__(self, position, ratio):
@@ -277,6 +431,39 @@ class ThicknessBlenderMixIn(ThicknessModifierMixIn):
                 right, left = left, right
         svert.attribute.thickness = (right, left)
 
+    def blend_thickness_array(self, stroke, thickness, asymmetric=False):
+        """
+        Same as blend_thickness() for all the stroke vertices, thickness is an array of
+        values, or of (right, left) values.
+        """
+        old = get_stroke_array(stroke, "thickness").astype(np.float64)
+        sides = self.thickness_sides(stroke)
+        thickness = np.asarray(thickness, dtype=np.float64)
+        if asymmetric:
+            right = self.blend_array(old[:, 0], thickness[:, 0])
+            left = self.blend_array(old[:, 1], thickness[:, 1])
+            swap = (sides == self.SIDES_SWAP)
+            set_stroke_array(stroke, "thickness", np.column_stack((
+                np.where(swap, left, right),
+                np.where(swap, right, left),
+            )))
+            return
+
+        if thickness.ndim == 2:
+            thickness = thickness.sum(axis=1)
+        v = self.blend_array(old.sum(axis=1), thickness)
+        if self.position == 'CENTER':
+            outer = inner = v * 0.5
+        elif self.position == 'INSIDE':
+            outer, inner = 0, v
+        elif self.position == 'OUTSIDE':
+            outer, inner = v, 0
+        elif self.position == 'RELATIVE':
+            outer, inner = v * self.ratio, v - (v * self.ratio)
+        else:
+            raise ValueError("unknown thickness position: " + self.position)
+        self.set_thickness_array(stroke, outer, inner, sides)
+
 
 class BaseThicknessShader(StrokeShader, ThicknessModifierMixIn):
     def __init__(self, thickness, position, ratio):
@@ -298,8 +485,7 @@ class BaseThicknessShader(StrokeShader, ThicknessModifierMixIn):
             raise ValueError("unknown thickness position: " + position)
 
     def shade(self, stroke):
-        for svert in stroke:
-            self.set_thickness(svert, self.outer, self.inner)
+        self.set_thickness_array(stroke, self.outer, self.inner)
 
 
 # Along Stroke modifiers
@@ -308,20 +494,18 @@ class ColorAlongStrokeShader(ColorRampModifier):
     """Maps a ramp to the color of the stroke, using the curvilinear abscissa (t)."""
 
     def shade(self, stroke):
-        for svert, t in zip(stroke, iter_t2d_along_stroke(stroke)):
-            a = svert.attribute.color
-            b = self.evaluate(t)
-            svert.attribute.color = self.blend_ramp(a, b)
+        a = get_stroke_array(stroke, "color")
+        b = self.evaluate_array(t2d_along_stroke_array(stroke))
+        set_stroke_array(stroke, "color", self.blend_ramp_array(a, b))
 
 
 class AlphaAlongStrokeShader(CurveMappingModifier):
     """Maps a curve to the alpha/transparency of the stroke, using the curvilinear abscissa (t)."""
 
     def shade(self, stroke):
-        for svert, t in zip(stroke, iter_t2d_along_stroke(stroke)):
-            a = svert.attribute.alpha
-            b = self.evaluate(t)
-            svert.attribute.alpha = self.blend(a, b)
+        a = get_stroke_array(stroke, "alpha")
+        b = self.evaluate_array(t2d_along_stroke_array(stroke))
+        set_stroke_array(stroke, "alpha", self.blend_array(a, b))
 
 
 class ThicknessAlongStrokeShader(ThicknessBlenderMixIn, CurveMappingModifier):
@@ -334,9 +518,8 @@ class ThicknessAlongStrokeShader(ThicknessBlenderMixIn, CurveMappingModifier):
         self.value = BoundedProperty(value_min, value_max)
 
     def shade(self, stroke):
-        for svert, t in zip(stroke, iter_t2d_along_stroke(stroke)):
-            b = self.value.min + self.evaluate(t) * self.value.delta
-            self.blend_thickness(svert, b)
+        b = self.value.min + self.evaluate_array(t2d_along_stroke_array(stroke)) * self.value.delta
+        self.blend_thickness_array(stroke, b)
 
 
 # -- Distance from Camera modifiers -- #
@@ -349,11 +532,9 @@ class ColorDistanceFromCameraShader(ColorRampModifier):
         self.range = BoundedProperty(range_min, range_max)
 
     def shade(self, stroke):
-        it = iter_distance_from_camera(stroke, *self.range)
-        for svert, t in it:
-            a = svert.attribute.color
-            b = self.evaluate(t)
-            svert.attribute.color = self.blend_ramp(a, b)
+        a = get_stroke_array(stroke, "color")
+        b = self.evaluate_array(distance_from_camera_array(stroke, *self.range))
+        set_stroke_array(stroke, "color", self.blend_ramp_array(a, b))
 
 
 class AlphaDistanceFromCameraShader(CurveMappingModifier):
@@ -364,11 +545,9 @@ class AlphaDistanceFromCameraShader(CurveMappingModifier):
         self.range = BoundedProperty(range_min, range_max)
 
     def shade(self, stroke):
-        it = iter_distance_from_camera(stroke, *self.range)
-        for svert, t in it:
-            a = svert.attribute.alpha
-            b = self.evaluate(t)
-            svert.attribute.alpha = self.blend(a, b)
+        a = get_stroke_array(stroke, "alpha")
+        b = self.evaluate_array(distance_from_camera_array(stroke, *self.range))
+        set_stroke_array(stroke, "alpha", self.blend_array(a, b))
 
 
 class ThicknessDistanceFromCameraShader(ThicknessBlenderMixIn, CurveMappingModifier):
@@ -382,9 +561,9 @@ class ThicknessDistanceFromCameraShader(ThicknessBlenderMixIn, CurveMappingModif
         self.value = BoundedProperty(value_min, value_max)
 
     def shade(self, stroke):
-        for (svert, t) in iter_distance_from_camera(stroke, *self.range):
-            b = self.value.min + self.evaluate(t) * self.value.delta
-            self.blend_thickness(svert, b)
+        t = distance_from_camera_array(stroke, *self.range)
+        b = self.value.min + self.evaluate_array(t) * self.value.delta
+        self.blend_thickness_array(stroke, b)
 
 
 # Distance from Object modifiers
@@ -403,11 +582,9 @@ class ColorDistanceFromObjectShader(ColorRampModifier):
         self.loc = matrix @ target.location
 
     def shade(self, stroke):
-        it = iter_distance_from_object(stroke, self.loc, *self.range)
-        for svert, t in it:
-            a = svert.attribute.color
-            b = self.evaluate(t)
-            svert.attribute.color = self.blend_ramp(a, b)
+        a = get_stroke_array(stroke, "color")
+        b = self.evaluate_array(distance_from_object_array(stroke, self.loc, *self.range))
+        set_stroke_array(stroke, "color", self.blend_ramp_array(a, b))
 
 
 class AlphaDistanceFromObjectShader(CurveMappingModifier):
@@ -424,11 +601,9 @@ class AlphaDistanceFromObjectShader(CurveMappingModifier):
         self.loc = matrix @ target.location
 
     def shade(self, stroke):
-        it = iter_distance_from_object(stroke, self.loc, *self.range)
-        for svert, t in it:
-            a = svert.attribute.alpha
-            b = self.evaluate(t)
-            svert.attribute.alpha = self.blend(a, b)
+        a = get_stroke_array(stroke, "alpha")
+        b = self.evaluate_array(distance_from_object_array(stroke, self.loc, *self.range))
+        set_stroke_array(stroke, "alpha", self.blend_array(a, b))
 
 
 class ThicknessDistanceFromObjectShader(ThicknessBlenderMixIn, CurveMappingModifier):
@@ -448,10 +623,9 @@ class ThicknessDistanceFromObjectShader(ThicknessBlenderMixIn, CurveMappingModif
         self.loc = matrix @ target.location
 
     def shade(self, stroke):
-        it = iter_distance_from_object(stroke, self.loc, *self.range)
-        for svert, t in it:
-            b = self.value.min + self.evaluate(t) * self.value.delta
-            self.blend_thickness(svert, b)
+        t = distance_from_object_array(stroke, self.loc, *self.range)
+        b = self.value.min + self.evaluate_array(t) * self.value.delta
+        self.blend_thickness_array(stroke, b)
 
 
 # Material modifiers
@@ -530,16 +704,12 @@ class CalligraphicThicknessShader(ThicknessBlenderMixIn, ScalarBlendModifier):
         self.func = VertexOrientation2DF0D()
 
     def shade(self, stroke):
-        it = Interface0DIterator(stroke)
-        for svert in it:
-            dir = self.func(it)
-            if dir.length != 0.0:
-                dir.normalize()
-                fac = abs(dir.orthogonal() @ self.orientation)
-                b = self.thickness.min + fac * self.thickness.delta
-            else:
-                b = self.thickness.min
-            self.blend_thickness(svert, b)
+        dirs = vertex_orientation_2d_array(stroke)
+        # dirs are either normalized or null vectors, with fac = 0.0 for the latter
+        orientation = self.orientation
+        fac = np.abs(dirs[:, 1] * orientation.x - dirs[:, 0] * orientation.y)
+        b = self.thickness.min + fac * self.thickness.delta
+        self.blend_thickness_array(stroke, b)
 
 
 # - Tangent Modifiers - #
@@ -605,6 +775,17 @@ class NoiseShader:
             b = n2.turbulence_smooth(self.scale * svert.curvilinear_abscissa + initU2, 2)
             yield (svert, a, b)
 
+    def noisegen_arrays(self, stroke, n1=Noise(), n2=Noise()):
+        """Same values as noisegen(), as two arrays."""
+        initU1 = stroke.length_2d * self.seed + n1.rand(512) * self.seed
+        initU2 = stroke.length_2d * self.seed + n2.rand() * self.seed
+
+        abscissas = get_stroke_array(stroke, "curvilinear_abscissa").tolist()
+        scale = self.scale
+        a = np.array([n1.turbulence_smooth(scale * u + initU1, 2) for u in abscissas])
+        b = np.array([n2.turbulence_smooth(scale * u + initU2, 2) for u in abscissas])
+        return a, b
+
 
 class ThicknessNoiseShader(ThicknessBlenderMixIn, ScalarBlendModifier, NoiseShader):
     """Thickness based on pseudo-noise"""
@@ -617,11 +798,11 @@ class ThicknessNoiseShader(ThicknessBlenderMixIn, ScalarBlendModifier, NoiseShad
         self.asymmetric = asymmetric
 
     def shade(self, stroke):
-        for svert, noiseval1, noiseval2 in self.noisegen(stroke):
-            (r, l) = svert.attribute.thickness
-            l += noiseval1 * self.amplitude
-            r += noiseval2 * self.amplitude
-            self.blend_thickness(svert, (r, l), self.asymmetric)
+        noiseval1, noiseval2 = self.noisegen_arrays(stroke)
+        thickness = get_stroke_array(stroke, "thickness").astype(np.float64)
+        thickness[:, 0] += noiseval2 * self.amplitude
+        thickness[:, 1] += noiseval1 * self.amplitude
+        self.blend_thickness_array(stroke, thickness, self.asymmetric)
 
 
 class ColorNoiseShader(ColorRampModifier, NoiseShader):
@@ -632,9 +813,10 @@ class ColorNoiseShader(ColorRampModifier, NoiseShader):
         NoiseShader.__init__(self, amplitude, period, seed)
 
     def shade(self, stroke):
-        for svert, noiseval1, noiseval2 in self.noisegen(stroke):
-            position = abs(noiseval1 + noiseval2)
-            svert.attribute.color = self.blend_ramp(svert.attribute.color, self.evaluate(position))
+        noiseval1, noiseval2 = self.noisegen_arrays(stroke)
+        position = np.abs(noiseval1 + noiseval2)
+        a = get_stroke_array(stroke, "color")
+        set_stroke_array(stroke, "color", self.blend_ramp_array(a, self.evaluate_array(position)))
 
 
 class AlphaNoiseShader(CurveMappingModifier, NoiseShader):
@@ -644,10 +826,11 @@ class AlphaNoiseShader(CurveMappingModifier, NoiseShader):
         CurveMappingModifier.__init__(self, blend, influence, mapping, invert, curve)
         NoiseShader.__init__(self, amplitude, period, seed)
 
-    def shade(self, stroke, n1=Noise(), n2=Noise()):
-        for svert, noiseval1, noiseval2 in self.noisegen(stroke):
-            position = abs(noiseval1 + noiseval2)
-            svert.attribute.alpha = self.blend(svert.attribute.alpha, self.evaluate(position))
+    def shade(self, stroke):
+        noiseval1, noiseval2 = self.noisegen_arrays(stroke)
+        position = np.abs(noiseval1 + noiseval2)
+        a = get_stroke_array(stroke, "alpha")
+        set_stroke_array(stroke, "alpha", self.blend_array(a, self.evaluate_array(position)))
 
 
 # - Crease Angle Modifiers - #
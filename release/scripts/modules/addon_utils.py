@@ -37,14 +37,35 @@ error_encoding = False
 error_duplicates = []
 addons_fake_modules = {}
 
+# On-disk cache of the parsed 'bl_info' of addons, so only the modified ones
+# are parsed again: {mod_path: (mtime, size, bl_info)}.
+# Loaded on first refresh, 'None' when it can't be used.
+_bl_info_cache = None
+_bl_info_cache_loaded = False
+_BL_INFO_CACHE_VERSION = 1
+
+# Add-ons registered as stubs until they are first used, see '_enable_lazy':
+# {module_name: (classes, [(menu_type, draw_func), ...])}.
+_lazy_addons = {}
+
+# Properties of the operators of lazy add-ons, recorded when they are loaded,
+# so their stubs can declare the same ones:
+# {module_name: (mod_path, mtime, {bl_idname: properties} or None)}.
+# Loaded on first use, 'None' when it can't be used.
+_lazy_props_cache = None
+_lazy_props_cache_loaded = False
+
 
 # called only once at startup, avoids calling 'reset_all', correct but slower.
 def _initialize():
     path_list = paths()
     for path in path_list:
         _bpy.utils._sys_path_ensure_append(path)
+    # Needed for the 'bl_info' of lazy add-ons (cheap with its cache).
+    modules(refresh=False)
     for addon in _preferences.addons:
-        enable(addon.module)
+        if not _enable_lazy(addon.module):
+            enable(addon.module)
 
 
 def paths():
@@ -58,8 +79,105 @@ def paths():
     return addon_paths
 
 
+def _bl_info_cache_filepath(filename="addons_bl_info.cache"):
+    import os
+    # Don't read or write user configuration files.
+    if _bpy.app.factory_startup:
+        return None
+    path = _bpy.utils.user_resource('CONFIG')
+    if not path:
+        return None
+    return os.path.join(path, filename)
+
+
+def _bl_info_cache_read(filename="addons_bl_info.cache"):
+    import marshal
+    import sys
+    filepath = _bl_info_cache_filepath(filename)
+    if filepath is None:
+        return None
+    try:
+        with open(filepath, "rb") as fh:
+            version, py_version, cache = marshal.load(fh)
+    except FileNotFoundError:
+        return {}
+    except Exception as ex:
+        print("Error reading addons cache:", repr(filepath), ex)
+        return {}
+    # Marshal format may change between Python versions.
+    if (
+            version != _BL_INFO_CACHE_VERSION or
+            py_version != tuple(sys.version_info[:2])
+    ):
+        return {}
+    return cache
+
+
+def _bl_info_cache_write(cache, filename="addons_bl_info.cache"):
+    import marshal
+    import os
+    import sys
+    filepath = _bl_info_cache_filepath(filename)
+    if filepath is None:
+        return
+    filepath_tmp = filepath + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath_tmp, "wb") as fh:
+            marshal.dump(
+                (_BL_INFO_CACHE_VERSION, tuple(sys.version_info[:2]), cache),
+                fh,
+            )
+        os.replace(filepath_tmp, filepath)
+    except Exception as ex:
+        # Unsupported values in 'bl_info' raise 'ValueError'.
+        print("Error writing addons cache:", repr(filepath), ex)
+        try:
+            os.remove(filepath_tmp)
+        except OSError:
+            pass
+
+
+def _module_names_stat(path):
+    """
+    Same as 'bpy.path.module_names(path)' but also return the 'os.stat_result'
+    of each module file, using 'os.scandir' to avoid some system calls.
+    """
+    import os
+    import stat
+
+    modules = []
+    try:
+        entries = sorted(os.scandir(path), key=lambda entry: entry.name)
+    except OSError:
+        return modules
+
+    for entry in entries:
+        filename = entry.name
+        if filename == "modules":
+            pass  # XXX, hard coded exception.
+        elif filename.endswith(".py") and filename != "__init__.py":
+            try:
+                modules.append((filename[0:-3], entry.path, entry.stat()))
+            except OSError:
+                pass
+        elif not filename.startswith("."):
+            # Skip hidden files since they are used by for version control.
+            fullpath = os.path.join(entry.path, "__init__.py")
+            try:
+                st = os.stat(fullpath)
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                modules.append((filename, fullpath, st))
+
+    return modules
+
+
 def modules_refresh(module_cache=addons_fake_modules):
     global error_encoding
+    global _bl_info_cache
+    global _bl_info_cache_loaded
     import os
 
     error_encoding = False
@@ -67,14 +185,39 @@ def modules_refresh(module_cache=addons_fake_modules):
 
     path_list = paths()
 
+    if not _bl_info_cache_loaded:
+        _bl_info_cache = _bl_info_cache_read()
+        _bl_info_cache_loaded = True
+    bl_info_cache = _bl_info_cache
+    bl_info_cache_changed = False
+
     # fake module importing
-    def fake_module(mod_name, mod_path, speedy=True, force_support=None):
+    def fake_module(
+            mod_name, mod_path, mod_stat,
+            speedy=True, force_support=None,
+    ):
         global error_encoding
+        nonlocal bl_info_cache_changed
 
         if _bpy.app.debug_python:
             print("fake_module", mod_path, mod_name)
         import ast
         ModuleType = type(ast)
+
+        cache_key = (mod_stat.st_mtime, mod_stat.st_size)
+        if bl_info_cache is not None:
+            cache_item = bl_info_cache.get(mod_path)
+        else:
+            cache_item = None
+        if cache_item is not None and tuple(cache_item[:2]) == cache_key:
+            mod = ModuleType(mod_name)
+            mod.bl_info = dict(cache_item[2])
+            mod.__file__ = mod_path
+            mod.__time__ = mod_stat.st_mtime
+            if force_support is not None:
+                mod.bl_info["support"] = force_support
+            return mod
+
         try:
             file_mod = open(mod_path, "r", encoding='UTF-8')
         except OSError as ex:
@@ -136,13 +279,17 @@ def modules_refresh(module_cache=addons_fake_modules):
                 mod = ModuleType(mod_name)
                 mod.bl_info = ast.literal_eval(body.value)
                 mod.__file__ = mod_path
-                mod.__time__ = os.path.getmtime(mod_path)
+                mod.__time__ = mod_stat.st_mtime
             except:
                 print("AST error parsing bl_info for:", repr(mod_path))
                 import traceback
                 traceback.print_exc()
                 return None
 
+            if bl_info_cache is not None:
+                bl_info_cache[mod_path] = (*cache_key, dict(mod.bl_info))
+                bl_info_cache_changed = True
+
             if force_support is not None:
                 mod.bl_info["support"] = force_support
 
@@ -156,6 +303,7 @@ def modules_refresh(module_cache=addons_fake_modules):
             return None
 
     modules_stale = set(module_cache.keys())
+    mod_paths = set()
 
     for path in path_list:
 
@@ -165,8 +313,9 @@ def modules_refresh(module_cache=addons_fake_modules):
         else:
             force_support = None
 
-        for mod_name, mod_path in _bpy.path.module_names(path):
+        for mod_name, mod_path, mod_stat in _module_names_stat(path):
             modules_stale.discard(mod_name)
+            mod_paths.add(mod_path)
             mod = module_cache.get(mod_name)
             if mod:
                 if mod.__file__ != mod_path:
@@ -177,12 +326,12 @@ def modules_refresh(module_cache=addons_fake_modules):
                     )
                     error_duplicates.append((mod.bl_info["name"], mod.__file__, mod_path))
 
-                elif mod.__time__ != os.path.getmtime(mod_path):
+                elif mod.__time__ != mod_stat.st_mtime:
                     print(
                         "reloading addon:",
                         mod_name,
                         mod.__time__,
-                        os.path.getmtime(mod_path),
+                        mod_stat.st_mtime,
                         repr(mod_path),
                     )
                     del module_cache[mod_name]
@@ -192,6 +341,7 @@ def modules_refresh(module_cache=addons_fake_modules):
                 mod = fake_module(
                     mod_name,
                     mod_path,
+                    mod_stat,
                     force_support=force_support,
                 )
                 if mod:
@@ -202,6 +352,14 @@ def modules_refresh(module_cache=addons_fake_modules):
         del module_cache[mod_stale]
     del modules_stale
 
+    if bl_info_cache is not None:
+        # Forget about removed addons.
+        for mod_path in bl_info_cache.keys() - mod_paths:
+            del bl_info_cache[mod_path]
+            bl_info_cache_changed = True
+        if bl_info_cache_changed:
+            _bl_info_cache_write(bl_info_cache)
+
 
 def modules(module_cache=addons_fake_modules, *, refresh=True):
     if refresh or ((module_cache is addons_fake_modules) and modules._is_first):
@@ -233,6 +391,9 @@ def check(module_name):
     import sys
     loaded_default = module_name in _preferences.addons
 
+    if module_name in _lazy_addons:
+        return loaded_default, True
+
     mod = sys.modules.get(module_name)
     loaded_state = (
         (mod is not None) and
@@ -292,6 +453,7 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
 
     import os
     import sys
+    from time import perf_counter
     from bpy_restrict_state import RestrictBlend
 
     if handle_error is None:
@@ -299,6 +461,10 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
             import traceback
             traceback.print_exc()
 
+    # Replace the stubs by the actual add-on.
+    if module_name in _lazy_addons:
+        _lazy_remove(module_name)
+
     # reload if the mtime changes
     mod = sys.modules.get(module_name)
     # chances of the file _not_ existing are low, but it could be removed
@@ -347,6 +513,7 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
     with RestrictBlend():
 
         # 1) try import
+        time_import = perf_counter()
         try:
             mod = __import__(module_name)
             mod.__time__ = os.path.getmtime(mod.__file__)
@@ -361,6 +528,7 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
             if default_set:
                 _addon_remove(module_name)
             return None
+        time_import = perf_counter() - time_import
 
         # 1.1) Fail when add-on is too old.
         # This is a temporary 2.8x migration check, so we can manage addons that are supported.
@@ -378,6 +546,7 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
         _bl_owner_id_set(module_name)
 
         # 3) Try run the modules register function.
+        time_register = perf_counter()
         try:
             mod.register()
         except Exception as ex:
@@ -392,11 +561,18 @@ def enable(module_name, *, default_set=False, persistent=False, handle_error=Non
             return None
         finally:
             _bl_owner_id_set(owner_id_prev)
+        time_register = perf_counter() - time_register
 
     # * OK loaded successfully! *
     mod.__addon_enabled__ = True
     mod.__addon_persistent__ = persistent
 
+    _bpy.utils._load_time_add(module_name, 'ADDON', "import", time_import)
+    _bpy.utils._load_time_add(module_name, 'ADDON', "register", time_register)
+
+    if mod.bl_info.get("lazy"):
+        _lazy_props_update(module_name, mod)
+
     if _bpy.app.debug_python:
         print("\taddon_utils.enable", mod.__name__)
 
@@ -421,6 +597,12 @@ def disable(module_name, *, default_set=False, handle_error=None):
             import traceback
             traceback.print_exc()
 
+    if module_name in _lazy_addons:
+        _lazy_remove(module_name)
+        if default_set:
+            _addon_remove(module_name)
+        return
+
     mod = sys.modules.get(module_name)
 
     # possible this addon is from a previous session and didn't load a
@@ -452,6 +634,326 @@ def disable(module_name, *, default_set=False, handle_error=None):
         print("\taddon_utils.disable", module_name)
 
 
+# Lazy add-ons
+#
+# Add-ons can declare a 'lazy' field in their 'bl_info', so when enabled at
+# startup only lightweight stubs of their operators and menu entries are
+# registered, the add-on itself is imported and registered the first time
+# one of these operators is called:
+#
+# "lazy": {
+#     # (bl_idname, bl_label[, bl_description])
+#     "operators": (("mesh.primitive_foo_add", "Foo"), ),
+#     # (menu_type, operator bl_idname[, text[, icon]])
+#     "menus": (("VIEW3D_MT_mesh_add", "mesh.primitive_foo_add"), ),
+# },
+#
+# The stubs declare the same properties as the actual operators, these are
+# recorded when the add-on is loaded, so an add-on is only lazy once it has
+# been loaded normally (and again after it changes on disk).
+# Calls from scripts ('bpy.ops') load the add-on before running the operator.
+# Lazy loading is disabled in background mode, where timers don't run.
+#
+# Everything else the add-on registers (keymaps, panels, preferences...)
+# is only available once it has been loaded.
+
+# 'bpy.props' function used for the stub property of each RNA property type.
+_LAZY_PROPS_FUNC = {
+    'BOOLEAN': "Bool",
+    'INT': "Int",
+    'FLOAT': "Float",
+    'STRING': "String",
+    'ENUM': "Enum",
+}
+
+
+def _lazy_operator_props(idname):
+    """
+    Describe the properties of a registered operator as
+    ``((identifier, bpy_props_function_name, keywords), ...)``,
+    None when a property can't be declared by a stub.
+    """
+    category, name = idname.split(".", 1)
+    rna_type = getattr(getattr(_bpy.ops, category), name).get_rna_type()
+
+    props = []
+    for prop in rna_type.properties:
+        identifier = prop.identifier
+        if identifier == "rna_type":
+            continue
+        func = _LAZY_PROPS_FUNC.get(prop.type)
+        if func is None:
+            return None
+
+        options = set()
+        if prop.is_hidden:
+            options.add('HIDDEN')
+        if prop.is_skip_save:
+            options.add('SKIP_SAVE')
+        kw = {
+            "name": prop.name,
+            "description": prop.description,
+        }
+
+        if prop.type == 'ENUM':
+            items = tuple(
+                (item.identifier, item.name, item.description,
+                 item.icon, item.value)
+                for item in prop.enum_items
+            )
+            # Items generated by a function can't be recorded.
+            if not items:
+                return None
+            kw["items"] = items
+            if prop.is_enum_flag:
+                options.add('ENUM_FLAG')
+                kw["default"] = set(prop.default_flag)
+            elif prop.default:
+                kw["default"] = prop.default
+        elif prop.type == 'STRING':
+            kw["default"] = prop.default
+            kw["subtype"] = prop.subtype
+            if prop.length_max:
+                kw["maxlen"] = prop.length_max
+        else:
+            kw["subtype"] = prop.subtype
+            if prop.type != 'BOOLEAN':
+                kw["min"] = prop.hard_min
+                kw["max"] = prop.hard_max
+                kw["soft_min"] = prop.soft_min
+                kw["soft_max"] = prop.soft_max
+                kw["step"] = prop.step
+            if prop.type == 'FLOAT':
+                kw["precision"] = prop.precision
+                kw["unit"] = prop.unit
+            if prop.array_length:
+                func += "Vector"
+                kw["size"] = prop.array_length
+                kw["default"] = tuple(prop.default_array)
+            else:
+                kw["default"] = prop.default
+
+        kw["options"] = options
+        props.append((identifier, func, kw))
+
+    return tuple(props)
+
+
+def _lazy_props_cache_get():
+    global _lazy_props_cache
+    global _lazy_props_cache_loaded
+    if not _lazy_props_cache_loaded:
+        _lazy_props_cache = _bl_info_cache_read("addons_lazy.cache")
+        _lazy_props_cache_loaded = True
+    return _lazy_props_cache
+
+
+def _lazy_props_get(module_name, mod):
+    """
+    The recorded operator properties of an add-on (from a fake module),
+    None when they aren't known.
+    """
+    cache = _lazy_props_cache_get()
+    if cache is None:
+        return None
+    cache_item = cache.get(module_name)
+    if cache_item is None:
+        return None
+    mod_path, mtime, props = cache_item
+    if mod_path != mod.__file__ or mtime != mod.__time__:
+        return None
+    return props
+
+
+def _lazy_props_update(module_name, mod):
+    """
+    Record the properties of the lazy operators of a loaded add-on.
+    """
+    cache = _lazy_props_cache_get()
+    if cache is None or _bpy.app.background:
+        return
+
+    props = {}
+    try:
+        for idname, *_args in mod.bl_info["lazy"].get("operators", ()):
+            op_props = _lazy_operator_props(idname)
+            if op_props is None:
+                props = None
+                break
+            props[idname] = op_props
+    except Exception:
+        # Invalid 'lazy' field or operator not registered by the add-on.
+        props = None
+
+    cache_item = (mod.__file__, mod.__time__, props)
+    if cache.get(module_name) != cache_item:
+        cache[module_name] = cache_item
+        _bl_info_cache_write(cache, "addons_lazy.cache")
+
+
+def _lazy_call_timer(module_name, idname, context_override, call_mode, kw):
+    if module_name in _lazy_addons:
+        enable(module_name)
+
+    category, name = idname.split(".", 1)
+    try:
+        getattr(getattr(_bpy.ops, category), name)(
+            context_override, call_mode, **kw,
+        )
+    except Exception:
+        import traceback
+        traceback.print_exc()
+    return None
+
+
+def _lazy_operator_stub(module_name, idname, label, description="", props=()):
+    import bpy.props
+    from bpy.types import Operator
+    from functools import partial
+
+    def call(self, context, call_mode):
+        properties = self.properties
+        kw = {}
+        for identifier, _func, _kw in props:
+            if properties.is_property_set(identifier):
+                value = getattr(properties, identifier)
+                if not isinstance(value, (bool, int, float, str, set)):
+                    value = tuple(value)
+                kw[identifier] = value
+
+        # Registering the add-on replaces this (running) operator type,
+        # so load it and call the actual operator once this one is done.
+        # Calls from scripts don't get here, see 'bpy.ops._op_lazy_load'.
+        _bpy.app.timers.register(
+            partial(
+                _lazy_call_timer,
+                module_name, idname, context.copy(), call_mode, kw,
+            ),
+            first_interval=0.0,
+        )
+        return {'FINISHED'}
+
+    def invoke(self, context, _event):
+        return call(self, context, 'INVOKE_DEFAULT')
+
+    def execute(self, context):
+        return call(self, context, 'EXEC_DEFAULT')
+
+    annotations = {}
+    for identifier, func, kw in props:
+        annotations[identifier] = getattr(bpy.props, func + "Property")(**kw)
+
+    category, name = idname.split(".", 1)
+    return type(
+        "%s_OT_%s" % (category.upper(), name),
+        (Operator, ),
+        {
+            "bl_idname": idname,
+            "bl_label": label,
+            "bl_description": description,
+            "invoke": invoke,
+            "execute": execute,
+            "__annotations__": annotations,
+        },
+    )
+
+
+def _lazy_menu_draw(idname, text=None, icon='NONE'):
+    def draw(self, _context):
+        if text is None:
+            self.layout.operator(idname, icon=icon)
+        else:
+            self.layout.operator(idname, text=text, icon=icon)
+    return draw
+
+
+def _lazy_remove(module_name):
+    classes, menus = _lazy_addons.pop(module_name)
+    for menu, draw in menus:
+        menu.remove(draw)
+    for cls in reversed(classes):
+        _bpy.ops._op_lazy_load.pop(cls.bl_idname, None)
+        _bpy.utils.unregister_class(cls)
+
+
+def _enable_lazy(module_name):
+    """
+    Register the stubs declared in the 'lazy' field of an add-on 'bl_info'
+    instead of the add-on itself.
+
+    :return: False when the add-on has to be enabled normally.
+    :rtype: bool
+    """
+    import sys
+    from functools import partial
+    from time import perf_counter
+
+    if module_name in _lazy_addons:
+        return True
+    # Timers don't run in background mode, the stubs would never call
+    # the actual operators.
+    if _bpy.app.background:
+        return False
+    mod = addons_fake_modules.get(module_name)
+    if mod is None or module_name in sys.modules:
+        return False
+    lazy = mod.bl_info.get("lazy")
+    # Let 'enable' deal with add-ons too old too.
+    if not lazy or mod.bl_info.get("blender", (0, 0, 0)) < (2, 80, 0):
+        return False
+
+    # Only once the operator properties are known.
+    props = _lazy_props_get(module_name, mod)
+    if props is None:
+        return False
+    try:
+        operators = [
+            (idname, *args, props[idname])
+            for idname, *args in lazy.get("operators", ())
+        ]
+    except (KeyError, TypeError, ValueError):
+        return False
+
+    from _bpy import _bl_owner_id_get, _bl_owner_id_set
+    owner_id_prev = _bl_owner_id_get()
+    _bl_owner_id_set(module_name)
+
+    t = perf_counter()
+    classes = []
+    menus = []
+    _lazy_addons[module_name] = classes, menus
+    try:
+        for idname, *args, op_props in operators:
+            # Pad the optional description.
+            args = (args + [""])[:2]
+            cls = _lazy_operator_stub(module_name, idname, *args, op_props)
+            _bpy.utils.register_class(cls)
+            classes.append(cls)
+            _bpy.ops._op_lazy_load[idname] = partial(enable, module_name)
+        for menu_type, *args in lazy.get("menus", ()):
+            menu = getattr(_bpy.types, menu_type)
+            draw = _lazy_menu_draw(*args)
+            menu.append(draw)
+            menus.append((menu, draw))
+    except Exception:
+        print("Invalid 'lazy' in bl_info for:", repr(mod.__file__))
+        import traceback
+        traceback.print_exc()
+        _lazy_remove(module_name)
+        return False
+    finally:
+        _bl_owner_id_set(owner_id_prev)
+
+    _bpy.utils._load_time_add(
+        module_name, 'ADDON_LAZY', "register", perf_counter() - t,
+    )
+
+    if _bpy.app.debug_python:
+        print("\taddon_utils._enable_lazy", module_name)
+
+    return True
+
+
 def reset_all(*, reload_scripts=False):
     """
     Sets the addon state based on the user preferences.
@@ -479,7 +981,8 @@ def reset_all(*, reload_scripts=False):
             if is_enabled == is_loaded:
                 pass
             elif is_enabled:
-                enable(mod_name)
+                if not _enable_lazy(mod_name):
+                    enable(mod_name)
             elif is_loaded:
                 print("\taddon_utils.reset_all unloading", mod_name)
                 disable(mod_name)
@@ -497,6 +1000,8 @@ def disable_all():
     for mod_name, mod in addon_modules:
         if getattr(mod, "__addon_enabled__", False):
             disable(mod_name)
+    for mod_name in list(_lazy_addons.keys()):
+        disable(mod_name)
 
 
 def _blender_manual_url_prefix():
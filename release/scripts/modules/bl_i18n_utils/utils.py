@@ -20,9 +20,12 @@
 
 # Some misc utilities...
 
+import bisect
 import collections
 import copy
+import difflib
 import hashlib
+import heapq
 import os
 import re
 import struct
@@ -45,7 +48,6 @@ def is_valid_po_path(path):
 
 
 def get_best_similar(data):
-    import difflib
     key, use_similar, similar_pool = data
 
     # try to find some close key in existing messages...
@@ -74,6 +76,115 @@ def get_best_similar(data):
     return key, tmp
 
 
+class SimilarMsgidIndex:
+    """
+    Character trigram inverted index over a pool of msgids, to find the most similar one to a new msgid.
+    best_similar() gives the same result as get_best_similar() over the same pool (best ratio above threshold,
+    last one in pool order on ties), but:
+        * The msgids sharing the most trigrams with the key are checked first, which usually gives a high best ratio
+          early on.
+        * Remaining msgids are then only checked when their length and character counts can still reach that best
+          ratio, and pool msgids are sorted by length so that most of them are never even visited.
+    """
+    __slots__ = (
+        "pool",
+        "order",
+        "lengths",
+        "char_counts",
+        "trigrams",
+        "nbr_candidates",
+    )
+
+    # Trigrams found in more than this ratio of the pool are useless to find candidates, skip them.
+    MAX_TRIGRAM_FREQUENCY = 0.1
+
+    def __init__(self, pool, nbr_candidates=8):
+        self.pool = tuple(pool)
+        self.nbr_candidates = nbr_candidates
+        # Pool indices sorted by msgid length.
+        self.order = sorted(range(len(self.pool)), key=lambda idx: len(self.pool[idx]))
+        self.lengths = [len(self.pool[idx]) for idx in self.order]
+        self.char_counts = [dict(collections.Counter(msgid)).get for msgid in self.pool]
+        self.trigrams = {}
+        for idx, msgid in enumerate(self.pool):
+            for tg in self._trigrams(msgid):
+                self.trigrams.setdefault(tg, []).append(idx)
+
+    @staticmethod
+    def _trigrams(msgid):
+        return {msgid[i:i + 3] for i in range(len(msgid) - 2)}
+
+    def _candidates(self, msgid, min_len, max_len):
+        """Pool indices sharing the most trigrams with msgid (best ones first)."""
+        max_freq = max(1, int(len(self.pool) * self.MAX_TRIGRAM_FREQUENCY))
+        shared = collections.Counter()
+        for tg in self._trigrams(msgid):
+            idcs = self.trigrams.get(tg, ())
+            if len(idcs) <= max_freq:
+                shared.update(idcs)
+        pool = self.pool
+        shared = ((n, idx) for idx, n in shared.items() if min_len < len(pool[idx]) < max_len)
+        return [idx for n, idx in heapq.nlargest(self.nbr_candidates, shared)]
+
+    def best_similar(self, key, use_similar):
+        """Same as get_best_similar((key, use_similar, pool))."""
+        msgid = key[1]
+        len_key = len(msgid)
+        # Same length window as get_best_similar().
+        min_len = len_key // 2
+        max_len = len_key * 2
+        pool = self.pool
+        char_counts = self.char_counts
+
+        s = difflib.SequenceMatcher()
+        s.set_seq2(msgid)
+        key_counts = collections.Counter(msgid)
+        key_chars = tuple(key_counts.keys())
+        key_nbrs = tuple(key_counts.values())
+        zeros = (0,) * len(key_chars)
+        # Removes all chars of msgid, what remains of an other msgid can never match.
+        no_key_chars = str.maketrans("", "", "".join(key_chars))
+        best_ratio = use_similar
+        best_idx = -1
+
+        def check(idx):
+            # Same values (and float rounding) as real_quick_ratio(), quick_ratio() and ratio(), the cheapest
+            # tests first.
+            nonlocal best_ratio, best_idx
+            x = pool[idx]
+            len_x = len(x)
+            length = len_key + len_x
+            if 2.0 * min(len_key, len_x) / length < best_ratio:
+                return
+            if 2.0 * (len_x - len(x.translate(no_key_chars))) / length < best_ratio:
+                return
+            if 2.0 * sum(map(min, key_nbrs, map(char_counts[idx], key_chars, zeros))) / length < best_ratio:
+                return
+            s.set_seq1(x)
+            sratio = s.ratio()
+            if sratio > best_ratio or (sratio == best_ratio and idx > best_idx):
+                best_ratio = sratio
+                best_idx = idx
+
+        checked = self._candidates(msgid, min_len, max_len)
+        for idx in checked:
+            check(idx)
+        checked = set(checked)
+
+        # Now that best_ratio is (hopefully) high, only visit msgids with a length that can still reach it
+        # (2 * min(len_key, len_x) / (len_key + len_x) >= best_ratio), check() does the exact test.
+        lo, hi = min_len, max_len
+        if best_ratio > 0.0:
+            lo = max(lo, int(len_key * best_ratio / (2.0 - best_ratio)) - 1)
+            hi = min(hi, int(len_key * (2.0 - best_ratio) / best_ratio) + 2)
+        order = self.order
+        for idx in order[bisect.bisect_right(self.lengths, lo):bisect.bisect_left(self.lengths, hi)]:
+            if idx not in checked:
+                check(idx)
+
+        return key, (pool[best_idx] if best_idx >= 0 else None)
+
+
 _locale_explode_re = re.compile(r"^([a-z]{2,})(?:_([A-Z]{2,}))?(?:@([a-z]{2,}))?$")
 
 
@@ -632,8 +743,8 @@ class I18nMessages:
 
         # Next process new keys.
         if use_similar > 0.0:
-            for key, msgid in map(get_best_similar,
-                                  tuple((nk, use_similar, tuple(similar_pool.keys())) for nk in new_keys)):
+            similar_index = SimilarMsgidIndex(similar_pool.keys())
+            for key, msgid in (similar_index.best_similar(nk, use_similar) for nk in new_keys):
                 if msgid:
                     # Try to get the same context, else just get one...
                     skey = (key[0], msgid)
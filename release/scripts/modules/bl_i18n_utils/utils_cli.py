@@ -20,6 +20,7 @@
 
 # Some useful operations from utils' I18nMessages class exposed as a CLI.
 
+import concurrent.futures
 import os
 
 if __package__ is None:
@@ -32,15 +33,27 @@ else:
     from . import utils_languages_menu
 
 
-def update_po(args, settings):
-    pot = utils_i18n.I18nMessages(uid=None, kind='PO', src=args.template, settings=settings)
-    if os.path.isfile(args.dst):
-        uid = os.path.splitext(os.path.basename(args.dst))[0]
-        po = utils_i18n.I18nMessages(uid=uid, kind='PO', src=args.dst, settings=settings)
+def update_po_callback(pot, dst, settings):
+    if os.path.isfile(dst):
+        uid = os.path.splitext(os.path.basename(dst))[0]
+        po = utils_i18n.I18nMessages(uid=uid, kind='PO', src=dst, settings=settings)
         po.update(pot)
     else:
         po = pot
-    po.write(kind="PO", dest=args.dst)
+    po.write(kind="PO", dest=dst)
+
+
+def update_po(args, settings):
+    pot = utils_i18n.I18nMessages(uid=None, kind='PO', src=args.template, settings=settings)
+    if len(args.dst) == 1 or args.jobs == 1:
+        for dst in args.dst:
+            update_po_callback(pot, dst, settings)
+        return
+    # Each language is independent, update them in parallel.
+    num_dst = len(args.dst)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs or None) as exctr:
+        for dst, _ in zip(args.dst, exctr.map(update_po_callback, (pot,) * num_dst, args.dst, (settings,) * num_dst)):
+            print("{} PO written!".format(dst))
 
 
 def cleanup_po(args, settings):
@@ -105,7 +118,10 @@ def main():
     sub_parser = sub_parsers.add_parser('update_po', help="Update a PO file from a given POT template file")
     sub_parser.add_argument('--template', metavar='template.pot', required=True,
                             help="The source pot file to use as template for the update.")
-    sub_parser.add_argument('--dst', metavar='dst.po', required=True, help="The destination po to update.")
+    sub_parser.add_argument('--dst', metavar='dst.po', required=True, nargs='+',
+                            help="The destination po(s) to update.")
+    sub_parser.add_argument('-j', '--jobs', type=int, default=0,
+                            help="Number of processes updating several po's at once (0 for one per CPU).")
     sub_parser.set_defaults(func=update_po)
 
     sub_parser = sub_parsers.add_parser('cleanup_po',
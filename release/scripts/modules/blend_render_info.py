@@ -32,6 +32,31 @@
 # } BHead;
 
 
+# Start and end frame (2 ints) followed by the scene name (64 chars).
+REND_CHUNK_SIZE = 8 + 64
+
+
+def unpack_rend_chunk(data, is_big_endian):
+    """
+    Return (start_frame, end_frame, scene_name) from the data of a 'REND' block,
+    so tools reading blend files by other means can share the decoding.
+    """
+    import struct
+
+    start_frame, end_frame = struct.unpack_from('>2i' if is_big_endian else '<2i', data, 0)
+
+    scene_name = data[8:REND_CHUNK_SIZE]
+
+    scene_name = scene_name[:scene_name.index(b'\0')]
+
+    try:
+        scene_name = str(scene_name, "utf8")
+    except TypeError:
+        pass
+
+    return start_frame, end_frame, scene_name
+
+
 def read_blend_rend_chunk(path):
 
     import struct
@@ -72,19 +97,8 @@ def read_blend_rend_chunk(path):
         # We don't care about the rest of the bhead struct
         blendfile.read(sizeof_bhead_left)
 
-        # Now we want the scene name, start and end frame. this is 32bites long
-        start_frame, end_frame = struct.unpack('>2i' if is_big_endian else '<2i', blendfile.read(8))
-
-        scene_name = blendfile.read(64)
-
-        scene_name = scene_name[:scene_name.index(b'\0')]
-
-        try:
-            scene_name = str(scene_name, "utf8")
-        except TypeError:
-            pass
-
-        scenes.append((start_frame, end_frame, scene_name))
+        # Now we want the scene name, start and end frame.
+        scenes.append(unpack_rend_chunk(blendfile.read(REND_CHUNK_SIZE), is_big_endian))
 
     blendfile.close()
 
@@ -31,6 +31,11 @@ _op_get_bl_options = _ops_module.get_bl_options
 
 _ModuleType = type(_ops_module)
 
+# Operators of add-ons loaded on first use, see 'addon_utils._enable_lazy':
+# {idname_py: load_function}. The add-on is loaded before the operator is
+# called, so scripts run the actual operator (with its properties).
+_op_lazy_load = {}
+
 
 # -----------------------------------------------------------------------------
 # Callable Operator Wrapper
@@ -116,6 +121,11 @@ class _BPyOpsSubModOp:
         import bpy
         context = bpy.context
 
+        if _op_lazy_load:
+            load = _op_lazy_load.get(self.idname_py())
+            if load is not None:
+                load()
+
         # Get the operator from blender
         wm = context.window_manager
 
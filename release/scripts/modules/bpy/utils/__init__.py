@@ -30,6 +30,7 @@ __all__ = (
     "keyconfig_init",
     "keyconfig_set",
     "load_scripts",
+    "load_scripts_report",
     "modules_from_path",
     "preset_find",
     "preset_paths",
@@ -118,8 +119,23 @@ def execfile(filepath, mod=None):
     return mod
 
 
+# Import and register times of script modules and add-ons,
+# see 'load_scripts_report'.
+_load_times = {}
+
+
+def _load_time_add(module_name, kind, step, seconds):
+    item = _load_times.setdefault(
+        module_name,
+        {"module": module_name, "kind": kind, "import": 0.0, "register": 0.0},
+    )
+    item["kind"] = kind
+    item[step] += seconds
+
+
 def _test_import(module_name, loaded_modules):
     use_time = _bpy.app.debug_python
+    from time import perf_counter
 
     if module_name in loaded_modules:
         return None
@@ -128,9 +144,7 @@ def _test_import(module_name, loaded_modules):
               "multiple periods" % module_name)
         return None
 
-    if use_time:
-        import time
-        t = time.time()
+    t = perf_counter()
 
     try:
         mod = __import__(module_name)
@@ -139,8 +153,10 @@ def _test_import(module_name, loaded_modules):
         traceback.print_exc()
         return None
 
+    t = perf_counter() - t
+    _load_time_add(module_name, 'SCRIPT', "import", t)
     if use_time:
-        print("time %s %.4f" % (module_name, time.time() - t))
+        print("time %s %.4f" % (module_name, t))
 
     loaded_modules.add(mod.__name__)  # should match mod.__name__ too
     return mod
@@ -207,10 +223,10 @@ def load_scripts(reload_scripts=False, refresh_scripts=False):
     use_time = use_class_register_check = _bpy.app.debug_python
     use_user = not _is_factory_startup
 
-    if use_time:
-        import time
-        t_main = time.time()
+    from time import perf_counter
+    t_main = perf_counter()
 
+    _load_times.clear()
     loaded_modules = set()
 
     if refresh_scripts:
@@ -227,11 +243,15 @@ def load_scripts(reload_scripts=False, refresh_scripts=False):
     def register_module_call(mod):
         register = getattr(mod, "register", None)
         if register:
+            t = perf_counter()
             try:
                 register()
             except:
                 import traceback
                 traceback.print_exc()
+            _load_time_add(
+                mod.__name__, 'SCRIPT', "register", perf_counter() - t,
+            )
         else:
             print("\nWarning! '%s' has no register function, "
                   "this is now a requirement for registerable scripts" %
@@ -325,8 +345,13 @@ def load_scripts(reload_scripts=False, refresh_scripts=False):
         import gc
         print("gc.collect() -> %d" % gc.collect())
 
+    _load_times_total[0] = perf_counter() - t_main
     if use_time:
-        print("Python Script Load Time %.4f" % (time.time() - t_main))
+        print("Python Script Load Time %.4f" % _load_times_total[0])
+
+    report_filepath = _os.environ.get("BLENDER_LOAD_SCRIPTS_REPORT")
+    if report_filepath:
+        load_scripts_report(filepath=report_filepath)
 
     if use_class_register_check:
         for cls in _bpy.types.bpy_struct.__subclasses__():
@@ -339,6 +364,39 @@ def load_scripts(reload_scripts=False, refresh_scripts=False):
                         )
 
 
+_load_times_total = [0.0]
+
+
+def load_scripts_report(*, filepath=None):
+    """
+    Return the time spent importing and registering each script module and
+    add-on by the last :func:`load_scripts` call (and add-ons enabled since),
+    slowest first. When the ``BLENDER_LOAD_SCRIPTS_REPORT`` environment
+    variable is set, this report is written to that file after loading.
+
+    :arg filepath: Optional JSON file to write the report to.
+    :type filepath: string
+    :return: A dictionary with the ``total`` load time and a list of
+       ``modules``, each one a dictionary with ``module``, ``kind``
+       (``'SCRIPT'``, ``'ADDON'`` or ``'ADDON_LAZY'``), ``import`` and
+       ``register`` times, in seconds.
+    :rtype: dict
+    """
+    report = {
+        "total": _load_times_total[0],
+        "modules": sorted(
+            (item.copy() for item in _load_times.values()),
+            key=lambda item: item["import"] + item["register"],
+            reverse=True,
+        ),
+    }
+    if filepath is not None:
+        import json
+        with open(filepath, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=1)
+    return report
+
+
 # base scripts
 _scripts = (
     _os.path.dirname(_os.path.dirname(_os.path.dirname(__file__))),
@@ -27,6 +27,8 @@
 #include "../Interface0D/CurvePoint/BPy_StrokeVertex.h"
 #include "../Iterator/BPy_StrokeVertexIterator.h"
 
+#include <cstring>
+
 #ifdef __cplusplus
 extern "C" {
 #endif
@@ -323,6 +325,227 @@ static PyObject *Stroke_stroke_vertices_size(BPy_Stroke *self)
   return PyLong_FromLong(self->s->strokeVerticesSize());
 }
 
+/* Stroke vertex attributes exchanged in bulk by foreach_get() and foreach_set(). */
+enum {
+  STROKE_FOREACH_POINT = 0,
+  STROKE_FOREACH_POINT_3D,
+  STROKE_FOREACH_CURVILINEAR_ABSCISSA,
+  STROKE_FOREACH_U,
+  STROKE_FOREACH_COLOR,
+  STROKE_FOREACH_ALPHA,
+  STROKE_FOREACH_THICKNESS,
+};
+
+static const struct {
+  const char *name;
+  int size;
+  bool is_writable;
+} Stroke_foreach_attributes[] = {
+    {"point", 2, true},
+    {"point_3d", 3, false},
+    {"curvilinear_abscissa", 1, false},
+    {"u", 1, false},
+    {"color", 3, true},
+    {"alpha", 1, true},
+    {"thickness", 2, true},
+};
+
+/* Parse the arguments of foreach_get() and foreach_set(), on success the buffer
+ * must be released with PyBuffer_Release(). */
+static int Stroke_foreach_parse_args(BPy_Stroke *self,
+                                     PyObject *args,
+                                     PyObject *kwds,
+                                     const char *error_prefix,
+                                     bool is_set,
+                                     int *r_attribute,
+                                     Py_buffer *r_buffer)
+{
+  static const char *kwlist[] = {"attribute", "seq", nullptr};
+  const char *name;
+  PyObject *seq;
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "sO", (char **)kwlist, &name, &seq)) {
+    return -1;
+  }
+  const int attributes_len = sizeof(Stroke_foreach_attributes) /
+                             sizeof(*Stroke_foreach_attributes);
+  int attribute = -1;
+  for (int i = 0; i < attributes_len; i++) {
+    if (strcmp(name, Stroke_foreach_attributes[i].name) == 0) {
+      attribute = i;
+      break;
+    }
+  }
+  if (attribute == -1) {
+    PyErr_Format(PyExc_ValueError, "%s: unknown attribute '%s'", error_prefix, name);
+    return -1;
+  }
+  if (is_set && !Stroke_foreach_attributes[attribute].is_writable) {
+    PyErr_Format(PyExc_AttributeError, "%s: attribute '%s' is read-only", error_prefix, name);
+    return -1;
+  }
+
+  int flags = PyBUF_C_CONTIGUOUS | PyBUF_FORMAT;
+  if (!is_set) {
+    flags |= PyBUF_WRITABLE;
+  }
+  if (PyObject_GetBuffer(seq, r_buffer, flags) == -1) {
+    PyErr_Format(PyExc_TypeError,
+                 "%s: expected a contiguous%s buffer of floats, not %.200s",
+                 error_prefix,
+                 is_set ? "" : " writable",
+                 Py_TYPE(seq)->tp_name);
+    return -1;
+  }
+
+  const Py_ssize_t len = (Py_ssize_t)self->s->strokeVerticesSize() *
+                         Stroke_foreach_attributes[attribute].size;
+  if (r_buffer->itemsize != sizeof(float) || !r_buffer->format ||
+      strcmp(r_buffer->format, "f") != 0) {
+    PyErr_Format(PyExc_TypeError,
+                 "%s: expected a buffer of 32 bits floats, not '%s'",
+                 error_prefix,
+                 r_buffer->format ? r_buffer->format : "B");
+    PyBuffer_Release(r_buffer);
+    return -1;
+  }
+  if (r_buffer->len != len * (Py_ssize_t)sizeof(float)) {
+    PyErr_Format(PyExc_ValueError,
+                 "%s: expected a buffer of %zd floats, not %zd",
+                 error_prefix,
+                 len,
+                 r_buffer->len / (Py_ssize_t)sizeof(float));
+    PyBuffer_Release(r_buffer);
+    return -1;
+  }
+
+  *r_attribute = attribute;
+  return 0;
+}
+
+PyDoc_STRVAR(Stroke_foreach_get_doc,
+             ".. method:: foreach_get(attribute, seq)\n"
+             "\n"
+             "   Copies an attribute of all the stroke vertices into a flat buffer of\n"
+             "   32 bits floats (e.g. a NumPy array of ``float32``), in the order of\n"
+             "   the vertices.  This is much faster than reading the attribute of\n"
+             "   each :class:`StrokeVertex` in a loop.\n"
+             "\n"
+             "   :arg attribute: The name of the attribute, one of ``'point'`` (2\n"
+             "      values), ``'point_3d'`` (3), ``'curvilinear_abscissa'`` (1),\n"
+             "      ``'u'`` (1), ``'color'`` (3), ``'alpha'`` (1) or ``'thickness'``\n"
+             "      (2, right and left).\n"
+             "   :type attribute: str\n"
+             "   :arg seq: A writable buffer of len(stroke) times the attribute size.\n"
+             "   :type seq: buffer");
+
+static PyObject *Stroke_foreach_get(BPy_Stroke *self, PyObject *args, PyObject *kwds)
+{
+  int attribute;
+  Py_buffer buffer;
+
+  if (Stroke_foreach_parse_args(
+          self, args, kwds, "Stroke.foreach_get", false, &attribute, &buffer) == -1) {
+    return nullptr;
+  }
+
+  float *data = (float *)buffer.buf;
+  for (StrokeInternal::StrokeVertexIterator it = self->s->strokeVerticesBegin(); !it.isEnd();
+       ++it) {
+    StrokeVertex *sv = &(*it);
+    switch (attribute) {
+      case STROKE_FOREACH_POINT:
+        data[0] = sv->x();
+        data[1] = sv->y();
+        break;
+      case STROKE_FOREACH_POINT_3D: {
+        Vec3r p(sv->getPoint3D());
+        data[0] = p[0];
+        data[1] = p[1];
+        data[2] = p[2];
+        break;
+      }
+      case STROKE_FOREACH_CURVILINEAR_ABSCISSA:
+        data[0] = sv->curvilinearAbscissa();
+        break;
+      case STROKE_FOREACH_U:
+        data[0] = sv->u();
+        break;
+      case STROKE_FOREACH_COLOR: {
+        const float *color = sv->attribute().getColor();
+        data[0] = color[0];
+        data[1] = color[1];
+        data[2] = color[2];
+        break;
+      }
+      case STROKE_FOREACH_ALPHA:
+        data[0] = sv->attribute().getAlpha();
+        break;
+      case STROKE_FOREACH_THICKNESS: {
+        const float *thickness = sv->attribute().getThickness();
+        data[0] = thickness[0];
+        data[1] = thickness[1];
+        break;
+      }
+    }
+    data += Stroke_foreach_attributes[attribute].size;
+  }
+
+  PyBuffer_Release(&buffer);
+  Py_RETURN_NONE;
+}
+
+PyDoc_STRVAR(Stroke_foreach_set_doc,
+             ".. method:: foreach_set(attribute, seq)\n"
+             "\n"
+             "   Sets an attribute of all the stroke vertices from a flat buffer of\n"
+             "   32 bits floats (e.g. a NumPy array of ``float32``), in the order of\n"
+             "   the vertices.\n"
+             "\n"
+             "   :arg attribute: The name of the attribute, one of ``'point'``,\n"
+             "      ``'color'``, ``'alpha'`` or ``'thickness'`` (see\n"
+             "      :meth:`foreach_get`).  After setting ``'point'``, the length of the\n"
+             "      stroke must be updated with :meth:`update_length`.\n"
+             "   :type attribute: str\n"
+             "   :arg seq: A buffer of len(stroke) times the attribute size.\n"
+             "   :type seq: buffer");
+
+static PyObject *Stroke_foreach_set(BPy_Stroke *self, PyObject *args, PyObject *kwds)
+{
+  int attribute;
+  Py_buffer buffer;
+
+  if (Stroke_foreach_parse_args(
+          self, args, kwds, "Stroke.foreach_set", true, &attribute, &buffer) == -1) {
+    return nullptr;
+  }
+
+  const float *data = (const float *)buffer.buf;
+  for (StrokeInternal::StrokeVertexIterator it = self->s->strokeVerticesBegin(); !it.isEnd();
+       ++it) {
+    StrokeVertex *sv = &(*it);
+    switch (attribute) {
+      case STROKE_FOREACH_POINT:
+        sv->setX(data[0]);
+        sv->setY(data[1]);
+        break;
+      case STROKE_FOREACH_COLOR:
+        sv->attribute().setColor(data[0], data[1], data[2]);
+        break;
+      case STROKE_FOREACH_ALPHA:
+        sv->attribute().setAlpha(data[0]);
+        break;
+      case STROKE_FOREACH_THICKNESS:
+        sv->attribute().setThickness(data[0], data[1]);
+        break;
+    }
+    data += Stroke_foreach_attributes[attribute].size;
+  }
+
+  PyBuffer_Release(&buffer);
+  Py_RETURN_NONE;
+}
+
 static PyMethodDef BPy_Stroke_methods[] = {
     {"compute_sampling",
      (PyCFunction)Stroke_compute_sampling,
@@ -355,6 +578,14 @@ static PyMethodDef BPy_Stroke_methods[] = {
      (PyCFunction)Stroke_stroke_vertices_size,
      METH_NOARGS,
      Stroke_stroke_vertices_size_doc},
+    {"foreach_get",
+     (PyCFunction)Stroke_foreach_get,
+     METH_VARARGS | METH_KEYWORDS,
+     Stroke_foreach_get_doc},
+    {"foreach_set",
+     (PyCFunction)Stroke_foreach_set,
+     METH_VARARGS | METH_KEYWORDS,
+     Stroke_foreach_set_doc},
     {nullptr, nullptr, 0, nullptr},
 };
 
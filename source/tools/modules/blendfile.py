@@ -21,6 +21,7 @@
 
 import gzip
 import logging
+import mmap
 import os
 import struct
 import tempfile
@@ -29,6 +30,12 @@ log = logging.getLogger("blendfile")
 
 FILE_BUFFER_SIZE = 1024 * 1024
 
+# Extension of the sidecar block index written next to blend files (see ``open_blend(use_index=True)``).
+INDEX_EXT = ".blendidx"
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
 
 class BlendFileError(Exception):
     """Raised when there was an error reading/parsing a blend file."""
@@ -41,9 +48,14 @@ class BlendFileError(Exception):
 # open a filename
 # determine if the file is compressed
 # and returns a handle
-def open_blend(filename, access="rb"):
+def open_blend(filename, access="rb", use_mmap=False, use_index=False):
     """Opens a blend file for reading or writing pending on the access
-    supports 2 kind of blend files. Uncompressed and compressed.
+    supports 3 kind of blend files. Uncompressed, gzip and zstd compressed.
+
+    :arg use_mmap: Memory map the (decompressed) file, only used for read-only access.
+    :arg use_index: Read the block headers from a sidecar index file when it matches
+       the size and modification time of the blend file, write it otherwise.
+
     Known issue: does not support packaged blend files
     """
     handle = open(filename, access)
@@ -52,34 +64,59 @@ def open_blend(filename, access="rb"):
     if magic == magic_test:
         log.debug("normal blendfile detected")
         handle.seek(0, os.SEEK_SET)
-        bfile = BlendFile(handle)
-        bfile.is_compressed = False
-        bfile.filepath_orig = filename
-        return bfile
-    elif magic[:2] == b'\x1f\x8b':
+        compression = None
+    elif magic[:2] == GZIP_MAGIC:
         log.debug("gzip blendfile detected")
+        compression = "gzip"
+    elif magic[:4] == ZSTD_MAGIC:
+        log.debug("zstd blendfile detected")
+        compression = "zstd"
+    else:
+        raise BlendFileError("filetype not a blend or a gzip blend")
+
+    if compression is not None:
         handle.close()
         log.debug("decompressing started")
-        fs = gzip.open(filename, "rb")
+        fs = _compressed_open(filename, compression, "rb")
         data = fs.read(FILE_BUFFER_SIZE)
         magic = data[:len(magic_test)]
-        if magic == magic_test:
-            handle = tempfile.TemporaryFile()
-            while data:
-                handle.write(data)
-                data = fs.read(FILE_BUFFER_SIZE)
-            log.debug("decompressing finished")
+        if magic != magic_test:
             fs.close()
-            log.debug("resetting decompressed file")
-            handle.seek(os.SEEK_SET, 0)
-            bfile = BlendFile(handle)
-            bfile.is_compressed = True
-            bfile.filepath_orig = filename
-            return bfile
-        else:
-            raise BlendFileError("filetype inside gzip not a blend")
-    else:
-        raise BlendFileError("filetype not a blend or a gzip blend")
+            raise BlendFileError("filetype inside %s not a blend" % compression)
+        handle = tempfile.TemporaryFile()
+        while data:
+            handle.write(data)
+            data = fs.read(FILE_BUFFER_SIZE)
+        log.debug("decompressing finished")
+        fs.close()
+        log.debug("resetting decompressed file")
+        handle.seek(os.SEEK_SET, 0)
+
+    bfile = BlendFile(
+        handle,
+        use_mmap=(use_mmap and access == "rb"),
+        index_source=(filename if use_index else None),
+    )
+    bfile.is_compressed = compression is not None
+    bfile.compression = compression
+    bfile.filepath_orig = filename
+    return bfile
+
+
+def _compressed_open(filename, compression, mode):
+    if compression == "gzip":
+        return gzip.open(filename, mode)
+    # zstd is not part of the standard library before Python 3.14.
+    try:
+        from compression import zstd
+        return zstd.open(filename, mode)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise BlendFileError("zstd compressed blend, the 'zstandard' module is needed to read it") from None
+    return zstandard.open(filename, mode)
 
 
 def pad_up_4(offset):
@@ -93,9 +130,12 @@ def pad_up_4(offset):
 class BlendFile:
     """
     Blend file.
+
+    Only block headers are read on load,
+    SDNA and the block lookup tables are created on first access.
     """
     __slots__ = (
-        # file (result of open())
+        # file (result of open()) or mmap
         "handle",
         # str (original name of the file path)
         "filepath_orig",
@@ -105,53 +145,69 @@ class BlendFile:
         "block_header_struct",
         # BlendFileBlock
         "blocks",
-        # [DNAStruct, ...]
-        "structs",
-        # dict {b'StructName': sdna_index}
+        # [DNAStruct, ...] (lazy, see 'structs')
+        "_structs",
+        # dict {b'StructName': sdna_index} (lazy, see 'sdna_index_from_id')
         # (where the index is an index into 'structs')
-        "sdna_index_from_id",
-        # dict {addr_old: block}
-        "block_from_offset",
-        # int
-        "code_index",
+        "_sdna_index_from_id",
+        # dict {addr_old: block} (lazy, see 'block_from_offset')
+        "_block_from_offset",
+        # dict {code: [block, ...]} (lazy, see 'code_index')
+        "_code_index",
+        # BlendFileBlock (the 'DNA1' block)
+        "_dna_block",
         # bool (did we make a change)
         "is_modified",
         # bool (is file gzipped)
         "is_compressed",
+        # None, "gzip" or "zstd"
+        "compression",
         )
 
-    def __init__(self, handle):
+    def __init__(self, handle, use_mmap=False, index_source=None):
         log.debug("initializing reading blend-file")
+        if use_mmap:
+            # The mapping keeps its own reference to the file.
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            handle.close()
+            handle = mapped
         self.handle = handle
         self.header = BlendFileHeader(handle)
         self.block_header_struct = self.header.create_block_header_struct()
-        self.blocks = []
-        self.code_index = {}
-        self.structs = []
-        self.sdna_index_from_id = {}
+        self.blocks = None
+        self._structs = None
+        self._sdna_index_from_id = None
+        self._block_from_offset = None
+        self._code_index = None
+        self.is_modified = False
+        self.is_compressed = False
+        self.compression = None
 
-        block = BlendFileBlock(handle, self)
-        while block.code != b'ENDB':
-            if block.code == b'DNA1':
-                (self.structs,
-                 self.sdna_index_from_id,
-                 ) = BlendFile.decode_structs(self.header, block, handle)
-            else:
-                handle.seek(block.size, os.SEEK_CUR)
+        index_key = None
+        if index_source is not None:
+            st = os.stat(index_source)
+            index_key = (st.st_size, st.st_mtime_ns)
+            self.blocks = BlendFile.read_index(self, index_source + INDEX_EXT, index_key)
 
+        if self.blocks is None:
+            self.blocks = []
+            block = BlendFileBlock(handle, self)
+            while block.code != b'ENDB':
+                handle.seek(block.size, os.SEEK_CUR)
+                self.blocks.append(block)
+                block = BlendFileBlock(handle, self)
             self.blocks.append(block)
-            self.code_index.setdefault(block.code, []).append(block)
 
-            block = BlendFileBlock(handle, self)
-        self.is_modified = False
-        self.blocks.append(block)
+            if index_key is not None:
+                BlendFile.write_index(self, index_source + INDEX_EXT, index_key)
 
-        if not self.structs:
+        for block in self.blocks:
+            if block.code == b'DNA1':
+                self._dna_block = block
+                break
+        else:
             raise BlendFileError("No DNA1 block in file, this is not a valid .blend file!")
 
-        # Cache (could lazy init, in case we never use?).
-        self.block_from_offset = {block.addr_old: block for block in self.blocks if block.code != b'ENDB'}
-
     def __repr__(self):
         return '<%s %r>' % (self.__class__.__qualname__, self.handle)
 
@@ -161,11 +217,46 @@ class BlendFile:
     def __exit__(self, type, value, traceback):
         self.close()
 
+    def _decode_sdna(self):
+        handle = self.handle
+        # Callers may be in the middle of reading a block.
+        offset = handle.tell()
+        handle.seek(self._dna_block.file_offset, os.SEEK_SET)
+        (self._structs,
+         self._sdna_index_from_id,
+         ) = BlendFile.decode_structs(self.header, self._dna_block, handle)
+        handle.seek(offset, os.SEEK_SET)
+
+    @property
+    def structs(self):
+        if self._structs is None:
+            self._decode_sdna()
+        return self._structs
+
+    @property
+    def sdna_index_from_id(self):
+        if self._sdna_index_from_id is None:
+            self._decode_sdna()
+        return self._sdna_index_from_id
+
+    @property
+    def code_index(self):
+        if self._code_index is None:
+            code_index = self._code_index = {}
+            for block in self.blocks:
+                if block.code != b'ENDB':
+                    code_index.setdefault(block.code, []).append(block)
+        return self._code_index
+
+    @property
+    def block_from_offset(self):
+        if self._block_from_offset is None:
+            self._block_from_offset = {block.addr_old: block for block in self.blocks if block.code != b'ENDB'}
+        return self._block_from_offset
+
     def find_blocks_from_code(self, code):
         assert(type(code) == bytes)
-        if code not in self.code_index:
-            return []
-        return self.code_index[code]
+        return self.code_index.get(code, [])
 
     def find_block_from_offset(self, offset):
         # same as looking looping over all blocks,
@@ -173,6 +264,70 @@ class BlendFile:
         assert(type(offset) is int)
         return self.block_from_offset.get(offset)
 
+    # -------------------------------------------------------------------------
+    # Sidecar block index
+    #
+    # The index stores the block headers, so blend files that didn't change
+    # since the index was written can be loaded without walking all blocks.
+
+    INDEX_MAGIC = b'BIDX0001'
+    # file-size, file-mtime (nanoseconds), pointer-size, little-endian, block-count
+    INDEX_HEADER = struct.Struct(b'<8sQqBBI')
+    # code, size, addr_old, sdna_index, count, file_offset
+    INDEX_BLOCK = struct.Struct(b'<4sIQIIQ')
+
+    def read_index(self, filepath, index_key):
+        """
+        Return the blocks stored in the index at filepath,
+        None when the index is missing or doesn't match index_key (size, mtime).
+        """
+        try:
+            with open(filepath, 'rb') as fh:
+                data = fh.read()
+        except OSError:
+            return None
+        header = BlendFile.INDEX_HEADER
+        if len(data) < header.size:
+            return None
+        magic, size, mtime, pointer_size, is_little_endian, blocks_len = header.unpack_from(data, 0)
+        if ((magic != BlendFile.INDEX_MAGIC) or
+                ((size, mtime) != index_key) or
+                (pointer_size != self.header.pointer_size) or
+                (bool(is_little_endian) != self.header.is_little_endian) or
+                (len(data) != header.size + blocks_len * BlendFile.INDEX_BLOCK.size)):
+            log.debug("ignoring outdated index %r" % filepath)
+            return None
+        log.debug("reading block index %r" % filepath)
+        return [
+            BlendFileBlock.from_index(self, *values)
+            for values in BlendFile.INDEX_BLOCK.iter_unpack(memoryview(data)[header.size:])
+        ]
+
+    def write_index(self, filepath, index_key):
+        """
+        Write the block headers to an index at filepath, failing silently when it can't be written.
+        """
+        index_block = BlendFile.INDEX_BLOCK
+        data = [BlendFile.INDEX_HEADER.pack(
+            BlendFile.INDEX_MAGIC, *index_key,
+            self.header.pointer_size, self.header.is_little_endian, len(self.blocks),
+        )]
+        for block in self.blocks:
+            data.append(index_block.pack(
+                block.code, block.size, block.addr_old, block.sdna_index, block.count, block.file_offset,
+            ))
+        filepath_tmp = filepath + ".tmp%d" % os.getpid()
+        try:
+            with open(filepath_tmp, 'wb') as fh:
+                fh.write(b''.join(data))
+            os.replace(filepath_tmp, filepath)
+        except OSError as ex:
+            log.warning("unable to write block index %r: %s" % (filepath, ex))
+            try:
+                os.remove(filepath_tmp)
+            except OSError:
+                pass
+
     def close(self):
         """
         Close the blend file
@@ -185,7 +340,7 @@ class BlendFile:
                 log.debug("close compressed blend file")
                 handle.seek(os.SEEK_SET, 0)
                 log.debug("compressing started")
-                fs = gzip.open(self.filepath_orig, "wb")
+                fs = _compressed_open(self.filepath_orig, self.compression or "gzip", "wb")
                 data = handle.read(FILE_BUFFER_SIZE)
                 while data:
                     fs.write(data)
@@ -316,6 +471,20 @@ class BlendFileBlock:
                  hex(self.addr_old),
                  ))
 
+    @classmethod
+    def from_index(cls, bfile, code, size, addr_old, sdna_index, count, file_offset):
+        """Create a block from values stored in the sidecar index, without reading the file."""
+        self = cls.__new__(cls)
+        self.file = bfile
+        self.user_data = None
+        self.code = code.partition(b'\0')[0]
+        self.size = size
+        self.addr_old = addr_old
+        self.sdna_index = sdna_index
+        self.count = count
+        self.file_offset = file_offset
+        return self
+
     def __init__(self, handle, bfile):
         OLDBLOCK = struct.Struct(b'4sI')
 
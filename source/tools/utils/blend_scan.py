@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+
+# ***** BEGIN GPL LICENSE BLOCK *****
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 59 Temple Place - Suite 330, Boston, MA  02111-1307, USA.
+#
+# ***** END GPL LICENCE BLOCK *****
+
+# <pep8 compliant>
+
+
+"""
+This is a tool for building a catalogue of all .blend files found in a directory tree,
+without running Blender.
+
+For each file it stores render ranges, ID names, linked libraries and external files
+(images, sounds, movie clips, fonts, caches, volumes).
+Files are read by a pool of processes, and only files whose size or modification time changed
+since the last run are read again.
+
+Example usage:
+
+   ./blend_scan.py -o catalogue.sqlite /path/to/library
+
+To write JSON-lines instead of SQLite (chosen from the output extension):
+
+   ./blend_scan.py -o catalogue.jsonl /path/to/library
+
+To list the files referencing a given image from the SQLite catalogue:
+
+   sqlite3 catalogue.sqlite "SELECT path FROM files WHERE data LIKE '%wood.png%'"
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+# Avoid maintaining multiple blendfile modules
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "modules"))
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "..", "release", "scripts", "modules"))
+del sys
+
+import blendfile
+import blend_render_info
+
+
+# ID codes of data-blocks referencing external files, and the name of their path field.
+# Older files use 'name' for the path.
+EXTERNAL_FILE_CODES = {b'IM', b'SO', b'MC', b'VF', b'CF', b'VO'}
+
+# Number of results written between two commits of the SQLite catalogue.
+SQLITE_COMMIT_STEP = 64
+
+
+##### Scanning (runs in worker processes) #####
+
+def _decode(value):
+    return value.decode('utf-8', 'surrogateescape')
+
+
+def _block_path(block):
+    for key in (b'filepath', b'name'):
+        if key in block.dna_type.field_from_name:
+            return _decode(block.get(key, use_str=False))
+    return None
+
+
+def _is_id_block(block):
+    fields = block.dna_type.fields
+    return bool(fields) and fields[0].dna_type.dna_type_id == b'ID'
+
+
+def scan_blend(filepath, use_index=False):
+    """
+    Return a dict describing the blend file at filepath.
+    """
+    result = {
+        "version": None,
+        "scenes": [],
+        "ids": {},
+        "libraries": [],
+        "files": [],
+    }
+    with blendfile.open_blend(filepath, use_mmap=True, use_index=use_index) as blend:
+        header = blend.header
+        result["version"] = header.version
+        handle = blend.handle
+
+        for block in blend.blocks:
+            code = block.code
+            if code == b'REND':
+                handle.seek(block.file_offset, os.SEEK_SET)
+                result["scenes"].append(blend_render_info.unpack_rend_chunk(
+                    handle.read(block.size), not header.is_little_endian))
+            elif len(code) == 2 and _is_id_block(block):
+                name = block.get((b'id', b'name'), use_str=False)
+                result["ids"].setdefault(_decode(code), []).append(_decode(name[2:]))
+                if code == b'LI':
+                    result["libraries"].append(_block_path(block))
+                elif code in EXTERNAL_FILE_CODES:
+                    path = _block_path(block)
+                    if path:
+                        packed = (b'packedfile' in block.dna_type.field_from_name and
+                                  block.get(b'packedfile') != 0)
+                        result["files"].append({"code": _decode(code), "path": path, "packed": packed})
+    return result
+
+
+def scan_file(filepath, size, mtime_ns, use_index):
+    """
+    Worker entry point, never raises so a bad file doesn't stop the scan.
+    """
+    try:
+        data = scan_blend(filepath, use_index=use_index)
+        error = None
+    except Exception as ex:
+        data = None
+        error = "%s: %s" % (type(ex).__name__, ex)
+    return filepath, size, mtime_ns, data, error
+
+
+##### Catalogues #####
+
+class CatalogueSQLite:
+    """
+    Catalogue stored in a SQLite database, one row per blend file.
+    """
+
+    def __init__(self, filepath):
+        self.db = sqlite3.connect(filepath)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, data TEXT, error TEXT)")
+        self.pending = 0
+
+    def stamps(self):
+        return {path: (size, mtime_ns) for path, size, mtime_ns in
+                self.db.execute("SELECT path, size, mtime_ns FROM files")}
+
+    def add(self, filepath, size, mtime_ns, data, error):
+        self.db.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+            (filepath, size, mtime_ns, None if data is None else json.dumps(data), error))
+        self.pending += 1
+        if self.pending >= SQLITE_COMMIT_STEP:
+            self.db.commit()
+            self.pending = 0
+
+    def remove(self, filepaths):
+        self.db.executemany("DELETE FROM files WHERE path = ?", ((f,) for f in filepaths))
+        self.db.commit()
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+
+class CatalogueJSONLines:
+    """
+    Catalogue stored as one JSON object per line.
+
+    Results are appended as they arrive, so an interrupted scan keeps what it read.
+    When the same path appears more than once, the last line wins,
+    a line with "removed" set drops the path.
+    The file is compacted at the end of the scan.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.records = {}
+        if os.path.exists(filepath):
+            with open(filepath, 'r', encoding='utf-8') as fh:
+                for line in fh:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Truncated last line of an interrupted scan.
+                        continue
+                    if record.get("removed"):
+                        self.records.pop(record["path"], None)
+                    else:
+                        self.records[record["path"]] = record
+        self.fh = open(filepath, 'a', encoding='utf-8')
+
+    def stamps(self):
+        return {path: (record["size"], record["mtime_ns"]) for path, record in self.records.items()}
+
+    def add(self, filepath, size, mtime_ns, data, error):
+        record = {"path": filepath, "size": size, "mtime_ns": mtime_ns, "data": data, "error": error}
+        self.records[filepath] = record
+        self.fh.write(json.dumps(record) + "\n")
+        self.fh.flush()
+
+    def remove(self, filepaths):
+        for filepath in filepaths:
+            del self.records[filepath]
+            self.fh.write(json.dumps({"path": filepath, "removed": True}) + "\n")
+        self.fh.flush()
+
+    def close(self):
+        self.fh.close()
+        filepath_tmp = self.filepath + ".tmp"
+        with open(filepath_tmp, 'w', encoding='utf-8') as fh:
+            for record in self.records.values():
+                fh.write(json.dumps(record) + "\n")
+        os.replace(filepath_tmp, self.filepath)
+
+
+def catalogue_open(filepath):
+    if filepath.endswith((".jsonl", ".json")):
+        return CatalogueJSONLines(filepath)
+    return CatalogueSQLite(filepath)
+
+
+##### Main #####
+
+def blend_files_iter(paths):
+    for path in paths:
+        if os.path.isfile(path):
+            st = os.stat(path)
+            yield os.path.abspath(path), st.st_size, st.st_mtime_ns
+            continue
+        stack = [path]
+        while stack:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith("."):
+                            stack.append(entry.path)
+                    elif entry.name.endswith(".blend"):
+                        st = entry.stat()
+                        yield os.path.abspath(entry.path), st.st_size, st.st_mtime_ns
+
+
+def path_is_under(filepath, roots):
+    """
+    True when filepath is one of the roots, or inside one of the root directories.
+    """
+    for root in roots:
+        if filepath == root or filepath.startswith(root.rstrip(os.sep) + os.sep):
+            return True
+    return False
+
+
+def scan(paths, catalogue, jobs=None, use_index=False, verbose=False):
+    """
+    Update catalogue with the blend files found in paths, returns (scanned, unchanged, removed) counts.
+
+    Only catalogued files under paths that no longer exist are removed,
+    files under other paths are kept, so several trees can share a catalogue.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    stamps = catalogue.stamps()
+    todo = []
+    found = set()
+    for filepath, size, mtime_ns in blend_files_iter(paths):
+        found.add(filepath)
+        if stamps.get(filepath) != (size, mtime_ns):
+            todo.append((filepath, size, mtime_ns))
+
+    roots = [os.path.abspath(path) for path in paths]
+    removed = [filepath for filepath in stamps if filepath not in found and path_is_under(filepath, roots)]
+    catalogue.remove(removed)
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(scan_file, *item, use_index) for item in todo]
+            for future in as_completed(futures):
+                filepath, size, mtime_ns, data, error = future.result()
+                catalogue.add(filepath, size, mtime_ns, data, error)
+                if error is not None:
+                    print("Error reading %r: %s" % (filepath, error))
+                elif verbose:
+                    print("Read %r" % filepath)
+
+    return len(todo), len(found) - len(todo), len(removed)
+
+
+def argparse_create():
+    import argparse
+
+    # When --help or no args are given, print this help
+    usage_text = __doc__
+
+    parser = argparse.ArgumentParser(description=usage_text,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+
+    parser.add_argument(
+        dest="paths", nargs="+", metavar='PATH',
+        help="Directories to scan recursively, or .blend files")
+    parser.add_argument(
+        "-o", "--output", dest="output", metavar='FILE', required=True,
+        help="Catalogue to create or update, JSON-lines when ending with '.jsonl', SQLite otherwise")
+    parser.add_argument(
+        "-j", "--jobs", dest="jobs", type=int, default=None,
+        help="Number of processes (defaults to the number of CPUs)")
+    parser.add_argument(
+        "--use-index", dest="use_index", default=False, action='store_true',
+        help="Read and write '%s' block index files next to the blend files" % blendfile.INDEX_EXT)
+    parser.add_argument(
+        "-v", "--verbose", dest="verbose", default=False, action='store_true',
+        help="Print every file read")
+
+    return parser
+
+
+def main():
+    args = argparse_create().parse_args()
+
+    time_start = time.time()
+    catalogue = catalogue_open(args.output)
+    try:
+        scanned, unchanged, removed = scan(
+            args.paths, catalogue,
+            jobs=args.jobs, use_index=args.use_index, verbose=args.verbose,
+        )
+    finally:
+        catalogue.close()
+
+    print("Read %d files, %d unchanged, %d removed in %.2f s" %
+          (scanned, unchanged, removed, time.time() - time_start))
+
+
+if __name__ == "__main__":
+    main()
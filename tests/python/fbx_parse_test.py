@@ -0,0 +1,129 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+"""
+Compare the binary FBX parser reading the whole file with its memory-mapped, lazy mode.
+
+Example Usage:
+
+./blender.bin --background --factory-startup --python tests/python/fbx_parse_test.py
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "release", "scripts", "addons"))
+
+from io_scene_fbx import encode_bin, parse_fbx
+
+FBX_VERSION = 7400
+
+
+def write_fbx(filepath):
+    elem_root = encode_bin.FBXElem(b'')
+
+    # needed by the writer
+    elem = encode_bin.FBXElem(b'FileId')
+    elem.add_bytes(b'')
+    elem_root.elems.append(elem)
+    elem = encode_bin.FBXElem(b'CreationTime')
+    elem.add_string(b'')
+    elem_root.elems.append(elem)
+
+    elem_objects = encode_bin.FBXElem(b'Objects')
+    elem_root.elems.append(elem_objects)
+    # small arrays are stored as is, bigger ones compressed
+    for length in (4, 1000):
+        elem = encode_bin.FBXElem(b'Geometry')
+        elem.add_int64(length)
+        elem.add_string(b'Geometry::Mesh')
+        elem.add_float64_array([i * 0.5 for i in range(length * 3)])
+        elem.add_float32_array([i * 0.25 for i in range(length)])
+        elem.add_int32_array([-i for i in range(length)])
+        elem.add_string(b'Mesh')
+        elem_objects.elems.append(elem)
+
+        elem_sub = encode_bin.FBXElem(b'LayerElement')
+        elem_sub.add_int64_array(range(length))
+        elem_sub.add_bool_array([i % 3 == 0 for i in range(length)])
+        elem_sub.add_byte_array([i % 256 for i in range(length)])
+        elem.elems.append(elem_sub)
+
+    encode_bin.init_write()
+    encode_bin.write(filepath, elem_root, FBX_VERSION)
+
+
+def elem_data(elem):
+    # properties are read by iteration, indexing and slicing, the way the importer does
+    return (
+        elem.id,
+        list(elem.props),
+        [elem.props[i] for i in range(len(elem.props))],
+        elem.props[1:],
+        bytes(elem.props_type),
+        [elem_data(elem_sub) for elem_sub in elem.elems],
+    )
+
+
+class FBXParseTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.tempdir.name, "test.fbx")
+        write_fbx(self.filepath)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_mmap(self):
+        elem_root, version = parse_fbx.parse(self.filepath, use_mmap=False)
+        self.assertEqual(version, FBX_VERSION)
+        expected = elem_data(elem_root)
+        parse_fbx.close(elem_root)
+
+        for array_cache_size in (0, 2, 16):
+            with self.subTest(array_cache_size=array_cache_size):
+                elem_root, version = parse_fbx.parse(self.filepath, use_mmap=True, array_cache_size=array_cache_size)
+                self.assertEqual(version, FBX_VERSION)
+                self.assertEqual(elem_data(elem_root), expected)
+                # accessed again, from the cache or decoded again
+                self.assertEqual(elem_data(elem_root), expected)
+                parse_fbx.close(elem_root)
+
+    def test_mmap_close(self):
+        elem_root, _version = parse_fbx.parse(self.filepath, use_mmap=True, array_cache_size=16)
+        elem_geom = elem_root.elems[2].elems[0]
+        self.assertIsInstance(elem_geom.props, parse_fbx.FBXLazyProps)
+        self.assertEqual(elem_geom.props[0], 4)
+        parse_fbx.close(elem_root)
+
+        # other properties are still there, arrays can't be decoded anymore
+        self.assertEqual(elem_geom.props[0], 4)
+        with self.assertRaises(ValueError):
+            elem_geom.props[2]
+
+
+def main():
+    unittest.main(argv=[__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []))
+
+
+if __name__ == "__main__":
+    main()
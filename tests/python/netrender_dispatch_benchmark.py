@@ -0,0 +1,189 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+"""
+Synthetic load on a local netrender master: many fake slaves poll for work
+and report every dispatched frame as done right away, so only the master's
+dispatching and bookkeeping is measured.
+
+Slaves keep their connection alive like real slaves, use --no-keep-alive
+to open a connection for every request instead.
+
+Example Usage:
+
+./blender.bin --background --factory-startup --python tests/python/netrender_dispatch_benchmark.py -- \
+    --slaves=500 --jobs=200 --frames=100 --tags=4
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "release", "scripts", "addons_contrib"))
+
+import netrender.master
+import netrender.model
+import netrender.utils
+
+
+def create_jobs(httpd, args):
+    tags = ["tag%i" % i for i in range(args.tags)]
+    for i in range(args.jobs):
+        job_info = netrender.model.RenderJob()
+        job_info.name = "job%i" % i
+        job_info.category = "category%i" % (i % 4)
+        # baking jobs don't upload a render result per frame
+        job_info.subtype = netrender.model.JOB_SUB_BAKING
+        job_info.chunks = args.chunks
+        job_info.priority = 1 + i % 3
+        if tags and i % 2:
+            job_info.tags = {random.choice(tags)}
+        for number in range(1, args.frames + 1):
+            job_info.addFrame(number)
+
+        # same as a job submitted to the master
+        job = netrender.master.MRenderJob(httpd.nextJobID(), job_info)
+        for frame in job_info.frames:
+            job.addFrame(frame.number, frame.command)
+        httpd.addJob(job)
+        job.start()
+
+
+class Slave:
+    def __init__(self, address, keep_alive):
+        self.address = address
+        self.keep_alive = keep_alive
+        self.conn = netrender.utils.KeepAliveHTTPConnection(*address)
+
+    def request(self, method, url, body=None, headers={}):
+        if not self.keep_alive:
+            self.conn.close()
+        self.conn.request(method, url, body, headers)
+        response = self.conn.getresponse()
+        data = response.read()
+        return response, data
+
+
+def slave_run(address, index, tags, keep_alive, stop, stats):
+    slave_info = netrender.model.RenderSlave()
+    slave_info.name = "slave%i" % index
+    slave_info.tags = tags
+
+    slave = Slave(address, keep_alive)
+
+    slave_id = None
+    while not stop.is_set():
+        try:
+            if slave_id is None:
+                response, data = slave.request("POST", "/slave", json.dumps(slave_info.serialize()))
+                slave_id = response.getheader("slave-id")
+                continue
+
+            t = time.time()
+            response, data = slave.request("GET", "/job", headers={"slave-id": slave_id})
+            stats["latencies"].append(time.time() - t)
+
+            if response.status != http.client.OK:
+                time.sleep(0.1)
+                continue
+
+            job = netrender.model.RenderJob.materialize(json.loads(str(data, encoding='utf8')))
+            for frame in job.frames:
+                headers = {
+                    "slave-id": slave_id,
+                    "job-id": job.id,
+                    "job-frame": str(frame.number),
+                    "job-result": str(netrender.model.FRAME_DONE),
+                    "job-time": "0",
+                }
+                slave.request("PUT", "/render", headers=headers)
+                stats["frames"] += 1
+        except (OSError, http.client.HTTPException):
+            # like a real slave, wait and retry
+            stats["errors"] += 1
+            slave.conn.close()
+            time.sleep(0.5)
+
+
+def main():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--slaves", type=int, default=500)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--chunks", type=int, default=1)
+    parser.add_argument("--tags", type=int, default=4, help="Number of distinct job tags")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run")
+    parser.add_argument("--no-keep-alive", dest="keep_alive", action="store_false")
+    args = parser.parse_args(argv)
+
+    path = tempfile.mkdtemp()
+    httpd = netrender.master.RenderMasterServer(
+        ("127.0.0.1", 0), netrender.master.RenderHandler, path, subdir=False)
+    httpd.stats = lambda *args: None
+    address = httpd.server_address
+
+    create_jobs(httpd, args)
+
+    # same as runMaster
+    master = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.5}, daemon=True)
+    master.start()
+    update_timer = netrender.master.RepeatTimer(netrender.master.UPDATE_INTERVAL, httpd.update)
+    update_timer.start()
+
+    stop = threading.Event()
+    stats = {"latencies": [], "frames": 0, "errors": 0}
+    tags = ["tag%i" % i for i in range(args.tags)]
+    slaves = []
+    for index in range(args.slaves):
+        # a third of the slaves render anything, the others only some tags
+        slave_tags = set(random.sample(tags, min(2, len(tags)))) if tags and index % 3 else set()
+        slave = threading.Thread(target=slave_run, args=(address, index, slave_tags, args.keep_alive, stop, stats), daemon=True)
+        slave.start()
+        slaves.append(slave)
+
+    time.sleep(args.duration)
+    stop.set()
+    update_timer.cancel()
+    httpd.shutdown()
+    httpd.server_close()
+
+    latencies = sorted(stats["latencies"]) or [0.0]
+
+    def percentile(p):
+        return 1000 * latencies[min(int(len(latencies) * p / 100), len(latencies) - 1)]
+
+    print("%i slaves, %i jobs of %i frames" % (args.slaves, args.jobs, args.frames))
+    print("Frames done: %i (%.1f/s)" % (stats["frames"], stats["frames"] / args.duration))
+    print("Job requests: %i, latency %.2f ms average, %.2f ms median, %.2f ms 95th, %.2f ms 99th percentile" % (
+        len(stats["latencies"]), 1000 * sum(latencies) / len(latencies), percentile(50), percentile(95), percentile(99)))
+    print("Connection errors: %i" % stats["errors"])
+    print("Jobs finished: %i" % sum(job.status == netrender.model.JOB_FINISHED for job in httpd.jobs))
+
+
+if __name__ == "__main__":
+    main()
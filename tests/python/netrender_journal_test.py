@@ -0,0 +1,176 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+"""
+Restore the netrender master state from its journal, as after a crash.
+
+Example Usage:
+
+./blender.bin --background --factory-startup --python tests/python/netrender_journal_test.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "release", "scripts", "addons_contrib"))
+
+import netrender.journal
+import netrender.master
+import netrender.model
+
+FRAMES = 10
+
+
+def create_slave(name):
+    slave_info = netrender.model.RenderSlave()
+    slave_info.name = name
+    slave_info.address = ("127.0.0.1", 8000)
+    return netrender.master.MRenderSlave(slave_info)
+
+
+def create_job():
+    job_info = netrender.model.RenderJob()
+    job_info.name = "job"
+    job_info.type = netrender.model.JOB_BLENDER
+    job_info.subtype = netrender.model.JOB_SUB_RENDER
+    job_info.chunks = 1
+
+    # same as a job submitted to the master
+    job = netrender.master.MRenderJob("1", job_info)
+    for number in range(1, FRAMES + 1):
+        job.addFrame(number, "")
+    job.start()
+    return job
+
+
+def job_state(job):
+    # as read back from the journal files
+    return json.loads(json.dumps(netrender.journal.jobState(job)))
+
+
+def slave_state(slave):
+    data = json.loads(json.dumps(slave.serialize()))
+    # restored slaves are seen when the master starts
+    del data["last_seen"]
+    return data
+
+
+class JournalTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.journal = netrender.journal.Journal(self.tempdir.name)
+
+        self.job = create_job()
+        self.slave = create_slave("slave")
+
+    def tearDown(self):
+        self.journal.close()
+        self.tempdir.cleanup()
+
+    def state(self):
+        # same as the master server state
+        return {
+                    "path": self.tempdir.name,
+                    "jobs": [netrender.journal.jobState(self.job)],
+                    "slaves": [self.slave.serialize()]
+                }
+
+    def journalFrame(self, frame):
+        self.journal.append({
+                                "op": "frame",
+                                "job": self.job.id,
+                                "frame": netrender.journal.frameState(frame),
+                                "frames_time": self.job.frames_time,
+                                "frames_timed": self.job.frames_timed,
+                                "last_dispatched": self.job.last_dispatched
+                            })
+
+    def renderFrames(self, count):
+        """Dispatch count frames and finish all of them but the last, which keeps the dispatched status"""
+        for i in range(count):
+            frame = self.job.getFrames()[0]
+            self.job.dispatchFrames([frame], self.slave)
+            self.journalFrame(frame)
+            if i < count - 1:
+                self.job.finishFrame(frame, self.slave, netrender.model.FRAME_DONE, 1.0 + i)
+                self.journalFrame(frame)
+
+    def test_restore(self):
+        self.journal.writeSnapshot(self.state())
+        self.journal.start()
+
+        self.journal.append({"op": "slave", "slave": self.slave.serialize()})
+        self.renderFrames(3)
+
+        self.journal.compact(self.state())
+
+        self.renderFrames(4)
+        self.job.priority = 5
+        self.journal.append({"op": "job_status", "job": netrender.journal.jobStatusState(self.job)})
+
+        job_expected = job_state(self.job)
+        slave_expected = slave_state(self.slave)
+
+        # the record of the last change is cut by a crash
+        self.job.priority = 10
+        self.journal.append({"op": "job_status", "job": netrender.journal.jobStatusState(self.job)})
+        self.journal.close()
+
+        with open(self.journal.journal_path, 'rb+') as f:
+            f.seek(-10, os.SEEK_END)
+            f.truncate()
+
+        state = netrender.journal.Journal(self.tempdir.name).load()
+        self.assertEqual(list(state["jobs"]), [self.job.id])
+        self.assertEqual(list(state["slaves"]), [self.slave.id])
+
+        job = netrender.master.restoreJob(state["jobs"][self.job.id])
+        slave = netrender.master.restoreSlave(state["slaves"][self.slave.id])
+
+        # frames being rendered are queued again
+        for frame_data in job_expected["frames"]:
+            if frame_data["status"] == netrender.model.FRAME_DISPATCHED:
+                frame_data["status"] = netrender.model.FRAME_QUEUED
+
+        self.assertEqual(job_state(job), job_expected)
+        self.assertEqual(job.priority, 5)
+        self.assertEqual(slave_state(slave), slave_expected)
+
+        # frame counters and lookups are rebuilt too
+        self.assertEqual(job.countFrames(netrender.model.FRAME_DONE), 5)
+        self.assertEqual(job.countFrames(netrender.model.FRAME_QUEUED), FRAMES - 5)
+        self.assertEqual(job.countFrames(netrender.model.FRAME_DISPATCHED), 0)
+        self.assertFalse(job.dispatched)
+        for frame in job.frames:
+            self.assertIs(job[frame.key], frame)
+
+        frame = job.getFrames()[0]
+        self.assertEqual(frame.number, 3)
+
+
+def main():
+    unittest.main(argv=[__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+"""
+Dispatching of the netrender master jobs, without any server or slave running.
+
+Example Usage:
+
+./blender.bin --background --factory-startup --python tests/python/netrender_master_test.py
+"""
+
+import os
+import sys
+import time
+import unittest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "release", "scripts", "addons_contrib"))
+
+import netrender.master
+import netrender.model
+
+FRAMES = 10
+
+
+def create_slave(name):
+    slave_info = netrender.model.RenderSlave()
+    slave_info.name = name
+    return netrender.master.MRenderSlave(slave_info)
+
+
+def create_job():
+    job_info = netrender.model.RenderJob()
+    job_info.name = "job"
+    job_info.type = netrender.model.JOB_BLENDER
+    job_info.subtype = netrender.model.JOB_SUB_RENDER
+    job_info.chunks = 1
+
+    # same as a job submitted to the master
+    job = netrender.master.MRenderJob("job", job_info)
+    for number in range(1, FRAMES + 1):
+        job.addFrame(number, "")
+    job.start()
+    return job
+
+
+class StragglerTest(unittest.TestCase):
+    def setUp(self):
+        self.job = create_job()
+        self.slave = create_slave("slave")
+        self.slave_idle = create_slave("idle")
+
+        # dispatch every frame, finishing all of them but the first
+        while True:
+            frames = self.job.getFrames()
+            if not frames:
+                break
+            self.job.dispatchFrames(frames, self.slave)
+            if frames[0].number != 1:
+                self.job.finishFrame(frames[0], self.slave, netrender.model.FRAME_DONE, 1.0)
+
+    def test_straggler_before_cursor(self):
+        frame = self.job.framesOf(1)[0]
+        self.assertEqual(frame.status, netrender.model.FRAME_DISPATCHED)
+        self.assertGreater(self.job.queued_cursor, frame.index)
+        self.assertEqual(self.job.dispatched, {frame})
+
+        frame.dispatch_time = time.time() - 100.0
+        self.assertIs(self.job.getStraggler(self.slave_idle, 2.0), frame)
+
+    def test_straggler_reset(self):
+        frame = self.job.framesOf(1)[0]
+        frame.dispatch_time = time.time() - 100.0
+        frame.reset(True)
+        self.assertFalse(self.job.dispatched)
+        self.assertIsNone(self.job.getStraggler(self.slave_idle, 2.0))
+
+    def test_no_straggler(self):
+        frame = self.job.framesOf(1)[0]
+        frame.dispatch_time = time.time()
+        self.assertIsNone(self.job.getStraggler(self.slave_idle, 2.0))
+
+    def test_straggler_own_slave(self):
+        frame = self.job.framesOf(1)[0]
+        frame.dispatch_time = time.time() - 100.0
+        self.assertIsNone(self.job.getStraggler(self.slave, 2.0))
+
+
+def main():
+    unittest.main(argv=[__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []))
+
+
+if __name__ == "__main__":
+    main()
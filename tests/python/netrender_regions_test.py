@@ -0,0 +1,129 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+"""
+Render a frame in regions the way netrender slaves do, merge them the way the
+master does, and compare the result with the frame rendered whole.
+
+./blender.bin --background --factory-startup --python tests/python/netrender_regions_test.py -- --regions=4
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import bpy
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "release", "scripts", "addons_contrib"))
+
+import netrender.model
+import netrender.regions
+import netrender.slave
+
+REGIONS = 4
+
+
+def render_job(job, blend_path, prefix):
+    command = netrender.slave.renderCommand(job, blend_path, prefix, 1)
+    subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+    return os.path.join(prefix, "%06d.exr" % job.frames[0].number)
+
+
+def load_pixels(filepath):
+    image = bpy.data.images.load(filepath)
+    pixels = image.pixels[:]
+    size = tuple(image.size)
+    bpy.data.images.remove(image)
+    return size, pixels
+
+
+class RegionsTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+
+        scene = bpy.context.scene
+        scene.render.engine = 'CYCLES'
+        scene.cycles.samples = 4
+        scene.cycles.use_adaptive_sampling = False
+        scene.cycles.use_denoising = False
+        # an odd height, so regions don't all have the same number of rows
+        scene.render.resolution_x = 64
+        scene.render.resolution_y = 47
+        scene.render.resolution_percentage = 100
+
+        self.blend_path = os.path.join(self.tempdir, "regions.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=self.blend_path, copy=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_regions(self):
+        job = netrender.model.RenderJob()
+        job.render = 'CYCLES'
+        job.addFrame(1)
+
+        full_path = render_job(job, self.blend_path, os.path.join(self.tempdir, "full"))
+
+        job.regions = REGIONS
+        region_paths = []
+        for region in range(REGIONS):
+            job.frames = [netrender.model.RenderFrame(1, region=region)]
+            prefix = os.path.join(self.tempdir, "region%i" % region)
+            region_paths.append(render_job(job, self.blend_path, prefix))
+
+        merged_path = os.path.join(self.tempdir, "merged.exr")
+        netrender.regions.merge(region_paths, merged_path)
+
+        full_size, full_pixels = load_pixels(full_path)
+        merged_size, merged_pixels = load_pixels(merged_path)
+
+        self.assertEqual(full_size, merged_size)
+        self.assertEqual(len(full_pixels), len(merged_pixels))
+        error = max(abs(a - b) for a, b in zip(full_pixels, merged_pixels))
+        self.assertLess(error, 1e-5)
+
+        # region renders are empty outside of their rows
+        for region, region_path in enumerate(region_paths):
+            (width, height), pixels = load_pixels(region_path)
+            ymin, ymax = netrender.regions.regionRows(region, REGIONS, height)
+            row_size = width * 4
+            self.assertFalse(any(pixels[:ymin * row_size]))
+            self.assertFalse(any(pixels[ymax * row_size:]))
+
+
+def main():
+    global REGIONS
+
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--regions", type=int, default=REGIONS)
+    args, remaining = parser.parse_known_args(argv)
+    REGIONS = args.regions
+
+    unittest.main(argv=[__file__] + remaining)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+"""
+Compare the regular and parallel parsing of the OBJ importer,
+on a given file or on a generated grid mesh.
+
+Example Usage:
+
+./blender.bin --background --factory-startup --python tests/python/obj_import_parallel_benchmark.py -- \
+    --path=/tmp/scan.obj
+
+./blender.bin --background --factory-startup --python tests/python/obj_import_parallel_benchmark.py -- \
+    --grid-size=2000
+"""
+
+import os
+import sys
+import time
+
+import bpy
+
+
+def write_grid_obj(filepath, size):
+    with open(filepath, 'w') as f:
+        fw = f.write
+        fw("o Grid\n")
+        for y in range(size):
+            fw("".join("v %f %f 0.0\n" % (x / size, y / size) for x in range(size)))
+        for y in range(size):
+            fw("".join("vt %f %f\n" % (x / size, y / size) for x in range(size)))
+        fw("vn 0.0 0.0 1.0\n")
+        for y in range(size - 1):
+            fw("".join(
+                "f %d/%d/1 %d/%d/1 %d/%d/1 %d/%d/1\n" % ((i,) * 2 + (i + 1,) * 2 + (i + size + 1,) * 2 + (i + size,) * 2)
+                for i in range(y * size + 1, y * size + size)
+            ))
+
+
+def import_stats(filepath, use_parallel_parse):
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    t = time.time()
+    bpy.ops.import_scene.obj(filepath=filepath, use_parallel_parse=use_parallel_parse)
+    t = time.time() - t
+    meshes = [ob.data for ob in bpy.context.scene.objects if ob.type == 'MESH']
+    return (
+        t,
+        sum(len(me.vertices) for me in meshes),
+        sum(len(me.polygons) for me in meshes),
+        sum(len(me.loops) for me in meshes),
+    )
+
+
+def main():
+    import argparse
+    import tempfile
+
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", help="OBJ file to import (a grid is generated if not set)")
+    parser.add_argument("--grid-size", type=int, default=1000, help="Size of the generated grid")
+    args = parser.parse_args(argv)
+
+    filepath = args.path
+    if not filepath:
+        filepath = os.path.join(tempfile.gettempdir(), "obj_import_parallel_benchmark.obj")
+        write_grid_obj(filepath, args.grid_size)
+
+    # Make sure the generated file is not skipped because of its size.
+    from io_scene_obj import import_obj
+    import_obj.PARALLEL_PARSE_MIN_SIZE = 0
+
+    t_serial, *stats_serial = import_stats(filepath, False)
+    t_parallel, *stats_parallel = import_stats(filepath, True)
+
+    print("File: %r (%.1f MiB)" % (filepath, os.path.getsize(filepath) / (1 << 20)))
+    print("Regular import:  %.3f sec (verts: %d, faces: %d, loops: %d)" % (t_serial, *stats_serial))
+    print("Parallel import: %.3f sec (verts: %d, faces: %d, loops: %d)" % (t_parallel, *stats_parallel))
+    print("Speed-up: %.2fx" % (t_serial / t_parallel))
+
+    if stats_serial != stats_parallel:
+        print("ERROR: regular and parallel imports do not give the same geometry!")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+# <pep8 compliant>
+
+"""
+Compare the array based 3D-Print Toolbox checks with the same checks done on BMesh elements.
+
+Example Usage:
+
+./blender.bin --background --factory-startup --python tests/python/object_print3d_utils_test.py
+"""
+
+import math
+import os
+import sys
+import unittest
+
+import bmesh
+import bpy
+from mathutils import Euler, Matrix, Vector
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "..", "release", "scripts", "addons"))
+
+from object_print3d_utils import mesh_helpers
+
+CUBE_VERTS = [(x, y, z) for x in (-1.0, 1.0) for y in (-1.0, 1.0) for z in (-1.0, 1.0)]
+CUBE_FACES = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+
+ANGLES = [math.radians(angle) for angle in (10.0, 45.0, 80.0, 100.0, 160.0)]
+
+
+def object_from_pydata(name, verts, edges, faces):
+    me = bpy.data.meshes.new(name)
+    me.from_pydata(verts, edges, faces)
+    obj = bpy.data.objects.new(name, me)
+    # checks in world space have to use the object transform
+    obj.matrix_world = Matrix.Translation((1.0, 2.0, 3.0)) @ Euler((0.3, 0.2, 0.1)).to_matrix().to_4x4()
+    return obj
+
+
+def bmesh_world(obj):
+    bm = mesh_helpers.bmesh_copy_from_object(obj, transform=True, triangulate=False)
+    bm.normal_update()
+    return bm
+
+
+def bmesh_check_solid(obj):
+    bm = mesh_helpers.bmesh_copy_from_object(obj, transform=False, triangulate=False)
+    non_manifold = [ele.index for ele in bm.edges if not ele.is_manifold]
+    non_contig = [ele.index for ele in bm.edges if ele.is_manifold and not ele.is_contiguous]
+    bm.free()
+    return non_manifold, non_contig
+
+
+def bmesh_check_distorted(obj, angle_distort):
+    bm = bmesh_world(obj)
+    faces = [ele.index for ele in bm.faces if mesh_helpers.face_is_distorted(ele, angle_distort)]
+    bm.free()
+    return faces
+
+
+def bmesh_check_sharp(obj, angle_sharp):
+    bm = bmesh_world(obj)
+    edges = [
+        ele.index for ele in bm.edges
+        if ele.is_manifold and ele.calc_face_angle_signed() > angle_sharp
+    ]
+    bm.free()
+    return edges
+
+
+def bmesh_check_overhang(obj, angle_overhang):
+    bm = bmesh_world(obj)
+    z_down_angle = Vector((0.0, 0.0, -1.0)).angle
+    faces = [ele.index for ele in bm.faces if z_down_angle(ele.normal, 4.0) < angle_overhang]
+    bm.free()
+    return faces
+
+
+class Print3DChecksTest(unittest.TestCase):
+    def assertIndices(self, indices, indices_expected):
+        self.assertEqual(sorted(indices.tolist()), sorted(indices_expected))
+
+    def compare_checks(self, obj):
+        data = mesh_helpers.MeshArrays(obj)
+
+        non_manifold, non_contig = mesh_helpers.mesh_check_solid(data)
+        non_manifold_expected, non_contig_expected = bmesh_check_solid(obj)
+        self.assertIndices(non_manifold, non_manifold_expected)
+        self.assertIndices(non_contig, non_contig_expected)
+
+        for angle in ANGLES:
+            with self.subTest(angle=math.degrees(angle)):
+                self.assertIndices(
+                    mesh_helpers.mesh_check_distorted(data, angle),
+                    bmesh_check_distorted(obj, angle),
+                )
+                self.assertIndices(
+                    mesh_helpers.mesh_check_sharp(data, angle),
+                    bmesh_check_sharp(obj, angle),
+                )
+                self.assertIndices(
+                    mesh_helpers.mesh_check_overhang(data, angle),
+                    bmesh_check_overhang(obj, angle),
+                )
+
+    def test_cube(self):
+        self.compare_checks(object_from_pydata("cube", CUBE_VERTS, [], CUBE_FACES))
+
+    def test_cube_flipped_face(self):
+        faces = CUBE_FACES[:]
+        faces[0] = faces[0][::-1]
+        self.compare_checks(object_from_pydata("cube_flipped", CUBE_VERTS, [], faces))
+
+    def test_cube_open(self):
+        self.compare_checks(object_from_pydata("cube_open", CUBE_VERTS, [], CUBE_FACES[1:]))
+
+    def test_concave(self):
+        # a cube with its top center vertex pushed down
+        verts = CUBE_VERTS + [(0.0, 0.0, 0.0)]
+        faces = CUBE_FACES[:5] + [(1, 5, 8), (5, 7, 8), (7, 3, 8), (3, 1, 8)]
+        self.compare_checks(object_from_pydata("concave", verts, [], faces))
+
+    def test_distorted(self):
+        verts = [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (1.0, 1.0, 0.5), (0.0, 1.0, 0.0)]
+        self.compare_checks(object_from_pydata("distorted", verts, [], [(0, 1, 2, 3)]))
+
+    def test_edges_only(self):
+        verts = [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (1.0, 1.0, 0.0)]
+        obj = object_from_pydata("edges", verts, [(0, 1), (1, 2)], [])
+        self.compare_checks(obj)
+
+        data = mesh_helpers.MeshArrays(obj)
+        faces_zero, edges_zero = mesh_helpers.mesh_check_degenerate(data, 0.0001)
+        self.assertEqual(len(faces_zero), 0)
+        self.assertEqual(len(edges_zero), 0)
+        self.assertEqual(len(mesh_helpers.mesh_check_self_intersect(data)), 0)
+        self.assertEqual(len(mesh_helpers.mesh_check_thick(data, 0.1)), 0)
+
+    def test_empty(self):
+        obj = object_from_pydata("empty", [], [], [])
+        self.compare_checks(obj)
+
+        data = mesh_helpers.MeshArrays(obj)
+        self.assertEqual(len(mesh_helpers.mesh_check_self_intersect(data)), 0)
+        self.assertEqual(len(mesh_helpers.mesh_check_thick(data, 0.1)), 0)
+
+
+def main():
+    unittest.main(argv=[__file__] + (sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []))
+
+
+if __name__ == "__main__":
+    main()